@@ -1,10 +1,11 @@
+import functools
 import inspect
 import logging
 import os
 import signal
 import sys
 from collections import defaultdict
-from typing import Callable
+from typing import Callable, cast
 
 import inject
 from flasgger import Swagger
@@ -12,12 +13,33 @@ from flask import Blueprint, Flask
 
 from config import Config, config, swagger_config, swagger_template
 from modules.common import message_bus as common_message_bus
+from modules.common.adapters.cache import RedisSharedCache
 from modules.common.adapters.notifications import DummyEmailNotificator
 from modules.common.adapters.task_dispatchers import CeleryTaskDispatcher
-from modules.common.database import initialize_database_sessions
+from modules.common.batching import MicroBatcher
+from modules.common.cache import (
+    AbstractSharedCache,
+    AbstractVersionedCache,
+    CachedResult,
+    GenerationalCache,
+    TTLCache,
+    TwoTierCache,
+    VersionedLRUCache,
+)
+from modules.common.database import (
+    NotificationListener,
+    get_engine,
+    get_session,
+    initialize_database_sessions,
+    remove_session,
+)
 from modules.common.domain.events import DomainEvent
+from modules.common.entrypoints.web import consistency as web_consistency
 from modules.template import adapters as template_adapters
+from modules.template import services as template_services
+from modules.template.domain.value_objects import TemplateId
 from modules.template.services import handlers as template_handlers
+from modules.template.services.queries.ports import AbstractTemplatesQueryRepository
 
 
 def get_configuration(environment_name: str | None = None) -> Config:
@@ -61,21 +83,65 @@ def inject_dependencies_into_handlers(handler: Callable, bindings: dict) -> Call
     return wrapper
 
 
-def inject_config(binder):
-    binder.bind_to_constructor("main_task_dispatcher", CeleryTaskDispatcher)
-    binder.bind_to_constructor("email_notificator", DummyEmailNotificator)
-    binder.bind_to_constructor(
-        "templates_unit_of_work", template_adapters.SqlAlchemyTemplatesUnitOfWork
+def inject_config(binder, configuration: Config):
+    # Bound dependencies are kept here as well, so they can be injected
+    # into handlers without reaching into private state of the binder.
+    bindings: dict[str, Callable] = {}
+
+    def bind(name: str, instance: object) -> None:
+        binder.bind(name, instance)
+        bindings[name] = lambda: instance
+
+    def bind_to_constructor(name: str, constructor: Callable) -> None:
+        # Instance is created once, whether it's requested first
+        # by the injector or by a handler.
+        cached_constructor = functools.cache(constructor)
+        binder.bind_to_constructor(name, cached_constructor)
+        bindings[name] = cached_constructor
+
+    bind_to_constructor("main_task_dispatcher", CeleryTaskDispatcher)
+    bind_to_constructor("email_notificator", DummyEmailNotificator)
+    bind_to_constructor(
+        "templates_unit_of_work",
+        lambda: template_adapters.SqlAlchemyTemplatesUnitOfWork(
+            notify_changes=_are_templates_cached(configuration),
+            searchable_fields=configuration.TEMPLATES_SEARCHABLE_FIELDS,
+        ),
     )
-    binder.bind_to_constructor(
+    shared_cache = (
+        RedisSharedCache(url=configuration.CACHE_REDIS_URL)
+        if configuration.CACHE_REDIS_URL is not None
+        else None
+    )
+    templates_cache = _create_templates_cache(
+        configuration=configuration, shared_cache=shared_cache
+    )
+    bind("templates_cache", templates_cache)
+    bind(
+        "templates_list_cache",
+        _create_templates_list_cache(
+            configuration=configuration, shared_cache=shared_cache
+        ),
+    )
+    bind_to_constructor(
         "templates_query_repository",
-        template_adapters.SqlAlchemyTemplatesQueryRepository,
+        lambda: _create_templates_query_repository(
+            configuration=configuration,
+            templates_cache=templates_cache,
+            shared_cache=shared_cache,
+        ),
+    )
+    bind_to_constructor(
+        "templates_create_batcher",
+        lambda: _create_templates_create_batcher(
+            configuration=configuration, bindings=bindings
+        ),
     )
     _message_bus = common_message_bus.MessageBus(
         event_handlers={},
         command_handlers={},
     )
-    binder.bind(
+    bind(
         "message_bus",
         _message_bus,
     )
@@ -83,12 +149,10 @@ def inject_config(binder):
         handlers=[
             template_handlers.EVENT_HANDLERS,
         ],
-        bindings=binder._bindings,
+        bindings=bindings,
     )
     _message_bus.command_handlers = {
-        command: inject_dependencies_into_handlers(
-            handler=handler, bindings=binder._bindings
-        )
+        command: inject_dependencies_into_handlers(handler=handler, bindings=bindings)
         for handler_ in [
             template_handlers.COMMAND_HANDLERS,
         ]
@@ -96,6 +160,150 @@ def inject_config(binder):
     }
 
 
+def _create_templates_cache(
+    configuration: Config, shared_cache: AbstractSharedCache | None
+) -> AbstractVersionedCache:
+    if shared_cache is None:
+        return VersionedLRUCache(
+            ttl_seconds=configuration.TEMPLATES_CACHE_TTL_SECONDS,
+            max_size=configuration.TEMPLATES_CACHE_MAX_SIZE,
+        )
+
+    return TwoTierCache(
+        shared_cache=shared_cache,
+        namespace="templates",
+        ttl_seconds=configuration.TEMPLATES_CACHE_TTL_SECONDS,
+        stale_seconds=configuration.CACHE_STALE_SECONDS,
+        local_ttl_seconds=configuration.CACHE_LOCAL_TTL_SECONDS,
+        local_max_size=configuration.TEMPLATES_CACHE_MAX_SIZE,
+        ttl_jitter=configuration.CACHE_TTL_JITTER,
+        serialize=template_adapters.serialize_template,
+        deserialize=template_adapters.deserialize_template,
+    )
+
+
+def _create_templates_list_cache(
+    configuration: Config, shared_cache: AbstractSharedCache | None
+) -> GenerationalCache | None:
+    if configuration.TEMPLATES_LIST_CACHE_MAX_SIZE <= 0:
+        return None
+
+    if shared_cache is None:
+        return GenerationalCache(
+            cache=VersionedLRUCache(
+                ttl_seconds=configuration.TEMPLATES_LIST_CACHE_TTL_SECONDS,
+                max_size=configuration.TEMPLATES_LIST_CACHE_MAX_SIZE,
+            ),
+            namespace="templates:list",
+        )
+
+    return GenerationalCache(
+        cache=TwoTierCache(
+            shared_cache=shared_cache,
+            namespace="templates:list",
+            ttl_seconds=configuration.TEMPLATES_LIST_CACHE_TTL_SECONDS,
+            stale_seconds=configuration.CACHE_STALE_SECONDS,
+            local_ttl_seconds=configuration.CACHE_LOCAL_TTL_SECONDS,
+            local_max_size=configuration.TEMPLATES_LIST_CACHE_MAX_SIZE,
+            ttl_jitter=configuration.CACHE_TTL_JITTER,
+            serialize=lambda result: result.serialize(
+                template_adapters.serialize_templates_list
+            ),
+            deserialize=lambda data: CachedResult.deserialize(
+                data, template_adapters.deserialize_templates_list
+            ),
+        ),
+        namespace="templates:list",
+        shared_cache=shared_cache,
+    )
+
+
+def _create_templates_query_repository(
+    configuration: Config,
+    templates_cache: AbstractVersionedCache,
+    shared_cache: AbstractSharedCache | None,
+) -> AbstractTemplatesQueryRepository:
+    count_cache = (
+        TwoTierCache(
+            shared_cache=shared_cache,
+            namespace="templates:count",
+            ttl_seconds=configuration.LIST_COUNT_CACHE_TTL_SECONDS,
+            stale_seconds=configuration.CACHE_STALE_SECONDS,
+            local_ttl_seconds=configuration.CACHE_LOCAL_TTL_SECONDS,
+            ttl_jitter=configuration.CACHE_TTL_JITTER,
+        )
+        if shared_cache is not None
+        else TTLCache(ttl_seconds=configuration.LIST_COUNT_CACHE_TTL_SECONDS)
+    )
+    repository = template_adapters.SqlAlchemyTemplatesQueryRepository(
+        count_cache=count_cache,
+        searchable_fields=configuration.TEMPLATES_SEARCHABLE_FIELDS,
+    )
+    if configuration.TEMPLATES_CACHE_MAX_SIZE <= 0:
+        return repository
+
+    return template_adapters.CachedTemplatesQueryRepository(
+        repository=repository,
+        cache=templates_cache,
+        primary_repository=template_adapters.SqlAlchemyTemplatesQueryRepository(
+            session_factory=get_session,
+            count_cache=count_cache,
+            searchable_fields=configuration.TEMPLATES_SEARCHABLE_FIELDS,
+        ),
+    )
+
+
+def _create_templates_cache_listener() -> NotificationListener:
+    templates_cache = cast(AbstractVersionedCache, inject.instance("templates_cache"))
+    templates_list_cache = cast(
+        GenerationalCache | None, inject.instance("templates_list_cache")
+    )
+
+    def handle_values(values: set[str]) -> None:
+        template_handlers.evict_changed_templates(
+            template_ids=[TemplateId.from_hex(value) for value in values],
+            templates_cache=templates_cache,
+        )
+        template_handlers.evict_templates_lists(
+            templates_list_cache=templates_list_cache
+        )
+
+    def handle_missed_notifications() -> None:
+        template_handlers.evict_all_templates(templates_cache=templates_cache)
+        template_handlers.evict_templates_lists(
+            templates_list_cache=templates_list_cache
+        )
+
+    return NotificationListener(
+        engine=get_engine(),
+        channel=template_adapters.TEMPLATES_CHANGED_CHANNEL,
+        handle_values=handle_values,
+        handle_missed_notifications=handle_missed_notifications,
+    )
+
+
+def _are_templates_cached(configuration: Config) -> bool:
+    return (
+        configuration.TEMPLATES_CACHE_MAX_SIZE > 0
+        or configuration.TEMPLATES_LIST_CACHE_MAX_SIZE > 0
+    )
+
+
+def _create_templates_create_batcher(
+    configuration: Config, bindings: dict
+) -> MicroBatcher | None:
+    if configuration.TEMPLATES_CREATE_BATCH_MAX_SIZE <= 1:
+        return None
+
+    return MicroBatcher(
+        handle_batch=inject_dependencies_into_handlers(
+            handler=template_services.create_templates, bindings=bindings
+        ),
+        max_batch_size=configuration.TEMPLATES_CREATE_BATCH_MAX_SIZE,
+        max_wait_seconds=configuration.TEMPLATES_CREATE_BATCH_MAX_WAIT_SECONDS,
+    )
+
+
 def _parse_event_handlers(
     handlers: list[
         dict[
@@ -139,9 +347,28 @@ def create_app(environment_name: str | None = None) -> Flask:
     configuration.init_app(app)
     app.url_map.strict_slashes = False
 
-    inject.configure(inject_config)
+    inject.configure(
+        lambda binder: inject_config(binder=binder, configuration=configuration)
+    )
 
-    initialize_database_sessions(configuration.database_url)
+    initialize_database_sessions(
+        database_url=configuration.database_url,
+        replica_database_url=configuration.database_replica_url,
+        replica_max_lag_seconds=configuration.DATABASE_REPLICA_MAX_LAG_SECONDS,
+        replica_max_wait_seconds=configuration.DATABASE_REPLICA_MAX_WAIT_SECONDS,
+    )
+    if _are_templates_cached(configuration):
+        # Templates changed by any process are evicted from caches
+        # of this process, so it doesn't serve them until they expire.
+        _create_templates_cache_listener().start()
+    # Each request is served with its own database session,
+    # which has to be released once the request is handled.
+    app.teardown_appcontext(remove_session)
+    # Consistency tokens let clients read their own writes,
+    # when queries are served by a read replica.
+    app.before_request(web_consistency.read_consistency_token)
+    app.after_request(web_consistency.add_consistency_token)
+    app.teardown_request(web_consistency.clear_consistency_tokens)
 
     logging.basicConfig(
         level=logging.getLevelName(app.config["LOG_LEVEL"]),
@@ -167,6 +394,12 @@ def create_app(environment_name: str | None = None) -> Flask:
     app.register_blueprint(main_api_blueprint, url_prefix="/api")
     # END OF BLUEPRINT REGISTRATION
 
+    from modules.template.entrypoints.cli import (  # noqa: E402
+        templates_cli as template_cli_commands,
+    )
+
+    app.cli.add_command(template_cli_commands)
+
     def closing_application_handler(signum, frame):
         close_app_cleanup()
         sys.exit(0)
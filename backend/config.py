@@ -11,6 +11,74 @@ class Config:
     DATABASE_PORT = os.environ["POSTGRES_DB_PORT"]
     DATABASE_NAME = os.environ["POSTGRES_DB_NAME"]
 
+    # Read replica is optional. When it's not configured,
+    # all queries are served by the primary database.
+    DATABASE_REPLICA_HOST = os.environ.get("POSTGRES_DB_REPLICA_HOST") or None
+    DATABASE_REPLICA_PORT = os.environ.get("POSTGRES_DB_REPLICA_PORT") or DATABASE_PORT
+    DATABASE_REPLICA_MAX_LAG_SECONDS = float(
+        os.environ.get("POSTGRES_DB_REPLICA_MAX_LAG_SECONDS") or 5
+    )
+    # Time given to the replica to catch up with a consistency token
+    # sent by a client, before a query is routed to the primary database.
+    DATABASE_REPLICA_MAX_WAIT_SECONDS = float(
+        os.environ.get("POSTGRES_DB_REPLICA_MAX_WAIT_SECONDS") or 0.2
+    )
+
+    # Default way of counting all templates matching list filters.
+    # It can be overridden by each request.
+    # Available options are: "exact", "estimated", "cached" and "none".
+    LIST_COUNT_STRATEGY = os.environ.get("LIST_COUNT_STRATEGY") or "exact"
+    LIST_COUNT_CACHE_TTL_SECONDS = float(
+        os.environ.get("LIST_COUNT_CACHE_TTL_SECONDS") or 30
+    )
+
+    # Comma-separated names of fields searched by "query" filter of templates.
+    # Each of them has to be indexed, see "SEARCHABLE_FIELDS".
+    TEMPLATES_SEARCHABLE_FIELDS = tuple(
+        (os.environ.get("TEMPLATES_SEARCHABLE_FIELDS") or "id").split(",")
+    )
+
+    # Templates retrieved by ids are cached in each process,
+    # until they change or expire. Changes are sent by the database
+    # to all processes, so they expire only if a notification is missed.
+    # Caches are disabled by default (size of 0), and so are the notifications,
+    # so deployments which need them have to enable them explicitly.
+    TEMPLATES_CACHE_MAX_SIZE = int(os.environ.get("TEMPLATES_CACHE_MAX_SIZE") or 0)
+    TEMPLATES_CACHE_TTL_SECONDS = float(
+        os.environ.get("TEMPLATES_CACHE_TTL_SECONDS") or 60
+    )
+    # Results of listing templates are cached for a short time.
+    # Any change of templates invalidates all of them in all processes,
+    # when a shared cache is given. Otherwise, other processes are notified
+    # only about changed templates, so they notice created ones,
+    # when cached lists expire. Size of 0 disables the cache.
+    TEMPLATES_LIST_CACHE_MAX_SIZE = int(
+        os.environ.get("TEMPLATES_LIST_CACHE_MAX_SIZE") or 0
+    )
+    TEMPLATES_LIST_CACHE_TTL_SECONDS = float(
+        os.environ.get("TEMPLATES_LIST_CACHE_TTL_SECONDS") or 5
+    )
+    # When a shared cache (Redis) is given, cached templates, lists and counts
+    # are shared by all processes, each keeping the hottest ones locally
+    # for a short time. Expired values are served for a while,
+    # when they are being refreshed.
+    CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL") or None
+    CACHE_STALE_SECONDS = float(os.environ.get("CACHE_STALE_SECONDS") or 30)
+    CACHE_LOCAL_TTL_SECONDS = float(os.environ.get("CACHE_LOCAL_TTL_SECONDS") or 5)
+    # Fraction by which time to live of cached values is randomly shortened.
+    CACHE_TTL_JITTER = float(os.environ.get("CACHE_TTL_JITTER") or 0.1)
+
+    # Templates created concurrently within the time window are saved
+    # with a single commit (group commit). Batches of 1 disable it.
+    TEMPLATES_CREATE_BATCH_MAX_SIZE = int(
+        os.environ.get("TEMPLATES_CREATE_BATCH_MAX_SIZE") or 1
+    )
+    TEMPLATES_CREATE_BATCH_MAX_WAIT_SECONDS = float(
+        os.environ.get("TEMPLATES_CREATE_BATCH_MAX_WAIT_SECONDS") or 0.002
+    )
+    # Maximum number of commands sent at once to the batch endpoint.
+    TEMPLATES_BATCH_MAX_SIZE = int(os.environ.get("TEMPLATES_BATCH_MAX_SIZE") or 1000)
+
     @staticmethod
     def init_app(app):
         pass
@@ -25,6 +93,19 @@ class Config:
             f"/{self.DATABASE_NAME}"
         )
 
+    @property
+    def database_replica_url(self) -> str | None:
+        if self.DATABASE_REPLICA_HOST is None:
+            return None
+
+        return (
+            f"postgresql://"
+            f"{self.DATABASE_USER}:{self.DATABASE_PASSWORD}"
+            f"@"
+            f"{self.DATABASE_REPLICA_HOST}:{self.DATABASE_REPLICA_PORT}"
+            f"/{self.DATABASE_NAME}"
+        )
+
 
 class DevelopmentConfig(Config):
     SWAGGER_ENABLED = True
@@ -37,6 +118,11 @@ class DevelopmentConfig(Config):
 
 class TestConfig(Config):
     DATABASE_NAME = f"{Config.DATABASE_NAME}_test"
+    # Counts cached by one test mustn't be visible in other ones.
+    LIST_COUNT_CACHE_TTL_SECONDS = 0.0
+    # Templates cached by one test mustn't be visible in other ones.
+    TEMPLATES_CACHE_MAX_SIZE = 0
+    TEMPLATES_LIST_CACHE_MAX_SIZE = 0
 
     @staticmethod
     def init_app(app):
@@ -0,0 +1,41 @@
+"""add templates value index
+
+Revision ID: 4e8a1f0c6d27
+Revises: 9b2d4c7e1a05
+Create Date: 2026-10-18 13:41:07.215839
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "4e8a1f0c6d27"
+down_revision: Union[str, None] = "9b2d4c7e1a05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Expression index is used instead of a generated column,
+    # because adding a stored generated column rewrites the whole table.
+    # Index is created concurrently to not block writes to a large table.
+    # It can't be done inside a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_templates_value",
+            "templates",
+            [sa.text("(CAST(value_data ->> 'value' AS INTEGER))")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_templates_value",
+            table_name="templates",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
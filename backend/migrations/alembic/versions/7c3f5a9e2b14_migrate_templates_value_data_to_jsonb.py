@@ -0,0 +1,180 @@
+"""migrate templates value data to jsonb
+
+Revision ID: 7c3f5a9e2b14
+Revises: 4e8a1f0c6d27
+Create Date: 2026-10-18 15:02:54.671092
+
+"""
+import time
+from typing import Sequence, Union
+from uuid import UUID
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "7c3f5a9e2b14"
+down_revision: Union[str, None] = "4e8a1f0c6d27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 10_000
+# Pause between batches gives replicas and autovacuum time to keep up.
+BATCH_PAUSE_SECONDS = 0.05
+# Swapping columns requires an exclusive lock, so it's better to fail
+# than to queue all other queries behind it for a long time.
+LOCK_TIMEOUT = "5s"
+
+# Batches are taken in order of IDs, so each one is found using primary key
+# index, instead of scanning for rows which haven't been copied yet.
+COPY_BATCH_QUERY = (
+    sa.text(
+        """
+        WITH batch AS (
+            SELECT id FROM templates WHERE id > :last_id ORDER BY id LIMIT :batch_size
+        )
+        UPDATE templates
+        SET value_data_jsonb = templates.value_data::jsonb
+        FROM batch
+        WHERE templates.id = batch.id
+        RETURNING templates.id
+        """
+    )
+    .bindparams(sa.bindparam("last_id", type_=sa.Uuid()))
+    .columns(id=sa.Uuid())
+)
+
+
+def upgrade() -> None:
+    # Changing column type in place rewrites the whole table holding
+    # an exclusive lock, so data is copied to a new column in batches instead.
+    # Writes made in the meantime are copied by a trigger.
+    # More details can be found here:
+    # https://www.postgresql.org/docs/current/sql-altertable.html#SQL-ALTERTABLE-NOTES.
+    # Column, function, trigger, constraint and indexes may be left over
+    # by an interrupted upgrade, so the upgrade can be run again.
+    op.execute("ALTER TABLE templates ADD COLUMN IF NOT EXISTS value_data_jsonb JSONB")
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION templates_copy_value_data_to_jsonb()
+        RETURNS trigger AS $$
+        BEGIN
+            NEW.value_data_jsonb := NEW.value_data::jsonb;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE TRIGGER templates_copy_value_data_to_jsonb
+        BEFORE INSERT OR UPDATE ON templates
+        FOR EACH ROW EXECUTE FUNCTION templates_copy_value_data_to_jsonb()
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        _copy_value_data_in_batches()
+
+        # Validating a check constraint doesn't block writes and
+        # lets "SET NOT NULL" skip scanning the whole table.
+        op.execute(
+            """
+            DO $$
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT FROM pg_constraint
+                    WHERE conrelid = 'templates'::regclass
+                        AND conname = 'value_data_jsonb_not_null'
+                ) THEN
+                    ALTER TABLE templates ADD CONSTRAINT value_data_jsonb_not_null
+                    CHECK (value_data_jsonb IS NOT NULL) NOT VALID;
+                END IF;
+            END
+            $$
+            """
+        )
+        op.execute(
+            "ALTER TABLE templates VALIDATE CONSTRAINT value_data_jsonb_not_null"
+        )
+
+        # Index, which failed to be created concurrently, is left invalid,
+        # so it's dropped and created again, instead of being skipped.
+        # More details can be found here:
+        # https://www.postgresql.org/docs/current/sql-createindex.html#SQL-CREATEINDEX-CONCURRENTLY.
+        op.drop_index(
+            "ix_templates_value_jsonb",
+            table_name="templates",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            "ix_templates_value_jsonb",
+            "templates",
+            [sa.text("(CAST(value_data_jsonb ->> 'value' AS INTEGER))")],
+            postgresql_concurrently=True,
+        )
+        # "jsonb_path_ops" index is smaller and faster than the default one,
+        # but it supports only containment ("@>") queries.
+        # More details can be found here:
+        # https://www.postgresql.org/docs/current/datatype-json.html#JSON-INDEXING.
+        op.drop_index(
+            "ix_templates_value_data",
+            table_name="templates",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            "ix_templates_value_data",
+            "templates",
+            ["value_data_jsonb"],
+            postgresql_using="gin",
+            postgresql_ops={"value_data_jsonb": "jsonb_path_ops"},
+            postgresql_concurrently=True,
+        )
+
+    op.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+    op.alter_column("templates", "value_data_jsonb", nullable=False)
+    op.drop_constraint("value_data_jsonb_not_null", "templates", type_="check")
+    op.execute("DROP TRIGGER templates_copy_value_data_to_jsonb ON templates")
+    op.execute("DROP FUNCTION templates_copy_value_data_to_jsonb()")
+    # Index of the old column is dropped together with it.
+    op.drop_column("templates", "value_data")
+    op.alter_column("templates", "value_data_jsonb", new_column_name="value_data")
+    op.execute("ALTER INDEX ix_templates_value_jsonb RENAME TO ix_templates_value")
+
+
+def downgrade() -> None:
+    # Downgrade rewrites the table, it's meant to be used
+    # only when the upgrade has to be reverted right away.
+    op.execute("DROP TRIGGER IF EXISTS templates_copy_value_data_to_jsonb ON templates")
+    op.execute("DROP FUNCTION IF EXISTS templates_copy_value_data_to_jsonb()")
+    op.drop_index("ix_templates_value_data", table_name="templates")
+    op.alter_column(
+        "templates",
+        "value_data",
+        type_=sa.JSON(),
+        postgresql_using="value_data::json",
+    )
+
+
+def _copy_value_data_in_batches() -> None:
+    if op.get_context().as_sql:
+        # Number of batches isn't known upfront, when SQL script is generated.
+        op.execute("UPDATE templates SET value_data_jsonb = value_data::jsonb")
+        return
+
+    connection = op.get_bind()
+    last_id = UUID(int=0)
+    while True:
+        copied_ids = (
+            connection.execute(
+                COPY_BATCH_QUERY, {"last_id": last_id, "batch_size": BATCH_SIZE}
+            )
+            .scalars()
+            .all()
+        )
+        if not copied_ids:
+            break
+
+        last_id = max(copied_ids)
+        time.sleep(BATCH_PAUSE_SECONDS)
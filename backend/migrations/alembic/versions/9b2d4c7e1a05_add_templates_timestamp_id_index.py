@@ -0,0 +1,38 @@
+"""add templates timestamp id index
+
+Revision ID: 9b2d4c7e1a05
+Revises: f3612e1e3522
+Create Date: 2026-10-18 10:12:31.403120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "9b2d4c7e1a05"
+down_revision: Union[str, None] = "f3612e1e3522"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Index is created concurrently to not block writes to a large table.
+    # It can't be done inside a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_templates_timestamp_id",
+            "templates",
+            ["timestamp", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_templates_timestamp_id",
+            table_name="templates",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
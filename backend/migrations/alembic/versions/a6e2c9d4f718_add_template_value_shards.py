@@ -0,0 +1,32 @@
+"""add template value shards
+
+Revision ID: a6e2c9d4f718
+Revises: d5b9e3a7c812
+Create Date: 2026-10-18 18:11:37.215904
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "a6e2c9d4f718"
+down_revision: Union[str, None] = "d5b9e3a7c812"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "template_value_shards",
+        sa.Column("template_id", sa.Uuid(), nullable=False),
+        sa.Column("shard", sa.Integer(), nullable=False),
+        sa.Column("value", sa.Integer(), nullable=False),
+        sa.CheckConstraint("value >= 0", name="ck_template_value_shards_value"),
+        sa.ForeignKeyConstraint(["template_id"], ["templates.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("template_id", "shard"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("template_value_shards")
@@ -0,0 +1,44 @@
+"""add template value shards versions
+
+Revision ID: b8f4d1e6c2a9
+Revises: a6e2c9d4f718
+Create Date: 2026-10-18 21:02:14.518337
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "b8f4d1e6c2a9"
+down_revision: Union[str, None] = "a6e2c9d4f718"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "templates",
+        sa.Column(
+            "is_sharded", sa.Boolean(), server_default=sa.false(), nullable=False
+        ),
+    )
+    op.add_column(
+        "template_value_shards",
+        sa.Column("version", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE templates
+        SET is_sharded = true
+        WHERE EXISTS (
+            SELECT FROM template_value_shards
+            WHERE template_value_shards.template_id = templates.id
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("template_value_shards", "version")
+    op.drop_column("templates", "is_sharded")
@@ -0,0 +1,38 @@
+"""add templates trigram search indexes
+
+Revision ID: d5b9e3a7c812
+Revises: 7c3f5a9e2b14
+Create Date: 2026-10-18 16:25:12.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "d5b9e3a7c812"
+down_revision: Union[str, None] = "7c3f5a9e2b14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Index is created concurrently to not block writes to a large table.
+    # It can't be done inside a transaction.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_templates_id_trgm "
+            "ON templates USING gin (CAST(id AS TEXT) gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    # Extension is left in place, as other objects may depend on it.
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_templates_id_trgm",
+            table_name="templates",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,5 @@
+from .redis import RedisSharedCache
+
+__all__ = [
+    "RedisSharedCache",
+]
@@ -0,0 +1,91 @@
+import logging
+import threading
+import time
+from typing import cast
+
+import redis
+
+from ...cache import AbstractSharedCache, SharedCacheUnavailable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT_SECONDS = 0.1
+# Time after a failure, for which the cache isn't called at all,
+# so requests don't wait for timeouts while it's down.
+DEFAULT_BACKOFF_SECONDS = 1.0
+
+
+class RedisSharedCache(AbstractSharedCache):
+    """
+    Shared cache stored in Redis (or any server speaking its protocol).
+
+    Cache is an optimization, so its failures are reported
+    as "SharedCacheUnavailable" after a short timeout,
+    and callers fall back to the database.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+        backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+    ) -> None:
+        self.client = redis.Redis.from_url(
+            url,
+            socket_timeout=timeout_seconds,
+            socket_connect_timeout=timeout_seconds,
+        )
+        self.backoff_seconds = backoff_seconds
+        self._lock = threading.Lock()
+        self._unavailable_until = 0.0
+
+    def get(self, key: str) -> bytes | None:
+        self._check_availability()
+        try:
+            # Client is synchronous, though it's typed as an asynchronous one as well.
+            return cast(bytes | None, self.client.get(key))
+        except redis.RedisError as err:
+            raise self._fail(err) from err
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._check_availability()
+        try:
+            self.client.set(key, value, px=_to_milliseconds(ttl_seconds))
+        except redis.RedisError as err:
+            raise self._fail(err) from err
+
+    def add(self, key: str, value: bytes, ttl_seconds: float) -> bool:
+        self._check_availability()
+        try:
+            return bool(
+                self.client.set(key, value, px=_to_milliseconds(ttl_seconds), nx=True)
+            )
+        except redis.RedisError as err:
+            raise self._fail(err) from err
+
+    def increment(self, key: str, ttl_seconds: float) -> int:
+        self._check_availability()
+        try:
+            with self.client.pipeline() as pipeline:
+                pipeline.incr(key)
+                pipeline.pexpire(key, _to_milliseconds(ttl_seconds))
+                value, _ = pipeline.execute()
+        except redis.RedisError as err:
+            raise self._fail(err) from err
+
+        return int(value)
+
+    def _check_availability(self) -> None:
+        with self._lock:
+            if time.monotonic() < self._unavailable_until:
+                raise SharedCacheUnavailable("Shared cache has recently failed.")
+
+    def _fail(self, err: redis.RedisError) -> SharedCacheUnavailable:
+        logger.warning("Shared cache failed: %s", err)
+        with self._lock:
+            self._unavailable_until = time.monotonic() + self.backoff_seconds
+        return SharedCacheUnavailable(str(err))
+
+
+def _to_milliseconds(seconds: float) -> int:
+    return max(int(seconds * 1000), 1)
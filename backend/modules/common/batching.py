@@ -0,0 +1,96 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Generic, Sequence, TypeVar
+
+Item = TypeVar("Item")
+Result = TypeVar("Result")
+
+
+class _Batch(Generic[Item, Result]):
+    def __init__(self) -> None:
+        self.items: list[Item] = []
+        self.futures: list[Future[Result]] = []
+        self.closed = threading.Event()
+
+
+class MicroBatcher(Generic[Item, Result]):
+    """
+    Merges items submitted concurrently by many threads into batches,
+    which are handled at once (e.g. saved with a single commit).
+
+    Thread which opens a batch (leader) waits until the batch is full
+    or the time window passes, and handles the whole batch.
+    Other threads only wait for results of their own items,
+    so no background thread has to be managed.
+    More details can be found here:
+    https://www.postgresql.org/docs/current/wal-configuration.html.
+    """
+
+    def __init__(
+        self,
+        handle_batch: Callable[[list[Item]], Sequence[Result]],
+        max_batch_size: int,
+        max_wait_seconds: float,
+    ) -> None:
+        """
+        :param handle_batch: Handles all items of a batch at once,
+                             returns results in the same order as items.
+        :param max_batch_size: Number of items which closes a batch immediately.
+        :param max_wait_seconds: Time for which a batch is kept open.
+        """
+
+        self.handle_batch = handle_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self._lock = threading.Lock()
+        self._open_batch: _Batch[Item, Result] | None = None
+
+    def submit(self, item: Item) -> Result:
+        """
+        :param item: Item to handle.
+        :raises Exception: Any exception raised while handling the batch.
+        :return: Result of handling the item.
+        """
+
+        future: Future[Result] = Future()
+
+        with self._lock:
+            batch = self._open_batch
+            is_leader = batch is None
+            if batch is None:
+                batch = self._open_batch = _Batch()
+
+            batch.items.append(item)
+            batch.futures.append(future)
+            if len(batch.items) >= self.max_batch_size:
+                self._close(batch)
+
+        if is_leader:
+            batch.closed.wait(self.max_wait_seconds)
+            with self._lock:
+                self._close(batch)
+            self._handle(batch)
+
+        return future.result()
+
+    def _close(self, batch: _Batch[Item, Result]) -> None:
+        if self._open_batch is batch:
+            self._open_batch = None
+        batch.closed.set()
+
+    def _handle(self, batch: _Batch[Item, Result]) -> None:
+        try:
+            results = self.handle_batch(batch.items)
+            if len(results) != len(batch.items):
+                raise RuntimeError(
+                    f"Batch of {len(batch.items)} items "
+                    f"handled with {len(results)} results."
+                )
+        except Exception as err:
+            # All items of a batch share its fate, e.g. a failed commit.
+            for future in batch.futures:
+                future.set_exception(err)
+            return
+
+        for future, result in zip(batch.futures, results):
+            future.set_result(result)
@@ -0,0 +1,18 @@
+from .dtos import CachedResult, CacheStatistics
+from .generational import GenerationalCache, make_key
+from .local import TTLCache, VersionedLRUCache
+from .ports import AbstractSharedCache, AbstractVersionedCache, SharedCacheUnavailable
+from .two_tier import TwoTierCache
+
+__all__ = [
+    "AbstractSharedCache",
+    "AbstractVersionedCache",
+    "CachedResult",
+    "CacheStatistics",
+    "GenerationalCache",
+    "SharedCacheUnavailable",
+    "TTLCache",
+    "TwoTierCache",
+    "VersionedLRUCache",
+    "make_key",
+]
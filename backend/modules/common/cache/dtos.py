@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+@dataclass(frozen=True)
+class CacheStatistics:
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    # Hits of expired values, served while they are being refreshed.
+    stale_hits: int = 0
+
+    def serialize(self):
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": self.size,
+        }
+
+
+@dataclass(frozen=True)
+class CachedResult:
+    value: Any
+    # Wall-clock time, since results can be shared between processes.
+    cached_at: float
+
+    def serialize(
+        self, serialize_value: Callable[[Any], Any] = lambda value: value
+    ) -> dict[str, Any]:
+        return {"value": serialize_value(self.value), "cached_at": self.cached_at}
+
+    @classmethod
+    def deserialize(
+        cls,
+        data: dict[str, Any],
+        deserialize_value: Callable[[Any], Any] = lambda value: value,
+    ) -> "CachedResult":
+        return cls(value=deserialize_value(data["value"]), cached_at=data["cached_at"])
@@ -0,0 +1,165 @@
+import dataclasses
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+from .dtos import CachedResult
+from .ports import AbstractSharedCache, AbstractVersionedCache, SharedCacheUnavailable
+
+logger = logging.getLogger(__name__)
+
+# Generation has to outlive cached results, so results cached under
+# an old generation aren't read again after it expires and starts from 0.
+DEFAULT_GENERATION_TTL_SECONDS = 24 * 60 * 60
+
+
+def make_key(*parts: object) -> str:
+    """
+    Builds a key, which is the same for equal parts of a query
+    (e.g. filters, ordering and pagination), regardless of order
+    of keys of their dictionaries.
+
+    :param parts: JSON-serializable values, dataclasses or values
+                  with a canonical string representation (e.g. timestamps).
+    :return: Key of the query.
+    """
+
+    return hashlib.blake2b(
+        json.dumps(parts, sort_keys=True, default=_to_canonical_form).encode(),
+        digest_size=16,
+    ).hexdigest()
+
+
+class GenerationalCache:
+    """
+    Cache of results of queries, which can't be invalidated one by one,
+    because it isn't known which of them a change affects (e.g. filtered lists).
+
+    All results are invalidated at once, by bumping a generation,
+    which is a part of their keys, so results cached before are never
+    read again and they expire on their own.
+    More details can be found here:
+    https://signalvnoise.com/posts/3113-how-key-based-cache-expiration-works.
+
+    When a shared cache is given, generation is kept in it, so it's bumped
+    for all processes at once. Otherwise, results are invalidated only by
+    changes made by this process, and changes made by other processes
+    are noticed when results expire (or when they are evicted locally).
+    """
+
+    def __init__(
+        self,
+        cache: AbstractVersionedCache,
+        namespace: str,
+        shared_cache: AbstractSharedCache | None = None,
+        generation_ttl_seconds: float = DEFAULT_GENERATION_TTL_SECONDS,
+    ) -> None:
+        """
+        :param cache: Cache of results, not shared with other kinds of results.
+        :param namespace: Prefix of a key of generation,
+                          unique for each kind of results.
+        :param shared_cache: Cache keeping generation for all processes.
+        :param generation_ttl_seconds: Time after which an unchanged
+                                       generation is forgotten.
+        """
+
+        self.cache = cache
+        self.namespace = namespace
+        self.shared_cache = shared_cache
+        self.generation_ttl_seconds = generation_ttl_seconds
+        self._lock = threading.Lock()
+        self._local_generation = 0
+
+    def get_or_load(
+        self,
+        key: str,
+        load: Callable[[], Any],
+        max_age_seconds: float | None = None,
+    ) -> Any:
+        """
+        :param key: Key of a query, e.g. built with "make_key".
+        :param load: Runs the query.
+        :param max_age_seconds: Maximum age of a cached result, which can be
+                                returned, 0 always runs the query.
+        :return: Result of the query.
+        """
+
+        generational_key = f"{self._get_generation()}:{key}"
+        if max_age_seconds is None or max_age_seconds > 0:
+            result = self.cache.get(generational_key)
+            if result is not None and (
+                max_age_seconds is None
+                or time.time() - result.cached_at <= max_age_seconds
+            ):
+                return result.value
+
+        token = self.cache.get_token(generational_key)
+        # Age of a result is counted from the moment its query started,
+        # so a result isn't younger than data it has been computed from.
+        cached_at = time.time()
+        value = load()
+        self.cache.set(
+            generational_key,
+            CachedResult(value=value, cached_at=cached_at),
+            # Result of a later query replaces the one,
+            # which has been too old for another caller.
+            version=time.time_ns(),
+            token=token,
+        )
+
+        return value
+
+    def invalidate(self) -> None:
+        self.invalidate_locally()
+
+        if self.shared_cache is None:
+            return
+
+        try:
+            self.shared_cache.increment(
+                self._get_generation_key(), ttl_seconds=self.generation_ttl_seconds
+            )
+        except SharedCacheUnavailable:
+            logger.warning(
+                "Generation of '%s' not bumped in shared cache.", self.namespace
+            )
+
+    def invalidate_locally(self) -> None:
+        """
+        Invalidates results only in this process, e.g. when they have been
+        already invalidated by another process.
+        """
+
+        with self._lock:
+            self._local_generation += 1
+        # Results loaded before this call aren't cached anymore.
+        self.cache.clear_locally()
+
+    def _get_generation(self) -> str:
+        if self.shared_cache is not None:
+            try:
+                generation = self.shared_cache.get(self._get_generation_key())
+            except SharedCacheUnavailable:
+                pass
+            else:
+                return generation.decode() if generation is not None else "0"
+
+        # Results cached locally aren't shared, so they can't be read
+        # by processes, which don't know this generation.
+        with self._lock:
+            return f"local-{self._local_generation}"
+
+    def _get_generation_key(self) -> str:
+        return f"{self.namespace}:generation"
+
+
+def _to_canonical_form(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        # Dataclasses with the same fields (e.g. kinds of pagination)
+        # are told apart by their types.
+        return [type(value).__name__, dataclasses.asdict(value)]
+
+    return str(value)
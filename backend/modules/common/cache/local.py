@@ -0,0 +1,233 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+from .dtos import CacheStatistics
+from .ports import AbstractVersionedCache
+
+DEFAULT_MAX_SIZE = 1024
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache, which forgets entries after a given time.
+
+    All entries live for the same time, so the oldest entry is the one
+    which is evicted first, when the cache is full.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        :param key: Key of an entry to retrieve.
+        :return: Value of the entry or None, if it doesn't exist or has expired.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                return None
+
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._set(key, value)
+
+    def add(self, key: Hashable, value: Any) -> bool:
+        """
+        Sets value only if there is no valid entry for the key yet.
+
+        :return: Whether the value has been set.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() < entry[0]:
+                return False
+
+            self._set(key, value)
+            return True
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+@dataclass(frozen=True)
+class _VersionedEntry:
+    expires_at: float
+    version: int
+    # Number of the last invalidation of the key, so values loaded before it
+    # can be told apart from values loaded after it.
+    invalidation: int
+    value: Any
+
+
+# Value of an entry, which has been invalidated and not set again.
+_INVALIDATED = object()
+
+
+class VersionedLRUCache(AbstractVersionedCache):
+    """
+    Thread-safe in-process cache of versioned values (e.g. aggregates),
+    bounded by number of entries and their age. Least recently used entry
+    is evicted first, when the cache is full.
+
+    Value loaded before an invalidation can be set after it,
+    e.g. a reader loads version 1, a writer saves version 2 and invalidates
+    the entry, and only then the reader sets version 1.
+    To prevent it, a reader takes a token before loading a value,
+    and the value is set only if the key hasn't been invalidated since
+    and no newer version is cached.
+    More details can be found here:
+    https://www.usenix.org/system/files/conference/nsdi13/nsdi13-final170_update.pdf.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, _VersionedEntry] = OrderedDict()
+        self._invalidations = 0
+        # Invalidations of removed entries are forgotten, so values loaded
+        # before the latest of them can't be trusted.
+        self._forgotten_invalidations = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        :param key: Key of an entry to retrieve.
+        :return: Value of the entry or None, if it doesn't exist,
+                 has expired or has been invalidated.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() >= entry.expires_at:
+                self._remove(key)
+                entry = None
+
+            if entry is None or entry.value is _INVALIDATED:
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+    def get_token(self, key: Hashable) -> int:
+        # Invalidations are counted for all keys together.
+
+        with self._lock:
+            return self._invalidations
+
+    def set(self, key: Hashable, value: Any, version: int, token: int) -> bool:
+        if self.max_size <= 0:
+            return False
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and token < self._forgotten_invalidations:
+                return False
+            if entry is not None and (
+                entry.invalidation > token
+                or (entry.value is not _INVALIDATED and entry.version >= version)
+            ):
+                return False
+
+            self._put(
+                key,
+                _VersionedEntry(
+                    expires_at=time.monotonic() + self.ttl_seconds,
+                    version=version,
+                    invalidation=entry.invalidation if entry is not None else 0,
+                    value=value,
+                ),
+            )
+            return True
+
+    def invalidate(self, key: Hashable) -> None:
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._invalidations += 1
+            # Invalidated entry is kept until it expires,
+            # so values loaded before the invalidation aren't set.
+            self._put(
+                key,
+                _VersionedEntry(
+                    expires_at=time.monotonic() + self.ttl_seconds,
+                    version=0,
+                    invalidation=self._invalidations,
+                    value=_INVALIDATED,
+                ),
+            )
+
+    def invalidate_locally(self, key: Hashable) -> None:
+        # All entries are kept in this process.
+        self.invalidate(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._invalidations += 1
+            self._forgotten_invalidations = self._invalidations
+            self._entries.clear()
+
+    def clear_locally(self) -> None:
+        self.clear()
+
+    @property
+    def statistics(self) -> CacheStatistics:
+        with self._lock:
+            return CacheStatistics(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+            )
+
+    def _put(self, key: Hashable, entry: _VersionedEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > max(self.max_size, 0):
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._forgotten_invalidations = max(
+            self._forgotten_invalidations, entry.invalidation
+        )
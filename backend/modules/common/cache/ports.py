@@ -0,0 +1,124 @@
+from abc import ABC, abstractmethod
+from typing import Any, Hashable
+
+from .dtos import CacheStatistics
+
+
+class SharedCacheUnavailable(Exception):
+    pass
+
+
+class AbstractSharedCache(ABC):
+    """
+    Cache shared by all processes (e.g. Redis), which stores bytes.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """
+        :param key: Key of a value to retrieve.
+        :raises SharedCacheUnavailable: Cache can't be reached.
+        :return: Value or None, if it doesn't exist or has expired.
+        """
+
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        """
+        :param key: Key of a value to set.
+        :param value: Value to set.
+        :param ttl_seconds: Time after which the value expires.
+        :raises SharedCacheUnavailable: Cache can't be reached.
+        """
+
+        pass
+
+    @abstractmethod
+    def add(self, key: str, value: bytes, ttl_seconds: float) -> bool:
+        """
+        Sets value only if the key doesn't exist yet, as a single operation,
+        so it can be used as a lock.
+
+        :raises SharedCacheUnavailable: Cache can't be reached.
+        :return: Whether the value has been set.
+        """
+
+        pass
+
+    @abstractmethod
+    def increment(self, key: str, ttl_seconds: float) -> int:
+        """
+        Increments an integer stored under the key (0 if it doesn't exist)
+        and sets its expiration time.
+
+        :raises SharedCacheUnavailable: Cache can't be reached.
+        :return: Incremented value.
+        """
+
+        pass
+
+
+class AbstractVersionedCache(ABC):
+    """
+    Cache of versioned values, which can be invalidated.
+
+    A reader takes a token before loading a value, so the value isn't set,
+    if the key has been invalidated in the meantime.
+    """
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Any | None:
+        """
+        :param key: Key of an entry to retrieve.
+        :return: Value of the entry or None, if it has to be loaded.
+        """
+
+        pass
+
+    @abstractmethod
+    def get_token(self, key: Hashable) -> Any:
+        """
+        :param key: Key of a value, which is going to be loaded.
+        :return: Token to pass when the loaded value is set.
+        """
+
+        pass
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, version: int, token: Any) -> bool:
+        """
+        :param key: Key of an entry to set.
+        :param value: Value to cache.
+        :param version: Version of the value, newer values have greater versions.
+        :param token: Token taken before the value was loaded.
+        :return: Whether the value has been cached.
+        """
+
+        pass
+
+    @abstractmethod
+    def invalidate(self, key: Hashable) -> None:
+        pass
+
+    @abstractmethod
+    def invalidate_locally(self, key: Hashable) -> None:
+        """
+        Invalidates a key only in this process, e.g. when it has been
+        already invalidated by another process.
+        """
+
+        pass
+
+    @abstractmethod
+    def clear_locally(self) -> None:
+        """
+        Forgets all values cached in this process.
+        """
+
+        pass
+
+    @property
+    @abstractmethod
+    def statistics(self) -> CacheStatistics:
+        pass
@@ -0,0 +1,279 @@
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+from .dtos import CacheStatistics
+from .local import DEFAULT_MAX_SIZE, TTLCache
+from .ports import AbstractSharedCache, AbstractVersionedCache, SharedCacheUnavailable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STALE_SECONDS = 30.0
+DEFAULT_LOCAL_TTL_SECONDS = 5.0
+DEFAULT_TTL_JITTER = 0.1
+# Time for which a single caller is trusted to refresh a stale value.
+REFRESH_TIMEOUT_SECONDS = 10.0
+# Generations have to outlive values, so a value saved under an old generation
+# isn't read again after its generation expires and starts from 0.
+GENERATION_TTL_MULTIPLIER = 10
+
+
+@dataclass(frozen=True)
+class _Entry:
+    value: Any
+    version: int
+    # Wall-clock time, since entries are shared between processes.
+    fresh_until: float
+
+
+@dataclass(frozen=True)
+class _Token:
+    # Generation isn't known, when the shared cache is unavailable.
+    generation: int | None
+    local_invalidations: int
+
+
+class TwoTierCache(AbstractVersionedCache):
+    """
+    Cache with a small in-process tier (L1) in front of a tier shared
+    by all processes (L2), so a value loaded by one process is reused
+    by others, while the hottest values are served without a round trip.
+
+    Values are kept for some time after they expire, and one caller
+    refreshes an expired value, while others are still served
+    the stale one (stale-while-revalidate). Times to live are randomly
+    shortened (jittered), so values cached together don't expire together.
+    More details can be found here:
+    https://www.rfc-editor.org/rfc/rfc5861#section-3.
+
+    Invalidation bumps generation of a key, which is a part of a key
+    of a value in L2, so a value loaded before an invalidation is saved
+    under an old generation and never read. Values in L1 of other processes
+    are served until they expire, so L1 has to live shortly.
+
+    When L2 is unavailable, values are cached only in L1.
+    """
+
+    def __init__(
+        self,
+        shared_cache: AbstractSharedCache,
+        namespace: str,
+        ttl_seconds: float,
+        stale_seconds: float = DEFAULT_STALE_SECONDS,
+        local_ttl_seconds: float = DEFAULT_LOCAL_TTL_SECONDS,
+        local_max_size: int = DEFAULT_MAX_SIZE,
+        ttl_jitter: float = DEFAULT_TTL_JITTER,
+        serialize: Callable[[Any], Any] = lambda value: value,
+        deserialize: Callable[[Any], Any] = lambda value: value,
+    ) -> None:
+        """
+        :param shared_cache: L2, shared by all processes.
+        :param namespace: Prefix of keys in L2, unique for each kind of values.
+        :param ttl_seconds: Time for which a value is fresh.
+        :param stale_seconds: Time for which an expired value is served,
+                              while it's being refreshed.
+        :param local_ttl_seconds: Time for which a value is kept in L1.
+        :param local_max_size: Maximum number of values kept in L1.
+        :param ttl_jitter: Maximum fraction, by which time to live is shortened.
+        :param serialize: Converts a value into a JSON-serializable one.
+        :param deserialize: Converts a deserialized JSON back into a value.
+        """
+
+        self.shared_cache = shared_cache
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.ttl_jitter = ttl_jitter
+        self.serialize = serialize
+        self.deserialize = deserialize
+        self._local = TTLCache(ttl_seconds=local_ttl_seconds, max_size=local_max_size)
+        # Refreshes are locked in L1, when L2 is unavailable.
+        self._local_refreshes = TTLCache(
+            ttl_seconds=REFRESH_TIMEOUT_SECONDS, max_size=local_max_size
+        )
+        self._lock = threading.Lock()
+        self._local_invalidations = 0
+        self._hits = 0
+        self._stale_hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._local.get(key)
+        if entry is None or not _is_fresh(entry):
+            # Value expired in L1 could have been already refreshed in L2.
+            shared_entry = self._get_shared_entry(key)
+            if shared_entry is not None:
+                entry = shared_entry
+                self._local.set(key, entry)
+
+        if entry is None:
+            with self._lock:
+                self._misses += 1
+            return None
+
+        if _is_fresh(entry):
+            with self._lock:
+                self._hits += 1
+            return entry.value
+
+        # Only one caller refreshes an expired value,
+        # others are served the stale one in the meantime.
+        if self._lock_refresh(key):
+            with self._lock:
+                self._misses += 1
+            return None
+
+        with self._lock:
+            self._stale_hits += 1
+        return entry.value
+
+    def get_token(self, key: Hashable) -> _Token:
+        generation = self._get_generation(key)
+        with self._lock:
+            return _Token(
+                generation=generation, local_invalidations=self._local_invalidations
+            )
+
+    def set(
+        self, key: Hashable, value: Any, version: int = 0, token: _Token | None = None
+    ) -> bool:
+        """
+        :param token: Token taken before the value was loaded,
+                      when it's not given, invalidations of the key are ignored.
+        """
+
+        if token is None:
+            token = self.get_token(key)
+
+        ttl_seconds = self.ttl_seconds * random.uniform(  # nosec B311
+            1 - self.ttl_jitter, 1
+        )
+        entry = _Entry(
+            value=value, version=version, fresh_until=time.time() + ttl_seconds
+        )
+
+        with self._lock:
+            if token.local_invalidations != self._local_invalidations:
+                return False
+            current_entry = self._local.get(key)
+            if (
+                current_entry is not None
+                and _is_fresh(current_entry)
+                and current_entry.version > version
+            ):
+                return False
+            self._local.set(key, entry)
+
+        if token.generation is not None:
+            self._set_shared_entry(
+                key=key,
+                generation=token.generation,
+                entry=entry,
+                ttl_seconds=ttl_seconds + self.stale_seconds,
+            )
+
+        return True
+
+    def invalidate(self, key: Hashable) -> None:
+        self.invalidate_locally(key)
+
+        try:
+            self.shared_cache.increment(
+                self._get_generation_key(key),
+                ttl_seconds=(self.ttl_seconds + self.stale_seconds)
+                * GENERATION_TTL_MULTIPLIER,
+            )
+        except SharedCacheUnavailable:
+            logger.warning(
+                "Key '%s' of '%s' not invalidated in shared cache.", key, self.namespace
+            )
+
+    def invalidate_locally(self, key: Hashable) -> None:
+        with self._lock:
+            self._local_invalidations += 1
+            self._local.delete(key)
+
+    def clear_locally(self) -> None:
+        with self._lock:
+            self._local_invalidations += 1
+            self._local.clear()
+
+    @property
+    def statistics(self) -> CacheStatistics:
+        with self._lock:
+            return CacheStatistics(
+                hits=self._hits,
+                stale_hits=self._stale_hits,
+                misses=self._misses,
+                evictions=self._local.evictions,
+                size=len(self._local),
+            )
+
+    def _get_generation(self, key: Hashable) -> int | None:
+        try:
+            generation = self.shared_cache.get(self._get_generation_key(key))
+        except SharedCacheUnavailable:
+            return None
+
+        return int(generation) if generation is not None else 0
+
+    def _get_shared_entry(self, key: Hashable) -> _Entry | None:
+        generation = self._get_generation(key)
+        if generation is None:
+            return None
+
+        try:
+            data = self.shared_cache.get(self._get_value_key(key, generation))
+        except SharedCacheUnavailable:
+            return None
+        if data is None:
+            return None
+
+        entry = json.loads(data)
+        return _Entry(
+            value=self.deserialize(entry["value"]),
+            version=entry["version"],
+            fresh_until=entry["fresh_until"],
+        )
+
+    def _set_shared_entry(
+        self, key: Hashable, generation: int, entry: _Entry, ttl_seconds: float
+    ) -> None:
+        try:
+            self.shared_cache.set(
+                self._get_value_key(key, generation),
+                json.dumps(
+                    {
+                        "value": self.serialize(entry.value),
+                        "version": entry.version,
+                        "fresh_until": entry.fresh_until,
+                    }
+                ).encode(),
+                ttl_seconds=ttl_seconds,
+            )
+        except SharedCacheUnavailable:
+            pass
+
+    def _lock_refresh(self, key: Hashable) -> bool:
+        try:
+            return self.shared_cache.add(
+                f"{self.namespace}:refresh:{key}",
+                b"1",
+                ttl_seconds=REFRESH_TIMEOUT_SECONDS,
+            )
+        except SharedCacheUnavailable:
+            return self._local_refreshes.add(key, True)
+
+    def _get_generation_key(self, key: Hashable) -> str:
+        return f"{self.namespace}:generation:{key}"
+
+    def _get_value_key(self, key: Hashable, generation: int) -> str:
+        return f"{self.namespace}:{generation}:{key}"
+
+
+def _is_fresh(entry: _Entry) -> bool:
+    return time.time() < entry.fresh_until
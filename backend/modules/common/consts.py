@@ -5,10 +5,23 @@ SWAGGER_FILES = os.path.join(Path(__file__).parent.parent.parent, "swagger_files
 
 PAGINATION_LIMIT_QUERY_PARAMETER_NAME = "limit"
 PAGINATION_OFFSET_QUERY_PARAMETER_NAME = "offset"
+PAGINATION_CURSOR_QUERY_PARAMETER_NAME = "cursor"
+PAGINATION_COUNT_STRATEGY_QUERY_PARAMETER_NAME = "count_strategy"
 PAGINATION_TOTAL_COUNT_NAME = "count"
+PAGINATION_TOTAL_COUNT_KIND_NAME = "count_kind"
 PAGINATION_NEXT_LINK_RELATION = "next"
 PAGINATION_PREVIOUS_LINK_RELATION = "previous"
 PAGINATION_RESULTS_NAME = "results"
 ORDERING_QUERY_PARAMETER_NAME = "ordering"
+IDS_QUERY_PARAMETER_NAME = "ids"
+IDS_MAX_NUMBER = 1000
+MISSING_IDS_NAME = "missing"
+EXPORT_FORMAT_QUERY_PARAMETER_NAME = "format"
+BULK_CHANGED_COUNT_NAME = "count"
+BATCH_RESULTS_NAME = "results"
+BATCH_ATOMIC_NAME = "atomic"
+BATCH_COMMANDS_NAME = "commands"
 
 ERROR_RESPONSE_KEY_DETAILS_NAME = "detail"
+
+CONSISTENCY_TOKEN_HEADER_NAME = "X-Consistency-Token"  # nosec B105
@@ -1,4 +1,24 @@
+from .explain import estimate_number_of_rows
+from .notifications import NotificationListener, notify
 from .orm import Base
-from .session import get_session, initialize_database_sessions
+from .session import (
+    get_engine,
+    get_read_session,
+    get_session,
+    initialize_database_sessions,
+    remember_commit_position,
+    remove_session,
+)
 
-__all__ = ["Base", "get_session", "initialize_database_sessions"]
+__all__ = [
+    "Base",
+    "NotificationListener",
+    "estimate_number_of_rows",
+    "get_engine",
+    "get_read_session",
+    "get_session",
+    "initialize_database_sessions",
+    "notify",
+    "remember_commit_position",
+    "remove_session",
+]
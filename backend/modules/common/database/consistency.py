@@ -0,0 +1,53 @@
+import re
+import threading
+
+# Consistency token is a position in the write-ahead log (LSN) of the primary
+# database, written in PostgreSQL's "XXXXXXXX/XXXXXXXX" format.
+# More details can be found here:
+# https://www.postgresql.org/docs/current/datatype-pg-lsn.html.
+_POSITION_PATTERN = re.compile(r"^[0-9A-Fa-f]{1,8}/[0-9A-Fa-f]{1,8}$")
+
+_context = threading.local()
+
+
+def validate_position(position: str) -> str:
+    """
+    :param position: Position in the write-ahead log to validate.
+    :raises ValueError: Position has invalid format.
+    :return: Validated position.
+    """
+
+    if not _POSITION_PATTERN.match(position):
+        raise ValueError(f"Invalid consistency token: '{position}'.")
+
+    return position.upper()
+
+
+def record_commit_position(position: str) -> None:
+    """
+    Stores the position of a transaction committed by the current thread.
+    """
+
+    _context.commit_position = validate_position(position)
+
+
+def get_commit_position() -> str | None:
+    return getattr(_context, "commit_position", None)
+
+
+def require_position(position: str) -> None:
+    """
+    Marks that queries of the current thread must see everything
+    committed up to the given position.
+    """
+
+    _context.required_position = validate_position(position)
+
+
+def get_required_position() -> str | None:
+    return getattr(_context, "required_position", None)
+
+
+def clear_positions() -> None:
+    _context.commit_position = None
+    _context.required_position = None
@@ -0,0 +1,288 @@
+import json
+import multiprocessing
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Mapping, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import (
+    JSON,
+    URL,
+    Boolean,
+    Connection,
+    DateTime,
+    Engine,
+    Float,
+    Integer,
+    Row,
+    String,
+    Table,
+    Uuid,
+    column,
+    create_engine,
+    func,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.pool import NullPool
+from sqlalchemy.types import TypeEngine
+
+from .orm import Base
+
+# Rows are fetched with a server-side cursor and written in batches,
+# so memory usage of a worker doesn't depend on size of its range.
+DUMP_BATCH_SIZE = 10_000
+DEFAULT_COMPRESSION = "zstd"
+
+EXPORT_SNAPSHOT_QUERY = text("SELECT pg_export_snapshot()")
+IMPORT_SNAPSHOT_QUERY = text("SET TRANSACTION SNAPSHOT :snapshot_id")
+READ_ONLY_QUERY = text("SET TRANSACTION READ ONLY")
+
+
+@dataclass(frozen=True)
+class DumpedPartition:
+    table_name: str
+    path: Path
+    rows: int
+
+
+@dataclass(frozen=True)
+class _PartitionTask:
+    database_url: URL
+    snapshot_id: str
+    table_name: str
+    columns: list[tuple[str, TypeEngine]]
+    split_column_name: str
+    lower_bound: Any
+    upper_bound: Any
+    schema: pa.Schema
+    path: Path
+    compression: str
+
+
+def split_into_ranges(
+    lowest: Any, highest: Any, number_of_ranges: int
+) -> list[tuple[Any, Any]]:
+    """
+    Splits space between the lowest and the highest value (ids, timestamps
+    or integers) into ranges of equal width. The first and the last range
+    are open, so no value is left out.
+
+    :return: Ranges as pairs of inclusive lower and exclusive upper bound,
+             "None" stands for no bound.
+    """
+
+    if isinstance(lowest, uuid.UUID):
+        return [
+            (
+                uuid.UUID(int=lower) if lower is not None else None,
+                uuid.UUID(int=upper) if upper is not None else None,
+            )
+            for lower, upper in split_into_ranges(
+                lowest.int, highest.int, number_of_ranges
+            )
+        ]
+
+    boundaries = [
+        lowest + (highest - lowest) * number // number_of_ranges
+        for number in range(1, number_of_ranges)
+    ]
+    return list(zip([None, *boundaries], [*boundaries, None]))
+
+
+def dump_tables(
+    engine: Engine,
+    tables: Mapping[str, str],
+    directory: Path,
+    number_of_partitions: int,
+    number_of_workers: int,
+    compression: str = DEFAULT_COMPRESSION,
+) -> list[DumpedPartition]:
+    """
+    Dumps tables into compressed Parquet files, one file per range
+    of the split column. Ranges are read in parallel by a pool of processes,
+    each on its own connection.
+
+    All of them import the same snapshot, exported by a coordinating
+    transaction, so the dump is consistent to a single point in time,
+    like a dump made by a single transaction.
+    More details can be found here:
+    https://www.postgresql.org/docs/current/functions-admin.html#FUNCTIONS-SNAPSHOT-SYNCHRONIZATION.
+
+    :param engine: Engine connected to the dumped database.
+    :param tables: Names of dumped tables (defined in ORM metadata)
+                   with names of columns splitting them into ranges,
+                   a column has to hold ids, timestamps or integers.
+    :param directory: Directory, where a subdirectory per table is created.
+    :param number_of_partitions: Number of ranges (files) per table.
+    :param number_of_workers: Number of processes reading ranges in parallel.
+    :param compression: Parquet compression codec.
+    :return: Dumped partitions.
+    """
+
+    with engine.connect() as connection:
+        # Snapshot is valid only as long as the transaction,
+        # which exported it, is open.
+        connection.execution_options(isolation_level="REPEATABLE READ")
+        with connection.begin():
+            connection.execute(READ_ONLY_QUERY)
+            snapshot_id = connection.execute(EXPORT_SNAPSHOT_QUERY).scalar_one()
+
+            tasks = [
+                task
+                for table_name, split_column_name in tables.items()
+                for task in _get_partition_tasks(
+                    connection=connection,
+                    database_url=engine.url,
+                    snapshot_id=snapshot_id,
+                    dumped_table=Base.metadata.tables[table_name],
+                    split_column_name=split_column_name,
+                    directory=directory / table_name,
+                    number_of_partitions=number_of_partitions,
+                    compression=compression,
+                )
+            ]
+
+            # Workers are started from scratch ("spawn"), instead of being forked,
+            # so they don't inherit connections of the parent process.
+            with ProcessPoolExecutor(
+                max_workers=number_of_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                return list(executor.map(_dump_partition, tasks))
+
+
+def _get_partition_tasks(
+    connection: Connection,
+    database_url: URL,
+    snapshot_id: str,
+    dumped_table: Table,
+    split_column_name: str,
+    directory: Path,
+    number_of_partitions: int,
+    compression: str,
+) -> list[_PartitionTask]:
+    split_column = dumped_table.c[split_column_name]
+    lowest, highest = connection.execute(
+        select(func.min(split_column), func.max(split_column))
+    ).one()
+    ranges = (
+        split_into_ranges(lowest, highest, number_of_partitions)
+        if lowest is not None
+        else [(None, None)]
+    )
+    schema = _get_arrow_schema(dumped_table)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    return [
+        _PartitionTask(
+            database_url=database_url,
+            snapshot_id=snapshot_id,
+            table_name=dumped_table.name,
+            columns=[(column_.name, column_.type) for column_ in dumped_table.c],
+            split_column_name=split_column_name,
+            lower_bound=lower_bound,
+            upper_bound=upper_bound,
+            schema=schema,
+            path=directory / f"part-{number:05d}.parquet",
+            compression=compression,
+        )
+        for number, (lower_bound, upper_bound) in enumerate(ranges)
+    ]
+
+
+def _dump_partition(task: _PartitionTask) -> DumpedPartition:
+    engine = create_engine(
+        url=task.database_url,
+        poolclass=NullPool,
+        isolation_level="REPEATABLE READ",
+        connect_args={"options": "-c timezone=utc"},
+    )
+    columns = [column(name, type_) for name, type_ in task.columns]
+    split_column = next(
+        column_ for column_ in columns if column_.name == task.split_column_name
+    )
+    query = select(*columns).select_from(table(task.table_name, *columns))
+    if task.lower_bound is not None:
+        query = query.where(split_column >= task.lower_bound)
+    if task.upper_bound is not None:
+        query = query.where(split_column < task.upper_bound)
+    converters = [_get_arrow_converter(type_) for _, type_ in task.columns]
+
+    rows = 0
+    try:
+        with engine.connect() as connection, connection.begin():
+            # Snapshot has to be imported before any query of the transaction.
+            connection.execute(IMPORT_SNAPSHOT_QUERY, {"snapshot_id": task.snapshot_id})
+            connection.execute(READ_ONLY_QUERY)
+
+            with pq.ParquetWriter(
+                task.path, schema=task.schema, compression=task.compression
+            ) as writer:
+                result = connection.execution_options(
+                    yield_per=DUMP_BATCH_SIZE
+                ).execute(query)
+                for batch in result.partitions():
+                    writer.write_batch(
+                        _convert_rows_to_record_batch(
+                            rows=batch, converters=converters, schema=task.schema
+                        )
+                    )
+                    rows += len(batch)
+    finally:
+        engine.dispose()
+
+    return DumpedPartition(table_name=task.table_name, path=task.path, rows=rows)
+
+
+def _convert_rows_to_record_batch(
+    rows: Sequence[Row], converters: list[Callable[[Any], Any]], schema: pa.Schema
+) -> pa.RecordBatch:
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array([convert(row[index]) for row in rows], type=field.type)
+            for index, (convert, field) in enumerate(zip(converters, schema))
+        ],
+        schema=schema,
+    )
+
+
+def _get_arrow_schema(dumped_table: Table) -> pa.Schema:
+    return pa.schema(
+        [
+            pa.field(
+                column_.name, _get_arrow_type(column_.type), nullable=column_.nullable
+            )
+            for column_ in dumped_table.c
+        ]
+    )
+
+
+def _get_arrow_type(type_: TypeEngine) -> pa.DataType:
+    # Ids and JSON documents are dumped as text,
+    # so they can be read by any analytics tool.
+    if isinstance(type_, (Uuid, JSON, String)):
+        return pa.string()
+    if isinstance(type_, DateTime):
+        return pa.timestamp("us", tz="UTC" if type_.timezone else None)
+    if isinstance(type_, Boolean):
+        return pa.bool_()
+    if isinstance(type_, Integer):
+        return pa.int64()
+    if isinstance(type_, Float):
+        return pa.float64()
+
+    raise ValueError(f"Column type '{type_}' can't be dumped.")
+
+
+def _get_arrow_converter(type_: TypeEngine) -> Callable[[Any], Any]:
+    if isinstance(type_, Uuid):
+        return lambda value: str(value) if value is not None else None
+    if isinstance(type_, JSON):
+        return lambda value: json.dumps(value) if value is not None else None
+
+    return lambda value: value
@@ -0,0 +1,36 @@
+from typing import Any
+
+from sqlalchemy import ClauseElement, Executable
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+
+class Explain(Executable, ClauseElement):
+    """
+    Wraps a statement into "EXPLAIN", so the statement is planned,
+    but not executed.
+    More details can be found here:
+    https://www.postgresql.org/docs/current/sql-explain.html.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement: Any) -> None:
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kwargs) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kwargs)}"
+
+
+def estimate_number_of_rows(session: Session, statement: Any) -> int:
+    """
+    :param session: Session to plan the statement in.
+    :param statement: Statement to estimate number of returned rows for.
+    :return: Number of rows, which the planner expects the statement to return.
+             It's based on table statistics, so it can be far from the real one.
+    """
+
+    plan = session.execute(Explain(statement)).scalar_one()
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,157 @@
+import logging
+import select
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+from psycopg2 import Error as DatabaseError
+from psycopg2 import sql
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_QUERY = text("SELECT pg_notify(:channel, :payload)")
+# Payload of a notification has to be shorter than 8000 bytes.
+# More details can be found here:
+# https://www.postgresql.org/docs/current/sql-notify.html.
+MAX_PAYLOAD_SIZE = 7999
+PAYLOAD_SEPARATOR = ","
+
+DEFAULT_BATCH_SECONDS = 0.01
+DEFAULT_RECONNECT_SECONDS = 1.0
+# Broken connection is noticed only when it's used,
+# so an idle listener checks it periodically.
+DEFAULT_HEALTH_CHECK_SECONDS = 10.0
+
+
+def notify(session: Session, channel: str, values: Iterable[str]) -> None:
+    """
+    Sends values to listeners of a channel, packed into as few
+    notifications as possible. Notifications are sent only if the current
+    transaction is committed, and they are delivered in order of commits.
+
+    Commits of transactions which notify are serialized by a global lock,
+    so only transactions with changes worth notifying about should notify.
+    More details can be found here:
+    https://www.postgresql.org/docs/current/sql-notify.html.
+
+    :param session: Session of the transaction, which notifies.
+    :param channel: Name of the channel.
+    :param values: Values without separators (e.g. ids).
+    """
+
+    payload = ""
+    for value in values:
+        if payload and len(payload) + len(value) + 1 > MAX_PAYLOAD_SIZE:
+            session.execute(NOTIFY_QUERY, {"channel": channel, "payload": payload})
+            payload = ""
+        payload = f"{payload}{PAYLOAD_SEPARATOR}{value}" if payload else value
+
+    if payload:
+        session.execute(NOTIFY_QUERY, {"channel": channel, "payload": payload})
+
+
+class NotificationListener:
+    """
+    Listens to a channel on a dedicated connection in a background thread.
+
+    Values received within a short time window are handled together,
+    so a burst of changes doesn't cause a burst of handler calls.
+    Notifications sent while the listener isn't connected are lost,
+    so missed notifications are handled every time it (re)connects,
+    e.g. by forgetting everything which could have changed.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        channel: str,
+        handle_values: Callable[[set[str]], None],
+        handle_missed_notifications: Callable[[], None],
+        batch_seconds: float = DEFAULT_BATCH_SECONDS,
+        reconnect_seconds: float = DEFAULT_RECONNECT_SECONDS,
+        health_check_seconds: float = DEFAULT_HEALTH_CHECK_SECONDS,
+    ) -> None:
+        """
+        :param engine: Engine of the database, which sends notifications.
+        :param channel: Name of the channel.
+        :param handle_values: Handles values received within a time window.
+        :param handle_missed_notifications: Handles notifications, which could have
+                                            been sent while not listening.
+        :param batch_seconds: Time window, in which received values are batched.
+        :param reconnect_seconds: Time between attempts to reconnect.
+        :param health_check_seconds: Time after which an idle connection is checked.
+        """
+
+        self.engine = engine
+        self.channel = channel
+        self.handle_values = handle_values
+        self.handle_missed_notifications = handle_missed_notifications
+        self.batch_seconds = batch_seconds
+        self.reconnect_seconds = reconnect_seconds
+        self.health_check_seconds = health_check_seconds
+        self._stopped = threading.Event()
+        # Thread doesn't keep a process alive, it only keeps its caches fresh.
+        self._thread = threading.Thread(
+            target=self._run, name=f"listener-{channel}", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._listen()
+            except (DatabaseError, SQLAlchemyError) as err:
+                logger.warning("Listening to '%s' failed: %s", self.channel, err)
+            except Exception:
+                logger.exception("Handling notifications of '%s' failed.", self.channel)
+
+            self._stopped.wait(self.reconnect_seconds)
+
+    def _listen(self) -> None:
+        connection = self.engine.raw_connection()
+        try:
+            dbapi_connection: Any = connection.dbapi_connection
+            # Notifications are delivered only outside of transactions.
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(
+                    sql.SQL("LISTEN {}").format(sql.Identifier(self.channel))
+                )
+            # Anything could have changed before listening started.
+            self.handle_missed_notifications()
+
+            while not self._stopped.is_set():
+                values = self._receive(dbapi_connection)
+                if values:
+                    self.handle_values(values)
+        finally:
+            # Connection in autocommit mode mustn't be reused by the pool.
+            connection.invalidate()
+
+    def _receive(self, dbapi_connection: Any) -> set[str]:
+        if select.select([dbapi_connection], [], [], self.health_check_seconds)[0]:
+            dbapi_connection.poll()
+            deadline = time.monotonic() + self.batch_seconds
+            while (remaining_seconds := deadline - time.monotonic()) > 0 and (
+                select.select([dbapi_connection], [], [], remaining_seconds)[0]
+            ):
+                dbapi_connection.poll()
+        else:
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+
+        values = {
+            value
+            for notification in dbapi_connection.notifies
+            for value in notification.payload.split(PAYLOAD_SEPARATOR)
+        }
+        dbapi_connection.notifies.clear()
+        return values
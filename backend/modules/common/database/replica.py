@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+
+from sqlalchemy import Connection, Engine, text
+from sqlalchemy.exc import SQLAlchemyError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECK_INTERVAL_SECONDS = 1.0
+DEFAULT_MAX_LAG_SECONDS = 5.0
+DEFAULT_MAX_WAIT_SECONDS = 0.2
+POSITION_POLL_INTERVAL_SECONDS = 0.01
+
+# Replica which replayed everything it has received is considered up to date,
+# even if the last replayed transaction is old (there were no writes recently).
+# Database which is not in recovery mode is not a replica at all,
+# so it can't lag behind.
+REPLICATION_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+POSITION_REPLAYED_QUERY = text(
+    """
+    SELECT COALESCE(
+        NOT pg_is_in_recovery()
+        OR pg_last_wal_replay_lsn() >= CAST(:position AS pg_lsn),
+        false
+    )
+    """
+)
+
+
+class ReplicaMonitor:
+    """
+    Tracks whether a read replica can serve queries.
+
+    Replica is considered unavailable when it can't be reached or
+    its replication lag exceeds the configured threshold.
+    The state is refreshed at most once per check interval,
+    so it can be checked before every query.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        max_lag_seconds: float,
+        check_interval_seconds: float = DEFAULT_CHECK_INTERVAL_SECONDS,
+    ) -> None:
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self._lock = threading.Lock()
+        self._available = False
+        self._checked_at: float | None = None
+
+    def is_available(self) -> bool:
+        if not self._is_check_due():
+            return self._available
+
+        # Only one thread refreshes the state,
+        # the other ones use the last known one in the meantime.
+        if not self._lock.acquire(blocking=False):
+            return self._available
+
+        try:
+            if self._is_check_due():
+                self._available = self._check()
+                self._checked_at = time.monotonic()
+        finally:
+            self._lock.release()
+
+        return self._available
+
+    def wait_for_position(self, position: str, timeout_seconds: float) -> bool:
+        """
+        :param position: Position in the write-ahead log of the primary database.
+        :param timeout_seconds: Maximum time to wait for the replica to catch up.
+        :return: Whether the replica has replayed the given position.
+        """
+
+        deadline = time.monotonic() + timeout_seconds
+
+        try:
+            with self.engine.connect() as connection:
+                while not self._has_replayed(connection, position):
+                    if time.monotonic() >= deadline:
+                        return False
+                    time.sleep(POSITION_POLL_INTERVAL_SECONDS)
+        except SQLAlchemyError as err:
+            logger.warning("Read replica is unreachable: '%s'.", err)
+            return False
+
+        return True
+
+    def _is_check_due(self) -> bool:
+        return (
+            self._checked_at is None
+            or time.monotonic() - self._checked_at >= self.check_interval_seconds
+        )
+
+    def _check(self) -> bool:
+        try:
+            with self.engine.connect() as connection:
+                lag = self._measure_lag(connection)
+        except SQLAlchemyError as err:
+            logger.warning("Read replica is unreachable: '%s'.", err)
+            return False
+
+        if lag > self.max_lag_seconds:
+            logger.warning(
+                "Read replica lags %.2f seconds behind primary database.", lag
+            )
+            return False
+
+        return True
+
+    @staticmethod
+    def _measure_lag(connection: Connection) -> float:
+        return float(connection.execute(REPLICATION_LAG_QUERY).scalar_one())
+
+    @staticmethod
+    def _has_replayed(connection: Connection, position: str) -> bool:
+        has_replayed = connection.execute(
+            POSITION_REPLAYED_QUERY, {"position": position}
+        ).scalar_one()
+        # Each check has to see the current state of the replica,
+        # not the snapshot taken by the first one.
+        connection.rollback()
+        return bool(has_replayed)
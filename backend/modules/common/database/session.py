@@ -1,13 +1,25 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
 
-SESSION: Session | None = None
+from . import consistency
+from .replica import DEFAULT_MAX_LAG_SECONDS, DEFAULT_MAX_WAIT_SECONDS, ReplicaMonitor
+
+SESSION_REGISTRY: scoped_session | None = None
+REPLICA_SESSION_REGISTRY: scoped_session | None = None
+REPLICA_MONITOR: ReplicaMonitor | None = None
+REPLICA_MAX_WAIT_SECONDS: float = DEFAULT_MAX_WAIT_SECONDS
+
+CURRENT_POSITION_QUERY = text("SELECT pg_current_wal_lsn()::text")
 
 
 def initialize_database_sessions(
     database_url: str,
+    replica_database_url: str | None = None,
+    replica_max_lag_seconds: float = DEFAULT_MAX_LAG_SECONDS,
+    replica_max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
 ):
-    global SESSION
+    global SESSION_REGISTRY, REPLICA_SESSION_REGISTRY, REPLICA_MONITOR
+    global REPLICA_MAX_WAIT_SECONDS
 
     # It's important to keep data consistent between transactions and
     # avoid race conditions.
@@ -19,27 +31,119 @@ def initialize_database_sessions(
     # A few solutions for handling data consistency are described here:
     # https://www.cosmicpython.com/book/chapter_07_aggregate.html.
 
-    SESSION = sessionmaker(
-        autocommit=False,
-        autoflush=False,
-        bind=create_engine(
-            url=database_url,
-            pool_pre_ping=True,
-            pool_size=20,
-            max_overflow=100,
-            isolation_level="REPEATABLE READ",
-            # Each PostreSQL connection has an associated time zone that defaults to
-            # system's time zone, so it has to be manually set to UTC
-            # in order to support multiple timezones.
-            # More details can be found here:
-            # https://stackoverflow.com/questions/26105730/sqlalchemy-converting-utc-datetime-to-local-time-before-saving.
-            connect_args={"options": "-c timezone=utc"},
-        ),
-    )()
+    # Sessions are not thread-safe, so each thread (and therefore each request
+    # handled by a threaded worker) gets its own session from the registry.
+    # More details can be found here:
+    # https://docs.sqlalchemy.org/en/20/orm/contextual.html.
+    SESSION_REGISTRY = scoped_session(
+        sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=_create_engine(database_url),
+        )
+    )
+
+    REPLICA_SESSION_REGISTRY = None
+    REPLICA_MONITOR = None
+    if replica_database_url is not None:
+        replica_engine = _create_engine(replica_database_url)
+        REPLICA_SESSION_REGISTRY = scoped_session(
+            sessionmaker(
+                autocommit=False,
+                autoflush=False,
+                bind=replica_engine,
+            )
+        )
+        REPLICA_MONITOR = ReplicaMonitor(
+            engine=replica_engine, max_lag_seconds=replica_max_lag_seconds
+        )
+        REPLICA_MAX_WAIT_SECONDS = replica_max_wait_seconds
+
+
+def _create_engine(database_url: str) -> Engine:
+    return create_engine(
+        url=database_url,
+        pool_pre_ping=True,
+        pool_size=20,
+        max_overflow=100,
+        isolation_level="REPEATABLE READ",
+        # Each PostreSQL connection has an associated time zone that defaults to
+        # system's time zone, so it has to be manually set to UTC
+        # in order to support multiple timezones.
+        # More details can be found here:
+        # https://stackoverflow.com/questions/26105730/sqlalchemy-converting-utc-datetime-to-local-time-before-saving.
+        connect_args={"options": "-c timezone=utc"},
+    )
 
 
 def get_session() -> Session:
-    if SESSION is None:
+    if SESSION_REGISTRY is None:
         raise RuntimeError("Database session not initialized.")
 
-    return SESSION
+    return SESSION_REGISTRY()
+
+
+def get_engine() -> Engine:
+    """
+    Returns engine of the primary database, for work which opens
+    its own connections (e.g. in other processes), instead of using sessions.
+    """
+
+    if SESSION_REGISTRY is None:
+        raise RuntimeError("Database session not initialized.")
+
+    return SESSION_REGISTRY.session_factory.kw["bind"]
+
+
+def get_read_session() -> Session:
+    """
+    Returns a session meant for read-only queries.
+    It's bound to the read replica, if one is configured and available,
+    otherwise to the primary database.
+
+    When the current thread requires a consistency token to be visible,
+    the replica is given a bounded time to catch up with it,
+    before the query is routed to the primary database.
+    """
+
+    if (
+        REPLICA_SESSION_REGISTRY is None
+        or REPLICA_MONITOR is None
+        or not REPLICA_MONITOR.is_available()
+    ):
+        return get_session()
+
+    required_position = consistency.get_required_position()
+    if required_position is not None and not REPLICA_MONITOR.wait_for_position(
+        position=required_position, timeout_seconds=REPLICA_MAX_WAIT_SECONDS
+    ):
+        return get_session()
+
+    return REPLICA_SESSION_REGISTRY()
+
+
+def remember_commit_position(session: Session) -> None:
+    """
+    Stores the position of a transaction just committed in the given session,
+    so it can be handed to a client as a consistency token.
+    Positions are needed only when reads can be served by a replica.
+    """
+
+    if REPLICA_SESSION_REGISTRY is None:
+        return
+
+    consistency.record_commit_position(
+        session.execute(CURRENT_POSITION_QUERY).scalar_one()
+    )
+
+
+def remove_session(exception: BaseException | None = None) -> None:
+    """
+    Closes and discards sessions of the current thread.
+    Meant to be called at the end of each request (or any other unit of work
+    executed by a thread), so connections go back to the pool.
+    """
+
+    for registry in (SESSION_REGISTRY, REPLICA_SESSION_REGISTRY):
+        if registry is not None:
+            registry.remove()
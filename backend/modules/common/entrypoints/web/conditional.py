@@ -0,0 +1,68 @@
+import hashlib
+from http import HTTPStatus
+
+from flask import Response, make_response, request
+
+from ...database import consistency
+
+ETAG_PARTS_SEPARATOR = "\x1f"
+
+
+def compute_etag(*parts: object) -> str:
+    """
+    Computes a strong entity tag from everything, which a representation
+    depends on, so it can be compared without serializing the representation.
+    """
+
+    return hashlib.blake2b(
+        ETAG_PARTS_SEPARATOR.join(str(part) for part in parts).encode(),
+        digest_size=16,
+    ).hexdigest()
+
+
+def is_not_modified(etag: str) -> bool:
+    """
+    :param etag: Entity tag of the current representation.
+    :return: Whether a client already has the current representation.
+    """
+
+    # "If-None-Match" is evaluated with the weak comparison.
+    # More details can be found here:
+    # https://www.rfc-editor.org/rfc/rfc9110#section-13.1.2.
+    return request.if_none_match.contains_weak(etag)
+
+
+def make_not_modified_response(etag: str) -> Response:
+    response = make_response("", HTTPStatus.NOT_MODIFIED)
+    response.set_etag(etag)
+    return response
+
+
+def get_expected_etags() -> set[str] | None:
+    """
+    :return: Entity tags sent in "If-Match" header, one of which has to
+             match the current representation, or None, if any one matches.
+    """
+
+    if not request.if_match or request.if_match.star_tag:
+        return None
+
+    # "If-Match" is evaluated with the strong comparison, so weak tags never match.
+    # More details can be found here:
+    # https://www.rfc-editor.org/rfc/rfc9110#section-13.1.1.
+    return request.if_match.as_set()
+
+
+def get_max_age_seconds() -> float | None:
+    """
+    :return: Maximum age of a cached result accepted by a client
+             ("max-age" directive of "Cache-Control" header),
+             0 if it has to be fresh, or None, if any cached result is accepted.
+    """
+
+    # Client sending a consistency token has to see its own changes,
+    # which may have been made by another process.
+    if request.cache_control.no_cache or consistency.get_required_position():
+        return 0
+
+    return request.cache_control.max_age
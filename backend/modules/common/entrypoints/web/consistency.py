@@ -0,0 +1,48 @@
+import logging
+from http import HTTPStatus
+
+from flask import Response, jsonify, make_response, request
+
+from ... import consts
+from ...database import consistency
+
+logger = logging.getLogger(__name__)
+
+
+def read_consistency_token() -> Response | None:
+    """
+    Makes queries of the request see all changes committed up to
+    the consistency token sent by a client (if any).
+    """
+
+    token = request.headers.get(consts.CONSISTENCY_TOKEN_HEADER_NAME)
+    if token is None:
+        return None
+
+    try:
+        consistency.require_position(token)
+    except ValueError as err:
+        logger.warning("Invalid consistency token: '%s'.", token)
+        return make_response(
+            jsonify({consts.ERROR_RESPONSE_KEY_DETAILS_NAME: str(err)}),
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    return None
+
+
+def add_consistency_token(response: Response) -> Response:
+    """
+    Hands a consistency token of changes committed by the request to a client,
+    so it can read its own writes in subsequent requests.
+    """
+
+    position = consistency.get_commit_position()
+    if position is not None:
+        response.headers[consts.CONSISTENCY_TOKEN_HEADER_NAME] = position
+
+    return response
+
+
+def clear_consistency_tokens(exception: BaseException | None = None) -> None:
+    consistency.clear_positions()
@@ -6,11 +6,17 @@ from ...dtos import Ordering, OrderingEnum
 class OrderingForm(Form):
     ordering = StringField(validators=[validators.DataRequired()])
 
-    def create_ordering(self) -> list[Ordering] | None:
+    def create_ordering(self, skip_unsupported: bool = True) -> list[Ordering] | None:
+        """
+        :param skip_unsupported: Whether fields other than timestamp are skipped,
+                                 otherwise they are left for the caller to reject.
+        """
+
         order: list[Ordering] = [
             self._get_ordering_for_single_field(field)
             for field in self.ordering.data.split(",")
             if any(key in field for key in ("timestamp",))
+            or (not skip_unsupported and field.strip())
         ]
         return order if order else None
 
@@ -1,11 +1,52 @@
+import os
+import time
 import uuid
-from typing import Self
+from typing import Callable, ClassVar, Self
+
+_UUID7_VERSION = 0x7
+_UUID7_VARIANT = 0b10
+_NANOSECONDS_PER_MILLISECOND = 1_000_000
+_SUB_MILLISECOND_BITS = 12
+
+
+def uuid4() -> uuid.UUID:
+    return uuid.uuid4()
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generates time-ordered UUID (version 7), which starts with a timestamp
+    in milliseconds, followed by a fraction of millisecond and random bits.
+    New values are appended at the end of an index,
+    instead of being scattered across the whole index, like random ones.
+    More details can be found here:
+    https://www.rfc-editor.org/rfc/rfc9562.html#name-uuid-version-7.
+    """
+
+    timestamp_ns = time.time_ns()
+    timestamp_ms, remainder_ns = divmod(timestamp_ns, _NANOSECONDS_PER_MILLISECOND)
+    sub_millisecond = (
+        remainder_ns << _SUB_MILLISECOND_BITS
+    ) // _NANOSECONDS_PER_MILLISECOND
+    random_bits = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+
+    return uuid.UUID(
+        int=(timestamp_ms & ((1 << 48) - 1)) << 80
+        | _UUID7_VERSION << 76
+        | sub_millisecond << 64
+        | _UUID7_VARIANT << 62
+        | random_bits
+    )
 
 
 class Uuid(uuid.UUID):
+    # Generator of new identifiers, it can be chosen separately for each aggregate.
+    # Identifiers generated in a different way are still valid.
+    generator: ClassVar[Callable[[], uuid.UUID]] = staticmethod(uuid4)
+
     @classmethod
     def new(cls) -> Self:
-        return cls(hex=uuid.uuid4().hex)
+        return cls(hex=cls.generator().hex)
 
     @classmethod
     def from_hex(cls, hex: str) -> Self:
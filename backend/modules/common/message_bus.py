@@ -1,13 +1,37 @@
+import threading
 from collections import deque
+from dataclasses import dataclass
+from enum import Enum
 from typing import Any, Callable, Sequence, Type
 
 from ..template.domain.entities import Template
 from .domain.commands import DomainCommand
 from .domain.events import DomainEvent
+from .ports.unit_of_work import AbstractUnitOfWork
 
 Message = DomainEvent | DomainCommand
 
 
+class CommandStatusEnum(Enum):
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    # Command succeeded, but was rolled back together with the whole batch.
+    ROLLED_BACK = "rolled_back"
+    # Command wasn't handled, because the batch had already failed.
+    SKIPPED = "skipped"
+
+
+@dataclass(frozen=True)
+class CommandResult:
+    command: DomainCommand
+    status: CommandStatusEnum
+    error: Exception | None = None
+
+
+class _BatchFailed(Exception):
+    pass
+
+
 class MessageBus:
     def __init__(
         self,
@@ -16,9 +40,26 @@ class MessageBus:
     ) -> None:
         self.event_handlers = event_handlers
         self.command_handlers = command_handlers
-        self.queue: deque[Message] = deque()
+        # A single instance is shared by all threads handling requests,
+        # so each of them has to process its own queue of messages.
+        self._local = threading.local()
+
+    @property
+    def queue(self) -> deque[Message]:
+        try:
+            return self._local.queue
+        except AttributeError:
+            self._local.queue = deque()
+            return self._local.queue
+
+    @property
+    def is_handling_batch(self) -> bool:
+        return getattr(self._local, "deferred_messages", None) is not None
 
     def handle(self, messages: Sequence[Message]) -> None:
+        if self._defer(messages):
+            return
+
         self.queue.extend(messages)
 
         while self.queue:
@@ -33,6 +74,72 @@ class MessageBus:
                     f"Message type '{type(message)}' not supported."
                 )
 
+    def handle_batch(
+        self,
+        commands: Sequence[DomainCommand],
+        unit_of_work: AbstractUnitOfWork,
+        atomic: bool = True,
+    ) -> list[CommandResult]:
+        """
+        Handles commands within a single unit of work, so all of them
+        are saved with a single commit. Handlers of commands have to use
+        the same unit of work, and each of them enters it again,
+        which makes each command a separate savepoint of the transaction.
+        Events emitted by handled commands are handled after the commit.
+
+        :param commands: Commands to handle, in order of handling.
+        :param unit_of_work: Unit of work used by handlers of commands.
+        :param atomic: If set, failure of any command rolls back all of them
+                       (all-or-nothing). Otherwise, only the failed command
+                       is rolled back (best-effort).
+        :return: Results of commands, in the same order as commands.
+        """
+
+        results: list[CommandResult] = []
+        messages: list[Message] = []
+
+        try:
+            with unit_of_work:
+                for command in commands:
+                    self._local.deferred_messages = []
+                    try:
+                        self.handle_command(command)
+                    except Exception as err:
+                        results.append(
+                            CommandResult(
+                                command=command,
+                                status=CommandStatusEnum.FAILED,
+                                error=err,
+                            )
+                        )
+                        if atomic:
+                            raise _BatchFailed() from err
+                    else:
+                        results.append(
+                            CommandResult(
+                                command=command, status=CommandStatusEnum.SUCCEEDED
+                            )
+                        )
+                        messages.extend(self._local.deferred_messages)
+                    finally:
+                        self._local.deferred_messages = None
+        except _BatchFailed:
+            return [
+                CommandResult(
+                    command=result.command,
+                    status=CommandStatusEnum.ROLLED_BACK,
+                )
+                if result.status == CommandStatusEnum.SUCCEEDED
+                else result
+                for result in results
+            ] + [
+                CommandResult(command=command, status=CommandStatusEnum.SKIPPED)
+                for command in commands[len(results) :]
+            ]
+
+        self.handle(messages)
+        return results
+
     def handle_event(self, event: DomainEvent):
         try:
             handlers = self.event_handlers[type(event)]
@@ -57,13 +164,29 @@ class MessageBus:
         self._collect_new_messages(result)
 
     def _collect_new_messages(self, result: Any):
+        messages: list[Message] = []
         if isinstance(result, Message):
-            self.queue.append(result)
+            messages.append(result)
         elif isinstance(result, Sequence):
-            self.queue.extend(
+            messages.extend(
                 message for message in result if isinstance(message, Message)
             )
         elif isinstance(result, Template):
-            self.queue.extend(
+            messages.extend(
                 message for message in result.messages if isinstance(message, Message)
             )
+
+        if not self._defer(messages):
+            self.queue.extend(messages)
+
+    def _defer(self, messages: Sequence[Message]) -> bool:
+        # Messages emitted by a command of a batch wait
+        # until the whole batch is committed.
+        deferred_messages: list[Message] | None = getattr(
+            self._local, "deferred_messages", None
+        )
+        if deferred_messages is None:
+            return False
+
+        deferred_messages.extend(messages)
+        return True
@@ -1,8 +1,27 @@
-from .dtos import Pagination
-from .utils import get_next_pagination_link, get_previous_pagination_link
+from .dtos import (
+    CountStrategyEnum,
+    Cursor,
+    CursorPagination,
+    Pagination,
+    TotalCount,
+)
+from .utils import (
+    decode_cursor,
+    encode_cursor,
+    get_cursor_pagination_link,
+    get_next_pagination_link,
+    get_previous_pagination_link,
+)
 
 __all__ = [
+    "CountStrategyEnum",
+    "Cursor",
+    "CursorPagination",
     "Pagination",
+    "TotalCount",
+    "decode_cursor",
+    "encode_cursor",
+    "get_cursor_pagination_link",
     "get_next_pagination_link",
     "get_previous_pagination_link",
 ]
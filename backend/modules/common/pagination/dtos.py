@@ -1,4 +1,7 @@
 from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
 
 
 @dataclass
@@ -20,3 +23,53 @@ class Pagination:
             raise ValueError("Offset must be an integer.")
         if self.records_per_page < 0:
             raise ValueError("Records per page must be greater than or equal to 0.")
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """
+    Position of a record in results ordered by timestamp and ID.
+    Backwards cursor points to records preceding the position,
+    otherwise to records following it.
+    """
+
+    timestamp: datetime
+    id: UUID
+    backwards: bool = False
+
+
+@dataclass
+class CursorPagination:
+    cursor: Cursor | None
+    records_per_page: int
+
+    def __post_init__(self):
+        try:
+            self.records_per_page = int(self.records_per_page)
+        except ValueError:
+            raise ValueError("Records per page must be an integer.")
+        if self.records_per_page < 0:
+            raise ValueError("Records per page must be greater than or equal to 0.")
+
+
+class CountStrategyEnum(Enum):
+    """
+    Ways of counting all records matching a query.
+
+    - EXACT: Counts records precisely, which is expensive for large results.
+    - ESTIMATED: Uses planner statistics, accurate only for broad queries.
+    - CACHED: Reuses exact count computed recently for the same filters.
+    - NONE: Doesn't count records, only says whether there are more of them.
+    """
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+    NONE = "none"
+
+
+@dataclass(frozen=True)
+class TotalCount:
+    kind: CountStrategyEnum
+    value: int | None
+    has_more: bool
@@ -1,12 +1,20 @@
+import base64
+import binascii
+import json
 import urllib.parse as urlparse
+from datetime import datetime
 from urllib.parse import urlencode
+from uuid import UUID
+
+from .. import consts
+from .dtos import Cursor
 
 
 def get_next_pagination_link(
-    url: str, offset: int, records_per_page: int, all_records_count: int
+    url: str, offset: int, records_per_page: int, has_more: bool
 ) -> str | None:
     link = None
-    if all_records_count - records_per_page > offset:
+    if has_more:
         # More about adding query params to url:
         # https://stackoverflow.com/questions/2506379/add-params-to-given-url-in-python.
         params = {"offset": str(offset + records_per_page)}
@@ -29,3 +37,53 @@ def get_previous_pagination_link(
         link = url.replace(f"offset={offset}", f"offset={offset-records_per_page}")
 
     return link
+
+
+def get_cursor_pagination_link(url: str, cursor: Cursor | None) -> str | None:
+    if cursor is None:
+        return None
+
+    url_parts = list(urlparse.urlparse(url))
+    query = dict(urlparse.parse_qsl(url_parts[4], keep_blank_values=True))
+    query.pop(consts.PAGINATION_OFFSET_QUERY_PARAMETER_NAME, None)
+    query[consts.PAGINATION_CURSOR_QUERY_PARAMETER_NAME] = encode_cursor(cursor)
+    url_parts[4] = urlencode(query)
+    return urlparse.urlunparse(url_parts)
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    # Cursor is opaque for clients, so its format can be changed at any time.
+    return (
+        base64.urlsafe_b64encode(
+            json.dumps(
+                [cursor.timestamp.isoformat(), cursor.id.hex, cursor.backwards]
+            ).encode()
+        )
+        .decode()
+        .rstrip("=")
+    )
+
+
+def decode_cursor(encoded_cursor: str) -> Cursor:
+    """
+    :param encoded_cursor: Cursor received from a client.
+    :raises ValueError: Cursor is malformed.
+    :return: Decoded cursor.
+    """
+
+    try:
+        timestamp, id_, backwards = json.loads(
+            base64.urlsafe_b64decode(encoded_cursor + "=" * (-len(encoded_cursor) % 4))
+        )
+        cursor = Cursor(
+            timestamp=datetime.fromisoformat(timestamp),
+            id=UUID(hex=id_),
+            backwards=bool(backwards),
+        )
+    except (binascii.Error, TypeError, ValueError) as err:
+        raise ValueError("Invalid cursor.") from err
+
+    if cursor.timestamp.tzinfo is None:
+        raise ValueError("Invalid cursor.")
+
+    return cursor
@@ -1,4 +1,5 @@
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from os import environ
 
 from dateutil import tz
@@ -16,3 +17,28 @@ def convert_timestamp_to_local_timestamp(timestamp: datetime) -> datetime:
 
 def convert_timestamp_to_utc_timestamp(timestamp: datetime) -> datetime:
     return timestamp.astimezone(timezone.utc)
+
+
+def parse_timestamp(text: str) -> datetime:
+    """
+    Parses timestamp in ISO 8601 format or in format of HTTP dates
+    (e.g. returned by the API). Timestamp without time zone is assumed
+    to be a local one.
+
+    :param text: Timestamp to parse.
+    :raises ValueError: Text isn't a valid timestamp.
+    :return: Timestamp with time zone.
+    """
+
+    try:
+        timestamp = datetime.fromisoformat(text)
+    except ValueError:
+        try:
+            timestamp = parsedate_to_datetime(text)
+        except (TypeError, ValueError) as err:
+            raise ValueError(f"Invalid timestamp: '{text}'.") from err
+
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=tz.gettz(TIME_ZONE))
+
+    return timestamp
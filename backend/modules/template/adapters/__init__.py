@@ -1,11 +1,24 @@
+from .repositories.cached import (
+    CachedTemplatesQueryRepository,
+    deserialize_template,
+    deserialize_templates_list,
+    serialize_template,
+    serialize_templates_list,
+)
 from .repositories.sqlalchemy import (
     SqlAlchemyTemplatesDomainRepository,
     SqlAlchemyTemplatesQueryRepository,
 )
-from .unit_of_work import SqlAlchemyTemplatesUnitOfWork
+from .unit_of_work import TEMPLATES_CHANGED_CHANNEL, SqlAlchemyTemplatesUnitOfWork
 
 __all__ = [
+    "CachedTemplatesQueryRepository",
     "SqlAlchemyTemplatesDomainRepository",
     "SqlAlchemyTemplatesQueryRepository",
     "SqlAlchemyTemplatesUnitOfWork",
+    "TEMPLATES_CHANGED_CHANNEL",
+    "deserialize_template",
+    "deserialize_templates_list",
+    "serialize_template",
+    "serialize_templates_list",
 ]
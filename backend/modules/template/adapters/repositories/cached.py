@@ -0,0 +1,177 @@
+from datetime import datetime
+from typing import Any, Iterator
+
+from modules.common.cache import AbstractVersionedCache
+from modules.common.database import consistency
+from modules.common.dtos import Ordering
+from modules.common.pagination.dtos import (
+    CountStrategyEnum,
+    CursorPagination,
+    Pagination,
+    TotalCount,
+)
+from modules.common.time import convert_timestamp_to_local_timestamp
+
+from ...domain.entities import Template as TemplateEntity
+from ...domain.ports.dtos import TemplatesFilters
+from ...domain.value_objects import TemplateId, TemplateValue
+from ...services.queries.ports import AbstractTemplatesQueryRepository
+
+
+class CachedTemplatesQueryRepository(AbstractTemplatesQueryRepository):
+    """
+    Serves templates retrieved by ids from a cache,
+    other queries are passed to the decorated repository.
+
+    Cached templates are invalidated by handlers of events emitted
+    when templates change, in the process handling the change.
+    Other processes evict them, when they are notified about the change
+    by the database, so they can serve a stale template for a moment
+    (or until it expires, if a notification is missed).
+    Templates returned by this repository are shared between threads,
+    so they mustn't be modified.
+    """
+
+    def __init__(
+        self,
+        repository: AbstractTemplatesQueryRepository,
+        cache: AbstractVersionedCache,
+        primary_repository: AbstractTemplatesQueryRepository | None = None,
+    ) -> None:
+        """
+        :param primary_repository: Repository reading from the primary database,
+                                   from which templates missing in the cache
+                                   are loaded. A replica can lag behind,
+                                   so a template loaded from it right after
+                                   an invalidation could be its stale copy,
+                                   cached again. By default, templates are
+                                   loaded from the decorated repository.
+        """
+
+        self.repository = repository
+        self.cache = cache
+        self.primary_repository = (
+            primary_repository if primary_repository is not None else repository
+        )
+
+    def get(self, template_id: TemplateId) -> TemplateEntity:
+        if not self._can_use_cache():
+            return self.repository.get(template_id)
+
+        template = self.cache.get(template_id)
+        if template is not None:
+            return template
+
+        token = self.cache.get_token(template_id)
+        template = self.primary_repository.get(template_id)
+        self.cache.set(template_id, template, version=template.version, token=token)
+
+        return template
+
+    def get_many(self, template_ids: list[TemplateId]) -> list[TemplateEntity]:
+        if not self._can_use_cache():
+            return self.repository.get_many(template_ids)
+
+        templates = []
+        missing_template_ids = []
+        for template_id in template_ids:
+            template = self.cache.get(template_id)
+            if template is not None:
+                templates.append(template)
+            else:
+                missing_template_ids.append(template_id)
+
+        if missing_template_ids:
+            tokens = {
+                template_id: self.cache.get_token(template_id)
+                for template_id in missing_template_ids
+            }
+            for template in self.primary_repository.get_many(missing_template_ids):
+                self.cache.set(
+                    template.id,
+                    template,
+                    version=template.version,
+                    token=tokens[template.id],
+                )
+                templates.append(template)
+
+        return templates
+
+    def stream(
+        self, filters: TemplatesFilters, ordering: list[Ordering]
+    ) -> Iterator[TemplateEntity]:
+        return self.repository.stream(filters=filters, ordering=ordering)
+
+    def list(
+        self,
+        filters: TemplatesFilters,
+        ordering: list[Ordering],
+        pagination: Pagination | CursorPagination | None,
+        count_strategy: CountStrategyEnum = CountStrategyEnum.EXACT,
+    ) -> tuple[list[TemplateEntity], TotalCount]:
+        return self.repository.list(
+            filters=filters,
+            ordering=ordering,
+            pagination=pagination,
+            count_strategy=count_strategy,
+        )
+
+    @staticmethod
+    def _can_use_cache() -> bool:
+        # Client sending a consistency token has to see its own changes,
+        # which may have been made by another process.
+        return consistency.get_required_position() is None
+
+
+def serialize_template(template: TemplateEntity) -> dict[str, Any]:
+    """
+    Converts a template into a JSON-serializable dictionary,
+    so it can be kept in a cache shared by processes.
+    """
+
+    return {
+        "id": str(template.id),
+        "value": template.value.value,
+        "timestamp": template.timestamp.isoformat(),
+        "version": template.version,
+    }
+
+
+def deserialize_template(data: dict[str, Any]) -> TemplateEntity:
+    template = TemplateEntity(
+        id=TemplateId.from_hex(data["id"]),
+        timestamp=convert_timestamp_to_local_timestamp(
+            datetime.fromisoformat(data["timestamp"])
+        ),
+        version=data["version"],
+    )
+    # Cached value has been valid, when it was loaded,
+    # so it isn't validated again (e.g. initial value of 0).
+    template._value = TemplateValue(value=data["value"])
+    return template
+
+
+def serialize_templates_list(
+    templates_list: tuple[list[TemplateEntity], TotalCount]
+) -> dict[str, Any]:
+    templates, count = templates_list
+    return {
+        "templates": [serialize_template(template) for template in templates],
+        "count": {
+            "kind": count.kind.value,
+            "value": count.value,
+            "has_more": count.has_more,
+        },
+    }
+
+
+def deserialize_templates_list(
+    data: dict[str, Any]
+) -> tuple[list[TemplateEntity], TotalCount]:
+    return [deserialize_template(template) for template in data["templates"]], (
+        TotalCount(
+            kind=CountStrategyEnum(data["count"]["kind"]),
+            value=data["count"]["value"],
+            has_more=data["count"]["has_more"],
+        )
+    )
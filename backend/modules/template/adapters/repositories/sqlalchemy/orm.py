@@ -1,16 +1,136 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import JSON, DateTime
+from sqlalchemy import (
+    DDL,
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Index,
+    Text,
+    case,
+    cast,
+    event,
+    false,
+    func,
+    select,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from modules.common.database import Base
 
+from .consts import VALUE_NAME_IN_DATABASE
+
 
 class Template(Base):
     __tablename__ = "templates"
+    __table_args__ = (
+        # Supports keyset (cursor) pagination ordered by timestamp.
+        Index("ix_templates_timestamp_id", "timestamp", "id"),
+        # Supports containment ("@>") queries on template data.
+        Index(
+            "ix_templates_value_data",
+            "value_data",
+            postgresql_using="gin",
+            postgresql_ops={"value_data": "jsonb_path_ops"},
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(primary_key=True)
-    value_data: Mapped[dict] = mapped_column(JSON, default=dict, nullable=False)
+    value_data: Mapped[dict] = mapped_column(JSONB, default=dict, nullable=False)
     timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     version: Mapped[int] = mapped_column(nullable=False)
+    is_sharded: Mapped[bool] = mapped_column(
+        default=False, server_default=false(), nullable=False
+    )
+
+
+class TemplateValueShard(Base):
+    """
+    Part of value of a heavily updated ("hot") template.
+
+    Value of a sharded template is a sum of its shards. Subtraction changes
+    only one of them, without touching the row of the template, so concurrent
+    subtractions from different shards don't wait for each other.
+    Each subtraction increments the version of its shard instead of the version
+    of the template, so a version of a sharded template is a sum of both.
+    Value stored in "templates" table is refreshed only when the shards
+    are rebalanced or the value is set, so filtering and ordering templates
+    by value uses the value of a sharded template as of that moment.
+    More details can be found here:
+    https://cloud.google.com/firestore/docs/solutions/counters.
+    """
+
+    __tablename__ = "template_value_shards"
+    __table_args__ = (
+        CheckConstraint("value >= 0", name="ck_template_value_shards_value"),
+    )
+
+    template_id: Mapped[UUID] = mapped_column(
+        ForeignKey("templates.id", ondelete="CASCADE"), primary_key=True
+    )
+    shard: Mapped[int] = mapped_column(primary_key=True)
+    value: Mapped[int] = mapped_column(nullable=False)
+    version: Mapped[int] = mapped_column(default=0, server_default="0", nullable=False)
+
+
+# Value is stored in JSONB, so it's indexed as an expression cast to integer.
+# Queries have to use exactly the same expression to make use of the index,
+# and it also makes values compared and sorted as numbers, not as text.
+# More details can be found here:
+# https://www.postgresql.org/docs/current/indexes-expressional.html.
+TEMPLATE_VALUE = Template.value_data[VALUE_NAME_IN_DATABASE].as_integer()
+Index("ix_templates_value", TEMPLATE_VALUE)
+
+# Value of a sharded template, "NULL" for templates which aren't sharded.
+# Shards are summed up only for sharded templates, so other templates
+# are read as cheaply as if there were no shards at all.
+SHARDED_TEMPLATE_VALUE = case(
+    (
+        Template.is_sharded,
+        select(func.sum(TemplateValueShard.value))
+        .where(TemplateValueShard.template_id == Template.id)
+        .correlate(Template)
+        .scalar_subquery(),
+    )
+)
+# Number of subtractions from shards of a template since they were written,
+# 0 for templates which aren't sharded.
+SHARDS_VERSION = case(
+    (
+        Template.is_sharded,
+        select(func.coalesce(func.sum(TemplateValueShard.version), 0))
+        .where(TemplateValueShard.template_id == Template.id)
+        .correlate(Template)
+        .scalar_subquery(),
+    ),
+    else_=0,
+)
+# Versions of shards are added to the version of the template, whenever
+# they are written again, so the version of a template never decreases.
+TEMPLATE_VERSION = Template.version + SHARDS_VERSION
+
+# Text of fields, which can be searched by "query" filter. Fields actually
+# searched are picked by "TEMPLATES_SEARCHABLE_FIELDS" setting.
+# Each of them is indexed with trigrams, so substring search doesn't have to scan
+# the whole table. In order to make another field searchable, add its text here
+# and create its index in a migration.
+# More details can be found here:
+# https://www.postgresql.org/docs/current/pgtrgm.html#PGTRGM-INDEX.
+SEARCHABLE_FIELDS = {
+    "id": cast(Template.id, Text),
+}
+for name, expression in SEARCHABLE_FIELDS.items():
+    Index(
+        f"ix_templates_{name}_trgm",
+        expression.label(f"{name}_text"),
+        postgresql_using="gin",
+        postgresql_ops={f"{name}_text": "gin_trgm_ops"},
+    )
+
+event.listen(
+    Template.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
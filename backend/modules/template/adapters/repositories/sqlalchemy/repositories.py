@@ -1,15 +1,44 @@
+import json
 import logging
-from datetime import datetime
-from typing import Callable
+import struct
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Iterator
 
-from sqlalchemy import String, or_, text
-from sqlalchemy.exc import NoResultFound
+from sqlalchemy import (
+    DateTime,
+    Engine,
+    Integer,
+    Result,
+    Row,
+    Uuid,
+    any_,
+    bindparam,
+    case,
+    delete,
+    false,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import NoResultFound, OperationalError
 from sqlalchemy.orm import Query, Session
-from sqlalchemy_utils.functions import cast_if
 
-from modules.common.database import get_session
+from modules.common.cache import TTLCache, TwoTierCache
+from modules.common.database import estimate_number_of_rows, get_read_session
 from modules.common.dtos import Ordering, OrderingEnum
-from modules.common.pagination import Pagination
+from modules.common.pagination import (
+    CountStrategyEnum,
+    CursorPagination,
+    Pagination,
+    TotalCount,
+)
 from modules.common.time import (
     convert_timestamp_to_local_timestamp,
     convert_timestamp_to_utc_timestamp,
@@ -18,48 +47,227 @@ from modules.common.time import (
 from .....template.services.queries.ports.repositories import (
     AbstractTemplatesQueryRepository,
 )
+from ....domain import exceptions as domain_exceptions
 from ....domain.entities import Template as TemplateEntity
 from ....domain.ports import AbstractTemplatesDomainRepository
 from ....domain.ports import dtos as ports_dtos
 from ....domain.ports import exceptions
 from ....domain.value_objects import TemplateId, TemplateValue
 from .consts import VALUE_NAME_IN_DATABASE
+from .orm import (
+    SEARCHABLE_FIELDS,
+    SHARDED_TEMPLATE_VALUE,
+    SHARDS_VERSION,
+    TEMPLATE_VALUE,
+    TEMPLATE_VERSION,
+)
 from .orm import Template as TemplateDb
+from .orm import (
+    TemplateValueShard,
+)
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_COUNT_CACHE_TTL_SECONDS = 30.0
+# Below this number of templates, estimated count is replaced by exact one.
+EXACT_COUNT_THRESHOLD = 1000
+
+# Number of rows fetched at once from a server-side cursor by exports.
+EXPORT_BATCH_SIZE = 1000
+
+READ_ONLY_TRANSACTION_QUERY = text("SET TRANSACTION READ ONLY")
+
+# Imported templates are copied into a temporary staging table first,
+# which isn't written to the write-ahead log and has no indexes,
+# and then merged into templates with a single statement.
+CREATE_IMPORT_STAGING_TABLE_QUERY = text(
+    "CREATE TEMPORARY TABLE templates_import (LIKE templates INCLUDING DEFAULTS)"
+)
+COPY_INTO_IMPORT_STAGING_TABLE_QUERY = (
+    "COPY templates_import (id, value_data, timestamp, version) "
+    "FROM STDIN (FORMAT binary)"
+)
+MERGE_IMPORT_STAGING_TABLE_QUERY = text(
+    """
+    INSERT INTO templates (id, value_data, timestamp, version)
+    SELECT id, value_data, timestamp, version FROM templates_import
+    ON CONFLICT (id) DO NOTHING
+    RETURNING id
+    """
+)
+DROP_IMPORT_STAGING_TABLE_QUERY = text("DROP TABLE templates_import")
+
+# Binary format of "COPY" is parsed by the database faster than the text one.
+# More details can be found here:
+# https://www.postgresql.org/docs/current/sql-copy.html#SQL-COPY-BINARY-FORMAT.
+COPY_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+COPY_BINARY_TRAILER = struct.pack("!h", -1)
+COPY_BINARY_JSONB_VERSION = b"\x01"
+COPY_BINARY_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+LIKE_ESCAPE_CHARACTER = "/"
+# More details can be found here:
+# https://www.postgresql.org/docs/current/errcodes-appendix.html.
+SERIALIZATION_FAILURE_ERROR_CODE = "40001"
+DEADLOCK_DETECTED_ERROR_CODE = "40P01"
+
+# Each shard of a template keeps this part of its value in reserve,
+# so subtractions from different shards can't bring the whole value below 1.
+SHARD_RESERVE = 1
+
+# Subtraction changes only one, randomly picked shard and its version,
+# without locking the row of the template, so concurrent subtractions wait
+# for each other only when they pick the same shard.
+# Shards are written again (e.g. rebalanced or merged) only when all of them
+# are locked, so a subtraction waiting for such a change either sees
+# the new value of its shard, or doesn't find the shard at all.
+# Other shards are summed up as of the start of the statement, so the returned
+# value doesn't include subtractions from them committed in the meantime.
+SUBTRACT_FROM_SHARD_QUERY = text(
+    """
+    WITH updated AS (
+        UPDATE template_value_shards
+        SET value = value - :value, version = version + 1
+        WHERE template_id = :template_id
+            AND shard = (
+                SELECT floor(random() * count(*))::integer
+                FROM template_value_shards
+                WHERE template_id = :template_id
+            )
+            AND value - :value >= :reserve
+        RETURNING shard, value
+    )
+    SELECT updated.value + (
+        SELECT COALESCE(sum(value), 0)
+        FROM template_value_shards
+        WHERE template_id = :template_id AND shard <> updated.shard
+    )
+    FROM updated
+    """
+).bindparams(
+    bindparam("template_id", type_=Uuid()),
+    bindparam("value", type_=Integer()),
+    bindparam("reserve", type_=Integer()),
+)
+
+TABLE_SIZE_ESTIMATE_QUERY = text(
+    "SELECT reltuples FROM pg_class WHERE oid = CAST(:table_name AS regclass)"
+)
+
 
 class SqlAlchemyTemplatesDomainRepository(AbstractTemplatesDomainRepository):
     """
     See description of parent class to get more details.
+
+    Templates aren't locked when they are retrieved. Instead, an update succeeds
+    only if the template still has the version it had when it was retrieved
+    (optimistic concurrency control), so concurrent transactions wait
+    for each other only during the update itself.
+    More details can be found here:
+    https://martinfowler.com/eaaCatalog/optimisticOfflineLock.html.
+
+    Retrieved templates are kept in an identity map, together with values
+    of their columns at the time of retrieval. Changes are saved by
+    "save_changes", when unit of work is committed, and only changed columns
+    are updated.
+    More details can be found here:
+    https://martinfowler.com/eaaCatalog/identityMap.html.
+
+    Value of a heavily updated template can be split into shards
+    (see "TemplateValueShard"), which is transparent to users of the repository.
     """
 
-    def __init__(self, session) -> None:
+    def __init__(self, session, searchable_fields: Iterable[str] | None = None) -> None:
+        """
+        :param searchable_fields: Names of fields searched by "query" filter,
+                                  by default all of "SEARCHABLE_FIELDS".
+        """
+
+        super().__init__()
         self.session = session
+        self.searchable_fields = _get_searchable_fields(searchable_fields)
+        self._identity_map: dict[TemplateId, TemplateEntity] = {}
+        self._snapshots: dict[TemplateId, dict] = {}
 
     def create(self, template: TemplateEntity) -> None:
         self.session.add(_map_template_entity_to_template_db(template))
 
-    def update(self, template: TemplateEntity) -> None:
-        try:
-            template_instance = (
-                self.session.query(TemplateDb)
-                .filter_by(id=template.id)
-                .with_for_update()
-                .scalar()
+    def import_many(self, templates: Iterable[TemplateEntity]) -> list[TemplateId]:
+        self.session.execute(CREATE_IMPORT_STAGING_TABLE_QUERY)
+        # "COPY" streams rows, so memory usage doesn't depend
+        # on the number of imported templates.
+        # More details can be found here:
+        # https://www.psycopg.org/docs/cursor.html#cursor.copy_expert.
+        with self.session.connection().connection.cursor() as cursor:
+            cursor.copy_expert(
+                COPY_INTO_IMPORT_STAGING_TABLE_QUERY,
+                _CopyStream(_encode_templates_in_copy_binary_format(templates)),
             )
-        except NoResultFound as err:
-            raise exceptions.TemplateDoesNotExist(
-                f"Cannot update template with id '{template.id}', it doesn't exist."
-            ) from err
+        imported_ids = [
+            TemplateId(template_id.hex)
+            for template_id in self.session.execute(
+                MERGE_IMPORT_STAGING_TABLE_QUERY
+            ).scalars()
+        ]
+        # Staging table is dropped right away, instead of on commit,
+        # so more templates can be imported within the same transaction.
+        self.session.execute(DROP_IMPORT_STAGING_TABLE_QUERY)
+
+        return imported_ids
+
+    def update(self, template: TemplateEntity) -> None:
+        # Template which wasn't retrieved before is overwritten unconditionally.
+        self._identity_map[template.id] = template
+
+    def save_changes(self) -> None:
+        # Each changed template is saved with a single statement,
+        # unchanged ones aren't saved at all.
+        for template_id in list(self._identity_map):
+            self._save(template_id)
+
+    def subtract_value(
+        self, template_id: TemplateId, value: TemplateValue
+    ) -> TemplateValue:
+        # Pending changes of the template are saved first,
+        # because it's retrieved again after the subtraction.
+        self._save(template_id)
+        self._use_read_committed_isolation_level()
+
+        # Template, which isn't sharded, is subtracted from with a single
+        # statement, which also tells whether the template is sharded,
+        # so its shards are touched only if it is.
+        final_value, is_sharded = self._execute(
+            statement=_build_subtract_from_template_statement(
+                template_id=template_id, value=value
+            ),
+            template_id=template_id,
+        ).one()
+
+        if final_value is None and is_sharded:
+            final_value = self._execute(
+                statement=SUBTRACT_FROM_SHARD_QUERY,
+                template_id=template_id,
+                parameters={
+                    "template_id": template_id,
+                    "value": value.value,
+                    "reserve": SHARD_RESERVE,
+                },
+            ).scalar_one_or_none()
 
-        for key, value in _map_template_entity_to_template_db(
-            template
-        ).__dict__.items():
-            if key != "_sa_instance_state":
-                setattr(template_instance, key, value)
+        if final_value is None:
+            # Value is too small (e.g. for the picked shard), or the template
+            # has been sharded, unsharded or rebalanced concurrently, so it's
+            # subtracted from again, with the template and its shards locked.
+            final_value = self._subtract_value_of_locked_template(
+                template_id=template_id, value=value
+            ).value
+
+        self._forget(template_id)
+        return TemplateValue(value=final_value)
 
     def delete(self, template_id: TemplateId):
+        # Shards are deleted together with the template by a foreign key.
+        self._forget(template_id)
         try:
             self.session.delete(
                 self.session.query(TemplateDb).filter_by(id=template_id).one()
@@ -70,11 +278,15 @@ class SqlAlchemyTemplatesDomainRepository(AbstractTemplatesDomainRepository):
             ) from err
 
     def get(self, template_id: TemplateId) -> TemplateEntity:
+        if template_id in self._identity_map:
+            return self._identity_map[template_id]
+
         try:
-            return _map_template_db_to_template_entity(
-                self.session.query(TemplateDb)
-                .filter_by(id=template_id)
-                .with_for_update()
+            template = _map_template_db_to_template_entity(
+                *self.session.query(
+                    TemplateDb, SHARDED_TEMPLATE_VALUE, TEMPLATE_VERSION
+                )
+                .filter(TemplateDb.id == template_id)
                 .one()
             )
         except NoResultFound as err:
@@ -82,73 +294,733 @@ class SqlAlchemyTemplatesDomainRepository(AbstractTemplatesDomainRepository):
                 f"Template with id '{template_id}' doesn't exist."
             ) from err
 
+        self._identity_map[template.id] = template
+        self._snapshots[template.id] = _map_template_entity_to_columns(template)
+        return template
+
+    def get_for_update(self, template_id: TemplateId) -> TemplateEntity:
+        self._save(template_id)
+        self._use_read_committed_isolation_level()
+
+        # Shards are locked as well, because subtractions from them don't lock
+        # the template. A template loaded by the session before is overwritten
+        # with its current state.
+        template_db = self._execute(
+            statement=select(TemplateDb)
+            .where(TemplateDb.id == template_id)
+            .with_for_update()
+            .execution_options(populate_existing=True),
+            template_id=template_id,
+        ).scalar_one_or_none()
+        if template_db is None:
+            raise exceptions.TemplateDoesNotExist(
+                f"Template with id '{template_id}' doesn't exist."
+            )
+        shards = self._lock_shards(template_id)
+
+        template = _map_template_db_to_template_entity(
+            template_db,
+            sharded_value=sum(shard.value for shard in shards) if shards else None,
+            version=template_db.version + sum(shard.version for shard in shards),
+        )
+        self._identity_map[template.id] = template
+        self._snapshots[template.id] = _map_template_entity_to_columns(template)
+        return template
+
+    def find_ids_for_update(
+        self,
+        filters: ports_dtos.TemplatesFilters,
+        after: TemplateId | None,
+        limit: int,
+    ) -> list[TemplateId]:
+        query = _filter(
+            query=self.session.query(TemplateDb.id),
+            filters=filters,
+            searchable_fields=self.searchable_fields,
+        )
+        if after is not None:
+            query = query.filter(TemplateDb.id > after)
+
+        return [
+            TemplateId(template_id.hex)
+            for template_id in self._execute(
+                statement=query.order_by(TemplateDb.id)
+                .limit(limit)
+                .with_for_update()
+                .statement,
+                template_id=None,
+            ).scalars()
+        ]
+
+    def delete_many(self, template_ids: list[TemplateId]) -> list[TemplateId]:
+        # Shards are deleted together with templates by a foreign key.
+        deleted_ids = self._execute(
+            statement=delete(TemplateDb)
+            .where(TemplateDb.id.in_(template_ids))
+            .returning(TemplateDb.id)
+            .execution_options(synchronize_session=False),
+            template_id=None,
+        ).scalars()
+
+        return self._forget_many(deleted_ids)
+
+    def set_value_many(
+        self, template_ids: list[TemplateId], value: TemplateValue
+    ) -> list[TemplateId]:
+        updated_ids = list(
+            self._execute(
+                statement=update(TemplateDb)
+                .where(TemplateDb.id.in_(template_ids))
+                .values(
+                    value_data=_map_template_value_dto_to_dict(value),
+                    version=TEMPLATE_VERSION + 1,
+                )
+                .returning(TemplateDb.id)
+                .execution_options(synchronize_session=False),
+                template_id=None,
+            ).scalars()
+        )
+        self._split_shards(updated_ids)
+
+        return self._forget_many(updated_ids)
+
+    def subtract_value_many(
+        self, template_ids: list[TemplateId], value: TemplateValue
+    ) -> list[TemplateId]:
+        # Value of sharded templates is read from the snapshot of the transaction,
+        # so a shard changed concurrently makes splitting the new value fail
+        # with a serialization error, instead of losing the change.
+        # The condition has to be kept in sync with "Template.subtract_value".
+        current_value = func.coalesce(SHARDED_TEMPLATE_VALUE, TEMPLATE_VALUE)
+        updated_ids = list(
+            self._execute(
+                statement=update(TemplateDb)
+                .where(TemplateDb.id.in_(template_ids))
+                .where(current_value - value.value > 0)
+                .values(
+                    value_data=TemplateDb.value_data.op("||")(
+                        func.jsonb_build_object(
+                            VALUE_NAME_IN_DATABASE, current_value - value.value
+                        )
+                    ),
+                    version=TEMPLATE_VERSION + 1,
+                )
+                .returning(TemplateDb.id)
+                .execution_options(synchronize_session=False),
+                template_id=None,
+            ).scalars()
+        )
+        self._split_shards(updated_ids)
+
+        return self._forget_many(updated_ids)
+
+    def shard_value(
+        self, template_id: TemplateId, number_of_shards: int
+    ) -> TemplateValue:
+        self._save(template_id)
+        value, shards = self._lock_value(template_id)
+        self.session.execute(
+            delete(TemplateValueShard).where(
+                TemplateValueShard.template_id == template_id
+            )
+        )
+        self.session.execute(
+            insert(TemplateValueShard),
+            [
+                {"template_id": template_id, "shard": shard, "value": shard_value}
+                for shard, shard_value in enumerate(
+                    _split_value(value=value.value, number_of_shards=number_of_shards)
+                )
+            ],
+        )
+        self._refresh_value(
+            template_id=template_id,
+            value=value,
+            shards_version=sum(shard.version for shard in shards),
+            is_sharded=True,
+        )
+        self._forget(template_id)
+        return value
+
+    def unshard_value(self, template_id: TemplateId) -> TemplateValue:
+        self._save(template_id)
+        value, shards = self._lock_value(template_id)
+        self.session.execute(
+            delete(TemplateValueShard).where(
+                TemplateValueShard.template_id == template_id
+            )
+        )
+        self._refresh_value(
+            template_id=template_id,
+            value=value,
+            shards_version=sum(shard.version for shard in shards),
+            is_sharded=False,
+        )
+        self._forget(template_id)
+        return value
+
+    def _save(self, template_id: TemplateId) -> None:
+        template = self._identity_map.get(template_id)
+        if template is None:
+            return
+
+        columns = _map_template_entity_to_columns(template)
+        snapshot = self._snapshots.get(template_id)
+        changed_columns = {
+            name: value
+            for name, value in columns.items()
+            if snapshot is None or snapshot[name] != value
+        }
+        # Version changes only together with data of template,
+        # so a template with only its version changed has nothing to save.
+        if changed_columns.keys() <= {"version"}:
+            return
+
+        statement = (
+            update(TemplateDb)
+            .where(TemplateDb.id == template_id)
+            .values(**changed_columns)
+            .returning(TemplateDb.is_sharded, SHARDS_VERSION)
+            .execution_options(synchronize_session=False)
+        )
+        if snapshot is not None:
+            statement = statement.where(TEMPLATE_VERSION == snapshot["version"])
+
+        row = self._execute(statement=statement, template_id=template_id).one_or_none()
+
+        if row is None:
+            if (
+                snapshot is None
+                or self.session.query(TemplateDb.id).filter_by(id=template_id).scalar()
+                is None
+            ):
+                raise exceptions.TemplateDoesNotExist(
+                    f"Cannot update template with id '{template_id}', "
+                    f"it doesn't exist."
+                )
+            raise exceptions.TemplateVersionConflict(
+                f"Template with id '{template_id}' has version other than "
+                f"expected '{snapshot['version']}'."
+            )
+
+        is_sharded, shards_version = row
+        if is_sharded:
+            # Shards are written again, so their versions are reset, as they are
+            # already included in the saved version of the template. Shards
+            # are locked after the template, and a subtraction from them made
+            # after the version was checked fails the update, instead of
+            # being overwritten.
+            shards = self._lock_shards(template_id)
+            if snapshot is not None and shards_version != sum(
+                shard.version for shard in shards
+            ):
+                raise exceptions.TemplateVersionConflict(
+                    f"Template with id '{template_id}' has been changed "
+                    f"by a concurrent transaction."
+                )
+            self._write_shards(
+                template_id=template_id,
+                value=template.value,
+                number_of_shards=len(shards),
+            )
+
+        self._snapshots[template_id] = columns
+        self.changed_template_ids.add(template_id)
+
+    def _forget(self, template_id: TemplateId) -> None:
+        # Template changed directly in a database is retrieved again when needed.
+        self._identity_map.pop(template_id, None)
+        self._snapshots.pop(template_id, None)
+        self.changed_template_ids.add(template_id)
+
+    def _forget_many(self, template_ids: Iterable[uuid.UUID]) -> list[TemplateId]:
+        forgotten_ids = [TemplateId(template_id.hex) for template_id in template_ids]
+        for template_id in forgotten_ids:
+            self._forget(template_id)
+
+        return forgotten_ids
+
+    def _split_shards(self, template_ids: list[uuid.UUID]) -> None:
+        # Value kept in "templates" table is split again between existing shards
+        # of each sharded template, in the same way as by "_split_value".
+        if not template_ids:
+            return
+
+        shards_count = (
+            select(
+                TemplateValueShard.template_id,
+                func.count().label("number_of_shards"),
+            )
+            .where(TemplateValueShard.template_id.in_(template_ids))
+            .group_by(TemplateValueShard.template_id)
+            .subquery()
+        )
+        self._execute(
+            statement=update(TemplateValueShard)
+            .where(TemplateValueShard.template_id == shards_count.c.template_id)
+            .where(TemplateDb.id == TemplateValueShard.template_id)
+            .values(
+                value=TEMPLATE_VALUE // shards_count.c.number_of_shards
+                + case(
+                    (
+                        TemplateValueShard.shard
+                        < TEMPLATE_VALUE % shards_count.c.number_of_shards,
+                        1,
+                    ),
+                    else_=0,
+                ),
+                version=0,
+            )
+            .execution_options(synchronize_session=False),
+            template_id=None,
+        )
+
+    def _use_read_committed_isolation_level(self) -> None:
+        # In "READ COMMITTED" isolation level, an operation which waited
+        # for a concurrent one to release the template sees its changes,
+        # instead of failing with a serialization error. It can be set only
+        # before the transaction starts, which is the case when the operation
+        # is the first one of the unit of work. Otherwise, or when
+        # the session is bound to an already opened connection, the isolation
+        # level is kept.
+        # More details can be found here:
+        # https://www.postgresql.org/docs/current/transaction-iso.html#XACT-READ-COMMITTED.
+        if not self.session.in_transaction() and isinstance(
+            self.session.get_bind(), Engine
+        ):
+            self.session.connection(
+                execution_options={"isolation_level": "READ COMMITTED"}
+            )
+
+    def _lock(self, template_id: TemplateId) -> TemplateValue:
+        # Template is locked before its shards, so operations locking both
+        # can't deadlock. Subtraction from a shard locks only the shard,
+        # so a deadlock with a transaction which locks the template later
+        # (e.g. in a batch) is detected by the database and reported
+        # as a version conflict.
+        value = self._execute(
+            statement=select(TEMPLATE_VALUE)
+            .where(TemplateDb.id == template_id)
+            .with_for_update(),
+            template_id=template_id,
+        ).scalar_one_or_none()
+        if value is None:
+            raise exceptions.TemplateDoesNotExist(
+                f"Template with id '{template_id}' doesn't exist."
+            )
+
+        return TemplateValue(value=value)
+
+    def _lock_value(self, template_id: TemplateId) -> tuple[TemplateValue, list[Row]]:
+        value = self._lock(template_id)
+        shards = self._lock_shards(template_id)
+        if shards:
+            value = TemplateValue(value=sum(shard.value for shard in shards))
+
+        return value, shards
+
+    def _subtract_value_of_locked_template(
+        self, template_id: TemplateId, value: TemplateValue
+    ) -> TemplateValue:
+        # Shard which can't cover the subtraction on its own borrows from
+        # the other ones, so all of them are locked and the remaining value
+        # is split evenly again (escrow).
+        current_value, shards = self._lock_value(template_id)
+        final_value = current_value.value - value.value
+        if final_value <= 0:
+            raise domain_exceptions.InvalidTemplateValue(
+                f"Invalid value: '{final_value}', must be above 0."
+            )
+
+        if shards:
+            self._write_shards(
+                template_id=template_id,
+                value=TemplateValue(value=final_value),
+                number_of_shards=len(shards),
+            )
+        self._refresh_value(
+            template_id=template_id,
+            value=TemplateValue(value=final_value),
+            shards_version=sum(shard.version for shard in shards),
+        )
+        return TemplateValue(value=final_value)
+
+    def _lock_shards(self, template_id: TemplateId) -> list[Row]:
+        return list(
+            self._execute(
+                statement=select(TemplateValueShard.value, TemplateValueShard.version)
+                .where(TemplateValueShard.template_id == template_id)
+                .order_by(TemplateValueShard.shard)
+                .with_for_update(),
+                template_id=template_id,
+            )
+        )
+
+    def _write_shards(
+        self, template_id: TemplateId, value: TemplateValue, number_of_shards: int
+    ) -> None:
+        # Versions of the shards are reset, so the caller has to include them
+        # in the version of the template.
+        self._execute(
+            statement=update(TemplateValueShard),
+            template_id=template_id,
+            parameters=[
+                {
+                    "template_id": template_id,
+                    "shard": shard,
+                    "value": shard_value,
+                    "version": 0,
+                }
+                for shard, shard_value in enumerate(
+                    _split_value(value=value.value, number_of_shards=number_of_shards)
+                )
+            ],
+        )
+
+    def _refresh_value(
+        self,
+        template_id: TemplateId,
+        value: TemplateValue,
+        shards_version: int,
+        is_sharded: bool | None = None,
+    ) -> None:
+        # Value kept in "templates" table is used to filter and order templates.
+        # Subtractions from the shards are folded into the version
+        # of the template, so it doesn't go back.
+        values: dict = {
+            "value_data": TemplateDb.value_data.op("||")(
+                func.jsonb_build_object(VALUE_NAME_IN_DATABASE, value.value)
+            ),
+            "version": TemplateDb.version + shards_version + 1,
+        }
+        if is_sharded is not None:
+            values["is_sharded"] = is_sharded
+
+        self._execute(
+            statement=update(TemplateDb)
+            .where(TemplateDb.id == template_id)
+            .values(**values)
+            .execution_options(synchronize_session=False),
+            template_id=template_id,
+        )
+
+    def _execute(
+        self,
+        statement,
+        template_id: TemplateId | None,
+        parameters: dict | list[dict] | None = None,
+    ) -> Result:
+        try:
+            return self.session.execute(statement, parameters)
+        except OperationalError as err:
+            # In "REPEATABLE READ" isolation level, a row changed by a concurrent
+            # transaction can't be updated at all. Transaction picked by
+            # the database to resolve a deadlock can be retried the same way.
+            if getattr(err.orig, "pgcode", None) in (
+                SERIALIZATION_FAILURE_ERROR_CODE,
+                DEADLOCK_DETECTED_ERROR_CODE,
+            ):
+                raise exceptions.TemplateVersionConflict(
+                    f"Template with id '{template_id}' has been changed "
+                    f"by a concurrent transaction."
+                    if template_id is not None
+                    else "Templates have been changed by a concurrent transaction."
+                ) from err
+            raise
+
 
 class SqlAlchemyTemplatesQueryRepository(AbstractTemplatesQueryRepository):
-    def __init__(self, session_factory: Callable = get_session) -> None:
+    def __init__(
+        self,
+        session_factory: Callable = get_read_session,
+        count_cache_ttl_seconds: float = DEFAULT_COUNT_CACHE_TTL_SECONDS,
+        count_cache: TTLCache | TwoTierCache | None = None,
+        searchable_fields: Iterable[str] | None = None,
+    ) -> None:
+        """
+        :param count_cache: Cache of "cached" counts, e.g. shared by processes,
+                            by default counts are cached in each process.
+        :param searchable_fields: Names of fields searched by "query" filter,
+                                  by default all of "SEARCHABLE_FIELDS".
+        """
+
         self.session_factory = session_factory
+        self.searchable_fields = _get_searchable_fields(searchable_fields)
+        self.count_cache = (
+            count_cache
+            if count_cache is not None
+            else TTLCache(ttl_seconds=count_cache_ttl_seconds)
+        )
 
     def get(self, template_id: TemplateId) -> TemplateEntity:
         try:
             with self.session_factory() as session:
                 return _map_template_db_to_template_entity(
-                    session.query(TemplateDb).filter_by(id=template_id).one()
+                    *session.query(TemplateDb, SHARDED_TEMPLATE_VALUE, TEMPLATE_VERSION)
+                    .filter(TemplateDb.id == template_id)
+                    .one()
                 )
         except NoResultFound as err:
             raise exceptions.TemplateDoesNotExist(
                 f"Template with id '{template_id}' doesn't exist."
             ) from err
 
+    def get_many(self, template_ids: list[TemplateId]) -> list[TemplateEntity]:
+        # Ids are sent as a single array parameter, so the statement
+        # is the same for any number of ids, and each of them is looked up
+        # in the primary key index.
+        # More details can be found here:
+        # https://www.postgresql.org/docs/current/functions-comparisons.html#FUNCTIONS-COMPARISONS-ANY-SOME.
+        with self.session_factory() as session:
+            return [
+                _map_template_db_to_template_entity(template, sharded_value, version)
+                for template, sharded_value, version in session.query(
+                    TemplateDb, SHARDED_TEMPLATE_VALUE, TEMPLATE_VERSION
+                ).filter(
+                    TemplateDb.id
+                    == any_(
+                        bindparam(
+                            "template_ids",
+                            value=list(template_ids),
+                            type_=postgresql.ARRAY(Uuid),
+                        )
+                    )
+                )
+            ]
+
+    def stream(
+        self, filters: ports_dtos.TemplatesFilters, ordering: list[Ordering]
+    ) -> Iterator[TemplateEntity]:
+        with self.session_factory() as session:
+            # All rows come from a single snapshot ("REPEATABLE READ"),
+            # so the export is consistent, however long it takes.
+            # Read-only transaction makes sure nothing is changed on the way.
+            # More details can be found here:
+            # https://www.postgresql.org/docs/current/sql-set-transaction.html.
+            session.execute(READ_ONLY_TRANSACTION_QUERY)
+
+            query = _filter(
+                query=session.query(
+                    TemplateDb, SHARDED_TEMPLATE_VALUE, TEMPLATE_VERSION
+                ),
+                filters=filters,
+                searchable_fields=self.searchable_fields,
+            )
+            for order in ordering:
+                query = _order(query=query, order=order)
+
+            # Rows are fetched in batches from a server-side cursor,
+            # so memory usage doesn't depend on the number of templates.
+            # More details can be found here:
+            # https://docs.sqlalchemy.org/en/20/orm/queryguide/api.html#fetching-large-result-sets-with-yield-per.
+            for template, sharded_value, version in query.yield_per(EXPORT_BATCH_SIZE):
+                yield _map_template_db_to_template_entity(
+                    template, sharded_value, version
+                )
+                # Rows already sent aren't needed anymore.
+                session.expunge(template)
+
     def list(
         self,
         filters: ports_dtos.TemplatesFilters,
         ordering: list[Ordering],
-        pagination: Pagination | None,
-    ) -> tuple[list[TemplateEntity], int]:
+        pagination: Pagination | CursorPagination | None,
+        count_strategy: CountStrategyEnum = CountStrategyEnum.EXACT,
+    ) -> tuple[list[TemplateEntity], TotalCount]:
         with self.session_factory() as session:
-            templates, query = _get_templates(
+            query = _filter(
+                query=session.query(
+                    TemplateDb, SHARDED_TEMPLATE_VALUE, TEMPLATE_VERSION
+                ),
+                filters=filters,
+                searchable_fields=self.searchable_fields,
+            )
+
+            # Exact count is computed by a window function in the same query
+            # as the page, so a second round trip isn't needed.
+            # Cursor pagination filters out templates preceding the cursor,
+            # so in that case templates have to be counted separately.
+            if count_strategy == CountStrategyEnum.EXACT and not isinstance(
+                pagination, CursorPagination
+            ):
+                rows, has_more = _get_templates(
+                    query=query.add_columns(func.count().over()),
+                    ordering=ordering,
+                    pagination=pagination,
+                )
+                return [
+                    _map_template_db_to_template_entity(
+                        template, sharded_value, version
+                    )
+                    for template, sharded_value, version, _ in rows
+                ], TotalCount(
+                    kind=CountStrategyEnum.EXACT,
+                    value=rows[0][3] if rows else _count_empty_page(query, pagination),
+                    has_more=has_more,
+                )
+
+            templates, has_more = _get_templates(
+                query=query, ordering=ordering, pagination=pagination
+            )
+            return [
+                _map_template_db_to_template_entity(template, sharded_value, version)
+                for template, sharded_value, version in templates
+            ], self._count(
                 session=session,
+                query=query,
                 filters=filters,
-                ordering=ordering,
-                pagination=pagination,
+                count_strategy=count_strategy,
+                has_more=has_more,
+            )
+
+    def _count(
+        self,
+        session: Session,
+        query: Query,
+        filters: ports_dtos.TemplatesFilters,
+        count_strategy: CountStrategyEnum,
+        has_more: bool,
+    ) -> TotalCount:
+        if count_strategy == CountStrategyEnum.NONE:
+            return TotalCount(kind=count_strategy, value=None, has_more=has_more)
+
+        if count_strategy == CountStrategyEnum.CACHED:
+            key = _normalize_filters(filters)
+            count = self.count_cache.get(key)
+            if count is None:
+                count = query.count()
+                self.count_cache.set(key, count)
+            return TotalCount(kind=count_strategy, value=count, has_more=has_more)
+
+        if count_strategy == CountStrategyEnum.ESTIMATED:
+            estimated_count = _estimate_count(
+                session=session, query=query, filters=filters
             )
-            return templates, query.count()
+            # Estimates are inaccurate for narrow queries,
+            # but these are also cheap to count exactly.
+            if estimated_count >= EXACT_COUNT_THRESHOLD:
+                return TotalCount(
+                    kind=count_strategy, value=estimated_count, has_more=has_more
+                )
+
+        return TotalCount(
+            kind=CountStrategyEnum.EXACT, value=query.count(), has_more=has_more
+        )
 
 
 def _get_templates(
-    session: Session,
-    filters: ports_dtos.TemplatesFilters,
+    query: Query,
     ordering: list[Ordering],
-    pagination: Pagination | None,
-) -> tuple:
-    query = _filter(query=session.query(TemplateDb), filters=filters)
+    pagination: Pagination | CursorPagination | None,
+) -> tuple[list, bool]:
+    if isinstance(pagination, CursorPagination):
+        return _paginate_by_cursor(
+            query=query, ordering=ordering, pagination=pagination
+        )
 
     for order in ordering:
         query = _order(query=query, order=order)
 
-    not_paginated_query = query
+    if pagination is None:
+        return query.all(), False
+
+    return _split_extra_row(
+        rows=_paginate(query=query, pagination=pagination).all(),
+        records_per_page=pagination.records_per_page,
+    )
+
+
+def _count_empty_page(query: Query, pagination: Pagination | None) -> int:
+    # Window function result isn't available, when the page is empty.
+    # First page can be empty only when no templates match the filters.
+    if pagination is None or pagination.offset == 0:
+        return 0
+
+    return query.count()
+
+
+def _estimate_count(
+    session: Session, query: Query, filters: ports_dtos.TemplatesFilters
+) -> int:
+    # Number of rows in a table is kept in statistics,
+    # which are refreshed by "VACUUM" and "ANALYZE".
+    # More details can be found here:
+    # https://wiki.postgresql.org/wiki/Count_estimate.
+    if filters == ports_dtos.TemplatesFilters():
+        estimated_count = session.execute(
+            TABLE_SIZE_ESTIMATE_QUERY, {"table_name": TemplateDb.__tablename__}
+        ).scalar_one()
+        # Table which has never been analyzed has no statistics.
+        if estimated_count >= 0:
+            return int(estimated_count)
+
+    return estimate_number_of_rows(session=session, statement=query.statement)
 
-    if pagination is not None:
-        query = _paginate(query=query, pagination=pagination)
 
+def _normalize_filters(filters: ports_dtos.TemplatesFilters) -> tuple:
+    # Filters which match the same templates have to share the same key.
     return (
-        [_map_template_db_to_template_entity(template) for template in query.all()],
-        not_paginated_query,
+        filters.value,
+        filters.value_from,
+        filters.value_to,
+        json.dumps(filters.data, sort_keys=True),
+        filters.query.lower() if filters.query is not None else None,
+        convert_timestamp_to_utc_timestamp(filters.timestamp_from)
+        if filters.timestamp_from is not None
+        else None,
+        convert_timestamp_to_utc_timestamp(filters.timestamp_to)
+        if filters.timestamp_to is not None
+        else None,
     )
 
 
-def _filter(query: Query, filters: ports_dtos.TemplatesFilters):
+def _split_extra_row(rows: list, records_per_page: int) -> tuple[list, bool]:
+    # One extra row is fetched to find out,
+    # whether there are more rows beyond the requested page.
+    return rows[:records_per_page], len(rows) > records_per_page
+
+
+def _get_searchable_fields(names: Iterable[str] | None) -> list:
+    if names is None:
+        return list(SEARCHABLE_FIELDS.values())
+
+    try:
+        return [SEARCHABLE_FIELDS[name] for name in names]
+    except KeyError as err:
+        raise ValueError(f"Field {err} can't be searched.") from err
+
+
+def _filter(
+    query: Query,
+    filters: ports_dtos.TemplatesFilters,
+    searchable_fields: Iterable | None = None,
+):
     if filters.value is not None:
-        query = query.filter(
-            text("value_data->>'value' = :val").params(val=filters.value)
-        )
+        query = query.filter(TEMPLATE_VALUE == filters.value)
+
+    if filters.value_from is not None:
+        query = query.filter(TEMPLATE_VALUE >= filters.value_from)
+
+    if filters.value_to is not None:
+        query = query.filter(TEMPLATE_VALUE <= filters.value_to)
+
+    if filters.data is not None:
+        query = query.filter(TemplateDb.value_data.contains(filters.data))
 
     if filters.query is not None:
+        pattern = f"%{_escape_like_pattern(filters.query)}%"
+        # Query matches no templates, when no fields are searched.
         query = query.filter(
             or_(
-                cast_if(TemplateDb.id, String).ilike(f"%{filters.query}%"),
-                # Add here other fields that should be searchable.
-                # Example:
-                #    TemplateDb.value_data.ilike(f"%{filters.query}%"),
+                false(),
+                *(
+                    field.ilike(pattern, escape=LIKE_ESCAPE_CHARACTER)
+                    for field in (
+                        searchable_fields
+                        if searchable_fields is not None
+                        else SEARCHABLE_FIELDS.values()
+                    )
+                ),
             )
         )
 
@@ -161,6 +1033,14 @@ def _filter(query: Query, filters: ports_dtos.TemplatesFilters):
     return query
 
 
+def _escape_like_pattern(value: str) -> str:
+    # Searched text is matched literally, also when it contains wildcards.
+    for character in (LIKE_ESCAPE_CHARACTER, "%", "_"):
+        value = value.replace(character, f"{LIKE_ESCAPE_CHARACTER}{character}")
+
+    return value
+
+
 def _filter_timestamp(
     query: Query, timestamp_from: datetime | None, timestamp_to: datetime | None
 ):
@@ -185,7 +1065,7 @@ def _asc_order(query, field: str):
         return query.order_by(TemplateDb.timestamp.asc())
 
     if field == "value":
-        return query.order_by(text(f"value_data->>'{VALUE_NAME_IN_DATABASE}' ASC"))
+        return query.order_by(TEMPLATE_VALUE.asc())
 
 
 def _desc_order(query: Query, field: str):
@@ -193,35 +1073,102 @@ def _desc_order(query: Query, field: str):
         return query.order_by(TemplateDb.timestamp.desc())
 
     if field == "value":
-        return query.order_by(text(f"value_data->>'{VALUE_NAME_IN_DATABASE}' DESC"))
+        return query.order_by(TEMPLATE_VALUE.desc())
 
 
 def _paginate(query: Query, pagination: Pagination):
-    return query.limit(pagination.records_per_page).offset(pagination.offset)
+    return query.limit(pagination.records_per_page + 1).offset(pagination.offset)
+
+
+def _paginate_by_cursor(
+    query: Query, ordering: list[Ordering], pagination: CursorPagination
+) -> tuple[list, bool]:
+    # Keyset pagination seeks directly to the cursor position using
+    # "ix_templates_timestamp_id" index, so it takes the same time for any page,
+    # and it doesn't skip or repeat records when other ones are added or removed.
+    # Results are always ordered by timestamp, ID is a tie-breaker
+    # for records with equal timestamps.
+    # More details can be found here:
+    # https://use-the-index-luke.com/no-offset.
+    descending = (
+        next(
+            (order.order for order in ordering if order.field == "timestamp"),
+            OrderingEnum.DESCENDING,
+        )
+        == OrderingEnum.DESCENDING
+    )
+
+    cursor = pagination.cursor
+    backwards = cursor is not None and cursor.backwards
+    # Records preceding the cursor are fetched in reversed order,
+    # starting from the closest one.
+    if backwards:
+        descending = not descending
+
+    if cursor is not None:
+        position = tuple_(TemplateDb.timestamp, TemplateDb.id)
+        # Timestamp is passed without time zone (as UTC, same as database
+        # connection time zone), so it can be compared with the indexed column
+        # without casting the column.
+        cursor_position = tuple_(
+            literal(
+                convert_timestamp_to_utc_timestamp(cursor.timestamp).replace(
+                    tzinfo=None
+                ),
+                DateTime(),
+            ),
+            literal(cursor.id, Uuid),
+        )
+        query = query.filter(
+            position < cursor_position if descending else position > cursor_position
+        )
+
+    if descending:
+        query = query.order_by(TemplateDb.timestamp.desc(), TemplateDb.id.desc())
+    else:
+        query = query.order_by(TemplateDb.timestamp.asc(), TemplateDb.id.asc())
+
+    templates, has_more = _split_extra_row(
+        rows=query.limit(pagination.records_per_page + 1).all(),
+        records_per_page=pagination.records_per_page,
+    )
+
+    return (templates[::-1] if backwards else templates), has_more
 
 
 def _map_template_entity_to_template_db(
     template_entity: TemplateEntity,
 ) -> TemplateDb:
     return TemplateDb(
-        id=template_entity.id,
-        value_data=_map_template_value_dto_to_dict(template_entity.value),
-        timestamp=convert_timestamp_to_utc_timestamp(template_entity.timestamp),
-        version=template_entity.version,
+        id=template_entity.id, **_map_template_entity_to_columns(template_entity)
     )
 
 
+def _map_template_entity_to_columns(template_entity: TemplateEntity) -> dict:
+    return {
+        "value_data": _map_template_value_dto_to_dict(template_entity.value),
+        "timestamp": convert_timestamp_to_utc_timestamp(template_entity.timestamp),
+        "version": template_entity.version,
+    }
+
+
 def _map_template_db_to_template_entity(
     template_db: TemplateDb,
+    sharded_value: int | None = None,
+    version: int | None = None,
 ) -> TemplateEntity:
     entity = TemplateEntity(
         id=TemplateId(template_db.id.hex),
         timestamp=convert_timestamp_to_local_timestamp(template_db.timestamp),
-        version=template_db.version,
+        version=version if version is not None else template_db.version,
     )
     # The Assumption is that data in a database are always correct and
     # can be safely loaded to an entity.
-    entity._value = _map_template_data_dict_to_dto(template_db.value_data)
+    entity._value = (
+        TemplateValue(value=sharded_value)
+        if sharded_value is not None
+        else _map_template_data_dict_to_dto(template_db.value_data)
+    )
     return entity
 
 
@@ -235,3 +1182,96 @@ def _map_template_value_dto_to_dict(template_value: TemplateValue) -> dict:
 
 def _map_template_data_dict_to_dto(template_dict: dict) -> TemplateValue:
     return TemplateValue(value=template_dict[VALUE_NAME_IN_DATABASE])
+
+
+def _split_value(value: int, number_of_shards: int) -> list[int]:
+    # Remainder of the division is spread over the first shards.
+    quotient, remainder = divmod(value, number_of_shards)
+    return [quotient + 1] * remainder + [quotient] * (number_of_shards - remainder)
+
+
+def _build_subtract_from_template_statement(
+    template_id: TemplateId, value: TemplateValue
+):
+    # The condition of the subtraction has to be kept in sync
+    # with "Template.subtract_value". Value of the template is returned only
+    # when it has been subtracted from, "is_sharded" is selected separately,
+    # so it's returned either way.
+    subtracted = (
+        update(TemplateDb)
+        .where(TemplateDb.id == template_id)
+        .where(TemplateDb.is_sharded.is_(False))
+        .where(TEMPLATE_VALUE - value.value > 0)
+        .values(
+            value_data=TemplateDb.value_data.op("||")(
+                func.jsonb_build_object(
+                    VALUE_NAME_IN_DATABASE, TEMPLATE_VALUE - value.value
+                )
+            ),
+            version=TemplateDb.version + 1,
+        )
+        .returning(TEMPLATE_VALUE.label("value"))
+        .cte("subtracted")
+    )
+    return select(
+        select(subtracted.c.value).scalar_subquery(),
+        select(TemplateDb.is_sharded)
+        .where(TemplateDb.id == template_id)
+        .scalar_subquery(),
+    )
+
+
+class _CopyStream:
+    """
+    File-like object, which reads data from chunks produced on demand.
+    """
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._buffer = bytearray()
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+def _encode_templates_in_copy_binary_format(
+    templates: Iterable[TemplateEntity],
+) -> Iterator[bytes]:
+    yield COPY_BINARY_HEADER
+
+    for template in templates:
+        columns = _map_template_entity_to_columns(template)
+        value_data = COPY_BINARY_JSONB_VERSION + json.dumps(
+            columns["value_data"]
+        ).encode("utf-8")
+        yield b"".join(
+            (
+                # Number of columns.
+                struct.pack("!h", 4),
+                # Each column is preceded by its length in bytes.
+                struct.pack("!i", 16),
+                template.id.bytes,
+                struct.pack("!i", len(value_data)),
+                value_data,
+                # Timestamp is a number of microseconds since 2000-01-01.
+                struct.pack(
+                    "!iq",
+                    8,
+                    (columns["timestamp"] - COPY_BINARY_EPOCH)
+                    // timedelta(microseconds=1),
+                ),
+                struct.pack("!ii", 4, columns["version"]),
+            )
+        )
+
+    yield COPY_BINARY_TRAILER
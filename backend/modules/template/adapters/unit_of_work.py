@@ -1,42 +1,135 @@
-from typing import Callable
+import threading
+from typing import Callable, Iterable
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, SessionTransaction
 
-from modules.common.database import get_session
+from modules.common.database import get_session, notify, remember_commit_position
 
 from ..adapters.repositories.sqlalchemy import SqlAlchemyTemplatesDomainRepository
+from ..domain.ports import AbstractTemplatesDomainRepository
 from ..domain.ports.unit_of_work import AbstractTemplatesUnitOfWork
 
+TEMPLATES_CHANGED_CHANNEL = "templates_changed"
+
 
 class SqlAlchemyTemplatesUnitOfWork(AbstractTemplatesUnitOfWork):
-    def __init__(self, session_factory: Callable = get_session) -> None:
+    def __init__(
+        self,
+        session_factory: Callable = get_session,
+        notify_changes: bool = False,
+        searchable_fields: Iterable[str] | None = None,
+    ) -> None:
+        """
+        :param notify_changes: Whether ids of changed templates are sent
+                               to "TEMPLATES_CHANGED_CHANNEL" on commit,
+                               so processes can evict their cached copies.
+        :param searchable_fields: Names of fields searched by "query" filter,
+                                  see "SqlAlchemyTemplatesDomainRepository".
+        """
+
         self.session_factory: Callable = session_factory
-        self._session: Session | None = None
+        self.notify_changes = notify_changes
+        self.searchable_fields = searchable_fields
+        # A single instance is shared by all handlers, so the state of
+        # an ongoing transaction has to be kept separately for each thread.
+        self._local = threading.local()
 
     def __enter__(self):
-        self._session = self.session_factory()
-        self.templates = SqlAlchemyTemplatesDomainRepository(self._session)
+        savepoints = getattr(self._local, "savepoints", None)
+        if savepoints is not None:
+            # Unit of work entered again within an ongoing transaction
+            # (e.g. by each command of a batch), saves its changes with a savepoint,
+            # so they can be rolled back without rolling back the whole transaction.
+            # Changes made so far are saved first, so they are kept
+            # when the savepoint is rolled back.
+            # More details can be found here:
+            # https://docs.sqlalchemy.org/en/20/orm/session_transaction.html#using-savepoint.
+            self.templates.save_changes()
+            savepoints.append(self.session.begin_nested())
+            return self
+
+        self._local.session = self.session_factory()
+        self._local.savepoints = []
+        self.templates = SqlAlchemyTemplatesDomainRepository(
+            self._local.session, searchable_fields=self.searchable_fields
+        )
         return super().__enter__()
 
     def __exit__(self, exc_type, exc_value, traceback):
-        if exc_type is None:
-            self.commit()
-        else:
-            self.rollback()
+        if self._local.savepoints:
+            self._exit_savepoint(
+                savepoint=self._local.savepoints.pop(), succeeded=exc_type is None
+            )
+            return None
 
-        self._session.close()
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            self._local.savepoints = None
+            self.session.close()
 
         return super().__exit__(exc_type, exc_value, traceback)
 
+    def _exit_savepoint(self, savepoint: SessionTransaction, succeeded: bool) -> None:
+        if succeeded:
+            try:
+                self.templates.save_changes()
+                savepoint.commit()
+            except Exception:
+                if savepoint.is_active:
+                    self._rollback_savepoint(savepoint)
+                raise
+        else:
+            self._rollback_savepoint(savepoint)
+
+    def _rollback_savepoint(self, savepoint: SessionTransaction) -> None:
+        savepoint.rollback()
+        # Templates tracked by the repository could be changed
+        # by rolled back statements, so they have to be retrieved again.
+        # Changes made before the savepoint are still going to be committed.
+        changed_template_ids = self.templates.changed_template_ids
+        self.templates = SqlAlchemyTemplatesDomainRepository(
+            self.session, searchable_fields=self.searchable_fields
+        )
+        self.templates.changed_template_ids.update(changed_template_ids)
+
+    @property
+    def templates(self) -> AbstractTemplatesDomainRepository:
+        try:
+            return self._local.templates
+        except AttributeError as err:
+            raise RuntimeError("Unit of work not started.") from err
+
+    @templates.setter
+    def templates(self, templates: AbstractTemplatesDomainRepository) -> None:
+        self._local.templates = templates
+
     @property
     def session(self) -> Session:
-        if self._session is None:
+        session: Session | None = getattr(self._local, "session", None)
+        if session is None:
             raise RuntimeError("Database session not initialized.")
 
-        return self._session
+        return session
 
     def commit(self):
+        # Changes of retrieved templates are saved right before the commit,
+        # only for templates which have actually changed.
+        self.templates.save_changes()
+        if self.notify_changes:
+            notify(
+                session=self.session,
+                channel=TEMPLATES_CHANGED_CHANNEL,
+                values=(
+                    template_id.hex
+                    for template_id in self.templates.changed_template_ids
+                ),
+            )
         self.session.commit()
+        remember_commit_position(self.session)
 
     def rollback(self):
         self.session.rollback()
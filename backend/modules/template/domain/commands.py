@@ -2,19 +2,24 @@ from dataclasses import dataclass
 
 from modules.common.domain.commands import DomainCommand
 
-from .value_objects import TemplateId, TemplateValue
+from .ports.dtos import TemplatesFilters
+from .value_objects import TemplateId, TemplateRevision, TemplateValue
 
 
 @dataclass(frozen=True)
 class SetTemplateValue(DomainCommand):
     template_id: TemplateId
     value: TemplateValue
+    # Command is rejected, unless the template is in one of given revisions.
+    expected_revisions: frozenset[TemplateRevision] | None = None
 
 
 @dataclass(frozen=True)
 class SubtractTemplateValue(DomainCommand):
     template_id: TemplateId
     value: TemplateValue
+    # Command is rejected, unless the template is in one of given revisions.
+    expected_revisions: frozenset[TemplateRevision] | None = None
 
 
 @dataclass(frozen=True)
@@ -25,3 +30,31 @@ class CreateTemplate(DomainCommand):
 @dataclass(frozen=True)
 class DeleteTemplate(DomainCommand):
     template_id: TemplateId
+
+
+@dataclass(frozen=True)
+class ShardTemplateValue(DomainCommand):
+    template_id: TemplateId
+    number_of_shards: int
+
+
+@dataclass(frozen=True)
+class UnshardTemplateValue(DomainCommand):
+    template_id: TemplateId
+
+
+@dataclass(frozen=True)
+class BulkDeleteTemplates(DomainCommand):
+    filters: TemplatesFilters
+
+
+@dataclass(frozen=True)
+class BulkSetTemplateValue(DomainCommand):
+    filters: TemplatesFilters
+    value: TemplateValue
+
+
+@dataclass(frozen=True)
+class BulkSubtractTemplateValue(DomainCommand):
+    filters: TemplatesFilters
+    value: TemplateValue
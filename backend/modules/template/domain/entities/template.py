@@ -4,7 +4,12 @@ from datetime import datetime
 
 from modules.common.domain.events import DomainEvent
 
-from ...domain.value_objects import TemplateId, TemplateValue
+from ...domain.value_objects import (
+    INITIAL_TEMPLATE_VALUE,
+    TemplateId,
+    TemplateRevision,
+    TemplateValue,
+)
 from ..exceptions import InvalidTemplateValue
 
 
@@ -13,9 +18,25 @@ class Template:
     Allocate here business logic and high-level rules that are related to this entity.
     """
 
-    def __init__(self, id: TemplateId, timestamp: datetime, version: int) -> None:
+    def __init__(
+        self,
+        id: TemplateId,
+        timestamp: datetime,
+        version: int,
+        value: TemplateValue | None = None,
+    ) -> None:
+        """
+        :param value: Initial value, it has to be valid when given.
+        :raises InvalidTemplateValue: Initial value is invalid.
+        """
+
+        if value is not None:
+            self.validate_value(value)
+
         self.id = id
-        self._value: TemplateValue = TemplateValue(value=0)
+        self._value: TemplateValue = (
+            value if value is not None else INITIAL_TEMPLATE_VALUE
+        )
         self.timestamp = timestamp
         self.version = version
         self.messages: list[DomainEvent] = []
@@ -24,16 +45,24 @@ class Template:
     def value(self) -> TemplateValue:
         return self._value
 
+    @property
+    def revision(self) -> TemplateRevision:
+        return TemplateRevision(version=self.version)
+
     @staticmethod
     def generate_id() -> TemplateId:
         return TemplateId.new()
 
-    def set_value(self, value: TemplateValue) -> None:
+    @staticmethod
+    def validate_value(value: TemplateValue) -> None:
         if value.value <= 0:
             raise InvalidTemplateValue(
                 f"Invalid value: '{value.value}', must be above 0."
             )
 
+    def set_value(self, value: TemplateValue) -> None:
+        self.validate_value(value)
+
         self._value = value
         self.version += 1
 
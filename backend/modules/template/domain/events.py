@@ -28,3 +28,40 @@ class TemplateValueSubtracted(DomainEvent):
 @dataclass(frozen=True)
 class TemplateDeleted(DomainEvent):
     template_id: TemplateId
+
+
+@dataclass(frozen=True)
+class TemplateValueSharded(DomainEvent):
+    template_id: TemplateId
+    number_of_shards: int
+
+
+@dataclass(frozen=True)
+class TemplateValueUnsharded(DomainEvent):
+    template_id: TemplateId
+
+
+# Bulk commands change many templates at once, in chunks,
+# so a single event is emitted for all templates of each chunk.
+
+
+@dataclass(frozen=True)
+class TemplatesValueSet(DomainEvent):
+    template_ids: tuple[TemplateId, ...]
+    value: TemplateValue
+
+
+@dataclass(frozen=True)
+class TemplatesValueSubtracted(DomainEvent):
+    template_ids: tuple[TemplateId, ...]
+    subtracted_value: TemplateValue
+
+
+@dataclass(frozen=True)
+class TemplatesDeleted(DomainEvent):
+    template_ids: tuple[TemplateId, ...]
+
+
+@dataclass(frozen=True)
+class TemplatesImported(DomainEvent):
+    template_ids: tuple[TemplateId, ...]
@@ -1,2 +1,10 @@
 class InvalidTemplateValue(Exception):
     pass
+
+
+class TemplateRevisionMismatch(Exception):
+    """
+    Template has been changed since a client has seen it.
+    """
+
+    pass
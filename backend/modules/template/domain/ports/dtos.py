@@ -5,6 +5,10 @@ from datetime import datetime
 @dataclass(frozen=True)
 class TemplatesFilters:
     value: int | None = None
+    value_from: int | None = None
+    value_to: int | None = None
+    # Templates containing given data, e.g. {"value": 5}.
+    data: dict | None = None
     query: str | None = None
     timestamp_from: datetime | None = None
     timestamp_to: datetime | None = None
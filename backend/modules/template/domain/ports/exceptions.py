@@ -1,2 +1,11 @@
 class TemplateDoesNotExist(Exception):
     pass
+
+
+class TemplateVersionConflict(Exception):
+    """
+    Template has been changed by another transaction,
+    since it was retrieved.
+    """
+
+    pass
@@ -1,10 +1,32 @@
 from abc import ABC, abstractmethod
+from typing import Iterable
 
 from ..entities import Template
-from ..value_objects import TemplateId
+from ..value_objects import TemplateId, TemplateValue
+from .dtos import TemplatesFilters
 
 
 class AbstractTemplatesDomainRepository(ABC):
+    def __init__(self) -> None:
+        # Existing templates changed in this unit of work,
+        # e.g. to invalidate their cached copies.
+        self.changed_template_ids: set[TemplateId] = set()
+
+    def save_changes(self) -> None:
+        """
+        Saves changes of templates retrieved or updated in this unit of work,
+        which haven't been saved yet. It's called by unit of work before
+        the commit. Repositories, which save changes right away,
+        have nothing to save.
+
+        :raises TemplateDoesNotExist: Updated template doesn't exist.
+        :raises TemplateVersionConflict: Template has been changed
+                                         since it was retrieved.
+        :return:
+        """
+
+        pass
+
     @abstractmethod
     def create(self, template: Template):
         """
@@ -15,16 +37,77 @@ class AbstractTemplatesDomainRepository(ABC):
 
         pass
 
+    @abstractmethod
+    def import_many(self, templates: Iterable[Template]) -> list[TemplateId]:
+        """
+        Saves many new templates at once. Templates with ids, which already
+        exist, are skipped, so importing the same templates again is harmless.
+
+        :param templates: Templates to save, retrieved lazily.
+        :return: Ids of saved templates.
+        """
+
+        pass
+
     @abstractmethod
     def update(self, template: Template):
         """
+        Changes of template can be saved when unit of work is committed,
+        in which case errors are raised by the commit.
+
         :param template: Template to update.
         :raises TemplateDoesNotExist: Template with given id doesn't exist.
+        :raises TemplateVersionConflict: Template has been changed
+                                         since it was retrieved.
         :return:
         """
 
         pass
 
+    @abstractmethod
+    def subtract_value(
+        self, template_id: TemplateId, value: TemplateValue
+    ) -> TemplateValue:
+        """
+        Subtracts value of template atomically, without retrieving it first.
+
+        :param template_id: ID of template to subtract value of.
+        :param value: Value to subtract.
+        :raises TemplateDoesNotExist: Template with given id doesn't exist.
+        :raises InvalidTemplateValue: Value after subtraction would be invalid.
+        :return: Value of template after subtraction.
+        """
+
+        pass
+
+    @abstractmethod
+    def shard_value(
+        self, template_id: TemplateId, number_of_shards: int
+    ) -> TemplateValue:
+        """
+        Splits value of template into given number of shards,
+        or changes number of shards of an already sharded template.
+
+        :param template_id: ID of template to shard.
+        :param number_of_shards: Number of shards to split value into.
+        :raises TemplateDoesNotExist: Template with given id doesn't exist.
+        :return: Value of template.
+        """
+
+        pass
+
+    @abstractmethod
+    def unshard_value(self, template_id: TemplateId) -> TemplateValue:
+        """
+        Merges shards of template back into a single value.
+
+        :param template_id: ID of template to unshard.
+        :raises TemplateDoesNotExist: Template with given id doesn't exist.
+        :return: Value of template.
+        """
+
+        pass
+
     @abstractmethod
     def delete(self, template_id: TemplateId):
         """
@@ -36,6 +119,74 @@ class AbstractTemplatesDomainRepository(ABC):
 
         pass
 
+    @abstractmethod
+    def find_ids_for_update(
+        self,
+        filters: TemplatesFilters,
+        after: TemplateId | None,
+        limit: int,
+    ) -> list[TemplateId]:
+        """
+        Found templates are locked until the end of the transaction,
+        in order of their ids, so concurrent bulk operations can't deadlock.
+
+        :param filters: Filters, which templates have to match.
+        :param after: ID after which templates are searched, in order of ids.
+        :param limit: Maximal number of ids to find.
+        :return: IDs of matching templates, in ascending order.
+        """
+
+        pass
+
+    @abstractmethod
+    def delete_many(self, template_ids: list[TemplateId]) -> list[TemplateId]:
+        """
+        :param template_ids: IDs of templates to delete.
+        :return: IDs of deleted templates.
+        """
+
+        pass
+
+    @abstractmethod
+    def set_value_many(
+        self, template_ids: list[TemplateId], value: TemplateValue
+    ) -> list[TemplateId]:
+        """
+        :param template_ids: IDs of templates to set value of.
+        :param value: Value to set, it has to be valid.
+        :return: IDs of updated templates.
+        """
+
+        pass
+
+    @abstractmethod
+    def subtract_value_many(
+        self, template_ids: list[TemplateId], value: TemplateValue
+    ) -> list[TemplateId]:
+        """
+        Templates, which value after subtraction would be invalid, are skipped.
+
+        :param template_ids: IDs of templates to subtract value of.
+        :param value: Value to subtract.
+        :return: IDs of updated templates.
+        """
+
+        pass
+
+    @abstractmethod
+    def get_for_update(self, template_id: TemplateId) -> Template:
+        """
+        Retrieves template and locks it until the end of the transaction,
+        so it can't be changed concurrently, e.g. after its revision is checked.
+
+        :param template_id: ID of template to retrieve.
+        :raises TemplateDoesNotExist: Template with given id doesn't exist.
+
+        :return: Current state of template with given id.
+        """
+
+        pass
+
     @abstractmethod
     def get(self, template_id: TemplateId) -> Template:
         """
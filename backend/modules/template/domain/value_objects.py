@@ -6,9 +6,23 @@ INITIAL_TEMPLATE_VERSION = 1
 
 
 class TemplateId(common_ids.Uuid):
-    pass
+    # Templates are created at high rate, so time-ordered identifiers
+    # keep inserts into the primary key index local.
+    generator = staticmethod(common_ids.uuid7)
 
 
 @dataclass(frozen=True)
 class TemplateValue:
     value: int
+
+
+INITIAL_TEMPLATE_VALUE = TemplateValue(value=0)
+
+
+@dataclass(frozen=True)
+class TemplateRevision:
+    """
+    State of a template, as seen by a client.
+    """
+
+    version: int
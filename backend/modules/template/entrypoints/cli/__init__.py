@@ -0,0 +1,9 @@
+from flask.cli import AppGroup
+
+templates_cli = AppGroup("templates", help="Manage templates.")
+
+# Ensure that the commands file was imported
+# after creating group to properly register commands.
+# More details can be found here:
+# https://flask.palletsprojects.com/en/3.0.x/cli/#custom-commands.
+from . import commands  # noqa: E402,F401
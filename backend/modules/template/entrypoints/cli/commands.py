@@ -0,0 +1,196 @@
+import logging
+import os
+import time
+from pathlib import Path
+from typing import TextIO
+
+import click
+import inject
+
+from modules.common.database import get_engine
+from modules.common.database.dump import DEFAULT_COMPRESSION, dump_tables
+from modules.common.message_bus import MessageBus
+
+from ... import services
+from ...adapters.repositories.sqlalchemy.orm import Template as TemplateDb
+from ...adapters.repositories.sqlalchemy.orm import TemplateValueShard
+from ...domain import commands as domain_commands
+from ...domain import exceptions as domain_exceptions
+from ...domain import value_objects
+from ...domain.ports import exceptions as ports_exceptions
+from .. import imports
+from . import templates_cli
+
+logger = logging.getLogger(__name__)
+
+# Columns, by which ranges of templates read in parallel can be split.
+DUMP_SPLIT_COLUMNS = ("id", "timestamp")
+DUMP_COMPRESSIONS = ("zstd", "snappy", "gzip", "none")
+DUMP_PARTITIONS_PER_WORKER = 4
+
+
+@templates_cli.command("shard-value")
+@click.argument("template_id")
+@click.argument("number_of_shards", type=click.IntRange(min=1))
+@inject.params(message_bus="message_bus", unit_of_work="templates_unit_of_work")
+def shard_template_value_command(
+    template_id: str, number_of_shards: int, message_bus: MessageBus, unit_of_work
+):
+    """
+    Splits value of a heavily updated template into NUMBER_OF_SHARDS rows,
+    so each subtraction changes only one of them.
+    """
+
+    try:
+        value = services.shard_template_value(
+            templates_unit_of_work=unit_of_work,
+            message_bus=message_bus,
+            command=domain_commands.ShardTemplateValue(
+                template_id=_parse_template_id(template_id),
+                number_of_shards=number_of_shards,
+            ),
+        )
+    except ports_exceptions.TemplateDoesNotExist as err:
+        raise click.ClickException(f"Template '{template_id}' does not exist.") from err
+
+    logger.info(
+        "Value '%s' of template '%s' split into %d shards.",
+        value.value,
+        template_id,
+        number_of_shards,
+    )
+
+
+@templates_cli.command("unshard-value")
+@click.argument("template_id")
+@inject.params(message_bus="message_bus", unit_of_work="templates_unit_of_work")
+def unshard_template_value_command(
+    template_id: str, message_bus: MessageBus, unit_of_work
+):
+    """
+    Merges shards of template value back into a single row.
+    """
+
+    try:
+        value = services.unshard_template_value(
+            templates_unit_of_work=unit_of_work,
+            message_bus=message_bus,
+            command=domain_commands.UnshardTemplateValue(
+                template_id=_parse_template_id(template_id)
+            ),
+        )
+    except ports_exceptions.TemplateDoesNotExist as err:
+        raise click.ClickException(f"Template '{template_id}' does not exist.") from err
+
+    logger.info("Value '%s' of template '%s' unsharded.", value.value, template_id)
+
+
+@templates_cli.command("import")
+@click.argument("file", type=click.File("r", encoding="utf-8"))
+@click.option(
+    "--format",
+    "import_format",
+    type=click.Choice(imports.IMPORT_FORMATS),
+    default=imports.NDJSON_FORMAT,
+    show_default=True,
+)
+@inject.params(message_bus="message_bus", unit_of_work="templates_unit_of_work")
+def import_templates_command(
+    file: TextIO, import_format: str, message_bus: MessageBus, unit_of_work
+):
+    """
+    Imports templates from FILE ("-" for the standard input),
+    in the same format as they are exported.
+    Templates with ids, which already exist, are skipped,
+    so a failed import can be simply repeated.
+    """
+
+    try:
+        result = services.import_templates(
+            templates_unit_of_work=unit_of_work,
+            message_bus=message_bus,
+            templates=imports.parse_imported_templates(
+                lines=file, import_format=import_format
+            ),
+        )
+    except (ValueError, domain_exceptions.InvalidTemplateValue) as err:
+        raise click.ClickException(str(err)) from err
+
+    click.echo(
+        f"{result.imported} of {result.processed} templates imported "
+        f"in {result.elapsed_seconds:.1f} s ({result.rows_per_second:.0f} rows/s)."
+    )
+
+
+@templates_cli.command("dump")
+@click.argument("directory", type=click.Path(file_okay=False, path_type=Path))
+@click.option(
+    "--split-by",
+    type=click.Choice(DUMP_SPLIT_COLUMNS),
+    default="id",
+    show_default=True,
+    help="Column splitting templates into ranges read in parallel.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=os.cpu_count() or 1,
+    show_default="number of CPUs",
+    help="Number of processes reading ranges in parallel.",
+)
+@click.option(
+    "--partitions",
+    type=click.IntRange(min=1),
+    default=None,
+    show_default=f"{DUMP_PARTITIONS_PER_WORKER} per worker",
+    help="Number of ranges (files) per table.",
+)
+@click.option(
+    "--compression",
+    type=click.Choice(DUMP_COMPRESSIONS),
+    default=DEFAULT_COMPRESSION,
+    show_default=True,
+)
+def dump_templates_command(
+    directory: Path,
+    split_by: str,
+    workers: int,
+    partitions: int | None,
+    compression: str,
+):
+    """
+    Dumps all templates into Parquet files in DIRECTORY, for analytics.
+    Dump is consistent to a single point in time, even though
+    ranges of templates are read in parallel.
+    Shards of template values are dumped as well, since value of
+    a sharded template is a sum of its shards.
+    """
+
+    start = time.perf_counter()
+    dumped_partitions = dump_tables(
+        engine=get_engine(),
+        tables={
+            TemplateDb.__tablename__: split_by,
+            TemplateValueShard.__tablename__: "template_id",
+        },
+        directory=directory,
+        number_of_partitions=partitions or workers * DUMP_PARTITIONS_PER_WORKER,
+        number_of_workers=workers,
+        compression=compression,
+    )
+    elapsed_seconds = time.perf_counter() - start
+
+    rows = sum(partition.rows for partition in dumped_partitions)
+    click.echo(
+        f"{rows} rows dumped into {len(dumped_partitions)} files "
+        f"in {elapsed_seconds:.1f} s ({rows / elapsed_seconds:.0f} rows/s)."
+    )
+
+
+def _parse_template_id(template_id: str) -> value_objects.TemplateId:
+    try:
+        return value_objects.TemplateId(template_id)
+    except ValueError as err:
+        raise click.BadParameter(
+            f"Invalid template ID format: '{template_id}'.", param_hint="TEMPLATE_ID"
+        ) from err
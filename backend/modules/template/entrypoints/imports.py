@@ -0,0 +1,78 @@
+import csv
+import json
+from typing import Iterable, Iterator
+
+from modules.common.time import parse_timestamp
+
+from ..domain import value_objects
+from ..services.commands.dtos import InputImportedTemplate
+
+NDJSON_FORMAT = "ndjson"
+CSV_FORMAT = "csv"
+IMPORT_FORMATS = (NDJSON_FORMAT, CSV_FORMAT)
+
+
+def parse_imported_templates(
+    lines: Iterable[str], import_format: str
+) -> Iterator[InputImportedTemplate]:
+    """
+    Parses templates in the same formats as they are exported,
+    a JSON object per line or CSV with a header, one line at a time.
+
+    :param lines: Lines of imported data.
+    :param import_format: One of `IMPORT_FORMATS`.
+    :raises ValueError: Line can't be parsed.
+    :return: Parsed templates.
+    """
+
+    if import_format == CSV_FORMAT:
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield _parse_imported_template(row, line_number=reader.line_num)
+        return
+
+    if import_format != NDJSON_FORMAT:
+        raise ValueError(f"Unsupported format: '{import_format}'.")
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            data = json.loads(line)
+        except ValueError as err:
+            raise ValueError(f"Line {line_number}: not a valid JSON.") from err
+        if not isinstance(data, dict):
+            raise ValueError(f"Line {line_number}: not a JSON object.")
+
+        yield _parse_imported_template(data, line_number=line_number)
+
+
+def _parse_imported_template(data: dict, line_number: int) -> InputImportedTemplate:
+    template_id = data.get("id")
+    value = data.get("value")
+    timestamp = data.get("timestamp")
+
+    try:
+        return InputImportedTemplate(
+            id=value_objects.TemplateId(str(template_id)) if template_id else None,
+            value=(
+                value_objects.TemplateValue(_parse_integer(value))
+                if value not in (None, "")
+                else None
+            ),
+            timestamp=parse_timestamp(str(timestamp)) if timestamp else None,
+        )
+    except ValueError as err:
+        raise ValueError(f"Line {line_number}: {err}") from err
+
+
+def _parse_integer(value) -> int:
+    # Booleans and floats would be silently converted to integers.
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"Invalid value: '{value}'.")
+
+    try:
+        return int(value)
+    except ValueError as err:
+        raise ValueError(f"Invalid value: '{value}'.") from err
@@ -1,28 +1,55 @@
+import csv
+import io
 import logging
 from http import HTTPStatus
+from typing import Iterator
 
 import inject
-from flask import jsonify, make_response, request
+from flask import (
+    Response,
+    current_app,
+    jsonify,
+    make_response,
+    request,
+    stream_with_context,
+)
 from werkzeug.datastructures import MultiDict
 
 from modules.common import consts, docstrings
 from modules.common import dtos as common_dtos
 from modules.common import pagination as pagination_utils
+from modules.common.batching import MicroBatcher
+from modules.common.cache import AbstractVersionedCache, GenerationalCache
+from modules.common.database import get_session, remember_commit_position
+from modules.common.entrypoints.web import conditional
 from modules.common.entrypoints.web import forms as common_forms
-from modules.common.message_bus import MessageBus
+from modules.common.message_bus import CommandResult, CommandStatusEnum, MessageBus
 
 from ... import services
 from ...adapters.repositories.sqlalchemy import SqlAlchemyTemplatesQueryRepository
 from ...domain import commands as domain_commands
 from ...domain import exceptions as domain_exceptions
 from ...domain import value_objects
-from ...domain.ports import dtos as ports_dtos
 from ...domain.ports import exceptions as ports_exceptions
+from ...services.queries.dtos import (
+    DetailedOutputTemplate,
+    OutputTemplate,
+    OutputTemplatesCursorPage,
+)
+from .. import imports
 from . import api_blueprint
 from . import forms as template_forms
 
 logger = logging.getLogger(__name__)
 
+EXPORT_CSV_FORMAT = "csv"
+EXPORT_NDJSON_FORMAT = "ndjson"
+EXPORT_MIME_TYPES = {
+    EXPORT_CSV_FORMAT: "text/csv",
+    EXPORT_NDJSON_FORMAT: "application/x-ndjson",
+}
+EXPORT_CSV_COLUMNS = ("id", "value", "timestamp")
+
 
 @docstrings.inject_parameter_info_doc_strings(consts.SWAGGER_FILES)
 @api_blueprint.route("/<template_id>", methods=["GET"])
@@ -54,13 +81,28 @@ def get_template_endpoint(
             HTTPStatus.NOT_FOUND,
         )
 
-    return make_response(jsonify(template.serialize()), HTTPStatus.OK)
+    # Template is usually served from the cache, so a client polling for changes
+    # costs a lookup, without serializing and sending the template.
+    etag = _get_template_etag(template)
+    if conditional.is_not_modified(etag):
+        logger.info("Template '%s' not modified.", template_id)
+        return conditional.make_not_modified_response(etag)
+
+    response = make_response(jsonify(template.serialize()), HTTPStatus.OK)
+    response.set_etag(etag)
+    return response
 
 
 @docstrings.inject_parameter_info_doc_strings(consts.SWAGGER_FILES)
 @api_blueprint.route("/", methods=["GET"])
-@inject.params(query_repository="templates_query_repository")
-def list_templates_endpoint(query_repository: SqlAlchemyTemplatesQueryRepository):
+@inject.params(
+    query_repository="templates_query_repository",
+    templates_list_cache="templates_list_cache",
+)
+def list_templates_endpoint(
+    query_repository: SqlAlchemyTemplatesQueryRepository,
+    templates_list_cache: GenerationalCache | None,
+):
     """
     file: {0}/template_endpoints/list_templates.yml
     """
@@ -70,14 +112,38 @@ def list_templates_endpoint(query_repository: SqlAlchemyTemplatesQueryRepository
     query_params = request.args
     logger.debug("Query params are: '%s'.", query_params)
 
+    if consts.IDS_QUERY_PARAMETER_NAME in query_params:
+        ids = query_params[consts.IDS_QUERY_PARAMETER_NAME]
+        return _get_templates_by_ids(
+            query_repository=query_repository,
+            template_ids=ids.split(",") if ids else [],
+        )
+
     try:
-        pagination = pagination_utils.Pagination(
-            offset=int(
-                query_params.get(consts.PAGINATION_OFFSET_QUERY_PARAMETER_NAME, 0)
-            ),
-            records_per_page=int(
-                query_params.get(consts.PAGINATION_LIMIT_QUERY_PARAMETER_NAME, 10)
-            ),
+        pagination: pagination_utils.Pagination | pagination_utils.CursorPagination
+        if consts.PAGINATION_CURSOR_QUERY_PARAMETER_NAME in query_params:
+            # Cursor is empty for the first page.
+            cursor = query_params[consts.PAGINATION_CURSOR_QUERY_PARAMETER_NAME]
+            pagination = pagination_utils.CursorPagination(
+                cursor=pagination_utils.decode_cursor(cursor) if cursor else None,
+                records_per_page=int(
+                    query_params.get(consts.PAGINATION_LIMIT_QUERY_PARAMETER_NAME, 10)
+                ),
+            )
+        else:
+            pagination = pagination_utils.Pagination(
+                offset=int(
+                    query_params.get(consts.PAGINATION_OFFSET_QUERY_PARAMETER_NAME, 0)
+                ),
+                records_per_page=int(
+                    query_params.get(consts.PAGINATION_LIMIT_QUERY_PARAMETER_NAME, 10)
+                ),
+            )
+        count_strategy = pagination_utils.CountStrategyEnum(
+            query_params.get(
+                consts.PAGINATION_COUNT_STRATEGY_QUERY_PARAMETER_NAME,
+                current_app.config["LIST_COUNT_STRATEGY"],
+            )
         )
     except ValueError as err:
         logger.warning("Invalid pagination parameters: '%s'.", err)
@@ -96,37 +162,88 @@ def list_templates_endpoint(query_repository: SqlAlchemyTemplatesQueryRepository
             HTTPStatus.BAD_REQUEST,
         )
 
-    filters = ports_dtos.TemplatesFilters(
-        query=form.query.data,
-        timestamp_from=form.timestamp_from.data,
-        timestamp_to=form.timestamp_to.data,
-    )
+    filters = form.create_filters()
 
+    # Cursor pages can't be ordered by other fields, so instead of being
+    # skipped, such fields are rejected.
     ordering: list[common_dtos.Ordering] | None = (
         common_forms.OrderingForm(
             data=request.args,
             meta={"csrf": False},
-        ).create_ordering()
+        ).create_ordering(
+            skip_unsupported=not isinstance(
+                pagination, pagination_utils.CursorPagination
+            )
+        )
         if consts.ORDERING_QUERY_PARAMETER_NAME in query_params
         else None
     )
 
+    if isinstance(pagination, pagination_utils.CursorPagination):
+        try:
+            page = services.list_templates_by_cursor(
+                templates_query_repository=query_repository,
+                filters=filters,
+                ordering=ordering,
+                pagination=pagination,
+                count_strategy=count_strategy,
+                templates_list_cache=templates_list_cache,
+                max_age_seconds=conditional.get_max_age_seconds(),
+            )
+        except ValueError as err:
+            logger.warning("Invalid ordering: '%s'.", err)
+            return make_response(
+                jsonify({consts.ERROR_RESPONSE_KEY_DETAILS_NAME: str(err)}),
+                HTTPStatus.BAD_REQUEST,
+            )
+        etag = _get_templates_cursor_page_etag(page)
+        if conditional.is_not_modified(etag):
+            return conditional.make_not_modified_response(etag)
+
+        response = make_response(
+            jsonify(
+                {
+                    consts.PAGINATION_TOTAL_COUNT_NAME: page.count.value,
+                    consts.PAGINATION_TOTAL_COUNT_KIND_NAME: page.count.kind.value,
+                    consts.PAGINATION_NEXT_LINK_RELATION: pagination_utils.get_cursor_pagination_link(  # noqa: E501
+                        url=request.url, cursor=page.next_cursor
+                    ),
+                    consts.PAGINATION_PREVIOUS_LINK_RELATION: pagination_utils.get_cursor_pagination_link(  # noqa: E501
+                        url=request.url, cursor=page.previous_cursor
+                    ),
+                    consts.PAGINATION_RESULTS_NAME: [
+                        template.serialize() for template in page.templates
+                    ],
+                }
+            ),
+            HTTPStatus.OK,
+        )
+        response.set_etag(etag)
+        return response
+
     templates, all_templates_count = services.list_templates(
         templates_query_repository=query_repository,
         filters=filters,
         ordering=ordering,
         pagination=pagination,
+        count_strategy=count_strategy,
+        templates_list_cache=templates_list_cache,
+        max_age_seconds=conditional.get_max_age_seconds(),
     )
+    etag = _get_templates_page_etag(templates=templates, count=all_templates_count)
+    if conditional.is_not_modified(etag):
+        return conditional.make_not_modified_response(etag)
 
-    return make_response(
+    response = make_response(
         jsonify(
             {
-                consts.PAGINATION_TOTAL_COUNT_NAME: all_templates_count,
+                consts.PAGINATION_TOTAL_COUNT_NAME: all_templates_count.value,
+                consts.PAGINATION_TOTAL_COUNT_KIND_NAME: all_templates_count.kind.value,
                 consts.PAGINATION_NEXT_LINK_RELATION: pagination_utils.get_next_pagination_link(  # noqa: E501
                     url=request.url,
                     offset=pagination.offset,
                     records_per_page=pagination.records_per_page,
-                    all_records_count=all_templates_count,
+                    has_more=all_templates_count.has_more,
                 ),
                 consts.PAGINATION_PREVIOUS_LINK_RELATION: pagination_utils.get_previous_pagination_link(  # noqa: E501
                     url=request.url,
@@ -140,23 +257,232 @@ def list_templates_endpoint(query_repository: SqlAlchemyTemplatesQueryRepository
         ),
         HTTPStatus.OK,
     )
+    response.set_etag(etag)
+    return response
+
+
+@docstrings.inject_parameter_info_doc_strings(consts.SWAGGER_FILES)
+@api_blueprint.route("/export", methods=["GET"])
+@inject.params(query_repository="templates_query_repository")
+def export_templates_endpoint(query_repository: SqlAlchemyTemplatesQueryRepository):
+    """
+    file: {0}/template_endpoints/export_templates.yml
+    """
+
+    query_params = request.args
+    export_format = query_params.get(
+        consts.EXPORT_FORMAT_QUERY_PARAMETER_NAME, EXPORT_NDJSON_FORMAT
+    )
+    if export_format not in EXPORT_MIME_TYPES:
+        logger.warning("Invalid export format: '%s'.", export_format)
+        return make_response(
+            jsonify(
+                {
+                    consts.ERROR_RESPONSE_KEY_DETAILS_NAME: {
+                        consts.EXPORT_FORMAT_QUERY_PARAMETER_NAME: [
+                            "Not a valid choice."
+                        ]
+                    }
+                }
+            ),
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    form = template_forms.TemplatesFiltersForm(
+        data=query_params,
+        meta={"csrf": False},
+    )
+    if not form.validate():
+        return make_response(
+            jsonify({consts.ERROR_RESPONSE_KEY_DETAILS_NAME: form.errors}),
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    ordering: list[common_dtos.Ordering] | None = (
+        common_forms.OrderingForm(
+            data=request.args,
+            meta={"csrf": False},
+        ).create_ordering()
+        if consts.ORDERING_QUERY_PARAMETER_NAME in query_params
+        else None
+    )
+
+    logger.info("Exporting templates as '%s'.", export_format)
+    templates = services.export_templates(
+        templates_query_repository=query_repository,
+        filters=form.create_filters(),
+        ordering=ordering,
+    )
+
+    # Templates are sent as soon as they are retrieved, so neither
+    # the whole result nor the whole response is kept in memory.
+    # Request context is kept until the response is sent,
+    # so the database session is released only afterwards.
+    # More details can be found here:
+    # https://flask.palletsprojects.com/en/stable/patterns/streaming/.
+    return Response(
+        stream_with_context(
+            _serialize_templates_to_csv(templates)
+            if export_format == EXPORT_CSV_FORMAT
+            else _serialize_templates_to_ndjson(templates)
+        ),
+        mimetype=EXPORT_MIME_TYPES[export_format],
+        headers={
+            "Content-Disposition": f"attachment; filename=templates.{export_format}"
+        },
+    )
+
+
+def _serialize_templates_to_ndjson(
+    templates: Iterator[DetailedOutputTemplate],
+) -> Iterator[str]:
+    for template in templates:
+        yield current_app.json.dumps(template.serialize()) + "\n"
+
+
+def _serialize_templates_to_csv(
+    templates: Iterator[DetailedOutputTemplate],
+) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(EXPORT_CSV_COLUMNS)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    for template in templates:
+        writer.writerow(
+            (template.id, template.value.value, template.timestamp.isoformat())
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+@docstrings.inject_parameter_info_doc_strings(consts.SWAGGER_FILES)
+@api_blueprint.route("/cache/statistics", methods=["GET"])
+@inject.params(templates_cache="templates_cache")
+def get_templates_cache_statistics_endpoint(templates_cache: AbstractVersionedCache):
+    """
+    file: {0}/template_endpoints/get_templates_cache_statistics.yml
+    """
+
+    return make_response(jsonify(templates_cache.statistics.serialize()), HTTPStatus.OK)
+
+
+@docstrings.inject_parameter_info_doc_strings(consts.SWAGGER_FILES)
+@api_blueprint.route("/bulk/get", methods=["POST"])
+@inject.params(query_repository="templates_query_repository")
+def get_templates_endpoint(query_repository: SqlAlchemyTemplatesQueryRepository):
+    """
+    file: {0}/template_endpoints/get_templates.yml
+    """
+
+    # Many ids don't fit into the limit of length of the URL,
+    # so they can be sent in the body as well.
+    template_ids = (request.get_json(force=True, silent=True) or {}).get(
+        consts.IDS_QUERY_PARAMETER_NAME
+    )
+    if not isinstance(template_ids, list) or not all(
+        isinstance(template_id, str) for template_id in template_ids
+    ):
+        logger.warning("Request can't be handled, due to invalid input data.")
+        return make_response(
+            jsonify(
+                {
+                    consts.ERROR_RESPONSE_KEY_DETAILS_NAME: {
+                        consts.IDS_QUERY_PARAMETER_NAME: ["Not a list of strings."]
+                    }
+                }
+            ),
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    return _get_templates_by_ids(
+        query_repository=query_repository, template_ids=template_ids
+    )
+
+
+def _get_templates_by_ids(
+    query_repository: SqlAlchemyTemplatesQueryRepository, template_ids: list[str]
+):
+    if not template_ids or len(template_ids) > consts.IDS_MAX_NUMBER:
+        logger.warning("Invalid number of template ids: %d.", len(template_ids))
+        return make_response(
+            jsonify(
+                {
+                    consts.ERROR_RESPONSE_KEY_DETAILS_NAME: {
+                        consts.IDS_QUERY_PARAMETER_NAME: [
+                            f"Number of ids has to be between 1 "
+                            f"and {consts.IDS_MAX_NUMBER}."
+                        ]
+                    }
+                }
+            ),
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    _template_ids: list[value_objects.TemplateId] = []
+    for template_id in template_ids:
+        try:
+            _template_ids.append(value_objects.TemplateId(template_id.strip()))
+        except ValueError:
+            return _handle_invalid_template_id(template_id)
+
+    logger.info("Getting data for %d templates.", len(_template_ids))
+    templates, missing_template_ids = services.get_templates(
+        templates_query_repository=query_repository, template_ids=_template_ids
+    )
+    logger.info(
+        "%d templates found, %d don't exist.",
+        len(templates),
+        len(missing_template_ids),
+    )
+
+    return make_response(
+        jsonify(
+            {
+                consts.PAGINATION_RESULTS_NAME: [
+                    template.serialize() for template in templates
+                ],
+                consts.MISSING_IDS_NAME: missing_template_ids,
+            }
+        ),
+        HTTPStatus.OK,
+    )
 
 
 @docstrings.inject_parameter_info_doc_strings(consts.SWAGGER_FILES)
 @api_blueprint.route("/", methods=["POST"])
-@inject.params(message_bus="message_bus", unit_of_work="templates_unit_of_work")
-def create_template_endpoint(message_bus: MessageBus, unit_of_work):
+@inject.params(
+    message_bus="message_bus",
+    unit_of_work="templates_unit_of_work",
+    create_batcher="templates_create_batcher",
+)
+def create_template_endpoint(
+    message_bus: MessageBus,
+    unit_of_work,
+    create_batcher: MicroBatcher[domain_commands.CreateTemplate, OutputTemplate] | None,
+):
     """
     file: {0}/template_endpoints/create_template.yml
     """
 
     logger.info("Creating a new template.")
 
-    template = services.create_template(
-        templates_unit_of_work=unit_of_work,
-        message_bus=message_bus,
-        command=domain_commands.CreateTemplate(),
-    )
+    if create_batcher is None:
+        template = services.create_template(
+            templates_unit_of_work=unit_of_work,
+            message_bus=message_bus,
+            command=domain_commands.CreateTemplate(),
+        )
+    else:
+        template = create_batcher.submit(domain_commands.CreateTemplate())
+        # Batch might have been committed by another thread, so the position
+        # of the commit, needed for a consistency token, isn't known to this one.
+        # Any later position is good enough to read own writes.
+        remember_commit_position(get_session())
 
     logger.info("Template '%s' created.", template.id)
 
@@ -218,6 +544,7 @@ def set_template_value_endpoint(message_bus: MessageBus, template_id: str):
                 domain_commands.SetTemplateValue(
                     template_id=_template_id,
                     value=value_objects.TemplateValue(template_value),
+                    expected_revisions=_get_expected_revisions(_template_id),
                 )
             ]
         )
@@ -238,6 +565,10 @@ def set_template_value_endpoint(message_bus: MessageBus, template_id: str):
             jsonify({consts.ERROR_RESPONSE_KEY_DETAILS_NAME: "Template not found."}),
             HTTPStatus.NOT_FOUND,
         )
+    except domain_exceptions.TemplateRevisionMismatch:
+        return _handle_template_revision_mismatch(template_id=template_id)
+    except ports_exceptions.TemplateVersionConflict:
+        return _handle_template_version_conflict(template_id=template_id)
 
     return make_response(jsonify({"message": "Template value set."}), HTTPStatus.OK)
 
@@ -271,6 +602,7 @@ def subtract_template_value_endpoint(message_bus: MessageBus, template_id: str):
                 domain_commands.SubtractTemplateValue(
                     template_id=_template_id,
                     value=value_objects.TemplateValue(value),
+                    expected_revisions=_get_expected_revisions(_template_id),
                 )
             ]
         )
@@ -299,10 +631,314 @@ def subtract_template_value_endpoint(message_bus: MessageBus, template_id: str):
             jsonify({consts.ERROR_RESPONSE_KEY_DETAILS_NAME: "Template not found."}),
             HTTPStatus.NOT_FOUND,
         )
+    except domain_exceptions.TemplateRevisionMismatch:
+        return _handle_template_revision_mismatch(template_id=template_id)
+    except ports_exceptions.TemplateVersionConflict:
+        return _handle_template_version_conflict(template_id=template_id)
 
     return make_response(jsonify({"message": "Template value set."}), HTTPStatus.OK)
 
 
+@docstrings.inject_parameter_info_doc_strings(consts.SWAGGER_FILES)
+@api_blueprint.route("/bulk/delete", methods=["POST"])
+@inject.params(message_bus="message_bus", unit_of_work="templates_unit_of_work")
+def bulk_delete_templates_endpoint(message_bus: MessageBus, unit_of_work):
+    """
+    file: {0}/template_endpoints/bulk_delete_templates.yml
+    """
+
+    filters_form = _get_bulk_filters_form()
+    if not filters_form.validate():
+        logger.warning("Request can't be handled, due to invalid input data.")
+        return make_response(
+            jsonify({consts.ERROR_RESPONSE_KEY_DETAILS_NAME: filters_form.errors}),
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    logger.info("Deleting templates in bulk.")
+    try:
+        count = services.bulk_delete_templates(
+            templates_unit_of_work=unit_of_work,
+            message_bus=message_bus,
+            command=domain_commands.BulkDeleteTemplates(
+                filters=filters_form.create_filters()
+            ),
+        )
+    except ports_exceptions.TemplateVersionConflict:
+        return _handle_template_version_conflict()
+    logger.info("%d templates deleted.", count)
+
+    return make_response(
+        jsonify({consts.BULK_CHANGED_COUNT_NAME: count}), HTTPStatus.OK
+    )
+
+
+@docstrings.inject_parameter_info_doc_strings(consts.SWAGGER_FILES)
+@api_blueprint.route("/bulk/set", methods=["POST"])
+@inject.params(message_bus="message_bus", unit_of_work="templates_unit_of_work")
+def bulk_set_template_value_endpoint(message_bus: MessageBus, unit_of_work):
+    """
+    file: {0}/template_endpoints/bulk_set_template_value.yml
+    """
+
+    filters_form = _get_bulk_filters_form()
+    form = template_forms.SetTemplateValueForm(
+        formdata=MultiDict(request.get_json(force=True, silent=True)),
+        meta={"csrf": False},
+    )
+    if not (filters_form.validate() & form.validate()):
+        logger.warning("Request can't be handled, due to invalid input data.")
+        return make_response(
+            jsonify(
+                {
+                    consts.ERROR_RESPONSE_KEY_DETAILS_NAME: {
+                        **form.errors,
+                        "filters": filters_form.errors,
+                    }
+                }
+            ),
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    template_value = form.value.data
+
+    logger.info("Setting value '%s' for templates in bulk.", template_value)
+    try:
+        count = services.bulk_set_template_value(
+            templates_unit_of_work=unit_of_work,
+            message_bus=message_bus,
+            command=domain_commands.BulkSetTemplateValue(
+                filters=filters_form.create_filters(),
+                value=value_objects.TemplateValue(template_value),
+            ),
+        )
+    except domain_exceptions.InvalidTemplateValue:
+        logger.warning("Invalid value '%s' for templates.", template_value)
+        return make_response(
+            jsonify({consts.ERROR_RESPONSE_KEY_DETAILS_NAME: "Invalid value."}),
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        )
+    except ports_exceptions.TemplateVersionConflict:
+        return _handle_template_version_conflict()
+    logger.info("Value '%s' set for %d templates.", template_value, count)
+
+    return make_response(
+        jsonify({consts.BULK_CHANGED_COUNT_NAME: count}), HTTPStatus.OK
+    )
+
+
+@docstrings.inject_parameter_info_doc_strings(consts.SWAGGER_FILES)
+@api_blueprint.route("/bulk/subtract", methods=["POST"])
+@inject.params(message_bus="message_bus", unit_of_work="templates_unit_of_work")
+def bulk_subtract_template_value_endpoint(message_bus: MessageBus, unit_of_work):
+    """
+    file: {0}/template_endpoints/bulk_subtract_template_value.yml
+    """
+
+    filters_form = _get_bulk_filters_form()
+    form = template_forms.SubtractTemplateValueForm(
+        formdata=MultiDict(request.get_json(force=True, silent=True)),
+        meta={"csrf": False},
+    )
+    if not (filters_form.validate() & form.validate()):
+        logger.warning("Request can't be handled, due to invalid input data.")
+        return make_response(
+            jsonify(
+                {
+                    consts.ERROR_RESPONSE_KEY_DETAILS_NAME: {
+                        **form.errors,
+                        "filters": filters_form.errors,
+                    }
+                }
+            ),
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    value = form.value.data
+
+    logger.info("Subtracting value '%s' for templates in bulk.", value)
+    try:
+        count = services.bulk_subtract_template_value(
+            templates_unit_of_work=unit_of_work,
+            message_bus=message_bus,
+            command=domain_commands.BulkSubtractTemplateValue(
+                filters=filters_form.create_filters(),
+                value=value_objects.TemplateValue(value),
+            ),
+        )
+    except ports_exceptions.TemplateVersionConflict:
+        return _handle_template_version_conflict()
+    logger.info("Value '%s' subtracted for %d templates.", value, count)
+
+    return make_response(
+        jsonify({consts.BULK_CHANGED_COUNT_NAME: count}), HTTPStatus.OK
+    )
+
+
+@docstrings.inject_parameter_info_doc_strings(consts.SWAGGER_FILES)
+@api_blueprint.route("/import", methods=["POST"])
+@inject.params(message_bus="message_bus", unit_of_work="templates_unit_of_work")
+def import_templates_endpoint(message_bus: MessageBus, unit_of_work):
+    """
+    file: {0}/template_endpoints/import_templates.yml
+    """
+
+    import_format = request.args.get(
+        consts.EXPORT_FORMAT_QUERY_PARAMETER_NAME, imports.NDJSON_FORMAT
+    )
+    if import_format not in imports.IMPORT_FORMATS:
+        logger.warning("Invalid import format: '%s'.", import_format)
+        return make_response(
+            jsonify(
+                {
+                    consts.ERROR_RESPONSE_KEY_DETAILS_NAME: {
+                        consts.EXPORT_FORMAT_QUERY_PARAMETER_NAME: [
+                            "Not a valid choice."
+                        ]
+                    }
+                }
+            ),
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    logger.info("Importing templates as '%s'.", import_format)
+    try:
+        # Body is read line by line, while templates are saved,
+        # so it's never kept in memory as a whole.
+        result = services.import_templates(
+            templates_unit_of_work=unit_of_work,
+            message_bus=message_bus,
+            templates=imports.parse_imported_templates(
+                lines=(line.decode("utf-8") for line in request.stream),
+                import_format=import_format,
+            ),
+        )
+    except domain_exceptions.InvalidTemplateValue as err:
+        logger.warning("Invalid imported template: '%s'.", err)
+        return make_response(
+            jsonify({consts.ERROR_RESPONSE_KEY_DETAILS_NAME: str(err)}),
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        )
+    except ValueError as err:
+        logger.warning("Imported data can't be parsed: '%s'.", err)
+        return make_response(
+            jsonify({consts.ERROR_RESPONSE_KEY_DETAILS_NAME: str(err)}),
+            HTTPStatus.BAD_REQUEST,
+        )
+    logger.info(
+        "%d of %d templates imported, %.0f rows/s.",
+        result.imported,
+        result.processed,
+        result.rows_per_second,
+    )
+
+    return make_response(jsonify(result.serialize()), HTTPStatus.OK)
+
+
+@docstrings.inject_parameter_info_doc_strings(consts.SWAGGER_FILES)
+@api_blueprint.route("/batch", methods=["POST"])
+@inject.params(message_bus="message_bus", unit_of_work="templates_unit_of_work")
+def execute_templates_commands_endpoint(message_bus: MessageBus, unit_of_work):
+    """
+    file: {0}/template_endpoints/execute_templates_commands.yml
+    """
+
+    data = request.get_json(force=True, silent=True)
+    if not isinstance(data, dict):
+        data = {}
+    atomic = data.get(consts.BATCH_ATOMIC_NAME, True)
+    commands_data = data.get(consts.BATCH_COMMANDS_NAME)
+    max_size = current_app.config["TEMPLATES_BATCH_MAX_SIZE"]
+
+    errors: dict = {}
+    if not isinstance(atomic, bool):
+        errors[consts.BATCH_ATOMIC_NAME] = ["Not a valid boolean value."]
+    if not isinstance(commands_data, list) or not commands_data:
+        errors[consts.BATCH_COMMANDS_NAME] = ["Not a non-empty list."]
+    elif len(commands_data) > max_size:
+        errors[consts.BATCH_COMMANDS_NAME] = [
+            f"Number of commands can't be greater than {max_size}."
+        ]
+    else:
+        forms = [
+            template_forms.BatchCommandForm(
+                formdata=MultiDict(
+                    command_data if isinstance(command_data, dict) else {}
+                ),
+                meta={"csrf": False},
+            )
+            for command_data in commands_data
+        ]
+        commands_errors = {
+            index: form.errors
+            for index, form in enumerate(forms)
+            if not form.validate()
+        }
+        if commands_errors:
+            errors[consts.BATCH_COMMANDS_NAME] = commands_errors
+
+    if errors:
+        logger.warning("Request can't be handled, due to invalid input data.")
+        return make_response(
+            jsonify({consts.ERROR_RESPONSE_KEY_DETAILS_NAME: errors}),
+            HTTPStatus.BAD_REQUEST,
+        )
+
+    logger.info("Executing batch of %d template commands.", len(forms))
+    results = services.execute_templates_commands(
+        templates_unit_of_work=unit_of_work,
+        message_bus=message_bus,
+        commands=[form.create_command() for form in forms],
+        atomic=atomic,
+    )
+    logger.info(
+        "%d of %d template commands succeeded.",
+        sum(result.status == CommandStatusEnum.SUCCEEDED for result in results),
+        len(results),
+    )
+
+    return make_response(
+        jsonify(
+            {
+                consts.BATCH_RESULTS_NAME: [
+                    _serialize_command_result(result) for result in results
+                ]
+            }
+        ),
+        HTTPStatus.OK,
+    )
+
+
+def _serialize_command_result(result: CommandResult) -> dict:
+    serialized_result: dict = {"status": result.status.value}
+
+    if result.error is None:
+        return serialized_result
+
+    if isinstance(result.error, domain_exceptions.InvalidTemplateValue):
+        detail = "Invalid value."
+    elif isinstance(result.error, ports_exceptions.TemplateDoesNotExist):
+        detail = "Template not found."
+    elif isinstance(result.error, ports_exceptions.TemplateVersionConflict):
+        detail = "Template is being changed concurrently, try again."
+    else:
+        logger.error(
+            "Template command '%s' failed.", result.command, exc_info=result.error
+        )
+        detail = "Command failed."
+    serialized_result[consts.ERROR_RESPONSE_KEY_DETAILS_NAME] = detail
+
+    return serialized_result
+
+
+def _get_bulk_filters_form() -> template_forms.BulkTemplatesFiltersForm:
+    filters = (request.get_json(force=True, silent=True) or {}).get("filters")
+    return template_forms.BulkTemplatesFiltersForm(
+        formdata=MultiDict(filters if isinstance(filters, dict) else {}),
+        meta={"csrf": False},
+    )
+
+
 def _handle_invalid_template_id(template_id: str):
     logger.warning("Invalid template ID format: '%s'.", template_id)
     return make_response(
@@ -311,3 +947,79 @@ def _handle_invalid_template_id(template_id: str):
         ),
         HTTPStatus.BAD_REQUEST,
     )
+
+
+def _handle_template_version_conflict(template_id: str | None = None):
+    if template_id is None:
+        logger.warning("Templates are being changed concurrently.")
+    else:
+        logger.warning("Template '%s' is being changed concurrently.", template_id)
+    return make_response(
+        jsonify(
+            {
+                consts.ERROR_RESPONSE_KEY_DETAILS_NAME: (
+                    "Template is being changed concurrently, try again."
+                )
+            }
+        ),
+        HTTPStatus.CONFLICT,
+    )
+
+
+def _handle_template_revision_mismatch(template_id: str):
+    logger.warning("Template '%s' has been changed since it was seen.", template_id)
+    return make_response(
+        jsonify(
+            {
+                consts.ERROR_RESPONSE_KEY_DETAILS_NAME: (
+                    "Template has been changed since it was retrieved."
+                )
+            }
+        ),
+        HTTPStatus.PRECONDITION_FAILED,
+    )
+
+
+def _get_template_etag(template: DetailedOutputTemplate) -> str:
+    # Tag is readable, so a revision sent back in "If-Match" header
+    # can be checked by a command, without retrieving the template first.
+    return f"{template.id.hex}.{template.version}"
+
+
+def _get_expected_revisions(
+    template_id: value_objects.TemplateId,
+) -> frozenset[value_objects.TemplateRevision] | None:
+    etags = conditional.get_expected_etags()
+    if etags is None:
+        return None
+
+    revisions = set()
+    for etag in etags:
+        # Tags of other templates or malformed ones never match.
+        try:
+            etag_template_id, version = etag.split(".")
+            if etag_template_id == template_id.hex:
+                revisions.add(value_objects.TemplateRevision(version=int(version)))
+        except ValueError:
+            continue
+
+    return frozenset(revisions)
+
+
+def _get_templates_page_etag(templates: list[OutputTemplate], count) -> str:
+    # Listed templates are represented only by ids and timestamps,
+    # which never change, so a page changes only when its templates do.
+    return conditional.compute_etag(
+        count.kind.value,
+        count.value,
+        count.has_more,
+        *(template.id for template in templates),
+    )
+
+
+def _get_templates_cursor_page_etag(page: OutputTemplatesCursorPage) -> str:
+    return conditional.compute_etag(
+        _get_templates_page_etag(templates=page.templates, count=page.count),
+        page.next_cursor,
+        page.previous_cursor,
+    )
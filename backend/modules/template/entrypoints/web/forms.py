@@ -1,13 +1,90 @@
-from wtforms import DateTimeField, Form, IntegerField, StringField, validators
+import json
+
+from wtforms import (
+    DateTimeField,
+    Form,
+    IntegerField,
+    SelectField,
+    StringField,
+    validators,
+)
+
+from ...domain import commands as domain_commands
+from ...domain import value_objects
+from ...domain.ports.dtos import TemplatesFilters
 
 strip_filter = lambda x: x.strip() if x else None  # noqa: E731
 
 
+class JSONObjectField(StringField):
+    def process_data(self, value):
+        self.data = None
+        self.data = self._parse(value) if isinstance(value, str) else value
+
+    def process_formdata(self, valuelist):
+        if valuelist:
+            self.data = None
+            # JSON request body can contain already parsed object.
+            self.data = (
+                self._parse(valuelist[0])
+                if isinstance(valuelist[0], str)
+                else self._validate(valuelist[0])
+            )
+
+    @staticmethod
+    def _parse(value: str) -> dict | None:
+        if not value:
+            return None
+
+        try:
+            data = json.loads(value)
+        except ValueError as err:
+            raise ValueError("Not a valid JSON.") from err
+
+        return JSONObjectField._validate(data)
+
+    @staticmethod
+    def _validate(data) -> dict:
+        if not isinstance(data, dict):
+            raise ValueError("Not a JSON object.")
+
+        return data
+
+
 class TemplatesFiltersForm(Form):
     query = StringField(filters=[strip_filter])
+    value = IntegerField(validators=[validators.Optional()])
+    value_from = IntegerField(validators=[validators.Optional()])
+    value_to = IntegerField(validators=[validators.Optional()])
+    data = JSONObjectField()
     timestamp_from = DateTimeField()
     timestamp_to = DateTimeField()
 
+    def create_filters(self) -> TemplatesFilters:
+        return TemplatesFilters(
+            value=self.value.data,
+            value_from=self.value_from.data,
+            value_to=self.value_to.data,
+            data=self.data.data,
+            query=self.query.data,
+            timestamp_from=self.timestamp_from.data,
+            timestamp_to=self.timestamp_to.data,
+        )
+
+
+class BulkTemplatesFiltersForm(TemplatesFiltersForm):
+    def validate(self, extra_validators=None) -> bool:
+        if not super().validate(extra_validators=extra_validators):
+            return False
+
+        # Bulk command without filters would change all templates,
+        # as well as one with empty query or empty data filter.
+        if all(field.data is None or field.data in ("", {}) for field in self):
+            self.form_errors.append("At least one filter is required.")
+            return False
+
+        return True
+
 
 class SetTemplateValueForm(Form):
     value = IntegerField(validators=[validators.DataRequired()])
@@ -15,3 +92,49 @@ class SetTemplateValueForm(Form):
 
 class SubtractTemplateValueForm(Form):
     value = IntegerField(validators=[validators.DataRequired()])
+
+
+class BatchCommandForm(Form):
+    SET_VALUE = "set"
+    SUBTRACT_VALUE = "subtract"
+    DELETE = "delete"
+
+    type = SelectField(
+        choices=[SET_VALUE, SUBTRACT_VALUE, DELETE],
+        validators=[validators.InputRequired()],
+    )
+    template_id = StringField(
+        validators=[validators.InputRequired(), validators.UUID()]
+    )
+    value = IntegerField(validators=[validators.Optional()])
+
+    def validate(self, extra_validators=None) -> bool:
+        if not super().validate(extra_validators=extra_validators):
+            return False
+
+        if self.type.data != self.DELETE and self.value.data is None:
+            self.value.errors = ["This field is required."]
+            return False
+
+        return True
+
+    def create_command(
+        self,
+    ) -> (
+        domain_commands.SetTemplateValue
+        | domain_commands.SubtractTemplateValue
+        | domain_commands.DeleteTemplate
+    ):
+        template_id = value_objects.TemplateId(self.template_id.data)
+
+        if self.type.data == self.SET_VALUE:
+            return domain_commands.SetTemplateValue(
+                template_id=template_id,
+                value=value_objects.TemplateValue(self.value.data),
+            )
+        if self.type.data == self.SUBTRACT_VALUE:
+            return domain_commands.SubtractTemplateValue(
+                template_id=template_id,
+                value=value_objects.TemplateValue(self.value.data),
+            )
+        return domain_commands.DeleteTemplate(template_id=template_id)
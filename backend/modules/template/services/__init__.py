@@ -1,16 +1,41 @@
 from .commands import (
+    bulk_delete_templates,
+    bulk_set_template_value,
+    bulk_subtract_template_value,
     create_template,
+    create_templates,
     delete_template,
+    execute_templates_commands,
+    import_templates,
     set_template_value,
+    shard_template_value,
     subtract_template_value,
+    unshard_template_value,
+)
+from .queries import (
+    export_templates,
+    get_template,
+    get_templates,
+    list_templates,
+    list_templates_by_cursor,
 )
-from .queries import get_template, list_templates
 
 __all__ = [
+    "bulk_delete_templates",
+    "bulk_set_template_value",
+    "bulk_subtract_template_value",
     "create_template",
+    "create_templates",
     "delete_template",
+    "execute_templates_commands",
+    "export_templates",
     "get_template",
+    "get_templates",
+    "import_templates",
     "list_templates",
+    "list_templates_by_cursor",
     "set_template_value",
+    "shard_template_value",
     "subtract_template_value",
+    "unshard_template_value",
 ]
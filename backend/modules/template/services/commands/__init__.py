@@ -1,13 +1,29 @@
 from .commands import (
+    bulk_delete_templates,
+    bulk_set_template_value,
+    bulk_subtract_template_value,
     create_template,
+    create_templates,
     delete_template,
+    execute_templates_commands,
+    import_templates,
     set_template_value,
+    shard_template_value,
     subtract_template_value,
+    unshard_template_value,
 )
 
 __all__ = [
+    "bulk_delete_templates",
+    "bulk_set_template_value",
+    "bulk_subtract_template_value",
     "create_template",
+    "create_templates",
     "delete_template",
+    "execute_templates_commands",
+    "import_templates",
     "set_template_value",
+    "shard_template_value",
     "subtract_template_value",
+    "unshard_template_value",
 ]
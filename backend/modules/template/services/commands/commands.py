@@ -1,13 +1,46 @@
-from modules.common.message_bus import MessageBus
+import functools
+import inspect
+import itertools
+import logging
+import random
+import time
+from typing import Callable, Iterable, Iterator, Sequence, TypeVar
+
+from modules.common.domain.events import DomainEvent
+from modules.common.message_bus import CommandResult, MessageBus
 from modules.common.time import get_current_timestamp
 
 from ...domain import commands as domain_commands
 from ...domain import entities
 from ...domain import events as domain_events
+from ...domain import exceptions as domain_exceptions
+from ...domain.ports import AbstractTemplatesDomainRepository
+from ...domain.ports.dtos import TemplatesFilters
+from ...domain.ports.exceptions import TemplateVersionConflict
 from ...domain.ports.unit_of_work import AbstractTemplatesUnitOfWork
-from ...domain.value_objects import INITIAL_TEMPLATE_VERSION
+from ...domain.value_objects import (
+    INITIAL_TEMPLATE_VALUE,
+    INITIAL_TEMPLATE_VERSION,
+    TemplateId,
+    TemplateRevision,
+    TemplateValue,
+)
 from ..queries.dtos import OutputTemplate
 from ..queries.mappers import map_template_entity_to_output_dto
+from .dtos import InputImportedTemplate, OutputTemplatesImport
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS_ON_CONFLICT = 5
+RETRY_BASE_DELAY_SECONDS = 0.005
+# Bulk commands change templates in chunks, each in its own transaction,
+# so templates are locked only for the time of a single chunk.
+BULK_CHUNK_SIZE = 1000
+# Imported templates are saved in chunks, each in its own transaction,
+# so a failed import can be resumed, instead of being repeated from scratch.
+IMPORT_CHUNK_SIZE = 100_000
+
+Handler = TypeVar("Handler", bound=Callable)
 
 # In this example app, there is no need to care much about history of changes,
 # and rather focus on separating business logic from infrastructure and data integrity.
@@ -28,6 +61,48 @@ from ..queries.mappers import map_template_entity_to_output_dto
 # https://www.cosmicpython.com/book/chapter_08_events_and_message_bus.html.
 
 
+def retry_on_version_conflict(handler: Handler) -> Handler:
+    """
+    Templates are updated with optimistic concurrency control,
+    so a command conflicting with a concurrent one is repeated from scratch,
+    with a new transaction and freshly retrieved templates.
+    Randomized, growing delay between attempts keeps conflicting commands
+    from colliding again.
+    Commands handled within a batch aren't repeated, as they would be
+    repeated with the same transaction (and its snapshot of templates),
+    so the conflict is raised right away and the batch handles it.
+    """
+
+    signature = inspect.signature(handler)
+
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        message_bus = signature.bind(*args, **kwargs).arguments["message_bus"]
+        if message_bus.is_handling_batch:
+            return handler(*args, **kwargs)
+
+        for attempt in range(1, MAX_ATTEMPTS_ON_CONFLICT + 1):
+            try:
+                return handler(*args, **kwargs)
+            except TemplateVersionConflict as err:
+                if attempt == MAX_ATTEMPTS_ON_CONFLICT:
+                    raise
+
+                logger.info(
+                    "Attempt %d of '%s' failed: '%s', retrying.",
+                    attempt,
+                    handler.__name__,
+                    err,
+                )
+                # Delay is used only to spread retries, it isn't security related.
+                delay = random.uniform(  # nosec B311
+                    0, RETRY_BASE_DELAY_SECONDS * 2**attempt
+                )
+                time.sleep(delay)
+
+    return wrapper  # type: ignore[return-value]
+
+
 def create_template(
     templates_unit_of_work: AbstractTemplatesUnitOfWork,
     message_bus: MessageBus,
@@ -39,25 +114,44 @@ def create_template(
     # More details can be found here:
     # https://martinfowler.com/bliki/CommandQuerySeparation.html.
 
-    template = entities.Template(
-        id=entities.Template.generate_id(),
-        timestamp=get_current_timestamp(),
-        version=INITIAL_TEMPLATE_VERSION,
-    )
-    output = map_template_entity_to_output_dto(template)
+    return create_templates(
+        templates_unit_of_work=templates_unit_of_work,
+        message_bus=message_bus,
+        commands=[command],
+    )[0]
+
+
+def create_templates(
+    templates_unit_of_work: AbstractTemplatesUnitOfWork,
+    message_bus: MessageBus,
+    commands: list[domain_commands.CreateTemplate],
+) -> list[OutputTemplate]:
+    # All templates are saved in a single transaction, so creating many of them
+    # at once costs a single commit (and a single flush of the write-ahead log).
+    templates = [
+        entities.Template(
+            id=entities.Template.generate_id(),
+            timestamp=get_current_timestamp(),
+            version=INITIAL_TEMPLATE_VERSION,
+        )
+        for _ in commands
+    ]
+    outputs = [map_template_entity_to_output_dto(template) for template in templates]
 
     with templates_unit_of_work:
-        templates_unit_of_work.templates.create(template)
+        for template in templates:
+            templates_unit_of_work.templates.create(template)
 
     message_bus.handle(
         [
             domain_events.TemplateCreated(
                 template_id=template.id, timestamp=template.timestamp
             )
+            for template in templates
         ]
     )
 
-    return output
+    return outputs
 
 
 def delete_template(
@@ -71,6 +165,7 @@ def delete_template(
     message_bus.handle([domain_events.TemplateDeleted(template_id=command.template_id)])
 
 
+@retry_on_version_conflict
 def set_template_value(
     templates_unit_of_work: AbstractTemplatesUnitOfWork,
     message_bus: MessageBus,
@@ -78,6 +173,9 @@ def set_template_value(
 ) -> None:
     with templates_unit_of_work:
         template = templates_unit_of_work.templates.get(command.template_id)
+        _check_revision(
+            template=template, expected_revisions=command.expected_revisions
+        )
         template.set_value(command.value)
         templates_unit_of_work.templates.update(template)
 
@@ -86,24 +184,290 @@ def set_template_value(
     )
 
 
+@retry_on_version_conflict
 def subtract_template_value(
     templates_unit_of_work: AbstractTemplatesUnitOfWork,
     message_bus: MessageBus,
     command: domain_commands.SubtractTemplateValue,
 ) -> None:
+    # Subtraction is executed by the repository as a single atomic operation,
+    # so popular templates aren't locked for the time of the whole command.
     with templates_unit_of_work:
-        template: entities.Template = templates_unit_of_work.templates.get(
-            command.template_id
+        if command.expected_revisions is not None:
+            # Template is locked before its revision is checked,
+            # so it can't be changed until it's subtracted from.
+            _check_revision(
+                template=templates_unit_of_work.templates.get_for_update(
+                    command.template_id
+                ),
+                expected_revisions=command.expected_revisions,
+            )
+        final_value = templates_unit_of_work.templates.subtract_value(
+            template_id=command.template_id, value=command.value
         )
-        final_value = template.subtract_value(command.value)
-        templates_unit_of_work.templates.update(template)
 
     message_bus.handle(
         [
             domain_events.TemplateValueSubtracted(
-                template_id=template.id,
+                template_id=command.template_id,
                 subtracted_value=command.value,
                 final_value=final_value,
             )
         ]
     )
+
+
+@retry_on_version_conflict
+def shard_template_value(
+    templates_unit_of_work: AbstractTemplatesUnitOfWork,
+    message_bus: MessageBus,
+    command: domain_commands.ShardTemplateValue,
+) -> TemplateValue:
+    with templates_unit_of_work:
+        value = templates_unit_of_work.templates.shard_value(
+            template_id=command.template_id,
+            number_of_shards=command.number_of_shards,
+        )
+
+    message_bus.handle(
+        [
+            domain_events.TemplateValueSharded(
+                template_id=command.template_id,
+                number_of_shards=command.number_of_shards,
+            )
+        ]
+    )
+
+    return value
+
+
+@retry_on_version_conflict
+def unshard_template_value(
+    templates_unit_of_work: AbstractTemplatesUnitOfWork,
+    message_bus: MessageBus,
+    command: domain_commands.UnshardTemplateValue,
+) -> TemplateValue:
+    with templates_unit_of_work:
+        value = templates_unit_of_work.templates.unshard_value(command.template_id)
+
+    message_bus.handle(
+        [domain_events.TemplateValueUnsharded(template_id=command.template_id)]
+    )
+
+    return value
+
+
+def bulk_delete_templates(
+    templates_unit_of_work: AbstractTemplatesUnitOfWork,
+    message_bus: MessageBus,
+    command: domain_commands.BulkDeleteTemplates,
+) -> int:
+    return _change_templates_in_chunks(
+        templates_unit_of_work=templates_unit_of_work,
+        message_bus=message_bus,
+        filters=command.filters,
+        change=lambda templates, template_ids: templates.delete_many(template_ids),
+        create_event=lambda template_ids: domain_events.TemplatesDeleted(
+            template_ids=template_ids
+        ),
+    )
+
+
+def bulk_set_template_value(
+    templates_unit_of_work: AbstractTemplatesUnitOfWork,
+    message_bus: MessageBus,
+    command: domain_commands.BulkSetTemplateValue,
+) -> int:
+    entities.Template.validate_value(command.value)
+
+    return _change_templates_in_chunks(
+        templates_unit_of_work=templates_unit_of_work,
+        message_bus=message_bus,
+        filters=command.filters,
+        change=lambda templates, template_ids: templates.set_value_many(
+            template_ids=template_ids, value=command.value
+        ),
+        create_event=lambda template_ids: domain_events.TemplatesValueSet(
+            template_ids=template_ids, value=command.value
+        ),
+    )
+
+
+def bulk_subtract_template_value(
+    templates_unit_of_work: AbstractTemplatesUnitOfWork,
+    message_bus: MessageBus,
+    command: domain_commands.BulkSubtractTemplateValue,
+) -> int:
+    # Templates, which value would become invalid, are skipped,
+    # instead of failing the whole command.
+    return _change_templates_in_chunks(
+        templates_unit_of_work=templates_unit_of_work,
+        message_bus=message_bus,
+        filters=command.filters,
+        change=lambda templates, template_ids: templates.subtract_value_many(
+            template_ids=template_ids, value=command.value
+        ),
+        create_event=lambda template_ids: domain_events.TemplatesValueSubtracted(
+            template_ids=template_ids, subtracted_value=command.value
+        ),
+    )
+
+
+def import_templates(
+    templates_unit_of_work: AbstractTemplatesUnitOfWork,
+    message_bus: MessageBus,
+    templates: Iterable[InputImportedTemplate],
+) -> OutputTemplatesImport:
+    """
+    Templates are validated and saved as they are read,
+    so any number of them can be imported.
+    Templates with ids, which already exist, are skipped.
+    Each chunk is committed on its own, so an event is emitted
+    for templates of each of them.
+
+    :raises InvalidTemplateValue: Value of an imported template is invalid,
+                                  chunks saved before are kept.
+    """
+
+    start = time.perf_counter()
+    processed = 0
+    imported = 0
+    imported_entities = _map_imported_templates_to_entities(templates)
+
+    while chunk := list(itertools.islice(imported_entities, IMPORT_CHUNK_SIZE)):
+        with templates_unit_of_work:
+            imported_ids = templates_unit_of_work.templates.import_many(chunk)
+        if imported_ids:
+            message_bus.handle(
+                [domain_events.TemplatesImported(template_ids=tuple(imported_ids))]
+            )
+        processed += len(chunk)
+        imported += len(imported_ids)
+        logger.info(
+            "Import progress: %d templates processed, %d imported, %.0f rows/s.",
+            processed,
+            imported,
+            processed / (time.perf_counter() - start),
+        )
+
+    return OutputTemplatesImport(
+        processed=processed,
+        imported=imported,
+        elapsed_seconds=time.perf_counter() - start,
+    )
+
+
+def _map_imported_templates_to_entities(
+    templates: Iterable[InputImportedTemplate],
+) -> Iterator[entities.Template]:
+    for number, template in enumerate(templates, start=1):
+        try:
+            yield entities.Template(
+                id=template.id or entities.Template.generate_id(),
+                timestamp=template.timestamp or get_current_timestamp(),
+                version=INITIAL_TEMPLATE_VERSION,
+                # Every template starts with value 0 (e.g. as exported
+                # after being created), other values have to be valid.
+                value=template.value
+                if template.value != INITIAL_TEMPLATE_VALUE
+                else None,
+            )
+        except domain_exceptions.InvalidTemplateValue as err:
+            raise domain_exceptions.InvalidTemplateValue(
+                f"Template number {number}: {err}"
+            ) from err
+
+
+def execute_templates_commands(
+    templates_unit_of_work: AbstractTemplatesUnitOfWork,
+    message_bus: MessageBus,
+    commands: Sequence[
+        domain_commands.SetTemplateValue
+        | domain_commands.SubtractTemplateValue
+        | domain_commands.DeleteTemplate
+    ],
+    atomic: bool = True,
+) -> list[CommandResult]:
+    # Commands are executed in order of ids of their templates,
+    # so concurrent batches lock templates in the same order and don't deadlock.
+    # Sorting is stable, so commands of the same template keep their order.
+    # More details can be found here:
+    # https://www.postgresql.org/docs/current/explicit-locking.html#LOCKING-DEADLOCKS.
+    order = sorted(range(len(commands)), key=lambda index: commands[index].template_id)
+
+    results = message_bus.handle_batch(
+        commands=[commands[index] for index in order],
+        unit_of_work=templates_unit_of_work,
+        atomic=atomic,
+    )
+
+    # Results are returned in the same order as given commands.
+    return [result for _, result in sorted(zip(order, results), key=lambda x: x[0])]
+
+
+def _change_templates_in_chunks(
+    templates_unit_of_work: AbstractTemplatesUnitOfWork,
+    message_bus: MessageBus,
+    filters: TemplatesFilters,
+    change: Callable[[AbstractTemplatesDomainRepository, list[TemplateId]], list],
+    create_event: Callable[[tuple[TemplateId, ...]], DomainEvent],
+) -> int:
+    # Templates are walked through in order of their ids (keyset pagination),
+    # so every chunk starts where the previous one ended, even when changed
+    # templates still match filters.
+    # Each chunk is committed on its own, so an event is emitted for each
+    # of them right away, and changes of committed chunks aren't missed,
+    # when a later one fails.
+    found_ids: list[TemplateId] = []
+    processed = 0
+    changed = 0
+
+    while True:
+        found_ids, chunk_changed_ids = _change_templates_chunk(
+            templates_unit_of_work=templates_unit_of_work,
+            message_bus=message_bus,
+            filters=filters,
+            after=found_ids[-1] if found_ids else None,
+            change=change,
+        )
+        if chunk_changed_ids:
+            message_bus.handle([create_event(tuple(chunk_changed_ids))])
+        processed += len(found_ids)
+        changed += len(chunk_changed_ids)
+        logger.info(
+            "Bulk change progress: %d templates processed, %d changed.",
+            processed,
+            changed,
+        )
+
+        if len(found_ids) < BULK_CHUNK_SIZE:
+            return changed
+
+
+def _check_revision(
+    template: entities.Template,
+    expected_revisions: frozenset[TemplateRevision] | None,
+) -> None:
+    if expected_revisions is not None and template.revision not in expected_revisions:
+        raise domain_exceptions.TemplateRevisionMismatch(
+            f"Template with id '{template.id}' has been changed since it was seen."
+        )
+
+
+@retry_on_version_conflict
+def _change_templates_chunk(
+    templates_unit_of_work: AbstractTemplatesUnitOfWork,
+    message_bus: MessageBus,
+    filters: TemplatesFilters,
+    after: TemplateId | None,
+    change: Callable[[AbstractTemplatesDomainRepository, list[TemplateId]], list],
+) -> tuple[list[TemplateId], list[TemplateId]]:
+    with templates_unit_of_work:
+        found_ids = templates_unit_of_work.templates.find_ids_for_update(
+            filters=filters, after=after, limit=BULK_CHUNK_SIZE
+        )
+        changed_ids = (
+            change(templates_unit_of_work.templates, found_ids) if found_ids else []
+        )
+
+    return found_ids, changed_ids
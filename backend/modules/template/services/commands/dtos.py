@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from ...domain.value_objects import TemplateId, TemplateValue
+
+
+@dataclass(frozen=True)
+class InputImportedTemplate:
+    # Missing id and timestamp are generated, like for a created template.
+    id: TemplateId | None
+    value: TemplateValue | None
+    timestamp: datetime | None
+
+
+@dataclass(frozen=True)
+class OutputTemplatesImport:
+    processed: int
+    imported: int
+    elapsed_seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.processed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def serialize(self):
+        return {
+            "processed": self.processed,
+            "imported": self.imported,
+            "rows_per_second": round(self.rows_per_second),
+        }
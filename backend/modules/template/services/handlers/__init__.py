@@ -3,30 +3,89 @@ from typing import Callable
 from ....common.domain.commands import DomainCommand
 from ....common.domain.events import DomainEvent
 from ...domain.commands import (
+    BulkDeleteTemplates,
+    BulkSetTemplateValue,
+    BulkSubtractTemplateValue,
     CreateTemplate,
     DeleteTemplate,
     SetTemplateValue,
+    ShardTemplateValue,
     SubtractTemplateValue,
+    UnshardTemplateValue,
 )
 from ...domain.events import (
     TemplateCreated,
     TemplateDeleted,
+    TemplatesDeleted,
+    TemplatesImported,
+    TemplatesValueSet,
+    TemplatesValueSubtracted,
     TemplateValueSet,
+    TemplateValueSharded,
     TemplateValueSubtracted,
+    TemplateValueUnsharded,
 )
 from ...services.commands import (
+    bulk_delete_templates,
+    bulk_set_template_value,
+    bulk_subtract_template_value,
     create_template,
     delete_template,
     set_template_value,
+    shard_template_value,
     subtract_template_value,
+    unshard_template_value,
+)
+from .cache import (
+    evict_all_templates,
+    evict_changed_templates,
+    evict_templates_lists,
+    invalidate_cached_template,
+    invalidate_cached_templates,
+    invalidate_cached_templates_lists,
+)
+from .notifications import (
+    send_template_value_set_notification,
+    send_templates_value_set_notification,
 )
-from .notifications import send_template_value_set_notification
 
 EVENT_HANDLERS: dict[type[DomainEvent], list[Callable]] = {
-    TemplateValueSet: [send_template_value_set_notification],
-    TemplateValueSubtracted: [],
-    TemplateCreated: [],
-    TemplateDeleted: [],
+    TemplateValueSet: [
+        invalidate_cached_template,
+        invalidate_cached_templates_lists,
+        send_template_value_set_notification,
+    ],
+    TemplateValueSubtracted: [
+        invalidate_cached_template,
+        invalidate_cached_templates_lists,
+    ],
+    TemplateCreated: [invalidate_cached_templates_lists],
+    TemplateDeleted: [invalidate_cached_template, invalidate_cached_templates_lists],
+    # Value of template doesn't change, but its version does, and its value
+    # used to filter and order templates is refreshed.
+    TemplateValueSharded: [
+        invalidate_cached_template,
+        invalidate_cached_templates_lists,
+    ],
+    TemplateValueUnsharded: [
+        invalidate_cached_template,
+        invalidate_cached_templates_lists,
+    ],
+    TemplatesValueSet: [
+        invalidate_cached_templates,
+        invalidate_cached_templates_lists,
+        send_templates_value_set_notification,
+    ],
+    TemplatesValueSubtracted: [
+        invalidate_cached_templates,
+        invalidate_cached_templates_lists,
+    ],
+    TemplatesDeleted: [
+        invalidate_cached_templates,
+        invalidate_cached_templates_lists,
+    ],
+    # Only new templates are imported, so none of them can be cached yet.
+    TemplatesImported: [invalidate_cached_templates_lists],
 }
 
 
@@ -35,4 +94,20 @@ COMMAND_HANDLERS: dict[type[DomainCommand], Callable] = {
     SubtractTemplateValue: subtract_template_value,
     CreateTemplate: create_template,
     DeleteTemplate: delete_template,
+    ShardTemplateValue: shard_template_value,
+    UnshardTemplateValue: unshard_template_value,
+    BulkDeleteTemplates: bulk_delete_templates,
+    BulkSetTemplateValue: bulk_set_template_value,
+    BulkSubtractTemplateValue: bulk_subtract_template_value,
 }
+
+__all__ = [
+    "COMMAND_HANDLERS",
+    "EVENT_HANDLERS",
+    "evict_all_templates",
+    "evict_changed_templates",
+    "evict_templates_lists",
+    "invalidate_cached_template",
+    "invalidate_cached_templates",
+    "invalidate_cached_templates_lists",
+]
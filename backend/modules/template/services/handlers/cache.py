@@ -0,0 +1,77 @@
+from typing import Iterable
+
+from modules.common.cache import AbstractVersionedCache, GenerationalCache
+
+from ...domain.events import (
+    TemplateCreated,
+    TemplateDeleted,
+    TemplatesDeleted,
+    TemplatesImported,
+    TemplatesValueSet,
+    TemplatesValueSubtracted,
+    TemplateValueSet,
+    TemplateValueSharded,
+    TemplateValueSubtracted,
+    TemplateValueUnsharded,
+)
+from ...domain.value_objects import TemplateId
+
+
+def invalidate_cached_template(
+    event: TemplateValueSet
+    | TemplateValueSubtracted
+    | TemplateDeleted
+    | TemplateValueSharded
+    | TemplateValueUnsharded,
+    templates_cache: AbstractVersionedCache,
+):
+    templates_cache.invalidate(event.template_id)
+
+
+def invalidate_cached_templates(
+    event: TemplatesValueSet | TemplatesValueSubtracted | TemplatesDeleted,
+    templates_cache: AbstractVersionedCache,
+):
+    for template_id in event.template_ids:
+        templates_cache.invalidate(template_id)
+
+
+def invalidate_cached_templates_lists(
+    event: TemplateCreated
+    | TemplateValueSet
+    | TemplateValueSubtracted
+    | TemplateDeleted
+    | TemplatesValueSet
+    | TemplatesValueSubtracted
+    | TemplatesDeleted
+    | TemplatesImported
+    | TemplateValueSharded
+    | TemplateValueUnsharded,
+    templates_list_cache: GenerationalCache | None,
+):
+    if templates_list_cache is None:
+        return
+
+    # It isn't known which lists a change affects, so all of them are invalidated.
+    templates_list_cache.invalidate()
+
+
+def evict_changed_templates(
+    template_ids: Iterable[TemplateId],
+    templates_cache: AbstractVersionedCache,
+):
+    # Templates changed by another process are already invalidated
+    # in caches shared by processes.
+    for template_id in template_ids:
+        templates_cache.invalidate_locally(template_id)
+
+
+def evict_all_templates(templates_cache: AbstractVersionedCache):
+    templates_cache.clear_locally()
+
+
+def evict_templates_lists(templates_list_cache: GenerationalCache | None):
+    if templates_list_cache is None:
+        return
+
+    templates_list_cache.invalidate_locally()
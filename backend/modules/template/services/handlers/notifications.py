@@ -5,7 +5,7 @@ from modules.notifications.domain import commands as notification_domain_command
 from modules.notifications.domain.ports import AbstractEmailNotificator
 from modules.notifications.services import commands as notification_commands
 
-from ...domain.events import TemplateValueSet
+from ...domain.events import TemplatesValueSet, TemplateValueSet
 
 logger = logging.getLogger(__name__)
 
@@ -24,3 +24,20 @@ def send_template_value_set_notification(
             content=f"Template value set for {event.template_id}.",
         ),
     )
+
+
+def send_templates_value_set_notification(
+    event: TemplatesValueSet,
+    main_task_dispatcher: AbstractTaskDispatcher,
+    email_notificator: AbstractEmailNotificator,
+):
+    # A single notification is sent for all templates changed by a bulk command.
+    notification_commands.send_email(
+        email_notificator=email_notificator,
+        task_dispatcher=main_task_dispatcher,
+        command=notification_domain_commands.SendEmail(
+            recipients=["admin@admin.com"],
+            title="Templates value set",
+            content=f"Value set for {len(event.template_ids)} templates.",
+        ),
+    )
@@ -1,3 +1,15 @@
-from .queries import get_template, list_templates
+from .queries import (
+    export_templates,
+    get_template,
+    get_templates,
+    list_templates,
+    list_templates_by_cursor,
+)
 
-__all__ = ["get_template", "list_templates"]
+__all__ = [
+    "export_templates",
+    "get_template",
+    "get_templates",
+    "list_templates",
+    "list_templates_by_cursor",
+]
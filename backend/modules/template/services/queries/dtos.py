@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from datetime import datetime
 
+from modules.common.pagination import Cursor, TotalCount
+
 from ...domain.value_objects import TemplateId, TemplateValue
 
 
@@ -19,6 +21,8 @@ class OutputTemplate:
 @dataclass
 class DetailedOutputTemplate(OutputTemplate):
     value: TemplateValue
+    # Version isn't serialized, it's exposed to clients as a part of an ETag.
+    version: int
 
     def serialize(self):
         return {
@@ -26,3 +30,11 @@ class DetailedOutputTemplate(OutputTemplate):
             "value": self.value.value,
             "timestamp": self.timestamp,
         }
+
+
+@dataclass
+class OutputTemplatesCursorPage:
+    templates: list[OutputTemplate]
+    count: TotalCount
+    next_cursor: Cursor | None
+    previous_cursor: Cursor | None
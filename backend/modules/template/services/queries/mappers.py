@@ -16,4 +16,5 @@ def map_template_entity_to_output_detailed_dto(
         id=template.id,
         value=template.value,
         timestamp=template.timestamp,
+        version=template.version,
     )
@@ -1,7 +1,13 @@
 from abc import ABC, abstractmethod
+from typing import Iterator
 
 from .....common.dtos import Ordering
-from .....common.pagination.dtos import Pagination
+from .....common.pagination.dtos import (
+    CountStrategyEnum,
+    CursorPagination,
+    Pagination,
+    TotalCount,
+)
 from .....template.domain.entities import Template
 from .....template.domain.ports.dtos import TemplatesFilters
 from .....template.domain.value_objects import TemplateId
@@ -19,17 +25,46 @@ class AbstractTemplatesQueryRepository(ABC):
 
         pass
 
+    @abstractmethod
+    def get_many(self, template_ids: list[TemplateId]) -> list[Template]:
+        """
+        :param template_ids: IDs of templates to retrieve.
+        :return: Existing templates with given ids, in any order.
+        """
+
+        pass
+
+    @abstractmethod
+    def stream(
+        self, filters: TemplatesFilters, ordering: list[Ordering]
+    ) -> Iterator[Template]:
+        """
+        :param filters: Filters to apply.
+        :param ordering: Ordering to apply.
+        :return: All templates matching given filters, retrieved gradually,
+                 as seen at the moment of retrieving the first one.
+        """
+
+        pass
+
     @abstractmethod
     def list(
         self,
         filters: TemplatesFilters,
         ordering: list[Ordering],
-        pagination: Pagination | None,
-    ) -> tuple[list[Template], int]:
+        pagination: Pagination | CursorPagination | None,
+        count_strategy: CountStrategyEnum = CountStrategyEnum.EXACT,
+    ) -> tuple[list[Template], TotalCount]:
         """
         :param filters: Filters to apply.
         :param ordering: Ordering to apply.
         :param pagination: Pagination to apply.
+                           Cursor pagination orders templates by timestamp only
+                           and returns them in the order of given ordering,
+                           also when they precede the cursor.
+        :param count_strategy: Way of counting templates matching given filters.
+                               Another kind of count can be returned,
+                               when the requested one isn't reasonable.
         :return: List of all templates and
                  total count of templates matching given filters.
         """
@@ -1,9 +1,19 @@
+from typing import Iterator
+
+from modules.common.cache import GenerationalCache, make_key
 from modules.common.dtos import Ordering, OrderingEnum
-from modules.common.pagination import Pagination
+from modules.common.pagination import (
+    CountStrategyEnum,
+    Cursor,
+    CursorPagination,
+    Pagination,
+    TotalCount,
+)
 
+from ...domain.entities import Template
 from ...domain.ports.dtos import TemplatesFilters
 from ...domain.value_objects import TemplateId
-from .dtos import DetailedOutputTemplate, OutputTemplate
+from .dtos import DetailedOutputTemplate, OutputTemplate, OutputTemplatesCursorPage
 from .mappers import (
     map_template_entity_to_output_detailed_dto,
     map_template_entity_to_output_dto,
@@ -20,23 +30,169 @@ def get_template(
     )
 
 
+def get_templates(
+    templates_query_repository: AbstractTemplatesQueryRepository,
+    template_ids: list[TemplateId],
+) -> tuple[list[DetailedOutputTemplate], list[TemplateId]]:
+    """
+    :param template_ids: IDs of templates to retrieve, repeated ids are skipped.
+    :return: Found templates, in the same order as given ids,
+             and ids of templates which don't exist.
+    """
+
+    unique_template_ids = list(dict.fromkeys(template_ids))
+    templates = {
+        template.id: template
+        for template in templates_query_repository.get_many(unique_template_ids)
+    }
+
+    return [
+        map_template_entity_to_output_detailed_dto(templates[template_id])
+        for template_id in unique_template_ids
+        if template_id in templates
+    ], [
+        template_id
+        for template_id in unique_template_ids
+        if template_id not in templates
+    ]
+
+
 def list_templates(
     templates_query_repository: AbstractTemplatesQueryRepository,
     filters: TemplatesFilters | None = None,
     ordering: list[Ordering] | None = None,
     pagination: Pagination | None = None,
-) -> tuple[list[OutputTemplate], int]:
+    count_strategy: CountStrategyEnum = CountStrategyEnum.EXACT,
+    templates_list_cache: GenerationalCache | None = None,
+    max_age_seconds: float | None = None,
+) -> tuple[list[OutputTemplate], TotalCount]:
+    """
+    :param templates_list_cache: Cache of results, which is skipped when not given.
+    :param max_age_seconds: Maximum age of a cached result,
+                            0 always lists templates from the repository.
+    """
+
     if filters is None:
         filters = TemplatesFilters()
 
     if ordering is None:
         ordering = [Ordering(field="timestamp", order=OrderingEnum.DESCENDING)]
 
-    templates, count = templates_query_repository.list(
+    templates, count = _list_templates(
+        templates_query_repository=templates_query_repository,
         filters=filters,
         ordering=ordering,
         pagination=pagination,
+        count_strategy=count_strategy,
+        templates_list_cache=templates_list_cache,
+        max_age_seconds=max_age_seconds,
     )
     return [
         map_template_entity_to_output_dto(template) for template in templates
     ], count
+
+
+def export_templates(
+    templates_query_repository: AbstractTemplatesQueryRepository,
+    filters: TemplatesFilters | None = None,
+    ordering: list[Ordering] | None = None,
+) -> Iterator[DetailedOutputTemplate]:
+    if filters is None:
+        filters = TemplatesFilters()
+
+    if ordering is None:
+        ordering = [Ordering(field="timestamp", order=OrderingEnum.DESCENDING)]
+
+    for template in templates_query_repository.stream(
+        filters=filters, ordering=ordering
+    ):
+        yield map_template_entity_to_output_detailed_dto(template)
+
+
+def list_templates_by_cursor(
+    templates_query_repository: AbstractTemplatesQueryRepository,
+    pagination: CursorPagination,
+    filters: TemplatesFilters | None = None,
+    ordering: list[Ordering] | None = None,
+    count_strategy: CountStrategyEnum = CountStrategyEnum.EXACT,
+    templates_list_cache: GenerationalCache | None = None,
+    max_age_seconds: float | None = None,
+) -> OutputTemplatesCursorPage:
+    """
+    :param templates_list_cache: Cache of results, which is skipped when not given.
+    :param max_age_seconds: Maximum age of a cached result,
+                            0 always lists templates from the repository.
+    :raises ValueError: Templates are ordered by a field other than timestamp.
+    """
+
+    if filters is None:
+        filters = TemplatesFilters()
+
+    if ordering is None:
+        ordering = [Ordering(field="timestamp", order=OrderingEnum.DESCENDING)]
+
+    # Cursor is a position in templates ordered by timestamp and ID,
+    # so it can't be used to page through templates in any other order.
+    if any(order.field != "timestamp" for order in ordering):
+        raise ValueError("Templates paged by cursor can be ordered only by timestamp.")
+
+    templates, count = _list_templates(
+        templates_query_repository=templates_query_repository,
+        filters=filters,
+        ordering=ordering,
+        pagination=pagination,
+        count_strategy=count_strategy,
+        templates_list_cache=templates_list_cache,
+        max_age_seconds=max_age_seconds,
+    )
+
+    if pagination.cursor is not None and pagination.cursor.backwards:
+        has_previous, has_next = count.has_more, bool(templates)
+    else:
+        has_previous, has_next = pagination.cursor is not None, count.has_more
+
+    return OutputTemplatesCursorPage(
+        templates=[
+            map_template_entity_to_output_dto(template) for template in templates
+        ],
+        count=count,
+        next_cursor=(
+            Cursor(timestamp=templates[-1].timestamp, id=templates[-1].id)
+            if has_next and templates
+            else None
+        ),
+        previous_cursor=(
+            Cursor(timestamp=templates[0].timestamp, id=templates[0].id, backwards=True)
+            if has_previous and templates
+            else None
+        ),
+    )
+
+
+def _list_templates(
+    templates_query_repository: AbstractTemplatesQueryRepository,
+    filters: TemplatesFilters,
+    ordering: list[Ordering],
+    pagination: Pagination | CursorPagination | None,
+    count_strategy: CountStrategyEnum,
+    templates_list_cache: GenerationalCache | None,
+    max_age_seconds: float | None,
+) -> tuple[list[Template], TotalCount]:
+    def list_from_repository() -> tuple[list[Template], TotalCount]:
+        return templates_query_repository.list(
+            filters=filters,
+            ordering=ordering,
+            pagination=pagination,
+            count_strategy=count_strategy,
+        )
+
+    if templates_list_cache is None:
+        return list_from_repository()
+
+    # Any change of templates can change any list, so cached lists
+    # are invalidated all at once, by handlers of events of the change.
+    return templates_list_cache.get_or_load(
+        key=make_key(filters, ordering, pagination, count_strategy),
+        load=list_from_repository,
+        max_age_seconds=max_age_seconds,
+    )
@@ -95,12 +95,20 @@ def message_bus() -> annotations.YieldFixture[common_message_bus.MessageBus]:
             template_domain_events.TemplateDeleted: [],
             template_domain_events.TemplateValueSet: [],
             template_domain_events.TemplateValueSubtracted: [],
+            template_domain_events.TemplateValueSharded: [],
+            template_domain_events.TemplateValueUnsharded: [],
+            template_domain_events.TemplatesDeleted: [],
+            template_domain_events.TemplatesImported: [],
+            template_domain_events.TemplatesValueSet: [],
+            template_domain_events.TemplatesValueSubtracted: [],
         },
         command_handlers={
             template_domain_commands.CreateTemplate: lambda event: None,
             template_domain_commands.DeleteTemplate: lambda event: None,
             template_domain_commands.SetTemplateValue: lambda event: None,
             template_domain_commands.SubtractTemplateValue: lambda event: None,
+            template_domain_commands.ShardTemplateValue: lambda event: None,
+            template_domain_commands.UnshardTemplateValue: lambda event: None,
         },
     )
 
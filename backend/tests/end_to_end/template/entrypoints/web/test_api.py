@@ -1,3 +1,4 @@
+import json
 from datetime import datetime, timedelta
 from http import HTTPStatus
 
@@ -17,10 +18,24 @@ from ....utils import get_url
 TEMPLATE_ROUTES = {
     "retrieve-template": "api.template-api.get_template_endpoint",
     "list-templates": "api.template-api.list_templates_endpoint",
+    "get-templates": "api.template-api.get_templates_endpoint",
+    "get-templates-cache-statistics": (
+        "api.template-api.get_templates_cache_statistics_endpoint"
+    ),
+    "export-templates": "api.template-api.export_templates_endpoint",
+    "import-templates": "api.template-api.import_templates_endpoint",
     "create-template": "api.template-api.create_template_endpoint",
     "delete-template": "api.template-api.delete_template_endpoint",
     "set-template-value": "api.template-api.set_template_value_endpoint",
     "subtract-template-value": "api.template-api.subtract_template_value_endpoint",
+    "bulk-delete-templates": "api.template-api.bulk_delete_templates_endpoint",
+    "bulk-set-template-value": "api.template-api.bulk_set_template_value_endpoint",
+    "bulk-subtract-template-value": (
+        "api.template-api.bulk_subtract_template_value_endpoint"
+    ),
+    "execute-templates-commands": (
+        "api.template-api.execute_templates_commands_endpoint"
+    ),
 }
 
 
@@ -120,6 +135,100 @@ def test_get_template_endpoint_returns_400_when_template_id_has_invalid_format(
     assert consts.ERROR_RESPONSE_KEY_DETAILS_NAME in json_response
 
 
+def test_get_template_endpoint_accepts_consistency_token(
+    client: APIClientData,
+):
+    # Given
+    api_client = client.client
+    template_id = create_template_via_api(client)
+
+    # When
+    response = api_client.get(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="retrieve-template",
+            path_parameters={"template_id": template_id},
+        ),
+        headers={consts.CONSISTENCY_TOKEN_HEADER_NAME: "0/16B3748"},
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_get_template_endpoint_returns_400_when_consistency_token_has_invalid_format(  # noqa: E501
+    client: APIClientData,
+):
+    # Given
+    api_client = client.client
+    template_id = create_template_via_api(client)
+
+    # When
+    response = api_client.get(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="retrieve-template",
+            path_parameters={"template_id": template_id},
+        ),
+        headers={consts.CONSISTENCY_TOKEN_HEADER_NAME: SQL_INJECTION_STRING},
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    json_response = response.json
+    assert json_response is not None
+    assert consts.ERROR_RESPONSE_KEY_DETAILS_NAME in json_response
+
+
+def test_get_template_endpoint_returns_304_when_template_has_not_changed(
+    client: APIClientData,
+):
+    # Given
+    api_client = client.client
+    template_id = create_template_via_api(client)
+    url = get_url(
+        app=api_client.application,
+        routes=TEMPLATE_ROUTES,
+        url_type="retrieve-template",
+        path_parameters={"template_id": template_id},
+    )
+    etag = api_client.get(url).headers["ETag"]
+
+    # When
+    response = api_client.get(url, headers={"If-None-Match": etag})
+
+    # Then
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert not response.data
+
+
+def test_list_templates_endpoint_returns_304_when_page_has_not_changed(
+    client: APIClientData,
+):
+    # Given
+    api_client = client.client
+    create_template_via_api(client)
+    url = get_url(
+        app=api_client.application,
+        routes=TEMPLATE_ROUTES,
+        url_type="list-templates",
+    )
+    etag = api_client.get(url).headers["ETag"]
+
+    # When
+    response = api_client.get(url, headers={"If-None-Match": etag})
+    create_template_via_api(client)
+    changed_page_response = api_client.get(url, headers={"If-None-Match": etag})
+
+    # Then
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert changed_page_response.status_code == HTTPStatus.OK
+    assert changed_page_response.headers["ETag"] != etag
+
+
 def test_list_templates_endpoint_returns_empty_list_when_no_template_exists(
     client: APIClientData,
 ):
@@ -251,6 +360,181 @@ def test_list_templates_endpoint_pagination_next_link(client: APIClientData):
     assert TemplateId(second_page_results[0]["id"]) == template_2_id
 
 
+def test_list_templates_endpoint_cursor_pagination_links(client: APIClientData):
+    # Given
+    api_client = client.client
+    pagination_limit = 1
+
+    template_2_id = create_template_via_api(client)
+    template_1_id = create_template_via_api(client)
+
+    # When and then
+    response = api_client.get(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="list-templates",
+        ),
+        query_string={
+            consts.PAGINATION_CURSOR_QUERY_PARAMETER_NAME: "",
+            consts.PAGINATION_LIMIT_QUERY_PARAMETER_NAME: pagination_limit,
+        },
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    json_response: dict = response.json  # type: ignore[assignment, no-redef]
+    assert json_response[consts.PAGINATION_TOTAL_COUNT_NAME] == 2
+    assert json_response.get(consts.PAGINATION_PREVIOUS_LINK_RELATION) is None
+    first_page_results = json_response[consts.PAGINATION_RESULTS_NAME]
+    assert len(first_page_results) == 1
+    assert TemplateId(first_page_results[0]["id"]) == template_1_id
+
+    # When and then
+    response = api_client.get(json_response[consts.PAGINATION_NEXT_LINK_RELATION])
+
+    assert response.status_code == HTTPStatus.OK
+    json_response: dict = response.json  # type: ignore[assignment, no-redef]
+    assert json_response.get(consts.PAGINATION_NEXT_LINK_RELATION) is None
+    second_page_results = json_response[consts.PAGINATION_RESULTS_NAME]
+    assert len(second_page_results) == 1
+    assert TemplateId(second_page_results[0]["id"]) == template_2_id
+
+    # When and then
+    response = api_client.get(json_response[consts.PAGINATION_PREVIOUS_LINK_RELATION])
+
+    assert response.status_code == HTTPStatus.OK
+    json_response: dict = response.json  # type: ignore[assignment, no-redef]
+    assert json_response.get(consts.PAGINATION_PREVIOUS_LINK_RELATION) is None
+    assert json_response[consts.PAGINATION_RESULTS_NAME] == first_page_results
+
+
+def test_list_templates_endpoint_returns_400_when_cursor_is_invalid(
+    client: APIClientData,
+):
+    # Given
+    api_client = client.client
+
+    # When
+    response = api_client.get(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="list-templates",
+        ),
+        query_string={
+            consts.PAGINATION_CURSOR_QUERY_PARAMETER_NAME: "invalid-cursor",
+        },
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_list_templates_endpoint_returns_400_when_cursor_page_is_ordered_by_value(
+    client: APIClientData,
+):
+    # Given
+    api_client = client.client
+
+    # When
+    response = api_client.get(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="list-templates",
+        ),
+        query_string={
+            consts.PAGINATION_CURSOR_QUERY_PARAMETER_NAME: "",
+            consts.ORDERING_QUERY_PARAMETER_NAME: "value",
+        },
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.parametrize(
+    "count_strategy, expected_count_kind",
+    [("exact", "exact"), ("estimated", "exact"), ("cached", "cached")],
+)
+def test_list_templates_endpoint_returns_count_kind(
+    client: APIClientData, count_strategy: str, expected_count_kind: str
+):
+    # Given
+    api_client = client.client
+    templates_number = 3
+    for _ in range(templates_number):
+        create_template_via_api(client)
+
+    # When
+    response = api_client.get(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="list-templates",
+        ),
+        query_string={
+            consts.PAGINATION_COUNT_STRATEGY_QUERY_PARAMETER_NAME: count_strategy,
+        },
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.OK
+    json_response: dict = response.json  # type: ignore[assignment]
+    assert json_response[consts.PAGINATION_TOTAL_COUNT_KIND_NAME] == expected_count_kind
+    assert json_response[consts.PAGINATION_TOTAL_COUNT_NAME] == templates_number
+
+
+def test_list_templates_endpoint_skips_count(client: APIClientData):
+    # Given
+    api_client = client.client
+    pagination_limit = 1
+    for _ in range(2):
+        create_template_via_api(client)
+
+    # When
+    response = api_client.get(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="list-templates",
+        ),
+        query_string={
+            consts.PAGINATION_COUNT_STRATEGY_QUERY_PARAMETER_NAME: "none",
+            consts.PAGINATION_LIMIT_QUERY_PARAMETER_NAME: pagination_limit,
+        },
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.OK
+    json_response: dict = response.json  # type: ignore[assignment]
+    assert json_response[consts.PAGINATION_TOTAL_COUNT_KIND_NAME] == "none"
+    assert json_response[consts.PAGINATION_TOTAL_COUNT_NAME] is None
+    assert json_response[consts.PAGINATION_NEXT_LINK_RELATION] is not None
+
+
+def test_list_templates_endpoint_returns_400_when_count_strategy_is_invalid(
+    client: APIClientData,
+):
+    # Given
+    api_client = client.client
+
+    # When
+    response = api_client.get(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="list-templates",
+        ),
+        query_string={
+            consts.PAGINATION_COUNT_STRATEGY_QUERY_PARAMETER_NAME: "invalid",
+        },
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
 def test_list_templates_endpoint_handles_invalid_pagination_parameters(
     client: APIClientData,
 ):
@@ -275,11 +559,110 @@ def test_list_templates_endpoint_handles_invalid_pagination_parameters(
     assert consts.ERROR_RESPONSE_KEY_DETAILS_NAME in json_response
 
 
-def test_list_templates_endpoint_filtering_by_query(client: APIClientData):
+def test_list_templates_endpoint_filtering_by_query(client: APIClientData):
+    # Given
+    api_client = client.client
+    create_template_via_api(client)
+    template_id = create_template_via_api(client)
+
+    # When
+    response = api_client.get(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="list-templates",
+        ),
+        query_string={"query": template_id},
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.OK
+
+    json_response = response.json
+    assert json_response is not None
+
+    results = json_response[consts.PAGINATION_RESULTS_NAME]
+    assert len(results) == 1
+    assert all(TemplateId.from_hex(item["id"]) == template_id for item in results)
+
+
+def test_list_templates_endpoint_filtering_by_value_range(client: APIClientData):
+    # Given
+    api_client = client.client
+    create_template_via_api(client)
+    template_id = create_template_via_api(client)
+    api_client.patch(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="set-template-value",
+            path_parameters={"template_id": template_id},
+        ),
+        json={"value": 10},
+    )
+
+    # When
+    response = api_client.get(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="list-templates",
+        ),
+        query_string={"value_from": 5, "value_to": 15},
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.OK
+
+    json_response = response.json
+    assert json_response is not None
+
+    results = json_response[consts.PAGINATION_RESULTS_NAME]
+    assert len(results) == 1
+    assert TemplateId.from_hex(results[0]["id"]) == template_id
+
+
+def test_list_templates_endpoint_filtering_by_contained_data(client: APIClientData):
+    # Given
+    api_client = client.client
+    create_template_via_api(client)
+    template_id = create_template_via_api(client)
+    api_client.patch(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="set-template-value",
+            path_parameters={"template_id": template_id},
+        ),
+        json={"value": 10},
+    )
+
+    # When
+    response = api_client.get(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="list-templates",
+        ),
+        query_string={"data": '{"value": 10}'},
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.OK
+
+    json_response = response.json
+    assert json_response is not None
+
+    results = json_response[consts.PAGINATION_RESULTS_NAME]
+    assert len(results) == 1
+    assert TemplateId.from_hex(results[0]["id"]) == template_id
+
+
+def test_list_templates_endpoint_returns_400_when_data_filter_is_invalid(
+    client: APIClientData,
+):
     # Given
     api_client = client.client
-    create_template_via_api(client)
-    template_id = create_template_via_api(client)
 
     # When
     response = api_client.get(
@@ -288,18 +671,11 @@ def test_list_templates_endpoint_filtering_by_query(client: APIClientData):
             routes=TEMPLATE_ROUTES,
             url_type="list-templates",
         ),
-        query_string={"query": template_id},
+        query_string={"data": "[10]"},
     )
 
     # Then
-    assert response.status_code == HTTPStatus.OK
-
-    json_response = response.json
-    assert json_response is not None
-
-    results = json_response[consts.PAGINATION_RESULTS_NAME]
-    assert len(results) == 1
-    assert all(TemplateId.from_hex(item["id"]) == template_id for item in results)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
 
 
 def test_list_templates_endpoint_filtering_a_few_attributes(client: APIClientData):
@@ -543,6 +919,48 @@ def test_set_template_value_endpoint_sets_template_value_when_specified_template
     assert DummyEmailNotificator.total_emails_sent == 1
 
 
+def test_set_template_value_endpoint_returns_412_when_template_has_changed(
+    client: APIClientData,
+):
+    # Given
+    api_client = client.client
+    template_id = create_template_via_api(client)
+    retrieve_url = get_url(
+        app=api_client.application,
+        routes=TEMPLATE_ROUTES,
+        url_type="retrieve-template",
+        path_parameters={"template_id": template_id},
+    )
+    set_value_url = get_url(
+        app=api_client.application,
+        routes=TEMPLATE_ROUTES,
+        url_type="set-template-value",
+        path_parameters={"template_id": template_id},
+    )
+    etag = api_client.get(retrieve_url).headers["ETag"]
+    first_value = fakers.fake_template_value().value
+    second_value = first_value + 1
+
+    # When
+    first_response = api_client.patch(
+        set_value_url, json={"value": first_value}, headers={"If-Match": etag}
+    )
+    second_response = api_client.patch(
+        set_value_url, json={"value": second_value}, headers={"If-Match": etag}
+    )
+
+    # Then
+    assert first_response.status_code == HTTPStatus.OK
+    assert second_response.status_code == HTTPStatus.PRECONDITION_FAILED
+    json_response = second_response.json
+    assert json_response is not None
+    assert consts.ERROR_RESPONSE_KEY_DETAILS_NAME in json_response
+
+    json_response = api_client.get(retrieve_url).json
+    assert json_response is not None
+    assert json_response["value"] == first_value
+
+
 def test_set_template_value_endpoint_returns_404_when_specified_template_does_not_exists(  # noqa: E501
     client: APIClientData,
 ):
@@ -814,3 +1232,354 @@ def test_subtract_value_endpoint_returns_422_when_subtraction_value_is_greater_o
     assert consts.ERROR_RESPONSE_KEY_DETAILS_NAME in json_response
 
     assert DummyEmailNotificator.total_emails_sent == 1
+
+
+def test_bulk_set_template_value_endpoint_sets_value_of_matching_templates(
+    client: APIClientData,
+):
+    # Given
+    api_client = client.client
+    template_id = create_template_via_api(client)
+    other_template_id = create_template_via_api(client)
+    other_template_value = fakers.fake_template_value(min_value=1).value
+    api_client.patch(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="set-template-value",
+            path_parameters={"template_id": other_template_id},
+        ),
+        json={"value": other_template_value},
+    )
+    template_value = fakers.fake_template_value(min_value=1).value
+
+    # When
+    response = api_client.post(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="bulk-set-template-value",
+        ),
+        json={"filters": {"value": 0}, "value": template_value},
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.OK
+
+    json_response = response.json
+    assert json_response is not None
+    assert json_response["count"] == 1
+
+    for _template_id, value in (
+        (template_id, template_value),
+        (other_template_id, other_template_value),
+    ):
+        response = api_client.get(
+            get_url(
+                app=api_client.application,
+                routes=TEMPLATE_ROUTES,
+                url_type="retrieve-template",
+                path_parameters={"template_id": _template_id},
+            )
+        )
+        assert response.json["value"] == value  # type: ignore[index]
+
+    assert DummyEmailNotificator.total_emails_sent == 2
+
+
+def test_bulk_delete_templates_endpoint_returns_400_when_filters_are_missing(
+    client: APIClientData,
+):
+    # Given
+    api_client = client.client
+    template_id = create_template_via_api(client)
+
+    # When
+    response = api_client.post(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="bulk-delete-templates",
+        ),
+        json={"filters": {}},
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    json_response = response.json
+    assert json_response is not None
+    assert consts.ERROR_RESPONSE_KEY_DETAILS_NAME in json_response
+
+    response = api_client.get(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="retrieve-template",
+            path_parameters={"template_id": template_id},
+        )
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.parametrize(
+    "atomic, expected_statuses, expected_value",
+    (
+        (False, ["succeeded", "failed"], 1),
+        (True, ["rolled_back", "failed"], 0),
+    ),
+)
+def test_execute_templates_commands_endpoint_reports_result_of_each_command(
+    client: APIClientData,
+    atomic: bool,
+    expected_statuses: list[str],
+    expected_value: int,
+):
+    # Given
+    api_client = client.client
+    template_id = create_template_via_api(client)
+    not_existing_template_id = fakers.fake_template_id()
+
+    # When
+    response = api_client.post(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="execute-templates-commands",
+        ),
+        json={
+            "atomic": atomic,
+            "commands": [
+                {"type": "set", "template_id": str(template_id), "value": 1},
+                {"type": "delete", "template_id": str(not_existing_template_id)},
+            ],
+        },
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.OK
+
+    json_response = response.json
+    assert json_response is not None
+    results = json_response[consts.BATCH_RESULTS_NAME]
+    assert [result["status"] for result in results] == expected_statuses
+    assert results[1][consts.ERROR_RESPONSE_KEY_DETAILS_NAME] == "Template not found."
+
+    response = api_client.get(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="retrieve-template",
+            path_parameters={"template_id": template_id},
+        )
+    )
+    assert response.json["value"] == expected_value  # type: ignore[index]
+
+
+def test_execute_templates_commands_endpoint_returns_400_when_command_is_invalid(
+    client: APIClientData,
+):
+    # Given
+    api_client = client.client
+    template_id = create_template_via_api(client)
+
+    # When
+    response = api_client.post(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="execute-templates-commands",
+        ),
+        json={
+            "commands": [
+                {"type": "set", "template_id": str(template_id), "value": 1},
+                {"type": "subtract", "template_id": str(template_id)},
+            ],
+        },
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    json_response = response.json
+    assert json_response is not None
+    assert "1" in json_response[consts.ERROR_RESPONSE_KEY_DETAILS_NAME]["commands"]
+
+
+@pytest.mark.parametrize("method", ("get", "post"))
+def test_get_templates_endpoint_returns_requested_templates(
+    client: APIClientData, method: str
+):
+    # Given
+    api_client = client.client
+    template_ids = [create_template_via_api(client) for _ in range(2)]
+    missing_template_id = fakers.fake_template_id()
+    requested_ids = [
+        str(template_ids[1]),
+        str(missing_template_id),
+        str(template_ids[0]),
+    ]
+
+    # When
+    if method == "get":
+        response = api_client.get(
+            get_url(
+                app=api_client.application,
+                routes=TEMPLATE_ROUTES,
+                url_type="list-templates",
+                query_parameters={
+                    consts.IDS_QUERY_PARAMETER_NAME: ",".join(requested_ids)
+                },
+            )
+        )
+    else:
+        response = api_client.post(
+            get_url(
+                app=api_client.application,
+                routes=TEMPLATE_ROUTES,
+                url_type="get-templates",
+            ),
+            json={consts.IDS_QUERY_PARAMETER_NAME: requested_ids},
+        )
+
+    # Then
+    assert response.status_code == HTTPStatus.OK
+
+    json_response = response.json
+    assert json_response is not None
+    assert [
+        template["id"] for template in json_response[consts.PAGINATION_RESULTS_NAME]
+    ] == [str(template_ids[1]), str(template_ids[0])]
+    assert json_response[consts.MISSING_IDS_NAME] == [str(missing_template_id)]
+
+
+def test_get_templates_cache_statistics_endpoint_returns_counters(
+    client: APIClientData,
+):
+    # Given
+    api_client = client.client
+
+    # When
+    response = api_client.get(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="get-templates-cache-statistics",
+        )
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.OK
+    json_response = response.json
+    assert json_response is not None
+    assert set(json_response) == {"hits", "misses", "evictions", "size"}
+
+
+@pytest.mark.parametrize(
+    "export_format, expected_mimetype",
+    (("ndjson", "application/x-ndjson"), ("csv", "text/csv")),
+)
+def test_export_templates_endpoint_streams_matching_templates(
+    client: APIClientData, export_format: str, expected_mimetype: str
+):
+    # Given
+    api_client = client.client
+    template_ids = {str(create_template_via_api(client)) for _ in range(3)}
+
+    # When
+    response = api_client.get(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="export-templates",
+            query_parameters={
+                consts.EXPORT_FORMAT_QUERY_PARAMETER_NAME: export_format,
+                "value": 0,
+            },
+        )
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.OK
+    assert response.mimetype == expected_mimetype
+    assert response.is_streamed
+
+    lines = response.get_data(as_text=True).splitlines()
+    if export_format == "csv":
+        assert lines[0] == "id,value,timestamp"
+        exported_ids = {line.split(",")[0] for line in lines[1:]}
+    else:
+        exported_ids = {json.loads(line)["id"] for line in lines}
+    assert exported_ids == template_ids
+
+
+def test_import_templates_endpoint_imports_new_templates(client: APIClientData):
+    # Given
+    api_client = client.client
+    existing_template_id = str(create_template_via_api(client))
+    imported_template_id = str(fakers.fake_template_id())
+
+    # When
+    response = api_client.post(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="import-templates",
+            query_parameters={consts.EXPORT_FORMAT_QUERY_PARAMETER_NAME: "ndjson"},
+        ),
+        data="\n".join(
+            json.dumps({"id": template_id, "value": 5})
+            for template_id in (existing_template_id, imported_template_id)
+        ),
+    )
+
+    # Then
+    assert response.status_code == HTTPStatus.OK
+    json_response = response.json
+    assert json_response is not None
+    assert json_response["processed"] == 2
+    assert json_response["imported"] == 1
+
+    response = api_client.get(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="retrieve-template",
+            path_parameters={"template_id": imported_template_id},
+        )
+    )
+    assert response.status_code == HTTPStatus.OK
+    json_response = response.json
+    assert json_response is not None
+    assert json_response["value"] == 5
+
+
+@pytest.mark.parametrize(
+    "data, expected_status_code",
+    [
+        ('{"value": -1}', HTTPStatus.UNPROCESSABLE_ENTITY),
+        ('{"value": "x"}', HTTPStatus.BAD_REQUEST),
+        ("not json", HTTPStatus.BAD_REQUEST),
+    ],
+)
+def test_import_templates_endpoint_returns_error_when_data_is_invalid(
+    client: APIClientData, data: str, expected_status_code: HTTPStatus
+):
+    # Given
+    api_client = client.client
+
+    # When
+    response = api_client.post(
+        get_url(
+            app=api_client.application,
+            routes=TEMPLATE_ROUTES,
+            url_type="import-templates",
+        ),
+        data=data,
+    )
+
+    # Then
+    assert response.status_code == expected_status_code
+    json_response = response.json
+    assert json_response is not None
+    assert consts.ERROR_RESPONSE_KEY_DETAILS_NAME in json_response
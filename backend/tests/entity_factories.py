@@ -23,4 +23,5 @@ class TemplateEntityFactory(BatchMixin):
             id=kwargs.get("id", fakers.fake_template_id()),
             timestamp=kwargs.get("timestamp", time.get_current_timestamp()),
             version=kwargs.get("version", INITIAL_TEMPLATE_VERSION),
+            value=kwargs.get("value"),
         )
@@ -1,5 +1,8 @@
+import time
+
 from faker import Faker
 
+from modules.common.cache import AbstractSharedCache, SharedCacheUnavailable
 from modules.common.domain import ports as common_ports
 from modules.template.domain import value_objects as template_value_objects
 from modules.template.domain.entities import Template as TemplateEntity
@@ -49,3 +52,40 @@ class TestTemplateUnitOfWork(AbstractTemplatesUnitOfWork):
 
     def rollback(self):
         pass
+
+
+class TestSharedCache(AbstractSharedCache):
+    """
+    In-memory stand-in for Redis, which can be shared by many caches
+    as if they were running in separate processes.
+    """
+
+    def __init__(self) -> None:
+        self.values: dict[str, tuple[float, bytes]] = {}
+        self.available = True
+
+    def get(self, key: str) -> bytes | None:
+        self._check_availability()
+        entry = self.values.get(key)
+        if entry is None or time.monotonic() >= entry[0]:
+            return None
+        return entry[1]
+
+    def set(self, key: str, value: bytes, ttl_seconds: float) -> None:
+        self._check_availability()
+        self.values[key] = (time.monotonic() + ttl_seconds, value)
+
+    def add(self, key: str, value: bytes, ttl_seconds: float) -> bool:
+        if self.get(key) is not None:
+            return False
+        self.set(key, value, ttl_seconds)
+        return True
+
+    def increment(self, key: str, ttl_seconds: float) -> int:
+        value = int(self.get(key) or 0) + 1
+        self.set(key, str(value).encode(), ttl_seconds)
+        return value
+
+    def _check_availability(self) -> None:
+        if not self.available:
+            raise SharedCacheUnavailable("Shared cache is unavailable.")
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import Engine, delete, insert
+
+from modules.common.database.dump import dump_tables
+from modules.common.time import get_current_timestamp
+from modules.template.adapters.repositories.sqlalchemy.orm import Template as TemplateDb
+from modules.template.domain.value_objects import TemplateId
+
+from ....common import annotations
+
+NUMBER_OF_TEMPLATES = 20
+
+
+@pytest.fixture
+def committed_template_ids(
+    prepared_database: Engine,
+) -> annotations.YieldFixture[set[str]]:
+    # Workers read on their own connections, so templates have to be committed.
+    template_ids = [TemplateId.new() for _ in range(NUMBER_OF_TEMPLATES)]
+    with prepared_database.begin() as connection:
+        connection.execute(
+            insert(TemplateDb),
+            [
+                {
+                    "id": template_id,
+                    "value_data": {"value": number},
+                    "timestamp": get_current_timestamp(),
+                    "version": 1,
+                }
+                for number, template_id in enumerate(template_ids)
+            ],
+        )
+
+    yield {str(template_id) for template_id in template_ids}
+
+    with prepared_database.begin() as connection:
+        connection.execute(delete(TemplateDb))
+
+
+@pytest.mark.parametrize("split_column_name", ["id", "timestamp"])
+def test_dump_tables_dumps_all_rows_into_partitions(
+    prepared_database: Engine,
+    committed_template_ids: set[str],
+    tmp_path: Path,
+    split_column_name: str,
+):
+    # When
+    dumped_partitions = dump_tables(
+        engine=prepared_database,
+        tables={TemplateDb.__tablename__: split_column_name},
+        directory=tmp_path,
+        number_of_partitions=3,
+        number_of_workers=2,
+    )
+
+    # Then
+    assert len(dumped_partitions) == 3
+    assert sum(partition.rows for partition in dumped_partitions) == len(
+        committed_template_ids
+    )
+    dumped_templates = pq.read_table(tmp_path / TemplateDb.__tablename__)
+    assert set(dumped_templates.column("id").to_pylist()) == committed_template_ids
@@ -0,0 +1,47 @@
+import threading
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+from modules.common.database import NotificationListener, notify
+
+CHANNEL = "test_channel"
+TIMEOUT_SECONDS = 5
+
+
+def test_notification_listener_receives_values_sent_on_commit(
+    prepared_database: Engine,
+):
+    # Given
+    received_values: list[set[str]] = []
+    connected = threading.Event()
+    received = threading.Event()
+
+    def handle_values(values: set[str]) -> None:
+        received_values.append(values)
+        received.set()
+
+    listener = NotificationListener(
+        engine=prepared_database,
+        channel=CHANNEL,
+        handle_values=handle_values,
+        handle_missed_notifications=connected.set,
+    )
+    listener.start()
+
+    try:
+        assert connected.wait(TIMEOUT_SECONDS)
+
+        # When
+        with Session(bind=prepared_database) as session:
+            notify(session=session, channel=CHANNEL, values=["first", "second"])
+            session.rollback()
+        with Session(bind=prepared_database) as session:
+            notify(session=session, channel=CHANNEL, values=["third"])
+            session.commit()
+
+        # Then
+        assert received.wait(TIMEOUT_SECONDS)
+        assert received_values == [{"third"}]
+    finally:
+        listener.stop()
@@ -0,0 +1,180 @@
+import pytest
+from pytest_mock import MockFixture
+from pytest_postgresql.janitor import DatabaseJanitor
+from sqlalchemy import text
+
+from config import config
+from modules.common.database import (
+    consistency,
+    get_read_session,
+    get_session,
+    initialize_database_sessions,
+    remember_commit_position,
+    remove_session,
+    session,
+)
+from modules.common.database.replica import ReplicaMonitor
+
+from ....common import annotations
+
+configuration = config["test"]()
+
+# A second database on the same server stands in for a read replica.
+REPLICA_DATABASE_NAME = f"{configuration.DATABASE_NAME}_replica"
+REPLICA_MAX_LAG_SECONDS = 5
+REQUIRED_POSITION = "0/1"
+
+
+@pytest.fixture(scope="module")
+def replica_database_url(prepared_database) -> annotations.YieldFixture[str]:
+    with DatabaseJanitor(
+        user=configuration.DATABASE_USER,
+        password=configuration.DATABASE_PASSWORD,
+        host=configuration.DATABASE_HOST,
+        port=configuration.DATABASE_PORT,
+        dbname=REPLICA_DATABASE_NAME,
+        version=0,
+    ):
+        yield configuration.database_url.replace(
+            f"/{configuration.DATABASE_NAME}", f"/{REPLICA_DATABASE_NAME}"
+        )
+
+
+@pytest.fixture
+def replica_session_registry(replica_database_url) -> annotations.YieldFixture[None]:
+    initialize_database_sessions(
+        database_url=configuration.database_url,
+        replica_database_url=replica_database_url,
+        replica_max_lag_seconds=REPLICA_MAX_LAG_SECONDS,
+    )
+    yield
+    consistency.clear_positions()
+    remove_session()
+    initialize_database_sessions(database_url=configuration.database_url)
+
+
+def get_current_database_name() -> str:
+    with get_read_session() as read_session:
+        return read_session.execute(text("SELECT current_database()")).scalar_one()
+
+
+def test_get_read_session_uses_replica_when_it_is_available(
+    replica_session_registry,
+):
+    # When
+    database_name = get_current_database_name()
+
+    # Then
+    assert database_name == REPLICA_DATABASE_NAME
+
+
+def test_get_read_session_uses_primary_database_when_replica_is_not_configured(
+    prepared_database,
+):
+    # Given
+    initialize_database_sessions(database_url=configuration.database_url)
+
+    # When
+    database_name = get_current_database_name()
+
+    # Then
+    assert database_name == configuration.DATABASE_NAME
+    remove_session()
+
+
+def test_get_read_session_falls_back_to_primary_database_when_replica_lags(
+    mocker: MockFixture,
+    replica_session_registry,
+):
+    # Given
+    mocker.patch.object(
+        ReplicaMonitor, "_measure_lag", return_value=REPLICA_MAX_LAG_SECONDS + 1
+    )
+
+    # When
+    database_name = get_current_database_name()
+
+    # Then
+    assert database_name == configuration.DATABASE_NAME
+
+
+def test_get_read_session_falls_back_to_primary_database_when_replica_is_unreachable(
+    prepared_database,
+):
+    # Given
+    initialize_database_sessions(
+        database_url=configuration.database_url,
+        replica_database_url=configuration.database_url.replace(
+            f"/{configuration.DATABASE_NAME}", "/not_existing_replica"
+        ),
+        replica_max_lag_seconds=REPLICA_MAX_LAG_SECONDS,
+    )
+
+    # When
+    database_name = get_current_database_name()
+
+    # Then
+    assert database_name == configuration.DATABASE_NAME
+    remove_session()
+
+
+def test_replica_monitor_checks_replica_at_most_once_per_interval(
+    mocker: MockFixture,
+    replica_session_registry,
+):
+    # Given
+    measure_lag = mocker.patch.object(ReplicaMonitor, "_measure_lag", return_value=0)
+    assert session.REPLICA_MONITOR is not None
+
+    # When
+    for _ in range(3):
+        session.REPLICA_MONITOR.is_available()
+
+    # Then
+    measure_lag.assert_called_once()
+
+
+def test_get_read_session_uses_replica_when_it_replayed_required_position(
+    replica_session_registry,
+):
+    # Given
+    consistency.require_position(REQUIRED_POSITION)
+
+    # When
+    database_name = get_current_database_name()
+
+    # Then
+    assert database_name == REPLICA_DATABASE_NAME
+
+
+def test_get_read_session_falls_back_to_primary_database_when_replica_did_not_replay_required_position(  # noqa: E501
+    mocker: MockFixture,
+    replica_session_registry,
+):
+    # Given
+    has_replayed = mocker.patch.object(
+        ReplicaMonitor, "_has_replayed", return_value=False
+    )
+    consistency.require_position(REQUIRED_POSITION)
+
+    # When
+    database_name = get_current_database_name()
+
+    # Then
+    assert database_name == configuration.DATABASE_NAME
+    assert has_replayed.call_count > 1  # Replica was given time to catch up.
+
+
+def test_remember_commit_position_records_position_when_replica_is_configured(
+    replica_session_registry,
+):
+    # Given
+    primary_session = get_session()
+
+    # When
+    remember_commit_position(primary_session)
+
+    # Then
+    position = consistency.get_commit_position()
+    assert position is not None
+    assert consistency.validate_position(position) == position
@@ -0,0 +1,110 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy.orm import Session
+
+from config import config
+from modules.common.database import (
+    get_session,
+    initialize_database_sessions,
+    remove_session,
+)
+from modules.template.adapters.repositories.sqlalchemy.orm import Template as TemplateDb
+from modules.template.adapters.unit_of_work import SqlAlchemyTemplatesUnitOfWork
+
+from ....common import annotations
+from ....entity_factories import TemplateEntityFactory
+
+NUMBER_OF_THREADS = 10
+
+
+@pytest.fixture
+def session_registry(prepared_database) -> annotations.YieldFixture[None]:
+    initialize_database_sessions(config["test"]().database_url)
+    yield
+    remove_session()
+
+
+def test_get_session_returns_the_same_session_within_a_thread(session_registry):
+    # When
+    first_session = get_session()
+    second_session = get_session()
+
+    # Then
+    assert isinstance(first_session, Session)
+    assert first_session is second_session
+
+
+def test_remove_session_discards_session_of_a_thread(session_registry):
+    # Given
+    session = get_session()
+
+    # When
+    remove_session()
+
+    # Then
+    assert get_session() is not session
+
+
+def test_get_session_never_shares_session_between_concurrent_threads(
+    session_registry,
+):
+    # Given
+    # All threads must be alive at the same time, so the registry can't reuse
+    # a session released by a finished thread.
+    barrier = threading.Barrier(NUMBER_OF_THREADS)
+
+    def get_thread_session() -> Session:
+        session = get_session()
+        barrier.wait(timeout=10)
+        assert get_session() is session
+        return session
+
+    # When
+    with ThreadPoolExecutor(max_workers=NUMBER_OF_THREADS) as executor:
+        futures = [
+            executor.submit(get_thread_session) for _ in range(NUMBER_OF_THREADS)
+        ]
+        sessions = [future.result() for future in futures]
+
+    # Then
+    assert len({id(session) for session in sessions}) == NUMBER_OF_THREADS
+
+
+def test_shared_unit_of_work_uses_separate_sessions_in_concurrent_threads(
+    session_registry,
+):
+    # Given
+    unit_of_work = SqlAlchemyTemplatesUnitOfWork()
+    barrier = threading.Barrier(NUMBER_OF_THREADS)
+    template_entities = TemplateEntityFactory.create_batch(NUMBER_OF_THREADS)
+
+    def create_template(template_entity) -> Session:
+        with unit_of_work:
+            unit_of_work.templates.create(template_entity)
+            barrier.wait(timeout=10)
+            return unit_of_work.session
+
+    # When
+    with ThreadPoolExecutor(max_workers=NUMBER_OF_THREADS) as executor:
+        futures = [
+            executor.submit(create_template, template_entity)
+            for template_entity in template_entities
+        ]
+        sessions = [future.result() for future in futures]
+
+    # Then
+    assert len({id(session) for session in sessions}) == NUMBER_OF_THREADS
+
+    session = get_session()
+    try:
+        assert (
+            session.query(TemplateDb)
+            .filter(TemplateDb.id.in_([template.id for template in template_entities]))
+            .count()
+            == NUMBER_OF_THREADS
+        )
+    finally:
+        session.query(TemplateDb).delete()
+        session.commit()
@@ -1,25 +1,44 @@
+import json
+from contextlib import contextmanager
 from datetime import timezone
-from typing import Callable
+from typing import Callable, Iterator
 
 import pytest
 from dateutil import tz
+from sqlalchemy import event, select, text, update
 from sqlalchemy.orm import Session
 
+from modules.common.database.explain import Explain
+from modules.common.dtos import Ordering, OrderingEnum
+from modules.common.pagination import (
+    CountStrategyEnum,
+    Cursor,
+    CursorPagination,
+    Pagination,
+    TotalCount,
+)
 from modules.common.time import TIME_ZONE
 from modules.template.adapters.repositories.sqlalchemy import (
     SqlAlchemyTemplatesDomainRepository,
     SqlAlchemyTemplatesQueryRepository,
+    repositories,
 )
 from modules.template.adapters.repositories.sqlalchemy.consts import (
     VALUE_NAME_IN_DATABASE,
 )
 from modules.template.adapters.repositories.sqlalchemy.orm import Template as TemplateDb
+from modules.template.adapters.repositories.sqlalchemy.orm import TemplateValueShard
 from modules.template.adapters.repositories.sqlalchemy.repositories import (
     _map_template_db_to_template_entity,
 )
 from modules.template.domain.entities import Template as TemplateEntity
+from modules.template.domain.exceptions import InvalidTemplateValue
 from modules.template.domain.ports import exceptions
 from modules.template.domain.ports.dtos import TemplatesFilters
+from modules.template.domain.value_objects import (
+    INITIAL_TEMPLATE_VERSION,
+    TemplateValue,
+)
 
 from ...... import entity_factories, fakers, model_factories
 
@@ -41,6 +60,32 @@ def test_domain_repository_creates_template(db_session: Session):
     assert timestamp.tzinfo == timezone.utc
 
 
+def test_domain_repository_imports_only_new_templates(db_session: Session):
+    # Given
+    existing_template = model_factories.TemplateFactory.create()
+    template_entities = [
+        entity_factories.TemplateEntityFactory.create(value=TemplateValue(value=5)),
+        entity_factories.TemplateEntityFactory.create(),
+    ]
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+
+    # When
+    imported_ids = repository.import_many(
+        [
+            *template_entities,
+            _map_template_db_to_template_entity(existing_template),
+        ]
+    )
+
+    # Then
+    assert set(imported_ids) == {
+        template_entity.id for template_entity in template_entities
+    }
+    for template_entity in template_entities:
+        result = db_session.query(TemplateDb).filter_by(id=template_entity.id).one()
+        assert _map_template_db_to_template_entity(result) == template_entity
+
+
 def test_domain_repository_updates_template(
     db_session: Session,
 ):
@@ -55,6 +100,7 @@ def test_domain_repository_updates_template(
     # When
     template_entity.set_value(value=new_template_value)
     repository.update(template_entity)
+    repository.save_changes()
     db_session.commit()
 
     # Then
@@ -65,6 +111,369 @@ def test_domain_repository_updates_template(
     assert result.value_data[VALUE_NAME_IN_DATABASE] == new_template_value.value
 
 
+def test_domain_repository_raises_exception_when_template_changed_after_retrieval(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create()
+    template_entity = repository.get(template_db.id)
+    db_session.execute(
+        text("UPDATE templates SET version = version + 1 WHERE id = :id"),
+        {"id": template_db.id},
+    )
+
+    # When
+    template_entity.set_value(value=fakers.fake_template_value())
+    repository.update(template_entity)
+    with pytest.raises(exceptions.TemplateVersionConflict):
+        repository.save_changes()
+
+    # Then
+    db_session.expire_all()
+    result = db_session.query(TemplateDb).filter_by(id=template_entity.id).one()
+    assert result.version == template_db.version + 1
+
+
+def test_domain_repository_subtracts_template_value(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create(
+        value_data={VALUE_NAME_IN_DATABASE: 10}
+    )
+
+    # When
+    final_value = repository.subtract_value(
+        template_id=template_db.id, value=TemplateValue(value=3)
+    )
+    db_session.commit()
+
+    # Then
+    assert final_value == TemplateValue(value=7)
+    db_session.expire_all()
+    result = db_session.query(TemplateDb).filter_by(id=template_db.id).one()
+    assert result.value_data[VALUE_NAME_IN_DATABASE] == 7
+    assert result.version == INITIAL_TEMPLATE_VERSION + 1
+
+
+def test_domain_repository_raises_exception_when_subtracted_value_is_too_big(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create(
+        value_data={VALUE_NAME_IN_DATABASE: 10}
+    )
+
+    # When
+    with pytest.raises(InvalidTemplateValue):
+        repository.subtract_value(
+            template_id=template_db.id, value=TemplateValue(value=10)
+        )
+
+    # Then
+    db_session.expire_all()
+    result = db_session.query(TemplateDb).filter_by(id=template_db.id).one()
+    assert result.value_data[VALUE_NAME_IN_DATABASE] == 10
+    assert result.version == INITIAL_TEMPLATE_VERSION
+
+
+def test_domain_repository_raises_exception_when_subtracting_from_missing_template(
+    db_session: Session,
+):
+    with pytest.raises(exceptions.TemplateDoesNotExist):
+        SqlAlchemyTemplatesDomainRepository(db_session).subtract_value(
+            template_id=fakers.fake_template_id(), value=TemplateValue(value=1)
+        )
+
+
+def test_domain_repository_shards_template_value(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create(
+        value_data={VALUE_NAME_IN_DATABASE: 10}
+    )
+
+    # When
+    repository.shard_value(template_id=template_db.id, number_of_shards=3)
+    db_session.commit()
+
+    # Then
+    assert _get_shard_values(db_session, template_db.id) == [4, 3, 3]
+    assert repository.get(template_db.id).value == TemplateValue(value=10)
+
+
+def test_domain_repository_subtracts_value_of_sharded_template(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create(
+        value_data={VALUE_NAME_IN_DATABASE: 10}
+    )
+    repository.shard_value(template_id=template_db.id, number_of_shards=2)
+    db_session.commit()
+
+    # When
+    final_value = repository.subtract_value(
+        template_id=template_db.id, value=TemplateValue(value=3)
+    )
+    db_session.commit()
+
+    # Then
+    assert final_value == TemplateValue(value=7)
+    assert sorted(_get_shard_values(db_session, template_db.id)) == [2, 5]
+    assert SqlAlchemyTemplatesQueryRepository(session_factory=lambda: db_session).get(
+        template_db.id
+    ).value == TemplateValue(value=7)
+
+
+def test_domain_repository_changes_version_of_sharded_template_on_subtraction(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create(
+        value_data={VALUE_NAME_IN_DATABASE: 10}
+    )
+    repository.shard_value(template_id=template_db.id, number_of_shards=2)
+    db_session.commit()
+    version = repository.get(template_db.id).version
+
+    # When
+    repository.subtract_value(template_id=template_db.id, value=TemplateValue(value=1))
+    db_session.commit()
+
+    # Then
+    assert repository.get(template_db.id).version == version + 1
+
+
+def test_domain_repository_does_not_change_template_row_on_subtraction_from_shard(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create(
+        value_data={VALUE_NAME_IN_DATABASE: 10}
+    )
+    repository.shard_value(template_id=template_db.id, number_of_shards=2)
+    db_session.commit()
+    db_session.expire_all()
+    version = db_session.query(TemplateDb).filter_by(id=template_db.id).one().version
+
+    # When
+    repository.subtract_value(template_id=template_db.id, value=TemplateValue(value=1))
+    db_session.commit()
+
+    # Then
+    db_session.expire_all()
+    result = db_session.query(TemplateDb).filter_by(id=template_db.id).one()
+    assert result.version == version
+    assert result.value_data[VALUE_NAME_IN_DATABASE] == 10
+
+
+def test_query_repository_filters_sharded_templates_by_value_of_last_rebalance(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create(
+        value_data={VALUE_NAME_IN_DATABASE: 10}
+    )
+    repository.shard_value(template_id=template_db.id, number_of_shards=2)
+    db_session.commit()
+    repository.subtract_value(template_id=template_db.id, value=TemplateValue(value=1))
+    db_session.commit()
+    query_repository = SqlAlchemyTemplatesQueryRepository(
+        session_factory=lambda: db_session
+    )
+
+    # When
+    lagging_results, _ = query_repository.list(
+        filters=TemplatesFilters(value=10), ordering=[], pagination=None
+    )
+    current_results, _ = query_repository.list(
+        filters=TemplatesFilters(value=9), ordering=[], pagination=None
+    )
+
+    # Then
+    assert [template.id for template in lagging_results] == [template_db.id]
+    assert lagging_results[0].value == TemplateValue(value=9)
+    assert not current_results
+
+
+def test_domain_repository_rebalances_shards_when_shard_runs_dry(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create(
+        value_data={VALUE_NAME_IN_DATABASE: 10}
+    )
+    repository.shard_value(template_id=template_db.id, number_of_shards=2)
+    db_session.commit()
+
+    # When
+    final_value = repository.subtract_value(
+        template_id=template_db.id, value=TemplateValue(value=7)
+    )
+    db_session.commit()
+
+    # Then
+    assert final_value == TemplateValue(value=3)
+    assert _get_shard_values(db_session, template_db.id) == [2, 1]
+    db_session.expire_all()
+    result = db_session.query(TemplateDb).filter_by(id=template_db.id).one()
+    assert result.value_data[VALUE_NAME_IN_DATABASE] == 3
+
+
+def test_domain_repository_keeps_value_of_sharded_template_above_zero(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create(
+        value_data={VALUE_NAME_IN_DATABASE: 10}
+    )
+    repository.shard_value(template_id=template_db.id, number_of_shards=2)
+    db_session.commit()
+
+    # When
+    with pytest.raises(InvalidTemplateValue):
+        repository.subtract_value(
+            template_id=template_db.id, value=TemplateValue(value=10)
+        )
+
+    # Then
+    assert _get_shard_values(db_session, template_db.id) == [5, 5]
+
+
+def test_domain_repository_sets_value_of_sharded_template(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create(
+        value_data={VALUE_NAME_IN_DATABASE: 10}
+    )
+    repository.shard_value(template_id=template_db.id, number_of_shards=2)
+    db_session.commit()
+    template_entity = repository.get(template_db.id)
+
+    # When
+    template_entity.set_value(TemplateValue(value=21))
+    repository.update(template_entity)
+    repository.unshard_value(template_db.id)
+    db_session.commit()
+
+    # Then
+    assert _get_shard_values(db_session, template_db.id) == []
+    assert repository.get(template_db.id).value == TemplateValue(value=21)
+
+
+def test_domain_repository_finds_ids_of_matching_templates_after_given_one(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_ids = sorted(
+        template_db.id
+        for template_db in model_factories.TemplateFactory.create_batch(
+            5, value_data={VALUE_NAME_IN_DATABASE: 10}
+        )
+    )
+    model_factories.TemplateFactory.create(value_data={VALUE_NAME_IN_DATABASE: 20})
+
+    # When
+    result = repository.find_ids_for_update(
+        filters=TemplatesFilters(value=10), after=template_ids[1], limit=2
+    )
+
+    # Then
+    assert result == template_ids[2:4]
+
+
+def test_domain_repository_sets_value_of_many_templates(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create(
+        value_data={VALUE_NAME_IN_DATABASE: 10}
+    )
+    sharded_template_db = model_factories.TemplateFactory.create(
+        value_data={VALUE_NAME_IN_DATABASE: 10}
+    )
+    repository.shard_value(template_id=sharded_template_db.id, number_of_shards=3)
+
+    # When
+    result = repository.set_value_many(
+        template_ids=[template_db.id, sharded_template_db.id],
+        value=TemplateValue(value=8),
+    )
+    db_session.commit()
+
+    # Then
+    assert set(result) == {template_db.id, sharded_template_db.id}
+    assert repository.get(template_db.id).value == TemplateValue(value=8)
+    assert repository.get(sharded_template_db.id).value == TemplateValue(value=8)
+    assert _get_shard_values(db_session, sharded_template_db.id) == [3, 3, 2]
+
+
+def test_domain_repository_subtracts_value_of_many_templates(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create(
+        value_data={VALUE_NAME_IN_DATABASE: 10}
+    )
+    small_template_db = model_factories.TemplateFactory.create(
+        value_data={VALUE_NAME_IN_DATABASE: 3}
+    )
+    sharded_template_db = model_factories.TemplateFactory.create(
+        value_data={VALUE_NAME_IN_DATABASE: 10}
+    )
+    repository.shard_value(template_id=sharded_template_db.id, number_of_shards=2)
+
+    # When
+    result = repository.subtract_value_many(
+        template_ids=[template_db.id, small_template_db.id, sharded_template_db.id],
+        value=TemplateValue(value=5),
+    )
+    db_session.commit()
+
+    # Then
+    assert set(result) == {template_db.id, sharded_template_db.id}
+    assert repository.get(template_db.id).value == TemplateValue(value=5)
+    assert repository.get(small_template_db.id).value == TemplateValue(value=3)
+    assert repository.get(sharded_template_db.id).value == TemplateValue(value=5)
+    assert _get_shard_values(db_session, sharded_template_db.id) == [3, 2]
+
+
+def test_domain_repository_deletes_many_templates(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_ids = [
+        template_db.id
+        for template_db in model_factories.TemplateFactory.create_batch(3)
+    ]
+
+    # When
+    result = repository.delete_many(template_ids[:2])
+    db_session.commit()
+
+    # Then
+    assert set(result) == set(template_ids[:2])
+    assert db_session.query(TemplateDb.id).scalar() == template_ids[2]
+
+
 def test_domain_repository_deletes_template(
     db_session: Session,
 ):
@@ -100,6 +509,84 @@ def test_domain_repository_can_retrieve_template(
     assert result.timestamp.tzinfo == tz.gettz(TIME_ZONE)
 
 
+def test_domain_repository_retrieves_template_once(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create()
+    template_entity = repository.get(template_db.id)
+
+    # When
+    with _record_statements(db_session) as statements:
+        result = repository.get(template_db.id)
+
+    # Then
+    assert result is template_entity
+    assert statements == []
+
+
+def test_domain_repository_retrieves_current_template_for_update(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create()
+    version = repository.get(template_db.id).version
+    db_session.execute(
+        update(TemplateDb)
+        .where(TemplateDb.id == template_db.id)
+        .values(version=TemplateDb.version + 1)
+    )
+
+    # When
+    with _record_statements(db_session) as statements:
+        result = repository.get_for_update(template_db.id)
+
+    # Then
+    assert result.version == version + 1
+    assert len(statements) == 1
+    assert "FOR UPDATE OF templates" in statements[0]
+
+
+def test_domain_repository_updates_only_changed_columns(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create()
+    template_entity = repository.get(template_db.id)
+    template_entity.set_value(value=fakers.fake_template_value())
+
+    # When
+    with _record_statements(db_session) as statements:
+        repository.save_changes()
+
+    # Then
+    assert len(statements) == 1
+    assert statements[0].startswith("UPDATE templates SET value_data=")
+    assert "timestamp" not in statements[0]
+
+
+def test_domain_repository_does_not_save_unchanged_template(
+    db_session: Session,
+):
+    # Given
+    repository = SqlAlchemyTemplatesDomainRepository(db_session)
+    template_db = model_factories.TemplateFactory.create()
+    template_entity = repository.get(template_db.id)
+    template_entity.set_value(value=fakers.fake_template_value())
+    repository.save_changes()
+
+    # When
+    with _record_statements(db_session) as statements:
+        repository.update(repository.get(template_db.id))
+        repository.save_changes()
+
+    # Then
+    assert statements == []
+
+
 def test_query_repository_can_retrieve_template(
     db_session_factory: Callable,
 ):
@@ -129,6 +616,56 @@ def test_query_repository_raises_exception_when_template_does_not_exist(
         repository.get(template_id=fakers.fake_template_id())
 
 
+def test_query_repository_retrieves_many_templates(
+    db_session_factory: Callable,
+):
+    # Given
+    template_entities = [
+        _map_template_db_to_template_entity(template)
+        for template in model_factories.TemplateFactory.create_batch(3)
+    ]
+    query_repository = SqlAlchemyTemplatesQueryRepository(db_session_factory)
+
+    # When
+    result = query_repository.get_many(
+        [template_entities[0].id, fakers.fake_template_id(), template_entities[2].id]
+    )
+
+    # Then
+    assert sorted(result, key=lambda template: template.id) == sorted(
+        [template_entities[0], template_entities[2]], key=lambda template: template.id
+    )
+
+
+def test_query_repository_streams_templates_in_batches(
+    monkeypatch: pytest.MonkeyPatch,
+    db_session_factory: Callable,
+):
+    # Given
+    monkeypatch.setattr(repositories, "EXPORT_BATCH_SIZE", 2)
+    template_entities = [
+        _map_template_db_to_template_entity(template)
+        for template in model_factories.TemplateFactory.create_batch(5)
+    ]
+    query_repository = SqlAlchemyTemplatesQueryRepository(db_session_factory)
+
+    # When
+    result = list(
+        query_repository.stream(
+            filters=TemplatesFilters(),
+            ordering=[Ordering(field="timestamp", order=OrderingEnum.ASCENDING)],
+        )
+    )
+
+    # Then
+    assert sorted(result, key=lambda template: template.id) == sorted(
+        template_entities, key=lambda template: template.id
+    )
+    assert [template.timestamp for template in result] == sorted(
+        template.timestamp for template in template_entities
+    )
+
+
 def test_query_repository_lists_templates(
     db_session_factory: Callable,
 ):
@@ -153,4 +690,330 @@ def test_query_repository_lists_templates(
     assert isinstance(results, list)
     assert all(isinstance(result, TemplateEntity) for result in results)
     assert set(results) == set(template_entites)
-    assert total_number_of_results == number_of_templates
+    assert total_number_of_results.value == number_of_templates
+
+
+def test_query_repository_lists_templates_by_cursor(
+    db_session_factory: Callable,
+):
+    # Given
+    template_entities = sorted(
+        (
+            _map_template_db_to_template_entity(template)
+            for template in model_factories.TemplateFactory.create_batch(3)
+        ),
+        key=lambda template: (template.timestamp, template.id),
+        reverse=True,
+    )
+    query_repository = SqlAlchemyTemplatesQueryRepository(db_session_factory)
+
+    # When
+    results, total_number_of_results = query_repository.list(
+        filters=TemplatesFilters(),
+        ordering=[],
+        pagination=CursorPagination(
+            cursor=Cursor(
+                timestamp=template_entities[0].timestamp,
+                id=template_entities[0].id,
+            ),
+            records_per_page=1,
+        ),
+    )
+
+    # Then
+    assert results == [template_entities[1]]
+    assert total_number_of_results.value == len(template_entities)
+
+
+def test_query_repository_counts_templates_in_the_same_query_as_page(
+    db_session_factory: Callable,
+):
+    # Given
+    number_of_templates = 3
+    model_factories.TemplateFactory.create_batch(number_of_templates)
+    query_repository = SqlAlchemyTemplatesQueryRepository(db_session_factory)
+
+    # When
+    results, total_count = query_repository.list(
+        filters=TemplatesFilters(),
+        ordering=[],
+        pagination=Pagination(offset=1, records_per_page=1),
+        count_strategy=CountStrategyEnum.EXACT,
+    )
+
+    # Then
+    assert len(results) == 1
+    assert total_count == TotalCount(
+        kind=CountStrategyEnum.EXACT, value=number_of_templates, has_more=True
+    )
+
+
+def test_query_repository_counts_templates_when_page_is_empty(
+    db_session_factory: Callable,
+):
+    # Given
+    number_of_templates = 2
+    model_factories.TemplateFactory.create_batch(number_of_templates)
+    query_repository = SqlAlchemyTemplatesQueryRepository(db_session_factory)
+
+    # When
+    results, total_count = query_repository.list(
+        filters=TemplatesFilters(),
+        ordering=[],
+        pagination=Pagination(offset=10, records_per_page=1),
+        count_strategy=CountStrategyEnum.EXACT,
+    )
+
+    # Then
+    assert not results
+    assert total_count.value == number_of_templates
+    assert not total_count.has_more
+
+
+def test_query_repository_skips_counting_templates(
+    db_session_factory: Callable,
+):
+    # Given
+    model_factories.TemplateFactory.create_batch(3)
+    query_repository = SqlAlchemyTemplatesQueryRepository(db_session_factory)
+
+    # When
+    results, total_count = query_repository.list(
+        filters=TemplatesFilters(),
+        ordering=[],
+        pagination=Pagination(offset=1, records_per_page=2),
+        count_strategy=CountStrategyEnum.NONE,
+    )
+
+    # Then
+    assert len(results) == 2
+    assert total_count == TotalCount(
+        kind=CountStrategyEnum.NONE, value=None, has_more=False
+    )
+
+
+def test_query_repository_reuses_cached_count(
+    db_session_factory: Callable,
+):
+    # Given
+    number_of_templates = 2
+    model_factories.TemplateFactory.create_batch(number_of_templates)
+    query_repository = SqlAlchemyTemplatesQueryRepository(db_session_factory)
+    query_repository.list(
+        filters=TemplatesFilters(),
+        ordering=[],
+        pagination=None,
+        count_strategy=CountStrategyEnum.CACHED,
+    )
+    model_factories.TemplateFactory.create()
+
+    # When
+    _, total_count = query_repository.list(
+        filters=TemplatesFilters(),
+        ordering=[],
+        pagination=None,
+        count_strategy=CountStrategyEnum.CACHED,
+    )
+
+    # Then
+    assert total_count.kind == CountStrategyEnum.CACHED
+    assert total_count.value == number_of_templates
+
+
+def test_query_repository_counts_exactly_when_estimate_is_small(
+    db_session_factory: Callable,
+):
+    # Given
+    number_of_templates = 2
+    model_factories.TemplateFactory.create_batch(number_of_templates)
+    query_repository = SqlAlchemyTemplatesQueryRepository(db_session_factory)
+
+    # When
+    _, total_count = query_repository.list(
+        filters=TemplatesFilters(),
+        ordering=[],
+        pagination=None,
+        count_strategy=CountStrategyEnum.ESTIMATED,
+    )
+
+    # Then
+    assert total_count.kind == CountStrategyEnum.EXACT
+    assert total_count.value == number_of_templates
+
+
+@pytest.mark.parametrize("filters", [TemplatesFilters(), TemplatesFilters(query="a")])
+def test_query_repository_estimates_count(
+    monkeypatch: pytest.MonkeyPatch,
+    db_session_factory: Callable,
+    filters: TemplatesFilters,
+):
+    # Given
+    monkeypatch.setattr(repositories, "EXACT_COUNT_THRESHOLD", 0)
+    model_factories.TemplateFactory.create_batch(2)
+    query_repository = SqlAlchemyTemplatesQueryRepository(db_session_factory)
+
+    # When
+    _, total_count = query_repository.list(
+        filters=filters,
+        ordering=[],
+        pagination=None,
+        count_strategy=CountStrategyEnum.ESTIMATED,
+    )
+
+    # Then
+    assert total_count.kind == CountStrategyEnum.ESTIMATED
+    assert isinstance(total_count.value, int)
+    assert total_count.value >= 0
+
+
+@pytest.mark.parametrize(
+    "filters, ordering",
+    [
+        (TemplatesFilters(value=5), []),
+        (TemplatesFilters(value_from=2, value_to=8), []),
+        (TemplatesFilters(), [Ordering(field="value", order=OrderingEnum.ASCENDING)]),
+        (TemplatesFilters(), [Ordering(field="value", order=OrderingEnum.DESCENDING)]),
+    ],
+)
+def test_query_repository_uses_value_index(
+    db_session: Session, filters: TemplatesFilters, ordering: list[Ordering]
+):
+    # Given
+    model_factories.TemplateFactory.create_batch(10)
+    # Sequential scan is cheaper for a small table, so planner has to be told
+    # to avoid it, in order to find out whether the index can be used at all.
+    db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    query = repositories._filter(query=db_session.query(TemplateDb), filters=filters)
+    for order in ordering:
+        query = repositories._order(query=query, order=order)
+
+    # When
+    plan = db_session.execute(Explain(query.statement)).scalar_one()
+
+    # Then
+    assert "ix_templates_value" in json.dumps(plan)
+
+
+def test_query_repository_filters_templates_by_contained_data(
+    db_session_factory: Callable,
+):
+    # Given
+    template = model_factories.TemplateFactory.create(
+        value_data={VALUE_NAME_IN_DATABASE: 5}
+    )
+    model_factories.TemplateFactory.create(value_data={VALUE_NAME_IN_DATABASE: 6})
+    query_repository = SqlAlchemyTemplatesQueryRepository(db_session_factory)
+
+    # When
+    results, _ = query_repository.list(
+        filters=TemplatesFilters(data={VALUE_NAME_IN_DATABASE: 5}),
+        ordering=[],
+        pagination=None,
+    )
+
+    # Then
+    assert results == [_map_template_db_to_template_entity(template)]
+
+
+def test_query_repository_uses_data_index(db_session: Session):
+    # Given
+    model_factories.TemplateFactory.create_batch(10)
+    # Sequential scan is cheaper for a small table, so planner has to be told
+    # to avoid it, in order to find out whether the index can be used at all.
+    db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    query = repositories._filter(
+        query=db_session.query(TemplateDb),
+        filters=TemplatesFilters(data={VALUE_NAME_IN_DATABASE: 5}),
+    )
+
+    # When
+    plan = db_session.execute(Explain(query.statement)).scalar_one()
+
+    # Then
+    assert "ix_templates_value_data" in json.dumps(plan)
+
+
+def test_query_repository_uses_search_index(db_session: Session):
+    # Given
+    model_factories.TemplateFactory.create_batch(10)
+    # Sequential scan is cheaper for a small table, so planner has to be told
+    # to avoid it, in order to find out whether the index can be used at all.
+    db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    query = repositories._filter(
+        query=db_session.query(TemplateDb),
+        filters=TemplatesFilters(query="abc1"),
+    )
+
+    # When
+    plan = db_session.execute(Explain(query.statement)).scalar_one()
+
+    # Then
+    assert "ix_templates_id_trgm" in json.dumps(plan)
+
+
+def test_query_repository_searches_wildcards_literally(
+    db_session_factory: Callable,
+):
+    # Given
+    model_factories.TemplateFactory.create_batch(3)
+    query_repository = SqlAlchemyTemplatesQueryRepository(db_session_factory)
+
+    # When
+    results, _ = query_repository.list(
+        filters=TemplatesFilters(query="%"),
+        ordering=[],
+        pagination=None,
+    )
+
+    # Then
+    assert not results
+
+
+def test_query_repository_searches_only_given_fields(
+    db_session_factory: Callable,
+):
+    # Given
+    template_db = model_factories.TemplateFactory.create()
+    query_repository = SqlAlchemyTemplatesQueryRepository(
+        db_session_factory, searchable_fields=[]
+    )
+
+    # When
+    results, _ = query_repository.list(
+        filters=TemplatesFilters(query=template_db.id.hex[:8]),
+        ordering=[],
+        pagination=None,
+    )
+
+    # Then
+    assert not results
+
+
+def test_query_repository_rejects_field_which_is_not_searchable():
+    with pytest.raises(ValueError):
+        SqlAlchemyTemplatesQueryRepository(searchable_fields=["value"])
+
+
+def _get_shard_values(session: Session, template_id) -> list[int]:
+    return list(
+        session.scalars(
+            select(TemplateValueShard.value)
+            .where(TemplateValueShard.template_id == template_id)
+            .order_by(TemplateValueShard.shard)
+        )
+    )
+
+
+@contextmanager
+def _record_statements(session: Session) -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    connection = session.connection()
+    event.listen(connection, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", record)
@@ -1,10 +1,17 @@
-from typing import Callable
+import select
+from typing import Any, Callable
 
 import pytest
+from sqlalchemy import Engine, delete
+from sqlalchemy.orm import sessionmaker
 
 from modules.template.adapters.repositories.sqlalchemy.orm import Template as TemplateDb
-from modules.template.adapters.unit_of_work import SqlAlchemyTemplatesUnitOfWork
+from modules.template.adapters.unit_of_work import (
+    TEMPLATES_CHANGED_CHANNEL,
+    SqlAlchemyTemplatesUnitOfWork,
+)
 from modules.template.domain.entities import Template as TemplateEntity
+from modules.template.domain.value_objects import TemplateValue
 
 from ....entity_factories import TemplateEntityFactory
 
@@ -59,3 +66,67 @@ def test_unit_of_work_rollbacks_when_exception_occur(
 
     # Then
     assert db_session_factory().query(TemplateDb).count() == 0
+
+
+def test_unit_of_work_rollbacks_only_nested_unit_of_work_when_exception_occur(
+    db_session_factory: Callable,
+):
+    # Given
+    template_entity = TemplateEntityFactory.create()
+    other_template_entity = TemplateEntityFactory.create()
+    unit_of_work = SqlAlchemyTemplatesUnitOfWork(db_session_factory)
+
+    # When
+    with unit_of_work:
+        with unit_of_work:
+            unit_of_work.templates.create(template_entity)
+
+        with pytest.raises(Exception):
+            with unit_of_work:
+                unit_of_work.templates.create(other_template_entity)
+                raise Exception
+
+    # Then
+    assert db_session_factory().get(TemplateDb, template_entity.id)
+    assert not db_session_factory().get(TemplateDb, other_template_entity.id)
+
+
+def test_unit_of_work_notifies_about_changed_templates_on_commit(
+    prepared_database: Engine,
+):
+    # Given
+    # Notifications are sent only when a transaction is committed,
+    # so the unit of work can't use a rolled back test session.
+    unit_of_work = SqlAlchemyTemplatesUnitOfWork(
+        session_factory=sessionmaker(bind=prepared_database), notify_changes=True
+    )
+    changed_template = TemplateEntityFactory.create()
+    unchanged_template = TemplateEntityFactory.create()
+    with unit_of_work:
+        unit_of_work.templates.create(changed_template)
+        unit_of_work.templates.create(unchanged_template)
+
+    listening_connection = prepared_database.raw_connection()
+    dbapi_connection: Any = listening_connection.dbapi_connection
+    dbapi_connection.autocommit = True
+    with dbapi_connection.cursor() as cursor:
+        cursor.execute(f"LISTEN {TEMPLATES_CHANGED_CHANNEL}")
+
+    try:
+        # When
+        with unit_of_work:
+            unit_of_work.templates.get(changed_template.id).set_value(
+                TemplateValue(value=5)
+            )
+            unit_of_work.templates.get(unchanged_template.id)
+
+        # Then
+        assert select.select([dbapi_connection], [], [], 5)[0]
+        dbapi_connection.poll()
+        assert [notification.payload for notification in dbapi_connection.notifies] == [
+            changed_template.id.hex
+        ]
+    finally:
+        listening_connection.invalidate()
+        with prepared_database.begin() as connection:
+            connection.execute(delete(TemplateDb))
@@ -0,0 +1,145 @@
+import argparse
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+
+from pytest_postgresql.janitor import DatabaseJanitor
+from sqlalchemy import Connection, Engine, create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from bootstrap import get_configuration
+from modules.common.database import Base
+from modules.common.database.explain import Explain
+
+# Benchmarks run against a separate database, which is created from scratch
+# and dropped afterwards, so development data is never touched.
+BENCHMARK_DATABASE_NAME_SUFFIX = "_benchmark"
+
+SEED_TEMPLATES_QUERY = text(
+    """
+    INSERT INTO templates (id, value_data, timestamp, version)
+    SELECT
+        gen_random_uuid(),
+        jsonb_build_object('value', floor(random() * 1000)::integer),
+        now() - make_interval(secs => number),
+        1
+    FROM generate_series(1, :number_of_templates) AS number
+    """
+)
+
+
+@dataclass(frozen=True)
+class Timings:
+    samples: list[float]
+
+    @property
+    def median_ms(self) -> float:
+        return statistics.median(self.samples) * 1000
+
+    @property
+    def p95_ms(self) -> float:
+        return statistics.quantiles(self.samples, n=20)[-1] * 1000
+
+    def __str__(self) -> str:
+        return f"median {self.median_ms:.2f} ms, p95 {self.p95_ms:.2f} ms"
+
+
+def get_argument_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--templates",
+        type=int,
+        default=1_000_000,
+        help="Number of templates to seed the database with.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=50,
+        help="Number of times each measured operation is repeated.",
+    )
+    return parser
+
+
+@contextmanager
+def benchmark_database() -> Iterator[Engine]:
+    configuration = get_configuration()
+    database_name = f"{configuration.DATABASE_NAME}{BENCHMARK_DATABASE_NAME_SUFFIX}"
+
+    with DatabaseJanitor(
+        user=configuration.DATABASE_USER,
+        password=configuration.DATABASE_PASSWORD,
+        host=configuration.DATABASE_HOST,
+        port=configuration.DATABASE_PORT,
+        dbname=database_name,
+        version=0,
+    ):
+        engine = create_engine(
+            url=configuration.database_url.replace(
+                f"/{configuration.DATABASE_NAME}", f"/{database_name}"
+            ),
+            pool_size=20,
+            max_overflow=100,
+            connect_args={"options": "-c timezone=utc"},
+        )
+        Base.metadata.create_all(engine)
+        try:
+            yield engine
+        finally:
+            engine.dispose()
+
+
+def get_session_factory(engine: Engine, isolation_level: str) -> sessionmaker:
+    # Application uses "REPEATABLE READ" isolation level, but with row locks
+    # a transaction waiting for a lock has to see the row committed by
+    # the previous one, instead of failing with serialization error.
+    # More details can be found here:
+    # https://www.postgresql.org/docs/current/transaction-iso.html#XACT-REPEATABLE-READ.
+    return sessionmaker(
+        bind=engine.execution_options(isolation_level=isolation_level),
+        autoflush=False,
+    )
+
+
+def seed_templates(engine: Engine, number_of_templates: int) -> None:
+    with engine.begin() as connection:
+        connection.execute(
+            SEED_TEMPLATES_QUERY, {"number_of_templates": number_of_templates}
+        )
+    # Planner needs fresh statistics to pick the same plans as in production.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("VACUUM ANALYZE templates"))
+
+
+def measure(operation: Callable[[], object], repeat: int) -> Timings:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        samples.append(time.perf_counter() - start)
+
+    return Timings(samples=samples)
+
+
+def get_plan_nodes(connection: Connection, statement) -> list[str]:
+    """
+    :return: Types of nodes of the plan picked for the given statement,
+             with names of used indexes.
+    """
+
+    plan = connection.execute(Explain(statement)).scalar_one()
+
+    nodes = []
+    pending = [plan[0]["Plan"]]
+    while pending:
+        node = pending.pop(0)
+        nodes.append(
+            f"{node['Node Type']} ({node['Index Name']})"
+            if "Index Name" in node
+            else node["Node Type"]
+        )
+        pending.extend(node.get("Plans", []))
+
+    return nodes
@@ -0,0 +1,126 @@
+"""
+Compares throughput of commands on templates, when each of them is handled
+separately (as by single requests) and when all of them are handled
+in a single batch, saved with a single commit.
+"""
+import functools
+import random
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from modules.common.message_bus import MessageBus
+from modules.template.adapters.unit_of_work import SqlAlchemyTemplatesUnitOfWork
+from modules.template.domain import commands as domain_commands
+from modules.template.domain import events as domain_events
+from modules.template.domain.value_objects import TemplateId, TemplateValue
+from modules.template.services import (
+    execute_templates_commands,
+    set_template_value,
+    subtract_template_value,
+)
+
+from ..base import (
+    benchmark_database,
+    get_argument_parser,
+    get_session_factory,
+    measure,
+    seed_templates,
+)
+
+# Templates are seeded with values lower than 1000, so subtracting 1
+# from templates with big enough values never fails.
+SEEDED_VALUE = 1_000_000
+
+RANDOM_TEMPLATES_QUERY = text(
+    "SELECT id FROM templates ORDER BY random() LIMIT :number"
+)
+SET_SEEDED_VALUE_QUERY = text(
+    "UPDATE templates SET value_data = jsonb_build_object('value', :value)"
+)
+
+
+def get_commands(
+    template_ids: list[TemplateId],
+) -> list[domain_commands.SetTemplateValue | domain_commands.SubtractTemplateValue]:
+    return [
+        domain_commands.SetTemplateValue(
+            template_id=template_id, value=TemplateValue(SEEDED_VALUE)
+        )
+        if random.random() < 0.5  # nosec B311
+        else domain_commands.SubtractTemplateValue(
+            template_id=template_id, value=TemplateValue(1)
+        )
+        for template_id in template_ids
+    ]
+
+
+def get_message_bus(unit_of_work: SqlAlchemyTemplatesUnitOfWork) -> MessageBus:
+    message_bus = MessageBus(
+        event_handlers={
+            domain_events.TemplateValueSet: [],
+            domain_events.TemplateValueSubtracted: [],
+        },
+        command_handlers={},
+    )
+    message_bus.command_handlers = {
+        command: functools.partial(
+            handler, templates_unit_of_work=unit_of_work, message_bus=message_bus
+        )
+        for command, handler in (
+            (domain_commands.SetTemplateValue, set_template_value),
+            (domain_commands.SubtractTemplateValue, subtract_template_value),
+        )
+    }
+
+    return message_bus
+
+
+def main() -> None:
+    parser = get_argument_parser(description=__doc__)
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Number of commands in a batch."
+    )
+    arguments = parser.parse_args()
+
+    with benchmark_database() as engine:
+        seed_templates(engine=engine, number_of_templates=arguments.templates)
+        with engine.begin() as connection:
+            connection.execute(SET_SEEDED_VALUE_QUERY, {"value": SEEDED_VALUE})
+            template_ids = [
+                TemplateId(template_id)
+                for template_id in connection.execute(
+                    RANDOM_TEMPLATES_QUERY, {"number": arguments.batch_size}
+                ).scalars()
+            ]
+
+        session_factory: sessionmaker = get_session_factory(
+            engine, isolation_level="REPEATABLE READ"
+        )
+        unit_of_work = SqlAlchemyTemplatesUnitOfWork(session_factory=session_factory)
+        message_bus = get_message_bus(unit_of_work)
+        commands = get_commands(template_ids)
+
+        for name, handle in (
+            (
+                "separately",
+                lambda: message_bus.handle(commands),
+            ),
+            (
+                "in a single batch",
+                lambda: execute_templates_commands(
+                    templates_unit_of_work=unit_of_work,
+                    message_bus=message_bus,
+                    commands=commands,
+                ),
+            ),
+        ):
+            timings = measure(handle, repeat=arguments.repeat)
+            print(
+                f"Handling {len(commands)} commands {name}: {timings}, "
+                f"{len(commands) / (timings.median_ms / 1000):.0f} commands/s."
+            )
+
+
+if __name__ == "__main__":
+    main()
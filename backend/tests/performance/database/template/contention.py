@@ -0,0 +1,155 @@
+"""
+Compares throughput of concurrent updates of a few hot templates,
+when templates are updated with optimistic version checks
+and when they are locked with "SELECT ... FOR UPDATE".
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from modules.common.message_bus import MessageBus
+from modules.template.adapters.repositories.sqlalchemy.orm import Template as TemplateDb
+from modules.template.adapters.unit_of_work import SqlAlchemyTemplatesUnitOfWork
+from modules.template.domain import events as domain_events
+from modules.template.domain.commands import SetTemplateValue
+from modules.template.domain.ports.exceptions import TemplateVersionConflict
+from modules.template.domain.value_objects import TemplateId, TemplateValue
+from modules.template.services import set_template_value
+
+from ..base import (
+    benchmark_database,
+    get_argument_parser,
+    get_session_factory,
+    seed_templates,
+)
+
+MAX_VALUE = 1000
+
+HOT_TEMPLATES_QUERY = text("SELECT id FROM templates ORDER BY random() LIMIT :number")
+
+
+def update_optimistically(
+    session_factory: sessionmaker,
+) -> Callable[[TemplateId, int], None]:
+    unit_of_work = SqlAlchemyTemplatesUnitOfWork(session_factory=session_factory)
+    message_bus = MessageBus(
+        event_handlers={domain_events.TemplateValueSet: []}, command_handlers={}
+    )
+
+    def update(template_id: TemplateId, value: int) -> None:
+        set_template_value(
+            templates_unit_of_work=unit_of_work,
+            message_bus=message_bus,
+            command=SetTemplateValue(
+                template_id=template_id, value=TemplateValue(value)
+            ),
+        )
+
+    return update
+
+
+def update_pessimistically(
+    session_factory: sessionmaker,
+) -> Callable[[TemplateId, int], None]:
+    def update(template_id: TemplateId, value: int) -> None:
+        with session_factory.begin() as session:
+            template = (
+                session.query(TemplateDb)
+                .filter_by(id=template_id)
+                .with_for_update()
+                .one()
+            )
+            template.value_data = {"value": value}
+            template.version += 1
+
+    return update
+
+
+def run(
+    update: Callable[[TemplateId, int], None],
+    template_ids: list[TemplateId],
+    threads: int,
+    updates_per_thread: int,
+) -> None:
+    conflicts = 0
+    lock = threading.Lock()
+
+    def work() -> None:
+        nonlocal conflicts
+        for _ in range(updates_per_thread):
+            try:
+                update(random.choice(template_ids), random.randint(0, MAX_VALUE))
+            except TemplateVersionConflict:
+                with lock:
+                    conflicts += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for future in [executor.submit(work) for _ in range(threads)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    updates = threads * updates_per_thread
+    print(
+        f"{updates / elapsed:.0f} updates/s, "
+        f"{conflicts} of {updates} updates failed after retries."
+    )
+
+
+def main() -> None:
+    parser = get_argument_parser(description=__doc__)
+    parser.add_argument(
+        "--threads", type=int, default=16, help="Number of concurrent writers."
+    )
+    parser.add_argument(
+        "--hot-templates",
+        type=int,
+        default=4,
+        help="Number of templates all writers update.",
+    )
+    arguments = parser.parse_args()
+
+    with benchmark_database() as engine:
+        seed_templates(engine=engine, number_of_templates=arguments.templates)
+
+        with engine.connect() as connection:
+            template_ids = [
+                TemplateId(template_id)
+                for template_id in connection.execute(
+                    HOT_TEMPLATES_QUERY, {"number": arguments.hot_templates}
+                ).scalars()
+            ]
+
+        for name, update in (
+            (
+                "optimistic version checks",
+                update_optimistically(
+                    get_session_factory(engine, isolation_level="REPEATABLE READ")
+                ),
+            ),
+            (
+                "row locks",
+                update_pessimistically(
+                    get_session_factory(engine, isolation_level="READ COMMITTED")
+                ),
+            ),
+        ):
+            print(
+                f"Updating {arguments.hot_templates} templates "
+                f"by {arguments.threads} threads with {name}."
+            )
+            run(
+                update=update,
+                template_ids=template_ids,
+                threads=arguments.threads,
+                updates_per_thread=arguments.repeat,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Compares number of templates created per second by concurrent clients,
+when each template is committed separately and when templates are
+grouped into batches saved with a single commit.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from sqlalchemy.orm import sessionmaker
+
+from modules.common.batching import MicroBatcher
+from modules.common.message_bus import MessageBus
+from modules.template.adapters.unit_of_work import SqlAlchemyTemplatesUnitOfWork
+from modules.template.domain import events as domain_events
+from modules.template.domain.commands import CreateTemplate
+from modules.template.services import create_template, create_templates
+from modules.template.services.queries.dtos import OutputTemplate
+
+from ..base import (
+    benchmark_database,
+    get_argument_parser,
+    get_session_factory,
+)
+
+
+def create_separately(session_factory: sessionmaker) -> Callable[[], object]:
+    unit_of_work = SqlAlchemyTemplatesUnitOfWork(session_factory=session_factory)
+    message_bus = _get_message_bus()
+
+    return lambda: create_template(
+        templates_unit_of_work=unit_of_work,
+        message_bus=message_bus,
+        command=CreateTemplate(),
+    )
+
+
+def create_in_batches(
+    session_factory: sessionmaker, max_batch_size: int, max_wait_seconds: float
+) -> Callable[[], object]:
+    unit_of_work = SqlAlchemyTemplatesUnitOfWork(session_factory=session_factory)
+    message_bus = _get_message_bus()
+    batcher: MicroBatcher[CreateTemplate, OutputTemplate] = MicroBatcher(
+        handle_batch=lambda commands: create_templates(
+            templates_unit_of_work=unit_of_work,
+            message_bus=message_bus,
+            commands=commands,
+        ),
+        max_batch_size=max_batch_size,
+        max_wait_seconds=max_wait_seconds,
+    )
+
+    return lambda: batcher.submit(CreateTemplate())
+
+
+def run(create: Callable[[], object], threads: int, creates_per_thread: int) -> None:
+    def work() -> None:
+        for _ in range(creates_per_thread):
+            create()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for future in [executor.submit(work) for _ in range(threads)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    print(f"{threads * creates_per_thread / elapsed:.0f} creates/s.")
+
+
+def main() -> None:
+    parser = get_argument_parser(description=__doc__)
+    parser.add_argument(
+        "--threads", type=int, default=32, help="Number of concurrent clients."
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=64, help="Maximum size of a batch."
+    )
+    parser.add_argument(
+        "--batch-wait-ms",
+        type=float,
+        default=2,
+        help="Time for which a batch is kept open.",
+    )
+    arguments = parser.parse_args()
+
+    with benchmark_database() as engine:
+        session_factory = get_session_factory(engine, isolation_level="REPEATABLE READ")
+
+        print(f"Creating templates by {arguments.threads} threads separately.")
+        run(
+            create=create_separately(session_factory),
+            threads=arguments.threads,
+            creates_per_thread=arguments.repeat,
+        )
+
+        print(
+            f"Creating templates by {arguments.threads} threads in batches "
+            f"of up to {arguments.batch_size} templates "
+            f"or {arguments.batch_wait_ms} ms."
+        )
+        run(
+            create=create_in_batches(
+                session_factory,
+                max_batch_size=arguments.batch_size,
+                max_wait_seconds=arguments.batch_wait_ms / 1000,
+            ),
+            threads=arguments.threads,
+            creates_per_thread=arguments.repeat,
+        )
+
+
+def _get_message_bus() -> MessageBus:
+    return MessageBus(
+        event_handlers={domain_events.TemplateCreated: []}, command_handlers={}
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compares latency of inserting templates, size of the primary key index
+and amount of generated WAL, when templates get random (version 4)
+and time-ordered (version 7) identifiers.
+"""
+import uuid
+from typing import Callable
+
+from sqlalchemy import Engine, insert, text
+
+from modules.common.ids import uuid4, uuid7
+from modules.common.time import get_current_timestamp
+from modules.template.adapters.repositories.sqlalchemy.orm import Template as TemplateDb
+
+from ..base import benchmark_database, get_argument_parser, measure
+
+WAL_POSITION_QUERY = text("SELECT pg_current_wal_lsn()")
+WAL_SIZE_QUERY = text(
+    "SELECT pg_size_pretty(pg_wal_lsn_diff(pg_current_wal_lsn(), :start))"
+)
+INDEX_SIZE_QUERY = text(
+    "SELECT pg_size_pretty(pg_relation_size('templates_pkey'::regclass))"
+)
+
+
+def insert_templates(
+    engine: Engine, generate_id: Callable[[], uuid.UUID], batch_size: int
+) -> Callable[[], None]:
+    def insert_batch() -> None:
+        timestamp = get_current_timestamp()
+        with engine.begin() as connection:
+            connection.execute(
+                insert(TemplateDb),
+                [
+                    {
+                        "id": generate_id(),
+                        "value_data": {"value": 0},
+                        "timestamp": timestamp,
+                        "version": 1,
+                    }
+                    for _ in range(batch_size)
+                ],
+            )
+
+    return insert_batch
+
+
+def main() -> None:
+    parser = get_argument_parser(description=__doc__)
+    arguments = parser.parse_args()
+    batch_size = max(arguments.templates // arguments.repeat, 1)
+
+    for name, generate_id in (("random", uuid4), ("time-ordered", uuid7)):
+        with benchmark_database() as engine:
+            with engine.connect() as connection:
+                wal_start = connection.execute(WAL_POSITION_QUERY).scalar_one()
+
+            timings = measure(
+                insert_templates(
+                    engine=engine, generate_id=generate_id, batch_size=batch_size
+                ),
+                repeat=arguments.repeat,
+            )
+
+            with engine.connect() as connection:
+                index_size = connection.execute(INDEX_SIZE_QUERY).scalar_one()
+                wal_size = connection.execute(
+                    WAL_SIZE_QUERY, {"start": wal_start}
+                ).scalar_one()
+
+        print(
+            f"Inserting {arguments.repeat} batches of {batch_size} templates "
+            f"with {name} identifiers: {timings}, "
+            f"primary key index {index_size}, WAL {wal_size}."
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compares number of templates imported per second, when each chunk
+is inserted row by row through the ORM and when it's streamed with COPY
+into a staging table and merged with a single statement.
+"""
+import time
+from typing import Callable
+
+from sqlalchemy.orm import sessionmaker
+
+from modules.common.time import get_current_timestamp
+from modules.template.adapters.unit_of_work import SqlAlchemyTemplatesUnitOfWork
+from modules.template.domain.entities import Template as TemplateEntity
+from modules.template.domain.value_objects import INITIAL_TEMPLATE_VERSION
+from modules.template.services.commands.commands import IMPORT_CHUNK_SIZE
+
+from ..base import benchmark_database, get_argument_parser, get_session_factory
+
+
+def generate_templates(number_of_templates: int) -> list[TemplateEntity]:
+    timestamp = get_current_timestamp()
+    return [
+        TemplateEntity(
+            id=TemplateEntity.generate_id(),
+            timestamp=timestamp,
+            version=INITIAL_TEMPLATE_VERSION,
+        )
+        for _ in range(number_of_templates)
+    ]
+
+
+def insert_rows(session_factory: sessionmaker) -> Callable[[list], object]:
+    unit_of_work = SqlAlchemyTemplatesUnitOfWork(session_factory=session_factory)
+
+    def insert(templates: list[TemplateEntity]) -> None:
+        with unit_of_work:
+            for template in templates:
+                unit_of_work.templates.create(template)
+
+    return insert
+
+
+def copy_rows(session_factory: sessionmaker) -> Callable[[list], object]:
+    unit_of_work = SqlAlchemyTemplatesUnitOfWork(session_factory=session_factory)
+
+    def copy(templates: list[TemplateEntity]) -> None:
+        with unit_of_work:
+            unit_of_work.templates.import_many(templates)
+
+    return copy
+
+
+def run(name: str, save_chunk: Callable[[list], object], templates: list) -> None:
+    start = time.perf_counter()
+    for offset in range(0, len(templates), IMPORT_CHUNK_SIZE):
+        save_chunk(templates[offset : offset + IMPORT_CHUNK_SIZE])
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"Importing {len(templates)} templates {name}: "
+        f"{len(templates) / elapsed:.0f} rows/s."
+    )
+
+
+def main() -> None:
+    parser = get_argument_parser(description=__doc__)
+    arguments = parser.parse_args()
+
+    with benchmark_database() as engine:
+        session_factory = get_session_factory(engine, isolation_level="REPEATABLE READ")
+
+        run(
+            "row by row",
+            save_chunk=insert_rows(session_factory),
+            templates=generate_templates(arguments.templates),
+        )
+        run(
+            "with COPY",
+            save_chunk=copy_rows(session_factory),
+            templates=generate_templates(arguments.templates),
+        )
+
+
+if __name__ == "__main__":
+    main()
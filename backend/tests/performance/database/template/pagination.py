@@ -0,0 +1,118 @@
+"""
+Compares latency of listing the first and a deep page of templates,
+when templates are paginated by offset and by cursor.
+"""
+from sqlalchemy import Connection, text
+from sqlalchemy.orm import Session
+
+from modules.common.dtos import Ordering, OrderingEnum
+from modules.common.pagination import (
+    CountStrategyEnum,
+    Cursor,
+    CursorPagination,
+    Pagination,
+)
+from modules.template.adapters.repositories.sqlalchemy import (
+    SqlAlchemyTemplatesQueryRepository,
+)
+from modules.template.domain.ports.dtos import TemplatesFilters
+
+from ..base import (
+    Timings,
+    benchmark_database,
+    get_argument_parser,
+    measure,
+    seed_templates,
+)
+
+# Both pagination strategies list the newest templates first.
+ORDERING = [Ordering(field="timestamp", order=OrderingEnum.DESCENDING)]
+
+# Cursor of a page points to the last record of the previous page.
+CURSOR_QUERY = text(
+    """
+    SELECT timestamp, id
+    FROM templates
+    ORDER BY timestamp DESC, id DESC
+    OFFSET :offset
+    LIMIT 1
+    """
+)
+
+
+def list_page(
+    connection: Connection, pagination: Pagination | CursorPagination, repeat: int
+) -> Timings:
+    repository = SqlAlchemyTemplatesQueryRepository(
+        session_factory=lambda: Session(bind=connection)
+    )
+
+    return measure(
+        lambda: repository.list(
+            filters=TemplatesFilters(),
+            ordering=ORDERING,
+            pagination=pagination,
+            count_strategy=CountStrategyEnum.NONE,
+        ),
+        repeat=repeat,
+    )
+
+
+def get_cursor(connection: Connection, offset: int) -> Cursor | None:
+    if offset == 0:
+        return None
+
+    timestamp, template_id = connection.execute(
+        CURSOR_QUERY, {"offset": offset - 1}
+    ).one()
+    return Cursor(timestamp=timestamp, id=template_id)
+
+
+def main() -> None:
+    parser = get_argument_parser(description=__doc__)
+    parser.add_argument(
+        "--records-per-page", type=int, default=10, help="Size of a page."
+    )
+    parser.add_argument(
+        "--pages",
+        type=int,
+        nargs="+",
+        default=[1, 10_000],
+        help="Numbers of pages to list.",
+    )
+    arguments = parser.parse_args()
+
+    needed_templates = max(arguments.pages) * arguments.records_per_page
+    if arguments.templates < needed_templates:
+        parser.error(f"At least {needed_templates} templates are needed.")
+
+    with benchmark_database() as engine:
+        seed_templates(engine=engine, number_of_templates=arguments.templates)
+
+        with engine.connect() as connection:
+            for page in arguments.pages:
+                offset = (page - 1) * arguments.records_per_page
+                for name, pagination in (
+                    (
+                        "offset",
+                        Pagination(
+                            offset=offset, records_per_page=arguments.records_per_page
+                        ),
+                    ),
+                    (
+                        "cursor",
+                        CursorPagination(
+                            cursor=get_cursor(connection=connection, offset=offset),
+                            records_per_page=arguments.records_per_page,
+                        ),
+                    ),
+                ):
+                    print(
+                        f"Listing page {page} of {arguments.templates} templates "
+                        f"by {name}: "
+                        f"{list_page(connection, pagination, arguments.repeat)}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Compares substring search of templates with and without trigram index.
+"""
+import itertools
+
+from sqlalchemy import Connection, text
+from sqlalchemy.orm import Session
+
+from modules.common.pagination import CountStrategyEnum, Pagination
+from modules.template.adapters.repositories.sqlalchemy import (
+    SqlAlchemyTemplatesQueryRepository,
+    repositories,
+)
+from modules.template.adapters.repositories.sqlalchemy.orm import Template as TemplateDb
+from modules.template.domain.ports.dtos import TemplatesFilters
+
+from ..base import (
+    Timings,
+    benchmark_database,
+    get_argument_parser,
+    get_plan_nodes,
+    measure,
+    seed_templates,
+)
+
+SEARCHED_TEXT_LENGTH = 6
+
+SEARCHED_TEXTS_QUERY = text(
+    """
+    SELECT substr(CAST(id AS TEXT), 1 + floor(random() * 30)::integer, :length)
+    FROM templates
+    ORDER BY random()
+    LIMIT :number_of_texts
+    """
+)
+
+
+def search(connection: Connection, searched_texts: list[str], repeat: int) -> Timings:
+    repository = SqlAlchemyTemplatesQueryRepository(
+        session_factory=lambda: Session(bind=connection)
+    )
+    texts = itertools.cycle(searched_texts)
+
+    print(
+        "Plan:",
+        " -> ".join(
+            get_plan_nodes(
+                connection=connection,
+                statement=repositories._filter(
+                    query=Session(bind=connection).query(TemplateDb),
+                    filters=TemplatesFilters(query=searched_texts[0]),
+                ).statement,
+            )
+        ),
+    )
+
+    return measure(
+        lambda: repository.list(
+            filters=TemplatesFilters(query=next(texts)),
+            ordering=[],
+            pagination=Pagination(offset=0, records_per_page=10),
+            count_strategy=CountStrategyEnum.NONE,
+        ),
+        repeat=repeat,
+    )
+
+
+def main() -> None:
+    arguments = get_argument_parser(description=__doc__).parse_args()
+
+    with benchmark_database() as engine:
+        seed_templates(engine=engine, number_of_templates=arguments.templates)
+
+        with engine.connect() as connection:
+            searched_texts = list(
+                connection.execute(
+                    SEARCHED_TEXTS_QUERY,
+                    {
+                        "length": SEARCHED_TEXT_LENGTH,
+                        "number_of_texts": arguments.repeat,
+                    },
+                ).scalars()
+            )
+
+            print(f"Searching {arguments.templates} templates with trigram index.")
+            print(search(connection, searched_texts, arguments.repeat))
+            connection.rollback()
+
+            # Index is dropped in a transaction, which is rolled back afterwards,
+            # so it doesn't have to be rebuilt.
+            connection.execute(text("DROP INDEX ix_templates_id_trgm"))
+            print(f"Searching {arguments.templates} templates without index.")
+            print(search(connection, searched_texts, arguments.repeat))
+            connection.rollback()
+
+
+if __name__ == "__main__":
+    main()
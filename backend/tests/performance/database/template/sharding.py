@@ -0,0 +1,117 @@
+"""
+Compares throughput of concurrent subtractions from a single hot template,
+which value is split into different numbers of shards. Each subtraction
+keeps its transaction open for a while afterwards, as if other changes were
+written in it, so subtractions from the same row wait for each other, and
+the throughput grows with the number of shards, up to the number of writers.
+"""
+import time
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from modules.template.adapters.repositories.sqlalchemy import (
+    SqlAlchemyTemplatesDomainRepository,
+)
+from modules.template.domain.value_objects import TemplateId, TemplateValue
+
+from ..base import (
+    benchmark_database,
+    get_argument_parser,
+    get_session_factory,
+    seed_templates,
+)
+from .contention import run
+
+# Value high enough to never run out during the benchmark.
+INITIAL_VALUE = 2_000_000_000
+
+HOT_TEMPLATE_QUERY = text(
+    """
+    UPDATE templates
+    SET value_data = jsonb_build_object('value', :value)
+    WHERE id = (SELECT id FROM templates LIMIT 1)
+    RETURNING id
+    """
+)
+
+
+def shard(session_factory: sessionmaker, template_id: TemplateId, shards: int) -> None:
+    with session_factory.begin() as session:
+        repository = SqlAlchemyTemplatesDomainRepository(session)
+        if shards == 0:
+            repository.unshard_value(template_id)
+        else:
+            repository.shard_value(template_id=template_id, number_of_shards=shards)
+
+
+def subtract(
+    session_factory: sessionmaker, hold_seconds: float
+) -> Callable[[TemplateId, int], None]:
+    def update(template_id: TemplateId, value: int) -> None:
+        with session_factory.begin() as session:
+            SqlAlchemyTemplatesDomainRepository(session).subtract_value(
+                template_id=template_id, value=TemplateValue(value)
+            )
+            # Changed row stays locked until the transaction ends.
+            time.sleep(hold_seconds)
+
+    return update
+
+
+def main() -> None:
+    parser = get_argument_parser(description=__doc__)
+    parser.add_argument(
+        "--threads", type=int, default=16, help="Number of concurrent writers."
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        nargs="+",
+        default=[0, 1, 2, 4, 8, 16, 32],
+        help="Numbers of shards to compare, 0 stands for unsharded template.",
+    )
+    parser.add_argument(
+        "--hold-ms",
+        type=float,
+        default=10,
+        help="Time each transaction stays open after the subtraction.",
+    )
+    arguments = parser.parse_args()
+
+    with benchmark_database() as engine:
+        seed_templates(engine=engine, number_of_templates=arguments.templates)
+        # Subtractions are made in "READ COMMITTED" isolation level,
+        # so the ones waiting for a shard don't fail, once it's released.
+        session_factory = get_session_factory(engine, isolation_level="READ COMMITTED")
+
+        with engine.begin() as connection:
+            template_id = TemplateId(
+                connection.execute(
+                    HOT_TEMPLATE_QUERY, {"value": INITIAL_VALUE}
+                ).scalar_one()
+            )
+
+        for shards in arguments.shards:
+            shard(
+                session_factory=session_factory, template_id=template_id, shards=shards
+            )
+            print(
+                f"Subtracting from a template split into {shards} shards "
+                f"by {arguments.threads} threads, holding each transaction "
+                f"for {arguments.hold_ms} ms."
+            )
+            run(
+                update=subtract(
+                    session_factory=session_factory,
+                    hold_seconds=arguments.hold_ms / 1000,
+                ),
+                template_ids=[template_id],
+                threads=arguments.threads,
+                updates_per_thread=arguments.repeat,
+            )
+
+
+if __name__ == "__main__":
+    main()
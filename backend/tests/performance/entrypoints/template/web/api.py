@@ -1,7 +1,13 @@
 from locust import task
 
+from modules.common import consts
 from tests.performance.entrypoints.template.base import BaseApiTests
 
+# Deep pages show the difference between pagination strategies:
+# offset pagination has to scan and skip all preceding rows,
+# while cursor pagination seeks directly to the requested position.
+DEEP_PAGE_OFFSET = 10_000
+
 
 class TemplateApiTests(BaseApiTests):
     @task
@@ -10,6 +16,25 @@ class TemplateApiTests(BaseApiTests):
             "/api/templates/",
         )
 
+    @task
+    def list_templates_deep_page_by_offset(self):
+        self.client.get(
+            "/api/templates/",
+            params={consts.PAGINATION_OFFSET_QUERY_PARAMETER_NAME: DEEP_PAGE_OFFSET},
+            name="/api/templates/?offset=[deep]",
+        )
+
+    @task
+    def list_templates_next_page_by_cursor(self):
+        # Cursor from the previous response is reused,
+        # so each user keeps walking further through the list.
+        response = self.client.get(
+            getattr(self, "next_page_url", None)
+            or f"/api/templates/?{consts.PAGINATION_CURSOR_QUERY_PARAMETER_NAME}=",
+            name="/api/templates/?cursor=[next]",
+        )
+        self.next_page_url = response.json().get(consts.PAGINATION_NEXT_LINK_RELATION)
+
     @task
     def get_template(self):
         self.client.get(
@@ -0,0 +1,56 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from modules.common.batching import MicroBatcher
+
+NUMBER_OF_ITEMS = 20
+MAX_BATCH_SIZE = 8
+
+
+def test_micro_batcher_merges_concurrent_items_into_batches():
+    # Given
+    batches = []
+
+    def handle_batch(items: list[int]) -> list[int]:
+        batches.append(items)
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(
+        handle_batch=handle_batch,
+        max_batch_size=MAX_BATCH_SIZE,
+        max_wait_seconds=0.05,
+    )
+
+    # When
+    with ThreadPoolExecutor(max_workers=NUMBER_OF_ITEMS) as executor:
+        results = list(executor.map(batcher.submit, range(NUMBER_OF_ITEMS)))
+
+    # Then
+    assert results == [item * 2 for item in range(NUMBER_OF_ITEMS)]
+    assert len(batches) < NUMBER_OF_ITEMS
+    assert all(len(batch) <= MAX_BATCH_SIZE for batch in batches)
+    assert sorted(item for batch in batches for item in batch) == list(
+        range(NUMBER_OF_ITEMS)
+    )
+
+
+def test_micro_batcher_raises_batch_exception_for_each_item():
+    # Given
+    def handle_batch(items: list[int]) -> list[int]:
+        raise ValueError("Batch failed.")
+
+    batcher = MicroBatcher(
+        handle_batch=handle_batch,
+        max_batch_size=MAX_BATCH_SIZE,
+        max_wait_seconds=0.01,
+    )
+
+    # When
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(batcher.submit, item) for item in range(2)]
+
+    # Then
+    for future in futures:
+        with pytest.raises(ValueError):
+            future.result()
@@ -0,0 +1,72 @@
+from modules.common.cache import VersionedLRUCache
+
+TTL_SECONDS = 60
+
+
+def test_versioned_lru_cache_evicts_least_recently_used_entry():
+    # Given
+    cache = VersionedLRUCache(ttl_seconds=TTL_SECONDS, max_size=2)
+    cache.set("first", 1, version=1, token=cache.get_token("first"))
+    cache.set("second", 2, version=1, token=cache.get_token("second"))
+    cache.get("first")
+
+    # When
+    cache.set("third", 3, version=1, token=cache.get_token("third"))
+
+    # Then
+    assert cache.get("first") == 1
+    assert cache.get("second") is None
+    assert cache.get("third") == 3
+    statistics = cache.statistics
+    assert statistics.hits == 3
+    assert statistics.misses == 1
+    assert statistics.evictions == 1
+    assert statistics.size == 2
+
+
+def test_versioned_lru_cache_skips_value_loaded_before_invalidation():
+    # Given
+    cache = VersionedLRUCache(ttl_seconds=TTL_SECONDS)
+    token = cache.get_token("key")
+    cache.invalidate("key")
+
+    # When
+    is_set = cache.set("key", "stale", version=1, token=token)
+
+    # Then
+    assert not is_set
+    assert cache.get("key") is None
+
+    # When
+    is_set = cache.set("key", "fresh", version=2, token=cache.get_token("key"))
+
+    # Then
+    assert is_set
+    assert cache.get("key") == "fresh"
+
+
+def test_versioned_lru_cache_skips_older_version():
+    # Given
+    cache = VersionedLRUCache(ttl_seconds=TTL_SECONDS)
+    token = cache.get_token("key")
+    cache.set("key", "newer", version=2, token=token)
+
+    # When
+    is_set = cache.set("key", "older", version=1, token=token)
+
+    # Then
+    assert not is_set
+    assert cache.get("key") == "newer"
+
+
+def test_versioned_lru_cache_forgets_expired_entries():
+    # Given
+    cache = VersionedLRUCache(ttl_seconds=0)
+    cache.set("key", "value", version=1, token=cache.get_token("key"))
+
+    # When
+    value = cache.get("key")
+
+    # Then
+    assert value is None
+    assert cache.statistics.size == 0
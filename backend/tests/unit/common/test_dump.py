@@ -0,0 +1,36 @@
+import uuid
+from datetime import datetime, timedelta
+
+from modules.common.database.dump import split_into_ranges
+
+
+def test_split_into_ranges_covers_whole_space_with_ranges_of_equal_width():
+    # Given
+    lowest = datetime(2024, 1, 1)
+    highest = lowest + timedelta(days=3)
+
+    # When
+    ranges = split_into_ranges(lowest, highest, number_of_ranges=3)
+
+    # Then
+    assert ranges == [
+        (None, lowest + timedelta(days=1)),
+        (lowest + timedelta(days=1), lowest + timedelta(days=2)),
+        (lowest + timedelta(days=2), None),
+    ]
+
+
+def test_split_into_ranges_splits_ids():
+    # When
+    ranges = split_into_ranges(
+        uuid.UUID(int=0), uuid.UUID(int=(1 << 128) - 1), number_of_ranges=4
+    )
+
+    # Then
+    assert [lower for lower, _ in ranges] == [
+        None,
+        uuid.UUID("3fffffff-ffff-ffff-ffff-ffffffffffff"),
+        uuid.UUID("7fffffff-ffff-ffff-ffff-ffffffffffff"),
+        uuid.UUID("bfffffff-ffff-ffff-ffff-ffffffffffff"),
+    ]
+    assert [upper for _, upper in ranges] == [lower for lower, _ in ranges[1:]] + [None]
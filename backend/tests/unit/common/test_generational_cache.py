@@ -0,0 +1,105 @@
+from datetime import datetime, timezone
+
+from modules.common.cache import (
+    CachedResult,
+    GenerationalCache,
+    TwoTierCache,
+    VersionedLRUCache,
+    make_key,
+)
+from modules.common.dtos import Ordering, OrderingEnum
+from modules.common.pagination import CursorPagination, Pagination
+from tests.fakers import TestSharedCache
+
+TTL_SECONDS = 60
+NAMESPACE = "test"
+
+
+def create_local_cache() -> GenerationalCache:
+    return GenerationalCache(
+        cache=VersionedLRUCache(ttl_seconds=TTL_SECONDS), namespace=NAMESPACE
+    )
+
+
+def test_generational_cache_returns_cached_result_until_invalidation():
+    # Given
+    cache = create_local_cache()
+    loads = []
+
+    def load():
+        loads.append(len(loads))
+        return loads[-1]
+
+    # When
+    first_result = cache.get_or_load("key", load)
+    cached_result = cache.get_or_load("key", load)
+    cache.invalidate()
+    result_after_invalidation = cache.get_or_load("key", load)
+
+    # Then
+    assert first_result == cached_result == 0
+    assert result_after_invalidation == 1
+    assert len(loads) == 2
+
+
+def test_generational_cache_loads_result_when_cached_one_is_too_old():
+    # Given
+    cache = create_local_cache()
+    cache.get_or_load("key", lambda: "old")
+
+    # When
+    accepted_result = cache.get_or_load("key", lambda: "new", max_age_seconds=60)
+    fresh_result = cache.get_or_load("key", lambda: "new", max_age_seconds=0)
+    cached_result = cache.get_or_load("key", lambda: "newer")
+
+    # Then
+    assert accepted_result == "old"
+    assert fresh_result == "new"
+    assert cached_result == "new"
+
+
+def test_generational_cache_invalidates_results_in_all_processes():
+    # Given
+    shared_cache = TestSharedCache()
+    first_cache, second_cache = (
+        GenerationalCache(
+            cache=TwoTierCache(
+                shared_cache=shared_cache,
+                namespace=NAMESPACE,
+                ttl_seconds=TTL_SECONDS,
+                serialize=CachedResult.serialize,
+                deserialize=CachedResult.deserialize,
+            ),
+            namespace=NAMESPACE,
+            shared_cache=shared_cache,
+        )
+        for _ in range(2)
+    )
+    first_cache.get_or_load("key", lambda: "old")
+
+    # When
+    shared_result = second_cache.get_or_load("key", lambda: "unused")
+    first_cache.invalidate()
+    result_after_invalidation = second_cache.get_or_load("key", lambda: "new")
+
+    # Then
+    assert shared_result == "old"
+    assert result_after_invalidation == "new"
+
+
+def test_make_key_returns_the_same_key_for_equal_queries():
+    # Given
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    ordering = [Ordering(field="timestamp", order=OrderingEnum.DESCENDING)]
+
+    # When
+    key = make_key({"a": 1, "b": 2}, timestamp, ordering, Pagination(0, 10))
+    equal_key = make_key({"b": 2, "a": 1}, timestamp, ordering, Pagination(0, 10))
+    other_key = make_key({"a": 1, "b": 2}, timestamp, ordering, Pagination(10, 10))
+    other_pagination_key = make_key(
+        {"a": 1, "b": 2}, timestamp, ordering, CursorPagination(None, 10)
+    )
+
+    # Then
+    assert key == equal_key
+    assert len({key, other_key, other_pagination_key}) == 3
@@ -0,0 +1,32 @@
+import uuid
+
+from modules.common.ids import Uuid, uuid7
+
+NUMBER_OF_IDS = 1000
+
+
+def test_uuid7_generates_time_ordered_ids():
+    # When
+    ids = [uuid7() for _ in range(NUMBER_OF_IDS)]
+
+    # Then
+    assert all(id_.version == 7 for id_ in ids)
+    assert all(id_.variant == uuid.RFC_4122 for id_ in ids)
+    assert ids == sorted(ids)
+    assert len(set(ids)) == NUMBER_OF_IDS
+
+
+def test_uuid_uses_generator_chosen_for_type():
+    # Given
+    class TimeOrderedId(Uuid):
+        generator = staticmethod(uuid7)
+
+    # When
+    random_id = Uuid.new()
+    time_ordered_id = TimeOrderedId.new()
+
+    # Then
+    assert random_id.version == 4
+    assert isinstance(time_ordered_id, TimeOrderedId)
+    assert time_ordered_id.version == 7
+    assert TimeOrderedId.from_hex(random_id.hex) == random_id
@@ -0,0 +1,18 @@
+from pytest_mock import MockFixture
+
+from modules.common.database.notifications import MAX_PAYLOAD_SIZE, notify
+
+
+def test_notify_packs_values_into_payloads_within_size_limit(mocker: MockFixture):
+    # Given
+    session = mocker.Mock()
+    values = [f"{number:032x}" for number in range(1000)]
+
+    # When
+    notify(session=session, channel="channel", values=values)
+
+    # Then
+    payloads = [call.args[1]["payload"] for call in session.execute.call_args_list]
+    assert len(payloads) == 5
+    assert all(len(payload) <= MAX_PAYLOAD_SIZE for payload in payloads)
+    assert ",".join(payloads).split(",") == values
@@ -0,0 +1,113 @@
+from modules.common.cache import TwoTierCache
+from tests.fakers import TestSharedCache
+
+TTL_SECONDS = 60
+NAMESPACE = "test"
+
+
+def test_two_tier_cache_shares_values_between_processes():
+    # Given
+    shared_cache = TestSharedCache()
+    first_cache = TwoTierCache(
+        shared_cache=shared_cache, namespace=NAMESPACE, ttl_seconds=TTL_SECONDS
+    )
+    second_cache = TwoTierCache(
+        shared_cache=shared_cache, namespace=NAMESPACE, ttl_seconds=TTL_SECONDS
+    )
+    first_cache.set("key", "value", version=1, token=first_cache.get_token("key"))
+
+    # When
+    value = second_cache.get("key")
+
+    # Then
+    assert value == "value"
+    assert second_cache.statistics.hits == 1
+
+
+def test_two_tier_cache_serves_stale_value_while_one_caller_refreshes_it():
+    # Given
+    shared_cache = TestSharedCache()
+    first_cache, second_cache = (
+        TwoTierCache(
+            shared_cache=shared_cache,
+            namespace=NAMESPACE,
+            ttl_seconds=0,
+            stale_seconds=TTL_SECONDS,
+            local_ttl_seconds=0,
+        )
+        for _ in range(2)
+    )
+    first_cache.set("key", "stale", version=1, token=first_cache.get_token("key"))
+
+    # When
+    refreshing_value = first_cache.get("key")
+    waiting_value = second_cache.get("key")
+
+    # Then
+    assert refreshing_value is None
+    assert waiting_value == "stale"
+    assert first_cache.statistics.misses == 1
+    assert second_cache.statistics.stale_hits == 1
+
+
+def test_two_tier_cache_skips_value_loaded_before_invalidation_in_another_process():
+    # Given
+    shared_cache = TestSharedCache()
+    writing_cache, reading_cache = (
+        TwoTierCache(
+            shared_cache=shared_cache,
+            namespace=NAMESPACE,
+            ttl_seconds=TTL_SECONDS,
+            local_ttl_seconds=0,
+        )
+        for _ in range(2)
+    )
+    token = reading_cache.get_token("key")
+    writing_cache.invalidate("key")
+
+    # When
+    reading_cache.set("key", "stale", version=1, token=token)
+
+    # Then
+    assert writing_cache.get("key") is None
+    assert reading_cache.get("key") is None
+
+
+def test_two_tier_cache_falls_back_to_local_cache_when_shared_cache_is_unavailable():
+    # Given
+    shared_cache = TestSharedCache()
+    shared_cache.available = False
+    cache = TwoTierCache(
+        shared_cache=shared_cache, namespace=NAMESPACE, ttl_seconds=TTL_SECONDS
+    )
+
+    # When
+    is_set = cache.set("key", "value", version=1, token=cache.get_token("key"))
+
+    # Then
+    assert is_set
+    assert cache.get("key") == "value"
+
+    # When
+    cache.invalidate("key")
+
+    # Then
+    assert cache.get("key") is None
+
+
+def test_two_tier_cache_clears_only_local_values_when_cleared_locally():
+    # Given
+    shared_cache = TestSharedCache()
+    cache = TwoTierCache(
+        shared_cache=shared_cache, namespace=NAMESPACE, ttl_seconds=TTL_SECONDS
+    )
+    token = cache.get_token("key")
+    cache.set("key", "value", version=1, token=cache.get_token("key"))
+
+    # When
+    cache.clear_locally()
+
+    # Then
+    assert cache.statistics.size == 0
+    assert not cache.set("key", "stale", version=1, token=token)
+    assert cache.get("key") == "value"
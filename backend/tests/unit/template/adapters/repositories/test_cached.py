@@ -0,0 +1,173 @@
+import json
+from typing import Callable
+
+from pytest_mock import MockFixture
+
+from modules.common.cache import TwoTierCache, VersionedLRUCache
+from modules.common.database import consistency
+from modules.common.pagination import CountStrategyEnum, TotalCount
+from modules.template.adapters import (
+    CachedTemplatesQueryRepository,
+    deserialize_template,
+    deserialize_templates_list,
+    serialize_template,
+    serialize_templates_list,
+)
+from modules.template.domain.events import TemplateValueSet
+from modules.template.domain.value_objects import TemplateValue
+from modules.template.services.handlers import invalidate_cached_template
+
+from ..... import entity_factories
+from .....fakers import TestSharedCache
+
+TTL_SECONDS = 60
+
+
+def test_cached_repository_retrieves_template_once_until_it_is_invalidated(
+    fake_template_query_repository_factory: Callable,
+    mocker: MockFixture,
+):
+    # Given
+    template = entity_factories.TemplateEntityFactory.create()
+    repository = fake_template_query_repository_factory([template])
+    get_spy = mocker.spy(repository, "get")
+    cache = VersionedLRUCache(ttl_seconds=TTL_SECONDS)
+    cached_repository = CachedTemplatesQueryRepository(
+        repository=repository, cache=cache
+    )
+
+    # When
+    results = [cached_repository.get(template.id) for _ in range(3)]
+
+    # Then
+    assert results == [template] * 3
+    assert get_spy.call_count == 1
+
+    # When
+    invalidate_cached_template(
+        TemplateValueSet(template_id=template.id, value=TemplateValue(value=5)),
+        templates_cache=cache,
+    )
+    cached_repository.get(template.id)
+
+    # Then
+    assert get_spy.call_count == 2
+
+
+def test_cached_repository_retrieves_only_templates_missing_in_cache(
+    fake_template_query_repository_factory: Callable,
+    mocker: MockFixture,
+):
+    # Given
+    templates = entity_factories.TemplateEntityFactory.create_batch(3)
+    repository = fake_template_query_repository_factory(templates)
+    get_many_spy = mocker.spy(repository, "get_many")
+    cached_repository = CachedTemplatesQueryRepository(
+        repository=repository, cache=VersionedLRUCache(ttl_seconds=TTL_SECONDS)
+    )
+    cached_repository.get(templates[0].id)
+
+    # When
+    results = cached_repository.get_many([template.id for template in templates])
+
+    # Then
+    assert set(results) == set(templates)
+    get_many_spy.assert_called_once_with([templates[1].id, templates[2].id])
+
+
+def test_cached_repository_skips_cache_when_consistency_token_is_required(
+    fake_template_query_repository_factory: Callable,
+    mocker: MockFixture,
+):
+    # Given
+    template = entity_factories.TemplateEntityFactory.create()
+    repository = fake_template_query_repository_factory([template])
+    get_spy = mocker.spy(repository, "get")
+    cached_repository = CachedTemplatesQueryRepository(
+        repository=repository, cache=VersionedLRUCache(ttl_seconds=TTL_SECONDS)
+    )
+    cached_repository.get(template.id)
+    mocker.patch.object(consistency, "get_required_position", return_value="0/1")
+
+    # When
+    cached_repository.get(template.id)
+
+    # Then
+    assert get_spy.call_count == 2
+
+
+def test_cached_repository_loads_missing_templates_from_primary_repository(
+    fake_template_query_repository_factory: Callable,
+    mocker: MockFixture,
+):
+    # Given
+    stale_template = entity_factories.TemplateEntityFactory.create()
+    template = entity_factories.TemplateEntityFactory.create(
+        id=stale_template.id, version=stale_template.version + 1
+    )
+    replica_repository = fake_template_query_repository_factory([stale_template])
+    primary_repository = fake_template_query_repository_factory([template])
+    replica_get_spy = mocker.spy(replica_repository, "get")
+    cached_repository = CachedTemplatesQueryRepository(
+        repository=replica_repository,
+        cache=VersionedLRUCache(ttl_seconds=TTL_SECONDS),
+        primary_repository=primary_repository,
+    )
+
+    # When
+    results = [cached_repository.get(template.id) for _ in range(2)]
+
+    # Then
+    assert results == [template] * 2
+    replica_get_spy.assert_not_called()
+
+
+def test_cached_repositories_share_templates_through_shared_cache(
+    fake_template_query_repository_factory: Callable,
+    mocker: MockFixture,
+):
+    # Given
+    template = entity_factories.TemplateEntityFactory.create()
+    first_repository, second_repository = (
+        fake_template_query_repository_factory([template]) for _ in range(2)
+    )
+    second_get_spy = mocker.spy(second_repository, "get")
+    shared_cache = TestSharedCache()
+    first_cached_repository, second_cached_repository = (
+        CachedTemplatesQueryRepository(
+            repository=repository,
+            cache=TwoTierCache(
+                shared_cache=shared_cache,
+                namespace="templates",
+                ttl_seconds=TTL_SECONDS,
+                serialize=serialize_template,
+                deserialize=deserialize_template,
+            ),
+        )
+        for repository in (first_repository, second_repository)
+    )
+    first_cached_repository.get(template.id)
+
+    # When
+    result = second_cached_repository.get(template.id)
+
+    # Then
+    assert result == template
+    assert second_get_spy.call_count == 0
+
+
+def test_serialized_templates_list_can_be_deserialized():
+    # Given
+    templates = entity_factories.TemplateEntityFactory.create_batch(2)
+    count = TotalCount(kind=CountStrategyEnum.NONE, value=None, has_more=True)
+
+    # When
+    result = deserialize_templates_list(
+        json.loads(json.dumps(serialize_templates_list((templates, count))))
+    )
+
+    # Then
+    assert result == (templates, count)
+    assert [template.value for template in result[0]] == [
+        template.value for template in templates
+    ]
@@ -1,14 +1,19 @@
-from typing import List
+from typing import Iterable, Iterator, List
 
 from modules.common.dtos import Ordering, OrderingEnum
-from modules.common.pagination import Pagination
+from modules.common.pagination import (
+    CountStrategyEnum,
+    CursorPagination,
+    Pagination,
+    TotalCount,
+)
 from modules.template.domain.entities import Template as TemplateEntity
 from modules.template.domain.ports import (
     AbstractTemplatesDomainRepository,
     exceptions,
 )
 from modules.template.domain.ports.dtos import TemplatesFilters
-from modules.template.domain.value_objects import TemplateId
+from modules.template.domain.value_objects import TemplateId, TemplateValue
 from modules.template.services.queries.ports import (
     AbstractTemplatesQueryRepository,
 )
@@ -16,6 +21,7 @@ from modules.template.services.queries.ports import (
 
 class TestTemplatesRepository(AbstractTemplatesDomainRepository):
     def __init__(self, templates: list[TemplateEntity]) -> None:
+        super().__init__()
         self._templates = set(templates)
 
     def create(self, template: TemplateEntity):
@@ -37,10 +43,75 @@ class TestTemplatesRepository(AbstractTemplatesDomainRepository):
                 f"Template with id '{template_id}' doesn't exist."
             ) from err
 
+    def get_for_update(self, template_id: TemplateId) -> TemplateEntity:
+        return self.get(template_id=template_id)
+
+    def import_many(self, templates: Iterable[TemplateEntity]) -> list[TemplateId]:
+        existing_ids = {template.id for template in self._templates}
+        imported_ids = []
+        for template in templates:
+            if template.id not in existing_ids:
+                self._templates.add(template)
+                existing_ids.add(template.id)
+                imported_ids.append(template.id)
+
+        return imported_ids
+
     def update(self, template: TemplateEntity):
         self._templates.remove(self.get(template_id=template.id))
         self._templates.add(template)
 
+    def subtract_value(
+        self, template_id: TemplateId, value: TemplateValue
+    ) -> TemplateValue:
+        return self.get(template_id=template_id).subtract_value(value)
+
+    def shard_value(
+        self, template_id: TemplateId, number_of_shards: int
+    ) -> TemplateValue:
+        # Shards are transparent to users of the repository.
+        return self.get(template_id=template_id).value
+
+    def unshard_value(self, template_id: TemplateId) -> TemplateValue:
+        return self.get(template_id=template_id).value
+
+    def find_ids_for_update(
+        self,
+        filters: TemplatesFilters,
+        after: TemplateId | None,
+        limit: int,
+    ) -> list[TemplateId]:
+        return sorted(
+            template.id
+            for template in TestTemplatesQueryRepository._filter(
+                templates=self._templates, filters=filters
+            )
+            if after is None or template.id > after
+        )[:limit]
+
+    def delete_many(self, template_ids: list[TemplateId]) -> list[TemplateId]:
+        for template_id in template_ids:
+            self.delete(template_id)
+        return template_ids
+
+    def set_value_many(
+        self, template_ids: list[TemplateId], value: TemplateValue
+    ) -> list[TemplateId]:
+        for template_id in template_ids:
+            self.get(template_id=template_id).set_value(value)
+        return template_ids
+
+    def subtract_value_many(
+        self, template_ids: list[TemplateId], value: TemplateValue
+    ) -> list[TemplateId]:
+        updated_ids = []
+        for template_id in template_ids:
+            template = self.get(template_id=template_id)
+            if template.value.value - value.value > 0:
+                template.subtract_value(value)
+                updated_ids.append(template_id)
+        return updated_ids
+
 
 class TestTemplatesQueryRepository(AbstractTemplatesQueryRepository):
     def __init__(self, templates: list[TemplateEntity]) -> None:
@@ -56,19 +127,48 @@ class TestTemplatesQueryRepository(AbstractTemplatesQueryRepository):
                 f"Template with id '{template_id}' doesn't exist."
             ) from err
 
+    def get_many(self, template_ids: list[TemplateId]) -> list[TemplateEntity]:
+        return [template for template in self._templates if template.id in template_ids]
+
     def list(
         self,
         filters: TemplatesFilters,
         ordering: list[Ordering],
-        pagination: Pagination | None,
-    ) -> tuple[list[TemplateEntity], int]:
+        pagination: Pagination | CursorPagination | None,
+        count_strategy: CountStrategyEnum = CountStrategyEnum.EXACT,
+    ) -> tuple[list[TemplateEntity], TotalCount]:
         templates = self._filter(templates=self._templates, filters=filters)
+        count = len(templates)
+
+        if isinstance(pagination, CursorPagination):
+            results, has_more = self._paginate_by_cursor(
+                templates=templates, ordering=ordering, pagination=pagination
+            )
+            return results, self._total_count(count, count_strategy, has_more)
+
         templates = self._order(templates=templates, ordering=ordering)
 
         if pagination is not None:
+            has_more = pagination.offset + pagination.records_per_page < count
             templates = self._paginate(templates=templates, pagination=pagination)
+            return list(templates), self._total_count(count, count_strategy, has_more)
 
-        return list(templates), len(templates)
+        return list(templates), self._total_count(count, count_strategy, False)
+
+    def stream(
+        self, filters: TemplatesFilters, ordering: List[Ordering]
+    ) -> Iterator[TemplateEntity]:
+        yield from self.list(filters=filters, ordering=ordering, pagination=None)[0]
+
+    @staticmethod
+    def _total_count(
+        count: int, count_strategy: CountStrategyEnum, has_more: bool
+    ) -> TotalCount:
+        return TotalCount(
+            kind=count_strategy,
+            value=None if count_strategy == CountStrategyEnum.NONE else count,
+            has_more=has_more,
+        )
 
     @staticmethod
     def _filter(
@@ -77,7 +177,30 @@ class TestTemplatesQueryRepository(AbstractTemplatesQueryRepository):
     ) -> set[TemplateEntity]:
         if filters.value is not None:
             templates = {
-                template for template in templates if template.value == filters.value
+                template
+                for template in templates
+                if template.value.value == filters.value
+            }
+
+        if filters.value_from is not None:
+            templates = {
+                template
+                for template in templates
+                if template.value.value >= filters.value_from
+            }
+
+        if filters.value_to is not None:
+            templates = {
+                template
+                for template in templates
+                if template.value.value <= filters.value_to
+            }
+
+        if filters.data is not None:
+            templates = {
+                template
+                for template in templates
+                if filters.data.items() <= {"value": template.value.value}.items()
             }
 
         if filters.query is not None:
@@ -123,6 +246,45 @@ class TestTemplatesQueryRepository(AbstractTemplatesQueryRepository):
 
         return templates
 
+    @staticmethod
+    def _paginate_by_cursor(
+        templates: set[TemplateEntity],
+        ordering: List[Ordering],
+        pagination: CursorPagination,
+    ) -> tuple[List[TemplateEntity], bool]:
+        descending = (
+            next(
+                (order.order for order in ordering if order.field == "timestamp"),
+                OrderingEnum.DESCENDING,
+            )
+            == OrderingEnum.DESCENDING
+        )
+        cursor = pagination.cursor
+        backwards = cursor is not None and cursor.backwards
+        if backwards:
+            descending = not descending
+
+        results = sorted(
+            templates,
+            key=lambda template: (template.timestamp, template.id),
+            reverse=descending,
+        )
+        if cursor is not None:
+            results = [
+                template
+                for template in results
+                if (
+                    (template.timestamp, template.id) < (cursor.timestamp, cursor.id)
+                    if descending
+                    else (template.timestamp, template.id)
+                    > (cursor.timestamp, cursor.id)
+                )
+            ]
+
+        has_more = len(results) > pagination.records_per_page
+        results = results[: pagination.records_per_page]
+        return (results[::-1] if backwards else results), has_more
+
     @staticmethod
     def _paginate(
         templates: set[TemplateEntity], pagination: Pagination
@@ -1,25 +1,55 @@
 from typing import Callable
 
 import pytest
+from pytest_mock import MockFixture
 
-from modules.common.message_bus import MessageBus
+from modules.common.message_bus import CommandStatusEnum, MessageBus
 from modules.template.domain.commands import (
+    BulkDeleteTemplates,
+    BulkSetTemplateValue,
+    BulkSubtractTemplateValue,
     CreateTemplate,
     DeleteTemplate,
     SetTemplateValue,
+    ShardTemplateValue,
     SubtractTemplateValue,
 )
-from modules.template.domain.ports.exceptions import TemplateDoesNotExist
+from modules.template.domain.events import (
+    TemplateCreated,
+    TemplatesDeleted,
+    TemplatesImported,
+    TemplatesValueSet,
+    TemplateValueSharded,
+)
+from modules.template.domain.exceptions import (
+    InvalidTemplateValue,
+    TemplateRevisionMismatch,
+)
+from modules.template.domain.ports.dtos import TemplatesFilters
+from modules.template.domain.ports.exceptions import (
+    TemplateDoesNotExist,
+    TemplateVersionConflict,
+)
 from modules.template.domain.value_objects import (
     INITIAL_TEMPLATE_VERSION,
+    TemplateRevision,
     TemplateValue,
 )
 from modules.template.services import (
+    bulk_delete_templates,
+    bulk_set_template_value,
+    bulk_subtract_template_value,
     create_template,
+    create_templates,
     delete_template,
+    import_templates,
     set_template_value,
+    shard_template_value,
     subtract_template_value,
 )
+from modules.template.services.commands import commands
+from modules.template.services.commands.commands import MAX_ATTEMPTS_ON_CONFLICT
+from modules.template.services.commands.dtos import InputImportedTemplate
 
 from ..... import entity_factories, fakers
 
@@ -44,6 +74,30 @@ def test_create_template_creates_template_with_default_value(
     assert template.version == INITIAL_TEMPLATE_VERSION
 
 
+def test_create_templates_creates_each_template(
+    fake_template_unit_of_work_factory: Callable,
+    message_bus: MessageBus,
+    mocker: MockFixture,
+):
+    # Given
+    unit_of_work = fake_template_unit_of_work_factory()
+    created_handler = mocker.Mock()
+    message_bus.event_handlers[TemplateCreated] = [created_handler]
+
+    # When
+    output_template_dtos = create_templates(
+        templates_unit_of_work=unit_of_work,
+        message_bus=message_bus,
+        commands=[CreateTemplate(), CreateTemplate(), CreateTemplate()],
+    )
+
+    # Then
+    assert len({output.id for output in output_template_dtos}) == 3
+    for output_template_dto in output_template_dtos:
+        assert unit_of_work.templates.get(output_template_dto.id)
+    assert created_handler.call_count == 3
+
+
 def test_delete_template_deletes_template(
     fake_template_unit_of_work_factory: Callable,
     message_bus: MessageBus,
@@ -173,3 +227,458 @@ def test_subtract_template_value_raises_exception_when_requested_template_does_n
 
     # Then
     assert not unit_of_work.templates._templates
+
+
+def test_set_template_value_raises_exception_when_template_revision_changed(
+    fake_template_unit_of_work_factory: Callable,
+    message_bus: MessageBus,
+):
+    # Given
+    template_entity = entity_factories.TemplateEntityFactory.create()
+    initial_value = template_entity.value
+    unit_of_work = fake_template_unit_of_work_factory(
+        initial_templates=[template_entity]
+    )
+    stale_revision = TemplateRevision(version=template_entity.version - 1)
+
+    # When
+    with pytest.raises(TemplateRevisionMismatch):
+        set_template_value(
+            templates_unit_of_work=unit_of_work,
+            command=SetTemplateValue(
+                template_id=template_entity.id,
+                value=fakers.fake_template_value(),
+                expected_revisions=frozenset([stale_revision]),
+            ),
+            message_bus=message_bus,
+        )
+
+    # Then
+    assert unit_of_work.templates.get(template_entity.id).value == initial_value
+
+
+def test_subtract_template_value_subtracts_value_when_template_revision_matches(
+    fake_template_unit_of_work_factory: Callable,
+    message_bus: MessageBus,
+    mocker: MockFixture,
+):
+    # Given
+    template_entity = entity_factories.TemplateEntityFactory.create()
+    template_entity._value = fakers.fake_template_value()
+    initial_value = template_entity.value
+    subtract_value = fakers.fake_template_value(max_value=initial_value.value)
+    unit_of_work = fake_template_unit_of_work_factory(
+        initial_templates=[template_entity]
+    )
+    get_for_update_spy = mocker.spy(unit_of_work.templates, "get_for_update")
+
+    # When
+    subtract_template_value(
+        templates_unit_of_work=unit_of_work,
+        command=SubtractTemplateValue(
+            template_id=template_entity.id,
+            value=subtract_value,
+            expected_revisions=frozenset([template_entity.revision]),
+        ),
+        message_bus=message_bus,
+    )
+
+    # Then
+    # Template is locked before its revision is checked.
+    get_for_update_spy.assert_called_once_with(template_entity.id)
+    assert unit_of_work.templates.get(template_entity.id).value == TemplateValue(
+        value=initial_value.value - subtract_value.value
+    )
+
+
+def test_subtract_template_value_raises_exception_when_template_revision_changed(
+    fake_template_unit_of_work_factory: Callable,
+    message_bus: MessageBus,
+):
+    # Given
+    template_entity = entity_factories.TemplateEntityFactory.create()
+    template_entity._value = fakers.fake_template_value()
+    initial_value = template_entity.value
+    unit_of_work = fake_template_unit_of_work_factory(
+        initial_templates=[template_entity]
+    )
+    stale_revision = TemplateRevision(version=template_entity.version - 1)
+
+    # When
+    with pytest.raises(TemplateRevisionMismatch):
+        subtract_template_value(
+            templates_unit_of_work=unit_of_work,
+            command=SubtractTemplateValue(
+                template_id=template_entity.id,
+                value=fakers.fake_template_value(max_value=initial_value.value),
+                expected_revisions=frozenset([stale_revision]),
+            ),
+            message_bus=message_bus,
+        )
+
+    # Then
+    assert unit_of_work.templates.get(template_entity.id).value == initial_value
+
+
+def test_set_template_value_retries_on_version_conflict(
+    fake_template_unit_of_work_factory: Callable,
+    message_bus: MessageBus,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # Given
+    template_entity = entity_factories.TemplateEntityFactory.create()
+    value = fakers.fake_template_value()
+    unit_of_work = fake_template_unit_of_work_factory(
+        initial_templates=[template_entity]
+    )
+    update = unit_of_work.templates.update
+    attempts = []
+
+    def conflicting_update(template):
+        attempts.append(template)
+        if len(attempts) == 1:
+            raise TemplateVersionConflict()
+        update(template)
+
+    monkeypatch.setattr(unit_of_work.templates, "update", conflicting_update)
+
+    # When
+    set_template_value(
+        templates_unit_of_work=unit_of_work,
+        command=SetTemplateValue(template_id=template_entity.id, value=value),
+        message_bus=message_bus,
+    )
+
+    # Then
+    assert len(attempts) == 2
+    assert unit_of_work.templates.get(template_entity.id).value == value
+
+
+def test_subtract_template_value_raises_exception_when_conflicts_persist(
+    fake_template_unit_of_work_factory: Callable,
+    message_bus: MessageBus,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # Given
+    template_entity = entity_factories.TemplateEntityFactory.create()
+    template_entity._value = fakers.fake_template_value()
+    subtract_value = fakers.fake_template_value(max_value=template_entity.value.value)
+    unit_of_work = fake_template_unit_of_work_factory(
+        initial_templates=[template_entity]
+    )
+    attempts = []
+
+    def conflicting_subtract_value(template_id, value):
+        attempts.append(template_id)
+        raise TemplateVersionConflict()
+
+    monkeypatch.setattr(
+        unit_of_work.templates, "subtract_value", conflicting_subtract_value
+    )
+
+    # When
+    with pytest.raises(TemplateVersionConflict):
+        subtract_template_value(
+            templates_unit_of_work=unit_of_work,
+            command=SubtractTemplateValue(
+                template_id=template_entity.id, value=subtract_value
+            ),
+            message_bus=message_bus,
+        )
+
+    # Then
+    assert len(attempts) == MAX_ATTEMPTS_ON_CONFLICT
+
+
+def test_subtract_template_value_within_batch_fails_on_version_conflict_without_retry(
+    fake_template_unit_of_work_factory: Callable,
+    message_bus: MessageBus,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # Given
+    template_entity = entity_factories.TemplateEntityFactory.create()
+    template_entity._value = fakers.fake_template_value()
+    subtract_value = fakers.fake_template_value(max_value=template_entity.value.value)
+    unit_of_work = fake_template_unit_of_work_factory(
+        initial_templates=[template_entity]
+    )
+    attempts = []
+
+    def conflicting_subtract_value(template_id, value):
+        attempts.append(template_id)
+        raise TemplateVersionConflict()
+
+    monkeypatch.setattr(
+        unit_of_work.templates, "subtract_value", conflicting_subtract_value
+    )
+    message_bus.command_handlers[
+        SubtractTemplateValue
+    ] = lambda command: subtract_template_value(
+        templates_unit_of_work=unit_of_work,
+        command=command,
+        message_bus=message_bus,
+    )
+    command = SubtractTemplateValue(
+        template_id=template_entity.id, value=subtract_value
+    )
+
+    # When
+    results = message_bus.handle_batch(commands=[command], unit_of_work=unit_of_work)
+
+    # Then
+    assert len(attempts) == 1
+    assert results[0].status == CommandStatusEnum.FAILED
+    assert isinstance(results[0].error, TemplateVersionConflict)
+
+
+def test_shard_template_value_keeps_value_and_emits_event(
+    fake_template_unit_of_work_factory: Callable,
+    message_bus: MessageBus,
+    mocker: MockFixture,
+):
+    # Given
+    template_entity = entity_factories.TemplateEntityFactory.create()
+    template_entity._value = fakers.fake_template_value()
+    unit_of_work = fake_template_unit_of_work_factory(
+        initial_templates=[template_entity]
+    )
+    value_sharded_handler = mocker.Mock()
+    message_bus.event_handlers[TemplateValueSharded] = [value_sharded_handler]
+
+    # When
+    value = shard_template_value(
+        templates_unit_of_work=unit_of_work,
+        message_bus=message_bus,
+        command=ShardTemplateValue(template_id=template_entity.id, number_of_shards=4),
+    )
+
+    # Then
+    assert value == template_entity.value
+    value_sharded_handler.assert_called_once_with(
+        TemplateValueSharded(template_id=template_entity.id, number_of_shards=4)
+    )
+
+
+def test_bulk_set_template_value_sets_value_of_matching_templates_in_chunks(
+    fake_template_unit_of_work_factory: Callable,
+    message_bus: MessageBus,
+    monkeypatch: pytest.MonkeyPatch,
+    mocker: MockFixture,
+):
+    # Given
+    matching_templates = entity_factories.TemplateEntityFactory.create_batch(5)
+    for template in matching_templates:
+        template._value = TemplateValue(value=10)
+    other_template = entity_factories.TemplateEntityFactory.create()
+    other_template._value = TemplateValue(value=20)
+    unit_of_work = fake_template_unit_of_work_factory(
+        initial_templates=[*matching_templates, other_template]
+    )
+    value_set_handler = mocker.Mock()
+    message_bus.event_handlers[TemplatesValueSet] = [value_set_handler]
+    monkeypatch.setattr(commands, "BULK_CHUNK_SIZE", 2)
+
+    # When
+    count = bulk_set_template_value(
+        templates_unit_of_work=unit_of_work,
+        message_bus=message_bus,
+        command=BulkSetTemplateValue(
+            filters=TemplatesFilters(value=10), value=TemplateValue(value=30)
+        ),
+    )
+
+    # Then
+    assert count == 5
+    assert all(
+        template.value == TemplateValue(value=30) for template in matching_templates
+    )
+    assert other_template.value == TemplateValue(value=20)
+    # An event is emitted for each chunk.
+    assert value_set_handler.call_count == 3
+    assert {
+        template_id
+        for call in value_set_handler.call_args_list
+        for template_id in call.args[0].template_ids
+    } == {template.id for template in matching_templates}
+
+
+def test_bulk_set_template_value_raises_exception_when_value_is_invalid(
+    fake_template_unit_of_work_factory: Callable,
+    message_bus: MessageBus,
+):
+    # Given
+    template_entity = entity_factories.TemplateEntityFactory.create()
+    unit_of_work = fake_template_unit_of_work_factory(
+        initial_templates=[template_entity]
+    )
+
+    # When
+    with pytest.raises(InvalidTemplateValue):
+        bulk_set_template_value(
+            templates_unit_of_work=unit_of_work,
+            message_bus=message_bus,
+            command=BulkSetTemplateValue(
+                filters=TemplatesFilters(value=0), value=TemplateValue(value=0)
+            ),
+        )
+
+    # Then
+    assert template_entity.value == TemplateValue(value=0)
+
+
+def test_bulk_subtract_template_value_skips_templates_with_too_small_value(
+    fake_template_unit_of_work_factory: Callable,
+    message_bus: MessageBus,
+):
+    # Given
+    big_template = entity_factories.TemplateEntityFactory.create()
+    big_template._value = TemplateValue(value=10)
+    small_template = entity_factories.TemplateEntityFactory.create()
+    small_template._value = TemplateValue(value=3)
+    unit_of_work = fake_template_unit_of_work_factory(
+        initial_templates=[big_template, small_template]
+    )
+
+    # When
+    count = bulk_subtract_template_value(
+        templates_unit_of_work=unit_of_work,
+        message_bus=message_bus,
+        command=BulkSubtractTemplateValue(
+            filters=TemplatesFilters(value_from=1), value=TemplateValue(value=5)
+        ),
+    )
+
+    # Then
+    assert count == 1
+    assert big_template.value == TemplateValue(value=5)
+    assert small_template.value == TemplateValue(value=3)
+
+
+def test_bulk_delete_templates_deletes_matching_templates(
+    fake_template_unit_of_work_factory: Callable,
+    message_bus: MessageBus,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # Given
+    matching_templates = entity_factories.TemplateEntityFactory.create_batch(4)
+    other_template = entity_factories.TemplateEntityFactory.create()
+    other_template._value = TemplateValue(value=1)
+    unit_of_work = fake_template_unit_of_work_factory(
+        initial_templates=[*matching_templates, other_template]
+    )
+    monkeypatch.setattr(commands, "BULK_CHUNK_SIZE", 2)
+
+    # When
+    count = bulk_delete_templates(
+        templates_unit_of_work=unit_of_work,
+        message_bus=message_bus,
+        command=BulkDeleteTemplates(filters=TemplatesFilters(value=0)),
+    )
+
+    # Then
+    assert count == 4
+    assert unit_of_work.templates._templates == {other_template}
+
+
+def test_bulk_delete_templates_emits_events_of_committed_chunks_when_chunk_fails(
+    fake_template_unit_of_work_factory: Callable,
+    message_bus: MessageBus,
+    monkeypatch: pytest.MonkeyPatch,
+    mocker: MockFixture,
+):
+    # Given
+    templates = entity_factories.TemplateEntityFactory.create_batch(4)
+    unit_of_work = fake_template_unit_of_work_factory(initial_templates=templates)
+    deleted_handler = mocker.Mock()
+    message_bus.event_handlers[TemplatesDeleted] = [deleted_handler]
+    monkeypatch.setattr(commands, "BULK_CHUNK_SIZE", 2)
+    monkeypatch.setattr(commands, "RETRY_BASE_DELAY_SECONDS", 0)
+    delete_many = unit_of_work.templates.delete_many
+    attempts = []
+
+    def failing_delete_many(template_ids):
+        attempts.append(template_ids)
+        if len(attempts) > 1:
+            raise TemplateVersionConflict()
+        return delete_many(template_ids)
+
+    monkeypatch.setattr(unit_of_work.templates, "delete_many", failing_delete_many)
+
+    # When
+    with pytest.raises(TemplateVersionConflict):
+        bulk_delete_templates(
+            templates_unit_of_work=unit_of_work,
+            message_bus=message_bus,
+            command=BulkDeleteTemplates(filters=TemplatesFilters(value=0)),
+        )
+
+    # Then
+    # Templates of the first chunk are deleted and the event is emitted for them.
+    deleted_handler.assert_called_once_with(
+        TemplatesDeleted(template_ids=tuple(attempts[0]))
+    )
+
+
+def test_import_templates_imports_new_templates_in_chunks(
+    fake_template_unit_of_work_factory: Callable,
+    message_bus: MessageBus,
+    mocker: MockFixture,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # Given
+    existing_template = entity_factories.TemplateEntityFactory.create()
+    unit_of_work = fake_template_unit_of_work_factory(
+        initial_templates=[existing_template]
+    )
+    imported_template_id = fakers.fake_template_id()
+    monkeypatch.setattr(commands, "IMPORT_CHUNK_SIZE", 2)
+    imported_handler = mocker.Mock()
+    message_bus.event_handlers[TemplatesImported] = [imported_handler]
+
+    # When
+    result = import_templates(
+        templates_unit_of_work=unit_of_work,
+        message_bus=message_bus,
+        templates=[
+            InputImportedTemplate(
+                id=existing_template.id, value=TemplateValue(value=5), timestamp=None
+            ),
+            InputImportedTemplate(
+                id=imported_template_id, value=TemplateValue(value=5), timestamp=None
+            ),
+            InputImportedTemplate(id=None, value=None, timestamp=None),
+        ],
+    )
+
+    # Then
+    assert result.processed == 3
+    assert result.imported == 2
+    assert existing_template.value == TemplateValue(value=0)
+    assert unit_of_work.templates.get(imported_template_id).value == TemplateValue(
+        value=5
+    )
+    # An event is emitted for templates imported with each chunk.
+    assert imported_handler.call_count == 2
+    assert imported_handler.call_args_list[0].args[0] == TemplatesImported(
+        template_ids=(imported_template_id,)
+    )
+
+
+def test_import_templates_raises_exception_when_value_is_invalid(
+    fake_template_unit_of_work_factory: Callable,
+    message_bus: MessageBus,
+):
+    # Given
+    unit_of_work = fake_template_unit_of_work_factory()
+
+    # When and then
+    with pytest.raises(InvalidTemplateValue):
+        import_templates(
+            templates_unit_of_work=unit_of_work,
+            message_bus=message_bus,
+            templates=[
+                InputImportedTemplate(
+                    id=None, value=TemplateValue(value=-1), timestamp=None
+                )
+            ],
+        )
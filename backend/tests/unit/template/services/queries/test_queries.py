@@ -2,8 +2,17 @@ from typing import Callable
 
 import pytest
 
+from modules.common.cache import GenerationalCache, VersionedLRUCache
+from modules.common.dtos import Ordering, OrderingEnum
+from modules.common.pagination import CursorPagination
 from modules.template.domain.ports.exceptions import TemplateDoesNotExist
-from modules.template.services import get_template, list_templates
+from modules.template.services import (
+    export_templates,
+    get_template,
+    get_templates,
+    list_templates,
+    list_templates_by_cursor,
+)
 from modules.template.services.queries.dtos import (
     DetailedOutputTemplate,
     OutputTemplate,
@@ -52,6 +61,53 @@ def test_get_template_raises_exception_when_requested_template_does_not_exist(
         )
 
 
+def test_get_templates_returns_templates_in_requested_order_and_missing_ids(
+    fake_template_query_repository_factory: Callable,
+):
+    # Given
+    templates = entity_factories.TemplateEntityFactory.create_batch(2)
+    missing_template_id = fakers.fake_template_id()
+    query_repository = fake_template_query_repository_factory(
+        initial_templates=templates
+    )
+
+    # When
+    output_templates, missing_template_ids = get_templates(
+        templates_query_repository=query_repository,
+        template_ids=[
+            templates[1].id,
+            missing_template_id,
+            templates[0].id,
+            templates[1].id,
+        ],
+    )
+
+    # Then
+    assert output_templates == [
+        map_template_entity_to_output_detailed_dto(templates[1]),
+        map_template_entity_to_output_detailed_dto(templates[0]),
+    ]
+    assert missing_template_ids == [missing_template_id]
+
+
+def test_export_templates_returns_detailed_output_dtos(
+    fake_template_query_repository_factory: Callable,
+):
+    # Given
+    templates = [entity_factories.TemplateEntityFactory.create()]
+    query_repository = fake_template_query_repository_factory(
+        initial_templates=templates
+    )
+
+    # When
+    results = list(export_templates(templates_query_repository=query_repository))
+
+    # Then
+    assert results == [
+        map_template_entity_to_output_detailed_dto(template) for template in templates
+    ]
+
+
 def test_list_templates_lists_all_templates(
     fake_template_query_repository_factory: Callable,
 ):
@@ -73,6 +129,37 @@ def test_list_templates_lists_all_templates(
     assert all(isinstance(result, OutputTemplate) for result in results)
 
 
+def test_list_templates_serves_cached_list_until_it_is_invalidated(
+    fake_template_query_repository_factory: Callable,
+):
+    # Given
+    template = entity_factories.TemplateEntityFactory.create()
+    query_repository = fake_template_query_repository_factory()
+    templates_list_cache = GenerationalCache(
+        cache=VersionedLRUCache(ttl_seconds=60), namespace="templates:list"
+    )
+    list_templates(
+        templates_query_repository=query_repository,
+        templates_list_cache=templates_list_cache,
+    )
+    query_repository._templates.add(template)
+
+    # When
+    cached_results, _ = list_templates(
+        templates_query_repository=query_repository,
+        templates_list_cache=templates_list_cache,
+    )
+    templates_list_cache.invalidate()
+    results, _ = list_templates(
+        templates_query_repository=query_repository,
+        templates_list_cache=templates_list_cache,
+    )
+
+    # Then
+    assert not cached_results
+    assert results == [map_template_entity_to_output_dto(template)]
+
+
 def test_list_templates_returns_empty_list_when_no_templates_exist(
     fake_template_query_repository_factory: Callable,
 ):
@@ -87,4 +174,95 @@ def test_list_templates_returns_empty_list_when_no_templates_exist(
     # Then
     assert isinstance(results, list)
     assert not results
-    assert total_number_of_results == 0
+    assert total_number_of_results.value == 0
+
+
+def test_list_templates_by_cursor_walks_through_all_templates(
+    fake_template_query_repository_factory: Callable,
+):
+    # Given
+    records_per_page = 2
+    templates = entity_factories.TemplateEntityFactory.create_batch(5)
+    query_repository = fake_template_query_repository_factory(
+        initial_templates=templates
+    )
+
+    # When
+    pages = [
+        list_templates_by_cursor(
+            templates_query_repository=query_repository,
+            pagination=CursorPagination(cursor=None, records_per_page=records_per_page),
+        )
+    ]
+    while pages[-1].next_cursor is not None:
+        pages.append(
+            list_templates_by_cursor(
+                templates_query_repository=query_repository,
+                pagination=CursorPagination(
+                    cursor=pages[-1].next_cursor, records_per_page=records_per_page
+                ),
+            )
+        )
+
+    # Then
+    assert [len(page.templates) for page in pages] == [2, 2, 1]
+    assert pages[0].previous_cursor is None
+    assert all(page.previous_cursor is not None for page in pages[1:])
+    assert [template for page in pages for template in page.templates] == [
+        map_template_entity_to_output_dto(template)
+        for template in sorted(
+            templates,
+            key=lambda template: (template.timestamp, template.id),
+            reverse=True,
+        )
+    ]
+
+
+def test_list_templates_by_cursor_rejects_ordering_by_value(
+    fake_template_query_repository_factory: Callable,
+):
+    # Given
+    query_repository = fake_template_query_repository_factory(
+        initial_templates=entity_factories.TemplateEntityFactory.create_batch(2)
+    )
+
+    # When
+    with pytest.raises(ValueError):
+        list_templates_by_cursor(
+            templates_query_repository=query_repository,
+            ordering=[Ordering(field="value", order=OrderingEnum.ASCENDING)],
+            pagination=CursorPagination(cursor=None, records_per_page=2),
+        )
+
+
+def test_list_templates_by_cursor_returns_previous_page(
+    fake_template_query_repository_factory: Callable,
+):
+    # Given
+    records_per_page = 2
+    query_repository = fake_template_query_repository_factory(
+        initial_templates=entity_factories.TemplateEntityFactory.create_batch(5)
+    )
+    first_page = list_templates_by_cursor(
+        templates_query_repository=query_repository,
+        pagination=CursorPagination(cursor=None, records_per_page=records_per_page),
+    )
+    second_page = list_templates_by_cursor(
+        templates_query_repository=query_repository,
+        pagination=CursorPagination(
+            cursor=first_page.next_cursor, records_per_page=records_per_page
+        ),
+    )
+
+    # When
+    previous_page = list_templates_by_cursor(
+        templates_query_repository=query_repository,
+        pagination=CursorPagination(
+            cursor=second_page.previous_cursor, records_per_page=records_per_page
+        ),
+    )
+
+    # Then
+    assert previous_page.templates == first_page.templates
+    assert previous_page.previous_cursor is None
+    assert previous_page.next_cursor is not None
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from pytest_mock import MockFixture
 
@@ -117,3 +119,114 @@ def test_message_bus_does_not_execute_handler_when_no_message_returned_by_other_
     assert not message_bus.queue
     sub_event_handler.assert_called_once()
     event_handler.assert_not_called()
+
+
+def test_message_bus_keeps_separate_queue_for_each_thread(
+    message_bus: common_message_bus.MessageBus,
+):
+    # Given
+    message_bus.queue.append(common_domain_events.DomainEvent())
+
+    # When
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other_thread_queue = executor.submit(lambda: list(message_bus.queue)).result()
+
+    # Then
+    assert not other_thread_queue
+    assert len(message_bus.queue) == 1
+
+
+def test_message_bus_handles_batch_commands_separately_when_not_atomic(
+    mocker: MockFixture,
+    message_bus: common_message_bus.MessageBus,
+):
+    # Given
+    class FailingCommand(common_domain_commands.DomainCommand):
+        pass
+
+    error = Exception()
+    event = common_domain_events.DomainEvent()
+    unit_of_work = mocker.MagicMock()
+    event_handler = mocker.Mock()
+
+    def handle_command(command):
+        message_bus.handle([event])
+        # Events are handled only after the whole batch is committed.
+        event_handler.assert_not_called()
+
+    def handle_failing_command(command):
+        message_bus.handle([event])
+        raise error
+
+    message_bus.command_handlers = {
+        common_domain_commands.DomainCommand: handle_command,
+        FailingCommand: handle_failing_command,
+    }
+    message_bus.event_handlers = {type(event): [event_handler]}
+    commands = [
+        common_domain_commands.DomainCommand(),
+        FailingCommand(),
+        common_domain_commands.DomainCommand(),
+    ]
+
+    # When
+    results = message_bus.handle_batch(
+        commands=commands, unit_of_work=unit_of_work, atomic=False
+    )
+
+    # Then
+    assert [result.command for result in results] == commands
+    assert [result.status for result in results] == [
+        common_message_bus.CommandStatusEnum.SUCCEEDED,
+        common_message_bus.CommandStatusEnum.FAILED,
+        common_message_bus.CommandStatusEnum.SUCCEEDED,
+    ]
+    assert results[1].error is error
+    unit_of_work.__enter__.assert_called_once()
+    unit_of_work.__exit__.assert_called_once_with(None, None, None)
+    # Events of the failed command are dropped.
+    assert event_handler.call_count == 2
+    assert not message_bus.queue
+
+
+def test_message_bus_rolls_back_whole_batch_when_atomic_and_command_fails(
+    mocker: MockFixture,
+    message_bus: common_message_bus.MessageBus,
+):
+    # Given
+    class FailingCommand(common_domain_commands.DomainCommand):
+        pass
+
+    event = common_domain_events.DomainEvent()
+    unit_of_work = mocker.MagicMock()
+    unit_of_work.__exit__.return_value = None
+    command_handler = mocker.Mock(return_value=event)
+    event_handler = mocker.Mock()
+
+    message_bus.command_handlers = {
+        common_domain_commands.DomainCommand: command_handler,
+        FailingCommand: mocker.Mock(side_effect=Exception()),
+    }
+    message_bus.event_handlers = {type(event): [event_handler]}
+    commands = [
+        common_domain_commands.DomainCommand(),
+        FailingCommand(),
+        common_domain_commands.DomainCommand(),
+    ]
+
+    # When
+    results = message_bus.handle_batch(
+        commands=commands, unit_of_work=unit_of_work, atomic=True
+    )
+
+    # Then
+    assert [result.status for result in results] == [
+        common_message_bus.CommandStatusEnum.ROLLED_BACK,
+        common_message_bus.CommandStatusEnum.FAILED,
+        common_message_bus.CommandStatusEnum.SKIPPED,
+    ]
+    command_handler.assert_called_once()
+    # Unit of work is left with an exception, so it's rolled back.
+    assert unit_of_work.__exit__.call_args.args[0] is not None
+    event_handler.assert_not_called()
+    assert not message_bus.queue
@@ -8,5 +8,7 @@ cd migrations/ && alembic upgrade head && cd -
 exec gunicorn "main:app" --bind :8000 \
     --name "large-application-template" \
     --workers 5 \
+    --worker-class gthread \
+    --threads 4 \
     --log-level="info" \
     --capture-output